@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -49,9 +52,15 @@ INSTALLED_APPS = [
     'home',
     'motoristas',
     'veiculos',
+    'cercas',
+    'telemetria',
+    'tarefas',
 ]
 
 MIDDLEWARE = [    
+    'core.metricas.MetricasMiddleware',
+    'core.consultas.DetectorConsultasMiddleware',
+    'core.perfilador.PerfiladorMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,15 +69,34 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.roteamento.FixarPrimarioMiddleware',
 ]
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.JWTClaimsAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # JSON codificado/decodificado com orjson (core.json_rapido) e MessagePack
+    # para o app (Accept: application/msgpack), oferecido se o msgpack estiver instalado
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.json_rapido.JSONRapidoRenderer',
+        'core.formato_binario.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.json_rapido.JSONRapidoParser',
+        'core.formato_binario.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS': 'core.formato_binario.NegociacaoConteudo',
+    # Proxies confiáveis na frente da aplicação: o IP dos throttles é o REMOTE_ADDR
+    # (0) ou o endereço que o último proxy pôs no X-Forwarded-For. None confiaria
+    # no cabeçalho inteiro, que o cliente forja à vontade
+    'NUM_PROXIES': 0,
 }
 
 SIMPLE_JWT = {
@@ -78,14 +106,36 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,
+    "TOKEN_REFRESH_SERIALIZER": "core.jwt.TokenRefreshFiltradoSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "core.jwt.TokenVerifyFiltradoSerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "core.jwt.TokenBlacklistFiltradoSerializer",
 }
 
 INSTALLED_APPS += ['rest_framework_simplejwt.token_blacklist']
 
 CORS_ALLOW_ALL_ORIGINS = True  # somente em dev; em prod restrinja domínios
+# Token de fixação no primário (core.roteamento): lido pelo front e reenviado nas leituras
+CORS_EXPOSE_HEADERS = ['X-SisFleet-Primario']
+CORS_ALLOW_HEADERS = (*default_headers, 'x-sisfleet-primario')
 
 AUTH_USER_MODEL = "core.CustomUser"
 
+# Verificação de senha no pool limitado de hash (core.hashing)
+AUTHENTICATION_BACKENDS = ["core.backends.ModelBackendPoolHash"]
+HASH_SENHA_TRABALHADORES = None  # None = os.cpu_count()
+HASH_SENHA_FILA_MAXIMA = None  # None = 4 x trabalhadores
+HASH_SENHA_ESPERA = 2.0  # segundos aguardando vaga antes de responder 503
+HASH_SENHA_RETRY_AFTER = 1
+
+# Token bucket dos endpoints de login, cadastro e recuperação de senha (core.throttling)
+# {escopo: {'ip' | 'identificador': (capacidade, tokens por segundo)}}
+THROTTLE_BALDES = {
+    'login': {'ip': (20, 1.0), 'identificador': (10, 1 / 30)},
+    'cadastro': {'ip': (10, 1 / 6), 'identificador': (3, 1 / 60)},
+    'recuperacao_senha': {'ip': (10, 1 / 6), 'identificador': (3, 1 / 60)},
+}
+THROTTLE_CACHE = 'default'
+
 ROOT_URLCONF = 'SisFleet.urls'
 
 TEMPLATES = [
@@ -117,6 +167,74 @@ DATABASES = {
     }
 }
 
+# Réplica de leitura (core.roteamento): listagens e relatórios marcados com
+# @leitura_replica leem do alias REPLICA_ALIAS quando ele existe em DATABASES.
+# Para testar localmente: SISFLEET_REPLICA_SQLITE=replica.sqlite3 e
+# `python manage.py sincronizar_replica --intervalo 5` em outro terminal.
+if os.environ.get('SISFLEET_REPLICA_SQLITE'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / os.environ['SISFLEET_REPLICA_SQLITE'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.roteamento.RoteadorReplica']
+REPLICA_ALIAS = 'replica'
+# Depois de gravar, o usuário lê do primário por este tempo (atraso da réplica)
+REPLICA_FIXAR_SEGUNDOS = 10
+# Liga/desliga a réplica por método: {'motoristas.services.motorista_service.MotoristaService.listar_motoristas': False}
+REPLICA_METODOS = {}
+
+# Cache das representações (to_dict) de motoristas e veículos (core.cache_representacao)
+# BACKEND 'locmem' (LRU por processo, MAX_ITENS) ou 'django' (ALIAS de CACHES: arquivo, Redis...)
+CACHE_REPRESENTACAO = {'BACKEND': 'locmem', 'MAX_ITENS': 20000}
+
+# Detector de N+1 (core.consultas.DetectorConsultasMiddleware), ativo quando DEBUG
+# (ou com DETECTOR_CONSULTAS_ATIVO = True). ACAO: 'log' (aviso) ou 'erro' (exceção)
+DETECTOR_CONSULTAS_LIMITE = 5
+DETECTOR_CONSULTAS_ACAO = 'log'
+
+# Consultas lentas (core.consultas_lentas): acima do limite vão para o arquivo
+# JSON Lines com o plano de execução; `python manage.py consultas_lentas` resume.
+# O arquivo fica fora da árvore do código (padrão: <tmp>/sisfleet-consultas-lentas.jsonl)
+CONSULTAS_LENTAS_ATIVO = True
+CONSULTAS_LENTAS_LIMITE_MS = 200
+CONSULTAS_LENTAS_ARQUIVO = os.environ.get(
+    'SISFLEET_CONSULTAS_LENTAS', Path(tempfile.gettempdir()) / 'sisfleet-consultas-lentas.jsonl'
+)
+
+# Métricas Prometheus em /api/metricas/ (core.metricas); o coletor usa
+# 'Authorization: Bearer <METRICAS_TOKEN>', administradores usam o JWT
+METRICAS_ATIVAS = True
+METRICAS_TOKEN = os.environ.get('SISFLEET_METRICAS_TOKEN')
+# Diretório onde cada worker grava as suas séries; /api/metricas/ soma todos.
+# None: cada processo exporta só as próprias (runserver, testes)
+METRICAS_DIRETORIO = os.environ.get('SISFLEET_METRICAS_DIR')
+METRICAS_INTERVALO_GRAVACAO = 1.0  # segundos entre gravações do instantâneo de um worker
+
+# Perfilador sob demanda (core.perfilador): administradores armam em /api/perfis/
+# ou um request traz 'X-Perfilar: <PERFILADOR_TOKEN>'. Desarmado, não perfila nada.
+# Os perfis ficam fora da árvore do código (padrão: <tmp>/sisfleet-perfis)
+PERFILADOR_DIRETORIO = os.environ.get('SISFLEET_PERFIS_DIR', Path(tempfile.gettempdir()) / 'sisfleet-perfis')
+PERFILADOR_TOKEN = os.environ.get('SISFLEET_PERFILADOR_TOKEN')
+PERFILADOR_MAX_REQUISICOES = 100  # por armação
+PERFILADOR_MAX_ARQUIVOS = 50  # os mais antigos são apagados
+PERFILADOR_VERIFICACAO_SEGUNDOS = 1.0  # frequência com que cada processo relê a armação do cache
+PERFILADOR_INTERVALO_AMOSTRAGEM = 0.005  # modo 'amostragem' (pilhas para flamegraph)
+
+# Fila de tarefas em segundo plano (app tarefas), executada por
+# `python manage.py worker_tarefas`. Falhas voltam à fila depois de
+# BASE * 2^(tentativa - 1) segundos, até MAXIMO; tarefa reivindicada por um
+# worker que morreu volta a ficar disponível depois do LEASE (renovado a cada
+# terço dele enquanto a tarefa executa)
+TAREFAS_BACKOFF_BASE = 10
+TAREFAS_BACKOFF_MAXIMO = 3600
+TAREFAS_LEASE_SEGUNDOS = 600
+
+# Emails das tarefas de notificação ('core.enviar_email'); em desenvolvimento vão para o console
+EMAIL_BACKEND = os.environ.get('SISFLEET_EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.environ.get('SISFLEET_EMAIL_REMETENTE', 'SisFleet <nao-responda@sisfleet.com>')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
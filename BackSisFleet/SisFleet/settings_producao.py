@@ -0,0 +1,136 @@
+"""
+Settings de produção do SisFleet.
+
+Uso: DJANGO_SETTINGS_MODULE=SisFleet.settings_producao
+
+Tudo que muda entre ambientes vem de variáveis de ambiente:
+
+    DJANGO_SECRET_KEY         chave secreta (obrigatória)
+    DJANGO_ALLOWED_HOSTS      hosts separados por vírgula
+    DJANGO_DEBUG              1 para ligar o DEBUG (padrão: desligado)
+    DB_ENGINE                 'sqlite' (padrão) ou 'postgresql'
+    DB_NAME                   caminho do arquivo SQLite ou nome do banco PostgreSQL
+    DB_USER, DB_PASSWORD, DB_HOST, DB_PORT   conexão PostgreSQL
+    DB_CONN_MAX_AGE           segundos de reuso da conexão persistente (padrão: 600)
+    DB_REPLICA_HOST/DB_REPLICA_PORT   réplica de leitura PostgreSQL (opcional)
+    DB_REPLICA_NAME           réplica de leitura SQLite, mantida por sincronizar_replica (opcional)
+    DB_PGBOUNCER              1 quando o PostgreSQL está atrás do PgBouncer em modo transaction
+    SQLITE_MMAP_MB, SQLITE_CACHE_MB, SQLITE_BUSY_TIMEOUT_MS   ajustes do SQLite
+    DJANGO_NUM_PROXIES        proxies reversos confiáveis na frente do gunicorn (padrão: 0)
+    CACHE_BACKEND             'redis', 'memcached' ou 'banco' (obrigatória)
+    CACHE_LOCATION            URL do Redis, host:porta do Memcached ou nome da tabela
+                              ('banco'; padrão sisfleet_cache, criada com createcachetable)
+    SISFLEET_METRICAS_DIR     diretório das métricas dos workers (padrão: <tmp>/sisfleet-metricas);
+                              esvaziar no deploy, antes de subir o gunicorn
+"""
+import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+from core.banco import pragmas_sqlite_producao
+
+
+def _env_bool(nome, padrao=False):
+    return os.environ.get(nome, '1' if padrao else '0').lower() in ('1', 'true', 'sim', 'yes')
+
+
+def _env_int(nome, padrao):
+    return int(os.environ.get(nome, padrao))
+
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+DEBUG = _env_bool('DJANGO_DEBUG')
+ALLOWED_HOSTS = [host.strip() for host in os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost').split(',') if host.strip()]
+
+SIMPLE_JWT = {**SIMPLE_JWT, "SIGNING_KEY": SECRET_KEY}  # noqa: F405
+
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'sisfleet'),
+            'USER': os.environ.get('DB_USER', 'sisfleet'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            # Conexão persistente por worker; com PgBouncer o pool fica no PgBouncer
+            'CONN_MAX_AGE': _env_int('DB_CONN_MAX_AGE', 600),
+            'CONN_HEALTH_CHECKS': True,
+            # Em modo transaction o PgBouncer não suporta cursores nomeados (usados por .iterator())
+            'DISABLE_SERVER_SIDE_CURSORS': _env_bool('DB_PGBOUNCER'),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': _env_int('DB_CONN_MAX_AGE', 600),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+
+# Réplica de leitura (core.roteamento): DB_REPLICA_HOST (PostgreSQL) ou DB_REPLICA_NAME (arquivo SQLite)
+if DB_ENGINE == 'postgresql' and os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+elif DB_ENGINE != 'postgresql' and os.environ.get('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['DB_REPLICA_NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Cache compartilhado por todos os workers (core.cache_compartilhado): throttle,
+# lista negra de tokens, fixação no primário, índice de cercas, estatísticas e
+# perfilador dependem dele. Sem CACHE_BACKEND o deploy falha aqui em vez de
+# cada worker usar um LocMem próprio. No 'banco' o incr não é atômico: prefira
+# Redis ou Memcached quando o throttle importa
+_BACKENDS_CACHE = {
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://localhost:6379/0'),
+    'memcached': ('django.core.cache.backends.memcached.PyMemcacheCache', '127.0.0.1:11211'),
+    'banco': ('django.core.cache.backends.db.DatabaseCache', 'sisfleet_cache'),
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND')
+if CACHE_BACKEND not in _BACKENDS_CACHE:
+    raise ImproperlyConfigured(
+        f"CACHE_BACKEND deve ser um de {', '.join(_BACKENDS_CACHE)} (recebido: {CACHE_BACKEND!r}); "
+        "os workers precisam de um cache compartilhado"
+    )
+CACHES = {
+    'default': {
+        'BACKEND': _BACKENDS_CACHE[CACHE_BACKEND][0],
+        'LOCATION': os.environ.get('CACHE_LOCATION', _BACKENDS_CACHE[CACHE_BACKEND][1]),
+        'KEY_PREFIX': 'sisfleet',
+        'TIMEOUT': 300,
+    }
+}
+
+# IP dos throttles: atrás de nginx/balanceador, o X-Forwarded-For posto por eles
+REST_FRAMEWORK = {**REST_FRAMEWORK, 'NUM_PROXIES': _env_int('DJANGO_NUM_PROXIES', 0)}  # noqa: F405
+
+# Representações de motoristas/veículos no cache compartilhado: um fragmento
+# serializado por um worker serve aos outros (a validade vem da versão, não do processo)
+CACHE_REPRESENTACAO = {'BACKEND': 'django', 'ALIAS': 'default', 'TIMEOUT': 3600}
+
+# /api/metricas/ soma as séries de todos os workers (core.metricas.RegistroMetricas)
+METRICAS_DIRETORIO = os.environ.get('SISFLEET_METRICAS_DIR', os.path.join(tempfile.gettempdir(), 'sisfleet-metricas'))
+
+# Aplicados em cada nova conexão por core.banco.aplicar_pragmas_sqlite
+SQLITE_PRAGMAS = pragmas_sqlite_producao(
+    busy_timeout_ms=_env_int('SQLITE_BUSY_TIMEOUT_MS', 5000),
+    cache_mb=_env_int('SQLITE_CACHE_MB', 64),
+    mmap_mb=_env_int('SQLITE_MMAP_MB', 256),
+)
+
+CORS_ALLOW_ALL_ORIGINS = _env_bool('DJANGO_CORS_ALLOW_ALL')
+CORS_ALLOWED_ORIGINS = [origem.strip() for origem in os.environ.get('DJANGO_CORS_ORIGINS', '').split(',') if origem.strip()]
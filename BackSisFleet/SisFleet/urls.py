@@ -36,4 +36,7 @@ urlpatterns = [
     path('home/', include('home.urls')),    
     path('motoristas/', include('motoristas.urls')),
     path('veiculos/', include('veiculos.urls')),
+    path('cercas/', include('cercas.urls')),
+    path('telemetria/', include('telemetria.urls')),
+    path('api/tarefas/', include('tarefas.urls')),
 ]
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class CercasConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'cercas'
+
+    def ready(self):
+        # Mantém os índices espaciais em memória sincronizados com as edições
+        from cercas import signals  # noqa: F401
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.23 on 2026-10-19 02:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CercaEletronica',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=100)),
+                ('tipo', models.CharField(choices=[('deposito', 'Depósito'), ('cliente', 'Cliente'), ('restrita', 'Área restrita')], default='cliente', max_length=20)),
+                ('vertices', models.JSONField(default=list)),
+                ('lat_min', models.FloatField(blank=True, null=True)),
+                ('lat_max', models.FloatField(blank=True, null=True)),
+                ('lon_min', models.FloatField(blank=True, null=True)),
+                ('lon_max', models.FloatField(blank=True, null=True)),
+                ('ativa', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('atualizado_por', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cerca_atualizado_por', to=settings.AUTH_USER_MODEL)),
+                ('criado_por', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cerca_criado_por', to=settings.AUTH_USER_MODEL)),
+                ('responsavel_fk', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cerca_responsavel', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['responsavel_fk', 'ativa'], name='cerca_responsavel_ativa_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1 @@
+from cercas.models.cercas import CercaEletronica
\ No newline at end of file
@@ -0,0 +1,108 @@
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+from datetime import datetime
+from core.models import CustomUser
+from common.utils.converte_data_para_string import converter_data_para_string
+
+
+class CercaEletronicaQuerySet(models.QuerySet):
+    """
+    bulk_create e update não passam pelo save() nem disparam signals: aqui o
+    retângulo envolvente é calculado e os índices espaciais dos responsáveis
+    afetados são invalidados, como no save/delete.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for cerca in objs:
+            cerca.calcular_envelope()
+        criadas = super().bulk_create(objs, *args, **kwargs)
+        self._invalidar_indices({cerca.responsavel_fk_id for cerca in objs})
+        return criadas
+
+    def update(self, **kwargs):
+        if 'vertices' in kwargs:
+            raise ValueError("Use save() para alterar os vértices: o retângulo envolvente é calculado no save()")
+        responsaveis = set(self.values_list('responsavel_fk_id', flat=True))
+        alteradas = super().update(**kwargs)
+        self._invalidar_indices(responsaveis)
+        return alteradas
+
+    def _invalidar_indices(self, responsavel_ids):
+        from cercas.services.cerca_service import CercaService
+        CercaService.invalidar_indices(responsavel_ids)
+
+
+class CercaEletronica(models.Model):
+    """
+    Modelo para representar cercas eletrônicas (polígonos) de um responsável.
+
+    Campos:
+    - responsavel_fk: Usuário (cliente) dono da cerca.
+    - nome: Nome de identificação da cerca.
+    - tipo: Depósito, local de cliente ou área restrita.
+    - vertices: Lista de vértices do polígono no formato [[latitude, longitude], ...].
+    - lat_min/lat_max/lon_min/lon_max: Retângulo envolvente, calculado no save() e no bulk_create.
+    - ativa: Cercas inativas não entram no índice espacial.
+    - criado_por: Usuário que criou o registro.
+    - atualizado_por: Usuário que atualizou o registro pela última vez.
+    - created_at: Data e hora de criação do registro.
+    - updated_at: Data e hora da última atualização do registro.
+    """
+
+    TIPOS = [
+        ('deposito', 'Depósito'),
+        ('cliente', 'Cliente'),
+        ('restrita', 'Área restrita'),
+    ]
+
+    responsavel_fk = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='cerca_responsavel')
+    nome = models.CharField(max_length=100)
+    tipo = models.CharField(max_length=20, choices=TIPOS, default='cliente')
+    vertices = models.JSONField(default=list)
+    lat_min = models.FloatField(null=True, blank=True)
+    lat_max = models.FloatField(null=True, blank=True)
+    lon_min = models.FloatField(null=True, blank=True)
+    lon_max = models.FloatField(null=True, blank=True)
+    ativa = models.BooleanField(default=True)
+    criado_por = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, related_name='cerca_criado_por', null=True)
+    atualizado_por = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, related_name='cerca_atualizado_por', null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    objects = CercaEletronicaQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['responsavel_fk', 'ativa'], name='cerca_responsavel_ativa_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.nome} ({self.get_tipo_display()})"
+
+    def calcular_envelope(self):
+        """Preenche lat_min/lat_max/lon_min/lon_max a partir dos vértices"""
+        if self.vertices:
+            latitudes = [vertice[0] for vertice in self.vertices]
+            longitudes = [vertice[1] for vertice in self.vertices]
+            self.lat_min, self.lat_max = min(latitudes), max(latitudes)
+            self.lon_min, self.lon_max = min(longitudes), max(longitudes)
+
+    def save(self, *args, **kwargs):
+        self.calcular_envelope()
+        super().save(*args, **kwargs)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'nome': self.nome,
+            'tipo': self.tipo,
+            'vertices': self.vertices,
+            'ativa': self.ativa,
+            'created_at': self.formatar_data(self.created_at),
+            'updated_at': self.formatar_data(self.updated_at),
+        }
+
+    def formatar_data(self, data):
+        return converter_data_para_string(data)
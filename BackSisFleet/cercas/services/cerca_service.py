@@ -0,0 +1,272 @@
+# cercas/services/cerca_service.py
+import threading
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from cercas.models.cercas import CercaEletronica
+from cercas.services.indice_espacial import IndiceEspacial
+
+
+class CercaError(Exception):
+    """Exceção base para erros relacionados à cerca eletrônica."""
+
+
+class BadRequestError(CercaError):
+    """Exceção para erros de solicitação inválida (código HTTP 400)."""
+
+
+class NotFoundError(CercaError):
+    """Exceção para erros de recurso não encontrado (código HTTP 404)."""
+
+
+class InternalServerError(CercaError):
+    """Exceção para erros internos do servidor (código HTTP 500)."""
+
+
+class CercaService:
+    """
+    Service class para operações de negócio com CercaEletronica.
+
+    Mantém um IndiceEspacial em memória por responsável, construído na primeira
+    consulta e atualizado de forma incremental pelos signals de save/delete.
+    Outros processos percebem a edição por um contador de versão no cache
+    compartilhado e reconstroem apenas o índice do responsável afetado.
+    """
+
+    MAX_PONTOS_CONSULTA = 10000
+
+    _indices = {}
+    _versoes = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _chave_versao(cls, responsavel_id):
+        return f"cercas:indice:versao:{responsavel_id}"
+
+    @classmethod
+    def _validar_vertices(cls, vertices):
+        """Valida e normaliza os vértices do polígono"""
+        if not isinstance(vertices, (list, tuple)) or len(vertices) < 3:
+            raise BadRequestError("A cerca deve ter pelo menos 3 vértices no formato [[latitude, longitude], ...]")
+
+        normalizados = []
+        for vertice in vertices:
+            try:
+                latitude, longitude = float(vertice[0]), float(vertice[1])
+            except (TypeError, ValueError, IndexError, KeyError):
+                raise BadRequestError("Vértice inválido. Use o formato [latitude, longitude]")
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                raise BadRequestError("Vértice fora dos limites de latitude/longitude")
+            normalizados.append([latitude, longitude])
+        return normalizados
+
+    @classmethod
+    def _carregar_dados_comuns(cls, data):
+        """Carrega os dados comuns para criação/atualização de cerca"""
+        return {
+            'nome': data.get('nome'),
+            'tipo': data.get('tipo'),
+            'vertices': data.get('vertices'),
+            'ativa': data.get('ativa'),
+        }
+
+    @classmethod
+    def criar_cerca(cls, data, usuario_criador):
+        """
+        Cria uma nova cerca eletrônica para o usuário responsável
+
+        Args:
+            data (dict): Dados da cerca (nome, tipo, vertices, ativa)
+            usuario_criador (User): Usuário responsável pela cerca
+
+        Returns:
+            CercaEletronica: Objeto da cerca criada
+        """
+        if not data.get('nome'):
+            raise BadRequestError("O nome da cerca é obrigatório")
+
+        tipos_validos = dict(CercaEletronica.TIPOS)
+        if data.get('tipo') and data['tipo'] not in tipos_validos:
+            raise BadRequestError(f"Tipo de cerca inválido. Use: {', '.join(tipos_validos)}")
+
+        dados = {field: value for field, value in cls._carregar_dados_comuns(data).items() if value is not None}
+        dados['vertices'] = cls._validar_vertices(data.get('vertices'))
+        dados['responsavel_fk'] = usuario_criador
+        dados['criado_por'] = usuario_criador
+        dados['atualizado_por'] = usuario_criador
+        dados['created_at'] = timezone.now()
+        dados['updated_at'] = timezone.now()
+
+        try:
+            return CercaEletronica.objects.create(**dados)
+        except IntegrityError as e:
+            raise InternalServerError(f"Erro de integridade ao criar cerca: {str(e)}")
+
+    @classmethod
+    def atualizar_cerca(cls, cerca_id, data, usuario_atualizador):
+        """
+        Atualiza uma cerca existente do usuário
+
+        Args:
+            cerca_id (int): ID da cerca
+            data (dict): Dados a serem atualizados
+            usuario_atualizador (User): Usuário que está atualizando o registro
+
+        Returns:
+            CercaEletronica: Objeto da cerca atualizada
+        """
+        cerca = cls.obter_cerca_por_id(cerca_id, usuario_atualizador.id)
+        dados = cls._carregar_dados_comuns(data)
+
+        if dados['tipo'] is not None and dados['tipo'] not in dict(CercaEletronica.TIPOS):
+            raise BadRequestError("Tipo de cerca inválido")
+        if dados['vertices'] is not None:
+            dados['vertices'] = cls._validar_vertices(dados['vertices'])
+
+        for field, value in dados.items():
+            if value is not None:
+                setattr(cerca, field, value)
+
+        cerca.atualizado_por = usuario_atualizador
+        cerca.updated_at = timezone.now()
+        cerca.save()
+        return cerca
+
+    @classmethod
+    def obter_cerca_por_id(cls, cerca_id, responsavel_id):
+        """
+        Obtém uma cerca do responsável pelo ID
+
+        Raises:
+            NotFoundError: Se a cerca não existir ou pertencer a outro responsável
+        """
+        try:
+            return CercaEletronica.objects.get(id=cerca_id, responsavel_fk_id=responsavel_id)
+        except (CercaEletronica.DoesNotExist, ValueError, TypeError):
+            raise NotFoundError(f"Cerca com ID {cerca_id} não encontrada")
+
+    @classmethod
+    def listar_cercas_por_responsavel(cls, responsavel_id):
+        """
+        Lista todas as cercas de um responsável.
+
+        Returns:
+            list: Lista de dicionários representando as cercas.
+        """
+        cercas = CercaEletronica.objects.filter(responsavel_fk_id=responsavel_id).order_by('nome')
+        return [cerca.to_dict() for cerca in cercas]
+
+    @classmethod
+    def deletar_cerca(cls, cerca_id, responsavel_id):
+        """
+        Exclui uma cerca do responsável
+
+        Raises:
+            NotFoundError: Se a cerca não for encontrada
+        """
+        cerca = cls.obter_cerca_por_id(cerca_id, responsavel_id)
+        cerca.delete()
+
+    @classmethod
+    def obter_indice(cls, responsavel_id):
+        """
+        Retorna o índice espacial do responsável, reconstruindo-o se ainda não
+        existir neste processo ou se outro processo alterou as cercas dele.
+        """
+        versao = cache.get(cls._chave_versao(responsavel_id), 0)
+        with cls._lock:
+            indice = cls._indices.get(responsavel_id)
+            if indice is not None and cls._versoes.get(responsavel_id) == versao:
+                return indice
+
+        indice = IndiceEspacial()
+        cercas = CercaEletronica.objects.filter(responsavel_fk_id=responsavel_id, ativa=True).values_list('id', 'vertices')
+        for cerca_id, vertices in cercas.iterator():
+            indice.atualizar(cerca_id, vertices)
+
+        with cls._lock:
+            cls._indices[responsavel_id] = indice
+            cls._versoes[responsavel_id] = versao
+        return indice
+
+    @classmethod
+    def _registrar_alteracao(cls, responsavel_id, alterar_indice):
+        """
+        Aplica a alteração no índice local e publica a nova versão no cache,
+        depois do commit: antes dele, outro processo que visse a versão nova
+        reconstruiria o índice com as linhas antigas e ficaria com ele até a
+        próxima alteração. Os outros processos só percebem a versão nova se o
+        cache for compartilhado (core.cache_compartilhado); com alterar_indice
+        None o índice local é descartado.
+        """
+        transaction.on_commit(lambda: cls._publicar_alteracao(responsavel_id, alterar_indice))
+
+    @classmethod
+    def _publicar_alteracao(cls, responsavel_id, alterar_indice):
+        chave = cls._chave_versao(responsavel_id)
+        cache.add(chave, 0, timeout=None)
+        try:
+            nova_versao = cache.incr(chave)
+        except ValueError:
+            cache.set(chave, 1, timeout=None)
+            nova_versao = 1
+
+        with cls._lock:
+            indice = cls._indices.get(responsavel_id)
+            if indice is None:
+                return
+            if alterar_indice is None or cls._versoes.get(responsavel_id) != nova_versao - 1:
+                # Outro processo também alterou: descarta e reconstrói na próxima consulta
+                del cls._indices[responsavel_id]
+                cls._versoes.pop(responsavel_id, None)
+                return
+            cls._versoes[responsavel_id] = nova_versao
+        alterar_indice(indice)
+
+    @classmethod
+    def sincronizar_cerca(cls, cerca):
+        """Atualiza incrementalmente o índice após o save de uma cerca"""
+        # Lidos agora: a alteração só é aplicada depois do commit
+        cerca_id, vertices = cerca.id, cerca.vertices
+        if cerca.ativa:
+            alterar = lambda indice: indice.atualizar(cerca_id, vertices)
+        else:
+            alterar = lambda indice: indice.remover(cerca_id)
+        cls._registrar_alteracao(cerca.responsavel_fk_id, alterar)
+
+    @classmethod
+    def remover_cerca_do_indice(cls, cerca):
+        """Remove a cerca do índice após o delete"""
+        # O delete zera cerca.id antes do commit
+        cerca_id = cerca.id
+        cls._registrar_alteracao(cerca.responsavel_fk_id, lambda indice: indice.remover(cerca_id))
+
+    @classmethod
+    def invalidar_indices(cls, responsavel_ids):
+        """Descarta os índices dos responsáveis em todos os processos (bulk_create/update, sem signals)"""
+        for responsavel_id in set(responsavel_ids):
+            cls._registrar_alteracao(responsavel_id, None)
+
+    @classmethod
+    def cercas_contendo_pontos(cls, responsavel_id, pontos):
+        """
+        Consulta em lote quais cercas do responsável contêm cada ponto.
+
+        Args:
+            responsavel_id (int): ID do usuário responsável
+            pontos (list): Pontos no formato [[latitude, longitude], ...]
+
+        Returns:
+            list: Para cada ponto, a lista de IDs das cercas que o contêm
+        """
+        if not isinstance(pontos, (list, tuple)):
+            raise BadRequestError("Informe 'pontos' como uma lista de [latitude, longitude]")
+        if len(pontos) > cls.MAX_PONTOS_CONSULTA:
+            raise BadRequestError(f"Máximo de {cls.MAX_PONTOS_CONSULTA} pontos por consulta")
+
+        try:
+            pontos = [(float(ponto[0]), float(ponto[1])) for ponto in pontos]
+        except (TypeError, ValueError, IndexError, KeyError):
+            raise BadRequestError("Ponto inválido. Use o formato [latitude, longitude]")
+
+        return cls.obter_indice(responsavel_id).consultar(pontos)
@@ -0,0 +1,126 @@
+# cercas/services/indice_espacial.py
+import threading
+from math import floor
+
+
+def ponto_no_poligono(latitude, longitude, vertices):
+    """
+    Teste exato de ponto-em-polígono (ray casting).
+
+    Args:
+        latitude (float): Latitude do ponto
+        longitude (float): Longitude do ponto
+        vertices (sequence): Vértices do polígono no formato [(lat, lon), ...]
+
+    Returns:
+        bool: True se o ponto estiver dentro do polígono
+    """
+    dentro = False
+    total = len(vertices)
+    lat_j, lon_j = vertices[total - 1]
+    for lat_i, lon_i in vertices:
+        if (lat_i > latitude) != (lat_j > latitude):
+            lon_cruzamento = (lon_j - lon_i) * (latitude - lat_i) / (lat_j - lat_i) + lon_i
+            if longitude < lon_cruzamento:
+                dentro = not dentro
+        lat_j, lon_j = lat_i, lon_i
+    return dentro
+
+
+class IndiceEspacial:
+    """
+    Índice em grade regular sobre os retângulos envolventes das cercas.
+
+    Cada cerca é registrada nas células que seu retângulo cobre; uma consulta
+    olha apenas a célula do ponto, filtra pelo retângulo e só então faz o teste
+    exato de ponto-em-polígono. Cercas grandes demais para a grade (mais de
+    `max_celulas_por_cerca` células) ficam numa lista à parte, testada sempre
+    pelo retângulo.
+    """
+
+    def __init__(self, tamanho_celula=0.05, max_celulas_por_cerca=1024):
+        self.tamanho_celula = tamanho_celula
+        self.max_celulas_por_cerca = max_celulas_por_cerca
+        self._cercas = {}
+        self._grade = {}
+        self._grandes = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cercas)
+
+    def _celula(self, latitude, longitude):
+        return floor(latitude / self.tamanho_celula), floor(longitude / self.tamanho_celula)
+
+    def _celulas_do_retangulo(self, lat_min, lat_max, lon_min, lon_max):
+        i_min, j_min = self._celula(lat_min, lon_min)
+        i_max, j_max = self._celula(lat_max, lon_max)
+        if (i_max - i_min + 1) * (j_max - j_min + 1) > self.max_celulas_por_cerca:
+            return None
+        return [(i, j) for i in range(i_min, i_max + 1) for j in range(j_min, j_max + 1)]
+
+    def _remover_sem_lock(self, cerca_id):
+        registro = self._cercas.pop(cerca_id, None)
+        if registro is None:
+            return
+        celulas = registro[2]
+        if celulas is None:
+            self._grandes.discard(cerca_id)
+            return
+        for celula in celulas:
+            ids = self._grade.get(celula)
+            if ids is not None:
+                ids.discard(cerca_id)
+                if not ids:
+                    del self._grade[celula]
+
+    def atualizar(self, cerca_id, vertices):
+        """Insere ou substitui uma cerca no índice sem reconstruir as demais."""
+        vertices = tuple((float(lat), float(lon)) for lat, lon in vertices)
+        latitudes = [lat for lat, _ in vertices]
+        longitudes = [lon for _, lon in vertices]
+        retangulo = (min(latitudes), max(latitudes), min(longitudes), max(longitudes))
+        celulas = self._celulas_do_retangulo(*retangulo)
+
+        with self._lock:
+            self._remover_sem_lock(cerca_id)
+            self._cercas[cerca_id] = (vertices, retangulo, celulas)
+            if celulas is None:
+                self._grandes.add(cerca_id)
+            else:
+                for celula in celulas:
+                    self._grade.setdefault(celula, set()).add(cerca_id)
+
+    def remover(self, cerca_id):
+        """Remove uma cerca do índice (nada acontece se ela não estiver indexada)."""
+        with self._lock:
+            self._remover_sem_lock(cerca_id)
+
+    def consultar(self, pontos):
+        """
+        Retorna, para cada ponto, a lista de IDs das cercas que o contêm.
+
+        Args:
+            pontos (iterable): Pontos no formato [(lat, lon), ...]
+
+        Returns:
+            list: Uma lista de IDs (ordenada) por ponto, na mesma ordem da entrada
+        """
+        resultados = []
+        with self._lock:
+            cercas = self._cercas
+            grade = self._grade
+            grandes = tuple(self._grandes)
+            for latitude, longitude in pontos:
+                latitude, longitude = float(latitude), float(longitude)
+                candidatos = grade.get(self._celula(latitude, longitude), ())
+                encontrados = []
+                for cerca_id in (*candidatos, *grandes):
+                    vertices, (lat_min, lat_max, lon_min, lon_max), _ = cercas[cerca_id]
+                    if not (lat_min <= latitude <= lat_max and lon_min <= longitude <= lon_max):
+                        continue
+                    if ponto_no_poligono(latitude, longitude, vertices):
+                        encontrados.append(cerca_id)
+                encontrados.sort()
+                resultados.append(encontrados)
+        return resultados
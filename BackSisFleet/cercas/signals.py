@@ -0,0 +1,15 @@
+# cercas/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from cercas.models.cercas import CercaEletronica
+from cercas.services.cerca_service import CercaService
+
+
+@receiver(post_save, sender=CercaEletronica)
+def atualizar_indice_cerca(sender, instance, **kwargs):
+    CercaService.sincronizar_cerca(instance)
+
+
+@receiver(post_delete, sender=CercaEletronica)
+def remover_cerca_do_indice(sender, instance, **kwargs):
+    CercaService.remover_cerca_do_indice(instance)
@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.db import models
+from django.test import TestCase
+from cercas.models.cercas import CercaEletronica
+from cercas.services.cerca_service import BadRequestError, CercaService
+from core.models import CustomUser
+
+TRIANGULO = [[-23.6, -46.7], [-23.6, -46.5], [-23.4, -46.6]]
+
+
+class CercaServiceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cliente = CustomUser.objects.create(username='cliente', tipo_usuario='cliente', cpf_cnpj='11222333000181')
+        cls.outro = CustomUser.objects.create(username='outro', tipo_usuario='cliente', cpf_cnpj='11222333000182')
+
+    def setUp(self):
+        cache.clear()
+        CercaService._indices.clear()
+        CercaService._versoes.clear()
+
+    def _criar(self, responsavel, vertices=TRIANGULO, **campos):
+        with self.captureOnCommitCallbacks(execute=True):
+            return CercaService.criar_cerca({'nome': 'Cerca', 'vertices': vertices, **campos}, responsavel)
+
+    def test_criar_calcula_retangulo_envolvente(self):
+        cerca = self._criar(self.cliente)
+        self.assertEqual((cerca.lat_min, cerca.lat_max, cerca.lon_min, cerca.lon_max), (-23.6, -23.4, -46.7, -46.5))
+
+    def test_bulk_create_calcula_retangulo_envolvente(self):
+        CercaEletronica.objects.bulk_create([
+            CercaEletronica(responsavel_fk=self.cliente, nome='Lote', vertices=TRIANGULO),
+        ])
+        cerca = CercaEletronica.objects.get(nome='Lote')
+        self.assertEqual((cerca.lat_min, cerca.lat_max, cerca.lon_min, cerca.lon_max), (-23.6, -23.4, -46.7, -46.5))
+
+    def test_vertices_invalidos(self):
+        for vertices in (None, [[0, 0], [1, 1]], [[0, 0], [1, 'x'], [2, 2]], [[0, 0], [91, 0], [1, 1]]):
+            with self.subTest(vertices=vertices), self.assertRaises(BadRequestError):
+                self._criar(self.cliente, vertices)
+
+    def test_consulta_so_considera_cercas_ativas_do_responsavel(self):
+        ativa = self._criar(self.cliente)
+        self._criar(self.cliente, ativa=False)
+        self._criar(self.outro)
+        self.assertEqual(CercaService.cercas_contendo_pontos(self.cliente.id, [[-23.55, -46.6], [0, 0]]), [[ativa.id], []])
+
+    def test_edicao_atualiza_indice_ja_construido(self):
+        cerca = self._criar(self.cliente)
+        ponto = [[-23.55, -46.6]]
+        self.assertEqual(CercaService.cercas_contendo_pontos(self.cliente.id, ponto), [[cerca.id]])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CercaService.atualizar_cerca(cerca.id, {'vertices': [[0, 0], [0, 1], [1, 1]]}, self.cliente)
+        self.assertEqual(CercaService.cercas_contendo_pontos(self.cliente.id, ponto), [[]])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CercaService.deletar_cerca(cerca.id, self.cliente.id)
+        self.assertEqual(CercaService.cercas_contendo_pontos(self.cliente.id, [[0.2, 0.5]]), [[]])
+
+    def test_alteracao_em_outro_processo_reconstroi_o_indice(self):
+        cerca = self._criar(self.cliente)
+        ponto = [[-23.55, -46.6]]
+        CercaService.cercas_contendo_pontos(self.cliente.id, ponto)
+
+        # Outro processo desativou a cerca: aqui o índice local continua válido até a versão mudar
+        models.QuerySet.update(CercaEletronica.objects.filter(id=cerca.id), ativa=False)
+        self.assertEqual(CercaService.cercas_contendo_pontos(self.cliente.id, ponto), [[cerca.id]])
+
+        cache.incr(CercaService._chave_versao(self.cliente.id))
+        self.assertEqual(CercaService.cercas_contendo_pontos(self.cliente.id, ponto), [[]])
+
+    def test_bulk_create_e_update_invalidam_o_indice(self):
+        ponto = [[-23.55, -46.6]]
+        self.assertEqual(CercaService.cercas_contendo_pontos(self.cliente.id, ponto), [[]])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CercaEletronica.objects.bulk_create([CercaEletronica(responsavel_fk=self.cliente, nome='Lote', vertices=TRIANGULO)])
+        cerca = CercaEletronica.objects.get(nome='Lote')
+        self.assertEqual(CercaService.cercas_contendo_pontos(self.cliente.id, ponto), [[cerca.id]])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CercaEletronica.objects.filter(id=cerca.id).update(ativa=False)
+        self.assertEqual(CercaService.cercas_contendo_pontos(self.cliente.id, ponto), [[]])
+
+    def test_versao_so_muda_depois_do_commit(self):
+        chave = CercaService._chave_versao(self.cliente.id)
+        with self.captureOnCommitCallbacks() as callbacks:
+            CercaService.criar_cerca({'nome': 'Cerca', 'vertices': TRIANGULO}, self.cliente)
+            self.assertIsNone(cache.get(chave))
+        for callback in callbacks:
+            callback()
+        self.assertEqual(cache.get(chave), 1)
+
+    def test_update_de_vertices_exige_save(self):
+        with self.assertRaises(ValueError):
+            CercaEletronica.objects.filter(responsavel_fk=self.cliente).update(vertices=TRIANGULO)
+
+    def test_limite_de_pontos_por_consulta(self):
+        with self.assertRaises(BadRequestError):
+            CercaService.cercas_contendo_pontos(self.cliente.id, [[0, 0]] * (CercaService.MAX_PONTOS_CONSULTA + 1))
+        with self.assertRaises(BadRequestError):
+            CercaService.cercas_contendo_pontos(self.cliente.id, [['a', 0]])
@@ -0,0 +1,67 @@
+from django.test import SimpleTestCase
+from cercas.services.indice_espacial import IndiceEspacial, ponto_no_poligono
+
+QUADRADO = [(0.0, 0.0), (0.0, 1.0), (1.0, 1.0), (1.0, 0.0)]
+# "U": o vão entre as pernas fica dentro do retângulo envolvente, mas fora do polígono
+U = [(0.0, 0.0), (0.0, 3.0), (3.0, 3.0), (3.0, 2.0), (1.0, 2.0), (1.0, 1.0), (3.0, 1.0), (3.0, 0.0)]
+
+
+class PontoNoPoligonoTests(SimpleTestCase):
+
+    def test_dentro_e_fora_do_quadrado(self):
+        self.assertTrue(ponto_no_poligono(0.5, 0.5, QUADRADO))
+        self.assertFalse(ponto_no_poligono(1.5, 0.5, QUADRADO))
+        self.assertFalse(ponto_no_poligono(-0.1, 0.5, QUADRADO))
+
+    def test_poligono_concavo(self):
+        self.assertTrue(ponto_no_poligono(0.5, 1.5, U))
+        self.assertTrue(ponto_no_poligono(2.0, 0.5, U))
+        self.assertTrue(ponto_no_poligono(2.0, 2.5, U))
+        self.assertFalse(ponto_no_poligono(2.0, 1.5, U))
+
+    def test_raio_passando_por_vertice_conta_um_cruzamento(self):
+        losango = [(0.0, 1.0), (1.0, 2.0), (2.0, 1.0), (1.0, 0.0)]
+        self.assertTrue(ponto_no_poligono(1.0, 1.0, losango))
+        self.assertFalse(ponto_no_poligono(1.0, -1.0, losango))
+        self.assertFalse(ponto_no_poligono(1.0, 3.0, losango))
+
+
+class IndiceEspacialTests(SimpleTestCase):
+
+    def test_consulta_devolve_ids_ordenados_por_ponto(self):
+        indice = IndiceEspacial(tamanho_celula=0.5)
+        indice.atualizar(2, QUADRADO)
+        indice.atualizar(1, [(0.5, 0.5), (0.5, 2.0), (2.0, 2.0), (2.0, 0.5)])
+        self.assertEqual(indice.consultar([(0.25, 0.25), (0.75, 0.75), (1.5, 1.5), (5.0, 5.0)]), [[2], [1, 2], [1], []])
+
+    def test_vao_do_poligono_concavo_nao_e_falso_positivo(self):
+        indice = IndiceEspacial(tamanho_celula=0.5)
+        indice.atualizar(1, U)
+        self.assertEqual(indice.consultar([(2.0, 1.5), (2.0, 0.5)]), [[], [1]])
+
+    def test_atualizar_substitui_e_remover_tira_da_grade(self):
+        indice = IndiceEspacial(tamanho_celula=0.5)
+        indice.atualizar(1, QUADRADO)
+        indice.atualizar(1, [(10.0, 10.0), (10.0, 11.0), (11.0, 11.0), (11.0, 10.0)])
+        self.assertEqual(indice.consultar([(0.5, 0.5), (10.5, 10.5)]), [[], [1]])
+        self.assertEqual(len(indice), 1)
+
+        indice.remover(1)
+        indice.remover(1)
+        self.assertEqual(indice.consultar([(10.5, 10.5)]), [[]])
+        self.assertEqual(indice._grade, {})
+
+    def test_cerca_grande_fica_fora_da_grade(self):
+        indice = IndiceEspacial(tamanho_celula=0.01, max_celulas_por_cerca=16)
+        indice.atualizar(1, QUADRADO)
+        self.assertEqual(indice._grandes, {1})
+        self.assertEqual(indice._grade, {})
+        self.assertEqual(indice.consultar([(0.5, 0.5), (1.5, 0.5)]), [[1], []])
+
+        indice.remover(1)
+        self.assertEqual(indice._grandes, set())
+
+    def test_coordenadas_negativas(self):
+        indice = IndiceEspacial()
+        indice.atualizar(7, [(-23.6, -46.7), (-23.6, -46.5), (-23.4, -46.6)])
+        self.assertEqual(indice.consultar([(-23.55, -46.6), (-23.45, -46.69)]), [[7], []])
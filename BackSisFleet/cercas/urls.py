@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import CercasView, ConsultaCercasView
+
+urlpatterns = [
+    path('', CercasView.as_view(), name='cercas'),
+    path('consulta/', ConsultaCercasView.as_view(), name='consulta_cercas'),
+]
@@ -0,0 +1 @@
+from cercas.views.cercas import CercasView, ConsultaCercasView
\ No newline at end of file
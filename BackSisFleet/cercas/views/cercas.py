@@ -0,0 +1,87 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from cercas.services.cerca_service import CercaService, BadRequestError, NotFoundError
+
+
+class CercasView(APIView):
+    """
+    API View para gerenciar as cercas eletrônicas do usuário responsável.
+
+    Permissões:
+        - Somente usuários autenticados do tipo 'cliente'.
+
+    Métodos disponíveis:
+        - GET: Lista as cercas do responsável.
+        - POST: Cria uma nova cerca.
+        - PUT: Atualiza uma cerca existente (campo 'id' no corpo).
+        - DELETE: Exclui uma cerca (campo 'id' no corpo).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        usuario = request.user
+        if usuario.tipo_usuario != 'cliente':
+            return Response({"mensagem": "Você não tem acesso a esta funcionalidade."}, status=403)
+
+        cercas = CercaService.listar_cercas_por_responsavel(usuario.id)
+        return Response({"cercas": cercas})
+
+    def post(self, request, *args, **kwargs):
+        usuario = request.user
+        if usuario.tipo_usuario != 'cliente':
+            return Response({"mensagem": "Não Autorizado"}, status=403)
+
+        try:
+            cerca = CercaService.criar_cerca(request.data, usuario)
+        except BadRequestError as e:
+            return Response({"erro": str(e)}, status=400)
+        return Response({"mensagem": "Cerca criada com sucesso", "cerca": cerca.to_dict()}, status=201)
+
+    def put(self, request, *args, **kwargs):
+        usuario = request.user
+        if usuario.tipo_usuario != 'cliente':
+            return Response({"mensagem": "Não Autorizado"}, status=403)
+
+        try:
+            cerca = CercaService.atualizar_cerca(request.data.get('id'), request.data, usuario)
+        except BadRequestError as e:
+            return Response({"erro": str(e)}, status=400)
+        except NotFoundError as e:
+            return Response({"erro": str(e)}, status=404)
+        return Response({"mensagem": "Cerca atualizada com sucesso", "cerca": cerca.to_dict()})
+
+    def delete(self, request, *args, **kwargs):
+        usuario = request.user
+        if usuario.tipo_usuario != 'cliente':
+            return Response({"mensagem": "Não Autorizado"}, status=403)
+
+        try:
+            CercaService.deletar_cerca(request.data.get('id'), usuario.id)
+        except NotFoundError as e:
+            return Response({"erro": str(e)}, status=404)
+        return Response({"mensagem": "Cerca excluída com sucesso"})
+
+
+class ConsultaCercasView(APIView):
+    """
+    Consulta em lote: quais cercas do responsável contêm cada um dos pontos.
+
+    Corpo esperado:
+        {"pontos": [[latitude, longitude], ...]}
+
+    Resposta:
+        {"resultados": [[id_cerca, ...], ...]}  (uma lista por ponto, na mesma ordem)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        usuario = request.user
+        if usuario.tipo_usuario != 'cliente':
+            return Response({"mensagem": "Você não tem acesso a esta funcionalidade."}, status=403)
+
+        try:
+            resultados = CercaService.cercas_contendo_pontos(usuario.id, request.data.get('pontos'))
+        except BadRequestError as e:
+            return Response({"erro": str(e)}, status=400)
+        return Response({"resultados": resultados})
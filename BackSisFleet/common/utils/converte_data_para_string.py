@@ -0,0 +1,26 @@
+from datetime import date, datetime
+
+
+def converter_data_para_string(data):
+    """
+    Formata datas no padrão da API: "%Y-%m-%d %H:%M:%S".
+
+    Usa isoformat (implementado em C), bem mais barato que strftime nas
+    listagens grandes; o resultado é o mesmo, inclusive para `date`, que
+    sai com o horário 00:00:00.
+
+    Args:
+        data (datetime|date|str|None): Data a formatar; strings no formato YYYY-MM-DD
+
+    Returns:
+        str|None: Data formatada ou None
+    """
+    if not data:
+        return None
+    if isinstance(data, str):
+        data = datetime.strptime(data, "%Y-%m-%d")
+    if isinstance(data, datetime):
+        return data.isoformat(' ', 'seconds')[:19]
+    if isinstance(data, date):
+        return data.isoformat() + ' 00:00:00'
+    return data.strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,124 @@
+"""
+Documentos sintéticos para testes de volume: CPF, CNPJ, CNH, RENAVAM, placa
+Mercosul e chassi com dígitos verificadores válidos.
+
+Cada gerador recebe um número de sequência e devolve sempre o mesmo documento;
+sequências diferentes dão documentos diferentes (permutação afim
+`(a * n + b) mod M` com `a` primo com `M`, perto de M / φ para que sequências
+vizinhas fiquem longe), então nenhum lote repete valor e os números parecem
+aleatórios.
+"""
+from math import gcd
+
+LETRAS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+# Chassi (VIN): sem I, O e Q
+CARACTERES_CHASSI = 'ABCDEFGHJKLMNPRSTUVWXYZ0123456789'
+
+
+class _Permutacao:
+    """Bijeção de [0, modulo) nela mesma"""
+
+    def __init__(self, modulo, deslocamento):
+        self.modulo = modulo
+        self.deslocamento = deslocamento
+        self.multiplicador = int(modulo * 0.6180339887)
+        while gcd(self.multiplicador, modulo) != 1:
+            self.multiplicador += 1
+
+    def __call__(self, sequencia):
+        return (self.multiplicador * sequencia + self.deslocamento) % self.modulo
+
+
+_CPF = _Permutacao(10 ** 9, 271_828_182)
+_CNPJ = _Permutacao(10 ** 8, 14_142_135)
+_CNH = _Permutacao(10 ** 8, 57_721_566)
+_RENAVAM = _Permutacao(10 ** 10, 1_618_033_988)
+_PLACA = _Permutacao(26 ** 4 * 10 ** 3, 123_456_789)
+_CHASSI = _Permutacao(len(CARACTERES_CHASSI) ** 14, 10 ** 20)
+
+
+def _digitos(numero, tamanho):
+    return [int(d) for d in str(numero).zfill(tamanho)]
+
+
+def _dv_modulo11(digitos, pesos):
+    resto = sum(d * p for d, p in zip(digitos, pesos)) % 11
+    return 0 if resto < 2 else 11 - resto
+
+
+def cpf(sequencia):
+    """CPF (11 dígitos, sem máscara) da sequência"""
+    base = _digitos(_CPF(sequencia), 9)
+    base.append(_dv_modulo11(base, range(10, 1, -1)))
+    base.append(_dv_modulo11(base, range(11, 1, -1)))
+    return ''.join(map(str, base))
+
+
+def cnpj(sequencia):
+    """CNPJ (14 dígitos, sem máscara) da sequência, sempre matriz (0001)"""
+    base = _digitos(_CNPJ(sequencia), 8) + [0, 0, 0, 1]
+    base.append(_dv_modulo11(base, [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+    base.append(_dv_modulo11(base, [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+    return ''.join(map(str, base))
+
+
+def _dv_cnh(base):
+    """Dígitos verificadores da base de 9 dígitos da CNH, ou None se a base não tem DV válido"""
+    resto = sum(d * p for d, p in zip(base, range(9, 0, -1))) % 11
+    desconto = 0
+    if resto >= 10:
+        resto, desconto = 0, 2
+    segundo = sum(d * p for d, p in zip(base, range(1, 10))) % 11
+    if segundo >= 10:
+        return [resto, 0]
+    # Com o desconto, segundo 0 ou 1 daria um DV negativo, que nenhum validador aceita
+    if segundo < desconto:
+        return None
+    return [resto, segundo - desconto]
+
+
+def cnh(sequencia):
+    """
+    Número de registro da CNH (11 dígitos) da sequência.
+
+    A permutação dá os 8 primeiros dígitos e o nono completa a base. O nono
+    tem peso 1 no primeiro DV, então só um valor dele cai no desconto (que pode
+    deixar a base sem DV válido): nesse caso o seguinte serve. Sequências
+    diferentes continuam dando números diferentes.
+    """
+    prefixo = _digitos(_CNH(sequencia), 8)
+    base = prefixo + [sum(prefixo) % 10]
+    dv = _dv_cnh(base)
+    if dv is None:
+        base[-1] = (base[-1] + 1) % 10
+        dv = _dv_cnh(base)
+    return ''.join(map(str, base + dv))
+
+
+def renavam(sequencia):
+    """RENAVAM (11 dígitos) da sequência"""
+    base = _digitos(_RENAVAM(sequencia), 10)
+    soma = sum(d * p for d, p in zip(reversed(base), [2, 3, 4, 5, 6, 7, 8, 9, 2, 3]))
+    dv = soma * 10 % 11
+    return ''.join(map(str, base + [0 if dv == 10 else dv]))
+
+
+def placa(sequencia):
+    """Placa no padrão Mercosul (LLLNLNN) da sequência"""
+    numero = _PLACA(sequencia)
+    numero, quarta = divmod(numero, 26)
+    letras = ''
+    for _ in range(3):
+        numero, indice = divmod(numero, 26)
+        letras += LETRAS[indice]
+    return f'{letras}{numero // 100}{LETRAS[quarta]}{numero % 100:02d}'
+
+
+def chassi(sequencia):
+    """Chassi (17 caracteres, WMI brasileiro '9') da sequência"""
+    numero = _CHASSI(sequencia)
+    serie = ''
+    for _ in range(14):
+        numero, indice = divmod(numero, len(CARACTERES_CHASSI))
+        serie = CARACTERES_CHASSI[indice] + serie
+    return f'9BR{serie}'
@@ -0,0 +1,162 @@
+import json
+from django.db import models
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dependência opcional, só necessária para a exportação Parquet
+    pa = pq = None
+
+# Linhas por row group: leitores de BI paralelizam por grupo e a memória do export fica limitada a um grupo
+LINHAS_POR_GRUPO = 50000
+COMPRESSAO = 'zstd'
+
+
+class ExportacaoColunarError(Exception):
+    """Exceção base para erros da exportação colunar."""
+
+
+class DependenciaAusenteError(ExportacaoColunarError):
+    """pyarrow não está instalado (código HTTP 501)."""
+
+
+def verificar_dependencia():
+    if pa is None:
+        raise DependenciaAusenteError("A exportação Parquet requer o pacote pyarrow instalado")
+
+
+def _tipo_arrow(campo):
+    if isinstance(campo, models.ForeignKey):
+        campo = campo.target_field
+    tipo = campo.get_internal_type()
+    if tipo in ('AutoField', 'BigAutoField', 'IntegerField', 'BigIntegerField', 'PositiveIntegerField',
+                'PositiveBigIntegerField', 'SmallIntegerField', 'PositiveSmallIntegerField', 'SmallAutoField'):
+        return pa.int64()
+    if tipo == 'BooleanField':
+        return pa.bool_()
+    if tipo == 'FloatField':
+        return pa.float64()
+    if tipo == 'DecimalField':
+        return pa.decimal128(campo.max_digits, campo.decimal_places)
+    if tipo == 'DateField':
+        return pa.date32()
+    if tipo == 'DateTimeField':
+        return pa.timestamp('us', tz='UTC')
+    if tipo == 'BinaryField':
+        return pa.binary()
+    return pa.string()
+
+
+def campos_exportaveis(modelo, excluir=()):
+    """Campos concretos do modelo, na ordem da tabela, menos os excluídos"""
+    return [campo for campo in modelo._meta.concrete_fields if campo.name not in excluir]
+
+
+def esquema(campos):
+    """Esquema Arrow tipado a partir dos campos do modelo"""
+    verificar_dependencia()
+    return pa.schema([pa.field(campo.attname, _tipo_arrow(campo), nullable=True) for campo in campos])
+
+
+def _converter_coluna(campo, valores):
+    if isinstance(campo, models.JSONField):
+        return [None if valor is None else json.dumps(valor, ensure_ascii=False) for valor in valores]
+    if isinstance(campo, models.BinaryField):
+        return [None if valor is None else bytes(valor) for valor in valores]
+    return valores
+
+
+def _grupos(queryset, campos, linhas_por_grupo):
+    """Lê o queryset pelo cursor e devolve tabelas Arrow de até `linhas_por_grupo` linhas"""
+    schema = esquema(campos)
+    colunas = [[] for _ in campos]
+    linhas = queryset.values_list(*[campo.attname for campo in campos]).iterator(chunk_size=min(linhas_por_grupo, 10000))
+
+    def montar_tabela():
+        arrays = [
+            pa.array(_converter_coluna(campo, coluna), type=schema.field(i).type)
+            for i, (campo, coluna) in enumerate(zip(campos, colunas))
+        ]
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    quantidade = 0
+    for linha in linhas:
+        for coluna, valor in zip(colunas, linha):
+            coluna.append(valor)
+        quantidade += 1
+        if quantidade >= linhas_por_grupo:
+            yield montar_tabela()
+            colunas = [[] for _ in campos]
+            quantidade = 0
+    if quantidade:
+        yield montar_tabela()
+
+
+def escrever_parquet(destino, queryset, campos, linhas_por_grupo=LINHAS_POR_GRUPO):
+    """
+    Grava o queryset em Parquet, um row group por vez.
+
+    Args:
+        destino (str|file): Caminho ou arquivo binário de saída
+        queryset (QuerySet): Linhas a exportar
+        campos (list): Campos do modelo (ver campos_exportaveis)
+        linhas_por_grupo (int): Linhas por row group
+
+    Returns:
+        int: Quantidade de linhas gravadas
+    """
+    total = 0
+    with pq.ParquetWriter(destino, esquema(campos), compression=COMPRESSAO) as escritor:
+        for tabela in _grupos(queryset, campos, linhas_por_grupo):
+            escritor.write_table(tabela)
+            total += tabela.num_rows
+    return total
+
+
+class _SaidaEmBlocos:
+    """Arquivo somente-escrita que acumula os bytes até serem recolhidos pelo gerador."""
+
+    def __init__(self):
+        self.blocos = []
+        self.posicao = 0
+        self.closed = False
+
+    def write(self, dados):
+        dados = bytes(dados)
+        self.blocos.append(dados)
+        self.posicao += len(dados)
+        return len(dados)
+
+    def tell(self):
+        return self.posicao
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self):
+        return True
+
+    def recolher(self):
+        dados = b''.join(self.blocos)
+        self.blocos = []
+        return dados
+
+
+def gerar_parquet(queryset, campos, linhas_por_grupo=LINHAS_POR_GRUPO):
+    """
+    Gera o arquivo Parquet em pedaços para StreamingHttpResponse: cada row group
+    é enviado assim que fica pronto e o rodapé vai no último pedaço.
+    """
+    verificar_dependencia()
+    saida = _SaidaEmBlocos()
+    escritor = pq.ParquetWriter(saida, esquema(campos), compression=COMPRESSAO)
+    try:
+        for tabela in _grupos(queryset, campos, linhas_por_grupo):
+            escritor.write_table(tabela)
+            yield saida.recolher()
+    finally:
+        escritor.close()
+    yield saida.recolher()
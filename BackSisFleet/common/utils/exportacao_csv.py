@@ -0,0 +1,73 @@
+import csv
+from datetime import date, datetime
+from django.http import StreamingHttpResponse
+
+# Linhas acumuladas antes de cada envio ao cliente: evita um write() de socket por linha
+LINHAS_POR_BLOCO = 500
+
+# Início de texto que o Excel/LibreOffice interpreta como fórmula (CSV injection)
+INICIOS_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+
+class _Buffer:
+    """Destino do csv.writer que apenas devolve a linha formatada."""
+
+    def write(self, valor):
+        return valor
+
+
+def _formatar(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, datetime):
+        return valor.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(valor, date):
+        return valor.strftime("%Y-%m-%d")
+    # Texto vindo do usuário (nome, endereço...) sai como texto: o apóstrofo impede a fórmula
+    if isinstance(valor, str) and valor.startswith(INICIOS_FORMULA):
+        return "'" + valor
+    return valor
+
+
+def gerar_linhas_csv(cabecalho, linhas):
+    """
+    Gera o CSV em blocos de texto, linha a linha a partir de um iterável.
+
+    Args:
+        cabecalho (list): Nomes das colunas
+        linhas (iterable): Tuplas de valores (ex.: values_list().iterator())
+
+    Yields:
+        str: Blocos de até LINHAS_POR_BLOCO linhas já formatadas
+    """
+    escritor = csv.writer(_Buffer(), delimiter=';')
+    # BOM para o Excel reconhecer o UTF-8 e o cabeçalho enviado de imediato (primeiro byte rápido)
+    yield '\ufeff' + escritor.writerow(cabecalho)
+
+    bloco = []
+    for linha in linhas:
+        bloco.append(escritor.writerow([_formatar(valor) for valor in linha]))
+        if len(bloco) >= LINHAS_POR_BLOCO:
+            yield ''.join(bloco)
+            bloco = []
+    if bloco:
+        yield ''.join(bloco)
+
+
+def resposta_csv(nome_arquivo, cabecalho, linhas):
+    """
+    Monta um StreamingHttpResponse com o CSV: a memória usada não depende
+    da quantidade de linhas.
+
+    Args:
+        nome_arquivo (str): Nome sugerido para download
+        cabecalho (list): Nomes das colunas
+        linhas (iterable): Tuplas de valores, consumidas sob demanda
+
+    Returns:
+        StreamingHttpResponse: Resposta com Content-Disposition de anexo
+    """
+    resposta = StreamingHttpResponse(gerar_linhas_csv(cabecalho, linhas), content_type='text/csv; charset=utf-8')
+    resposta['Content-Disposition'] = f'attachment; filename="{nome_arquivo}"'
+    resposta['Cache-Control'] = 'no-store'
+    return resposta
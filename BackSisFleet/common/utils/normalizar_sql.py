@@ -0,0 +1,28 @@
+import re
+
+_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_LISTAS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_ESPACOS = re.compile(r"\s+")
+
+
+def normalizar_sql(sql):
+    """
+    Formato da consulta, sem os valores: literais, números e placeholders viram
+    '?' e listas de valores (IN (...), VALUES (...)) de qualquer tamanho viram
+    '(...)', assim como as várias linhas de um VALUES (bulk_create). Duas
+    execuções do mesmo código com parâmetros diferentes têm o mesmo formato.
+
+    Args:
+        sql (str): SQL com placeholders (%s) ou com os valores já interpolados
+
+    Returns:
+        str: SQL normalizado
+    """
+    sql = _TEXTO.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _NUMERO.sub('?', sql)
+    sql = _LISTA.sub('(...)', sql)
+    sql = _LISTAS.sub('(...)', sql)
+    return _ESPACOS.sub(' ', sql).strip()
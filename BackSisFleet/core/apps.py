@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from core import cache_compartilhado, signals  # noqa: F401
+        from core.banco import aplicar_pragmas_sqlite
+        from core.consultas_lentas import instalar_captura
+
+        connection_created.connect(aplicar_pragmas_sqlite, dispatch_uid='core.aplicar_pragmas_sqlite')
+        connection_created.connect(instalar_captura, dispatch_uid='core.instalar_captura')
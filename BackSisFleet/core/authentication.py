@@ -0,0 +1,49 @@
+# core/authentication.py
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from .models import UsuarioToken
+
+
+def _chave_inativo(usuario_id):
+    return f"usuarios:inativo:{usuario_id}"
+
+
+def marcar_usuario_inativo(usuario_id, inativo=True):
+    """
+    Registra no cache compartilhado que o usuário foi desativado (ou reativado).
+
+    A marca dura o tempo de vida do access token: depois disso nenhum token
+    emitido antes da desativação continua válido, e o refresh já consulta o
+    banco (USER_AUTHENTICATION_RULE).
+    """
+    if inativo:
+        cache.set(_chave_inativo(usuario_id), True, timeout=int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()))
+    else:
+        cache.delete(_chave_inativo(usuario_id))
+
+
+class JWTClaimsAuthentication(JWTAuthentication):
+    """
+    Autenticação JWT que monta o usuário a partir das claims do token.
+
+    Evita o SELECT em CustomUser a cada requisição: id, username, tipo_usuario,
+    cpf_cnpj, is_staff e responsavel_id vêm do token emitido por
+    MyTokenObtainPairSerializer; o restante do registro só é lido se a view
+    acessar outro campo. Tokens sem essas claims (emitidos antes desta versão
+    ou pelo fluxo de recuperação de senha) caem no comportamento padrão.
+
+    O banco não é consultado, então a desativação de um usuário é conferida
+    pela claim is_active e pela marca que o save de CustomUser grava no cache
+    compartilhado (marcar_usuario_inativo): uma leitura de cache por request.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token or 'tipo_usuario' not in validated_token:
+            return super().get_user(validated_token)
+        usuario_id = validated_token[api_settings.USER_ID_CLAIM]
+        if not validated_token.get('is_active', True) or cache.get(_chave_inativo(usuario_id)):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return UsuarioToken.from_token(usuario_id, validated_token)
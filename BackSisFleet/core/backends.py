@@ -0,0 +1,29 @@
+# core/backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from .hashing import gerar_hash_senha, verificar_senha
+
+UserModel = get_user_model()
+
+
+class ModelBackendPoolHash(ModelBackend):
+    """
+    ModelBackend que verifica a senha no pool limitado de hash (core.hashing).
+
+    Mantém o comportamento do backend padrão, inclusive o hash descartável
+    para usuários inexistentes (proteção contra enumeração por tempo).
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            gerar_hash_senha(password)
+            return None
+        if verificar_senha(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
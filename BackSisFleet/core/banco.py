@@ -0,0 +1,34 @@
+# core/banco.py
+from django.conf import settings
+
+
+def pragmas_sqlite_producao(busy_timeout_ms=5000, cache_mb=64, mmap_mb=256):
+    """PRAGMAs recomendados para o SQLite em produção (usados em settings_producao)"""
+    return {
+        # Leitores não bloqueiam o escritor (e vice-versa)
+        'journal_mode': 'WAL',
+        # Com WAL, NORMAL só arrisca a última transação numa queda de energia, não a integridade
+        'synchronous': 'NORMAL',
+        'busy_timeout': busy_timeout_ms,
+        # Valor negativo = KiB
+        'cache_size': -1024 * cache_mb,
+        'mmap_size': 1024 * 1024 * mmap_mb,
+        'temp_store': 'MEMORY',
+    }
+
+
+def aplicar_pragmas_sqlite(sender, connection, **kwargs):
+    """
+    Handler de connection_created: aplica settings.SQLITE_PRAGMAS a cada nova
+    conexão SQLite (ex.: journal_mode=WAL, synchronous=NORMAL, busy_timeout).
+
+    Sem SQLITE_PRAGMAS (settings de desenvolvimento) não faz nada. Os PRAGMAs
+    são executados direto na conexão do driver, fora do log de queries.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if not pragmas:
+        return
+    for nome, valor in pragmas.items():
+        connection.connection.execute(f'PRAGMA {nome} = {valor}')
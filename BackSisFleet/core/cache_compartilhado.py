@@ -0,0 +1,35 @@
+# core/cache_compartilhado.py
+"""
+Estado que precisa ser visto por todos os processos fica no cache padrão do
+Django: versão do índice de cercas e da lista negra de tokens, estatísticas de
+usuários, baldes do throttle, fixação no primário e armação do perfilador.
+Com o LocMemCache (o padrão quando CACHES não é definido) cada processo tem o
+seu cache e, sob gunicorn, tudo isso erra em silêncio. Em produção CACHES vem
+de SisFleet/settings_producao.py; `python manage.py check --deploy` acusa um
+cache local.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+BACKENDS_LOCAIS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def cache_compartilhado(alias='default'):
+    """True se o cache `alias` é visto por todos os processos (Redis, Memcached, banco, arquivo)"""
+    configuracao = getattr(settings, 'CACHES', {}).get(alias, {})
+    return configuracao.get('BACKEND', BACKENDS_LOCAIS[0]) not in BACKENDS_LOCAIS
+
+
+@register(Tags.caches, deploy=True)
+def verificar_cache_compartilhado(app_configs, **kwargs):
+    if cache_compartilhado():
+        return []
+    return [Warning(
+        "O cache padrão é local ao processo: com mais de um worker, throttle, lista negra de tokens, "
+        "fixação no primário, índice de cercas, estatísticas e perfilador ficam inconsistentes.",
+        hint="Defina CACHE_BACKEND/CACHE_LOCATION (SisFleet/settings_producao.py).",
+        id='core.W001',
+    )]
@@ -0,0 +1,165 @@
+# core/cache_representacao.py
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+
+class BackendLocmemLRU:
+    """Dicionário em memória do processo com descarte LRU acima de `max_itens`."""
+
+    def __init__(self, max_itens=10000, **kwargs):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, chaves):
+        encontrados = {}
+        with self._lock:
+            for chave in chaves:
+                if chave in self._itens:
+                    self._itens.move_to_end(chave)
+                    encontrados[chave] = self._itens[chave]
+        return encontrados
+
+    def set_many(self, valores):
+        with self._lock:
+            for chave, valor in valores.items():
+                self._itens[chave] = valor
+                self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def delete(self, chave):
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def clear(self):
+        with self._lock:
+            self._itens.clear()
+
+
+class BackendCacheDjango:
+    """
+    Usa um alias de settings.CACHES (FileBasedCache, Redis, Memcached...), que
+    pode ser compartilhado entre processos. O descarte segue a política do
+    próprio backend (MAX_ENTRIES/CULL_FREQUENCY, maxmemory-policy etc.).
+    """
+
+    def __init__(self, alias='default', timeout=None, **kwargs):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def _cache(self):
+        return caches[self.alias]
+
+    def get_many(self, chaves):
+        return self._cache.get_many(list(chaves))
+
+    def set_many(self, valores):
+        self._cache.set_many(valores, timeout=self.timeout)
+
+    def delete(self, chave):
+        self._cache.delete(chave)
+
+    def clear(self):
+        # Não limpa um cache possivelmente compartilhado com outros dados: as entradas expiram pela versão
+        pass
+
+
+BACKENDS = {
+    'locmem': BackendLocmemLRU,
+    'django': BackendCacheDjango,
+}
+
+
+def _criar_backend():
+    """Backend configurado em settings.CACHE_REPRESENTACAO (padrão: locmem com LRU)"""
+    configuracao = dict(getattr(settings, 'CACHE_REPRESENTACAO', {}))
+    tipo = configuracao.pop('BACKEND', 'locmem')
+    return BACKENDS[tipo](**{chave.lower(): valor for chave, valor in configuracao.items()})
+
+
+class CacheRepresentacao:
+    """
+    Cache da representação serializada (to_dict) de cada objeto de um modelo.
+
+    Cada entrada guarda o dicionário junto com a versão do objeto: o updated_at
+    do próprio registro e os campos de data dos relacionados que aparecem na
+    representação (ex.: o usuário aninhado). Na listagem, uma consulta leve
+    busca só (pk, versão); os fragmentos com versão igual vêm do cache e apenas
+    os que mudaram são carregados e serializados de novo. O updated_at dos
+    modelos é auto_now, então qualquer save(), em qualquer processo, muda a
+    versão; remover a entrada no post_save só libera a memória mais cedo.
+
+    Args:
+        modelo (Model): Modelo cujas representações são guardadas
+        campos_versao (list): Campos (com lookups) que compõem a versão
+        serializar (callable): Função objeto -> dict
+    """
+
+    _backend = None
+    _lock_backend = threading.Lock()
+
+    def __init__(self, modelo, campos_versao, serializar):
+        self.modelo = modelo
+        self.campos_versao = list(campos_versao)
+        self.serializar = serializar
+        self.prefixo = f'rep:{modelo._meta.label_lower}'
+        uid = f'cache_representacao:{self.prefixo}'
+        post_save.connect(self._invalidar, sender=modelo, dispatch_uid=uid, weak=False)
+        post_delete.connect(self._invalidar, sender=modelo, dispatch_uid=uid, weak=False)
+
+    @classmethod
+    def backend(cls):
+        if CacheRepresentacao._backend is None:
+            with cls._lock_backend:
+                if CacheRepresentacao._backend is None:
+                    CacheRepresentacao._backend = _criar_backend()
+        return CacheRepresentacao._backend
+
+    def _chave(self, pk):
+        return f'{self.prefixo}:{pk}'
+
+    def _invalidar(self, sender, instance, **kwargs):
+        self.backend().delete(self._chave(instance.pk))
+
+    def representar(self, queryset):
+        """
+        Retorna a representação de cada objeto do queryset, na ordem do queryset.
+
+        Args:
+            queryset (QuerySet): Objetos a representar (filtros, ordem e select_related
+                são reaproveitados para carregar os que não estão em cache)
+
+        Returns:
+            list: Dicionários gerados por `serializar`
+        """
+        versoes = [(linha[0], tuple(linha[1:])) for linha in queryset.values_list('pk', *self.campos_versao)]
+        if not versoes:
+            return []
+
+        backend = self.backend()
+        em_cache = backend.get_many([self._chave(pk) for pk, _ in versoes])
+
+        representacoes = {}
+        faltando = {}
+        for pk, versao in versoes:
+            entrada = em_cache.get(self._chave(pk))
+            if entrada is not None and entrada[0] == versao:
+                representacoes[pk] = entrada[1]
+            else:
+                faltando[pk] = versao
+
+        if faltando:
+            novos = {}
+            for objeto in queryset.filter(pk__in=list(faltando)):
+                representacao = self.serializar(objeto)
+                representacoes[objeto.pk] = representacao
+                novos[self._chave(objeto.pk)] = (faltando[objeto.pk], representacao)
+            backend.set_many(novos)
+
+        return [representacoes[pk] for pk, _ in versoes if pk in representacoes]
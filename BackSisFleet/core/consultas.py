@@ -0,0 +1,148 @@
+# core/consultas.py
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from common.utils.normalizar_sql import normalizar_sql
+
+logger = logging.getLogger(__name__)
+
+# Código do projeto (para apontar a linha que disparou a consulta), fora de bibliotecas instaladas
+_RAIZ_PROJETO = str(settings.BASE_DIR)
+# Módulos de instrumentação (execute_wrappers empilhados entre o código e o banco)
+_INSTRUMENTACAO = {
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), nome)
+    for nome in ('consultas.py', 'consultas_lentas.py', 'metricas.py')
+}
+
+
+class ConsultasRepetidasError(Exception):
+    """Consultas de mesmo formato repetidas num request (N+1), com DETECTOR_CONSULTAS_ACAO = 'erro'."""
+
+
+def origem_consulta():
+    """Primeira linha do projeto na pilha de chamadas ('arquivo:linha em função')"""
+    quadro = sys._getframe(2)
+    while quadro is not None:
+        arquivo = quadro.f_code.co_filename
+        if arquivo.startswith(_RAIZ_PROJETO) and arquivo not in _INSTRUMENTACAO and 'site-packages' not in arquivo:
+            return f'{os.path.relpath(arquivo, _RAIZ_PROJETO)}:{quadro.f_lineno} em {quadro.f_code.co_name}'
+        quadro = quadro.f_back
+    return None
+
+
+class Consulta:
+    """Uma consulta executada: banco, SQL, formato normalizado, duração (s) e origem no código."""
+
+    __slots__ = ('alias', 'sql', 'formato', 'duracao', 'origem')
+
+    def __init__(self, alias, sql, duracao, origem):
+        self.alias = alias
+        self.sql = sql
+        self.formato = normalizar_sql(sql)
+        self.duracao = duracao
+        self.origem = origem
+
+
+class RegistroConsultas:
+    """
+    Registra as consultas feitas pela thread atual em todos os bancos
+    (connection.execute_wrapper), dentro de um bloco `with`.
+
+    Args:
+        origem (bool): Guarda a linha do projeto que disparou cada consulta
+    """
+
+    def __init__(self, origem=True):
+        self.origem = origem
+        self.consultas = []
+        self._pilha = None
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas.append(Consulta(
+                context['connection'].alias, sql, time.perf_counter() - inicio,
+                origem_consulta() if self.origem else None,
+            ))
+
+    def __enter__(self):
+        self._pilha = ExitStack()
+        for conexao in connections.all():
+            self._pilha.enter_context(conexao.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._pilha.close()
+        return False
+
+    def __len__(self):
+        return len(self.consultas)
+
+    def repetidas(self, limite):
+        """
+        Leituras de mesmo formato executadas `limite` vezes ou mais: o sinal de
+        um N+1 (uma consulta por linha de uma listagem).
+
+        Returns:
+            list: (formato, quantidade, origem da primeira execução), da mais repetida para a menos
+        """
+        leituras = [consulta for consulta in self.consultas if consulta.formato[:6].upper() == 'SELECT']
+        contagem = Counter((consulta.alias, consulta.formato) for consulta in leituras)
+        origens = {}
+        for consulta in leituras:
+            origens.setdefault((consulta.alias, consulta.formato), consulta.origem)
+        return [
+            (formato, quantidade, origens[(alias, formato)])
+            for (alias, formato), quantidade in contagem.most_common()
+            if quantidade >= limite
+        ]
+
+
+class DetectorConsultasMiddleware:
+    """
+    Conta as consultas de cada request e aponta N+1: leituras com o mesmo
+    formato (mesmo SQL, parâmetros diferentes) repetidas DETECTOR_CONSULTAS_LIMITE
+    vezes ou mais.
+
+    Ativo em DEBUG (ou com DETECTOR_CONSULTAS_ATIVO = True). Com
+    DETECTOR_CONSULTAS_ACAO = 'log' registra um aviso com o formato e a linha
+    do código que disparou a consulta; com 'erro' levanta ConsultasRepetidasError
+    (usado nos testes). A resposta leva o total no cabeçalho X-Consultas.
+
+    Consultas feitas durante o envio de respostas em streaming (exportações)
+    acontecem depois do retorno da view e não são contadas.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'DETECTOR_CONSULTAS_ATIVO', settings.DEBUG):
+            return self.get_response(request)
+
+        with RegistroConsultas() as registro:
+            response = self.get_response(request)
+
+        response['X-Consultas'] = str(len(registro))
+        repetidas = registro.repetidas(getattr(settings, 'DETECTOR_CONSULTAS_LIMITE', 5))
+        if repetidas:
+            self._reportar(request, repetidas)
+        return response
+
+    def _reportar(self, request, repetidas):
+        descricao = '; '.join(
+            f'{quantidade}x {formato} ({origem or "origem desconhecida"})'
+            for formato, quantidade, origem in repetidas
+        )
+        mensagem = f'Consultas repetidas em {request.method} {request.path}: {descricao}'
+        if getattr(settings, 'DETECTOR_CONSULTAS_ACAO', 'log') == 'erro':
+            raise ConsultasRepetidasError(mensagem)
+        logger.warning(mensagem)
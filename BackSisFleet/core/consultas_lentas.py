@@ -0,0 +1,198 @@
+# core/consultas_lentas.py
+import json
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+from common.utils.normalizar_sql import normalizar_sql
+from core.consultas import origem_consulta
+
+logger = logging.getLogger(__name__)
+
+# Comparações que um índice B-tree atende: igualdade (e IN/IS) primeiro, depois intervalo
+_COMPARACAO = re.compile(
+    r'"(?P<tabela>\w+)"\."(?P<coluna>\w+)"\s*(?P<operador>=|<=|>=|<|>|IN\b|IS\b|BETWEEN\b|LIKE\b)',
+    re.IGNORECASE,
+)
+_ORDER_BY = re.compile(r'\bORDER BY\b(?P<colunas>.*?)(?:\bLIMIT\b|\bOFFSET\b|$)', re.IGNORECASE)
+_COLUNA = re.compile(r'"(?P<tabela>\w+)"\."(?P<coluna>\w+)"')
+_IGUALDADE = {'=', 'IN', 'IS'}
+
+# SQLite: 'SCAN tabela' sem índice (SQLite < 3.36: 'SCAN TABLE tabela'); Postgres: 'Seq Scan on tabela'.
+# O (?!\w) impede o \w+ de recuar uma letra e escapar do lookahead do USING INDEX
+_VARREDURA_SQLITE = re.compile(r'^SCAN (?:TABLE )?(?!CONSTANT ROW$)(?P<tabela>\w+)(?!\w)(?! .*USING (?:COVERING )?INDEX)')
+_VARREDURA_POSTGRES = re.compile(r'Seq Scan on (?P<tabela>\w+)')
+# Ordenação feita depois da leitura, sem índice na ordem pedida
+_ORDENACAO = {'sqlite': 'USE TEMP B-TREE FOR ORDER BY', 'postgresql': 'Sort Key:'}
+_TABELA_PRINCIPAL = re.compile(r'\bFROM "(?P<tabela>\w+)"', re.IGNORECASE)
+
+
+def explicar(conexao, sql, params):
+    """
+    Plano de execução de uma consulta: EXPLAIN QUERY PLAN no SQLite, EXPLAIN
+    (sem ANALYZE, a consulta não é executada de novo) no Postgres.
+
+    Returns:
+        list: Linhas do plano (texto), vazia se o banco não suporta ou o EXPLAIN falhou
+    """
+    if conexao.vendor == 'sqlite':
+        prefixo = 'EXPLAIN QUERY PLAN '
+    elif conexao.vendor == 'postgresql':
+        prefixo = 'EXPLAIN '
+    else:
+        return []
+    try:
+        with conexao.cursor() as cursor:
+            cursor.execute(prefixo + sql, params)
+            linhas = cursor.fetchall()
+    except DatabaseError as e:
+        logger.debug('EXPLAIN falhou para %s: %s', sql, e)
+        return []
+    # SQLite: (id, pai, não usado, detalhe); Postgres: uma coluna de texto por linha
+    return [linha[-1] for linha in linhas]
+
+
+def tabelas_varridas(vendor, plano):
+    """Tabelas lidas por inteiro (sem índice) segundo o plano"""
+    padrao = _VARREDURA_POSTGRES if vendor == 'postgresql' else _VARREDURA_SQLITE
+    tabelas = []
+    for linha in plano:
+        encontrado = padrao.search(linha.strip())
+        if encontrado and encontrado.group('tabela') not in tabelas:
+            tabelas.append(encontrado.group('tabela'))
+    return tabelas
+
+
+def tabelas_sem_indice(vendor, formato, plano):
+    """Tabelas varridas por inteiro e, se a ordenação não usa índice, a tabela principal"""
+    tabelas = tabelas_varridas(vendor, plano)
+    marcador = _ORDENACAO.get(vendor)
+    principal = _TABELA_PRINCIPAL.search(formato)
+    if marcador and principal and any(marcador in linha for linha in plano) and principal.group('tabela') not in tabelas:
+        tabelas.append(principal.group('tabela'))
+    return tabelas
+
+
+def sugerir_indices(formato, tabelas):
+    """
+    Índices candidatos para as tabelas varridas: colunas comparadas por
+    igualdade primeiro, depois uma coluna de intervalo (ou da ordenação).
+
+    Heurística sobre o SQL gerado pelo ORM ("tabela"."coluna"); comparações
+    entre colunas (JOINs) e LIKE com '%' no início não aproveitam o índice e
+    devem ser avaliadas caso a caso.
+
+    Args:
+        formato (str): SQL normalizado
+        tabelas (list): Tabelas lidas sem índice (tabelas_sem_indice)
+
+    Returns:
+        list: Comandos CREATE INDEX sugeridos
+    """
+    where = re.split(r'\bWHERE\b', formato, maxsplit=1, flags=re.IGNORECASE)
+    filtros = re.split(r'\b(?:GROUP BY|ORDER BY|LIMIT)\b', where[1], maxsplit=1, flags=re.IGNORECASE)[0] if len(where) > 1 else ''
+    ordenacao = _ORDER_BY.search(formato)
+
+    sugestoes = []
+    for tabela in tabelas:
+        igualdade, intervalo = [], []
+        for comparacao in _COMPARACAO.finditer(filtros):
+            if comparacao.group('tabela') != tabela:
+                continue
+            coluna, operador = comparacao.group('coluna'), comparacao.group('operador').upper()
+            destino = igualdade if operador in _IGUALDADE else intervalo
+            if coluna not in igualdade and coluna not in intervalo:
+                destino.append(coluna)
+        if not intervalo and ordenacao:
+            intervalo = [
+                coluna.group('coluna') for coluna in _COLUNA.finditer(ordenacao.group('colunas'))
+                if coluna.group('tabela') == tabela and coluna.group('coluna') not in igualdade
+            ][:1]
+        colunas = igualdade + intervalo[:1]
+        if colunas:
+            sugestoes.append(f'CREATE INDEX {tabela}_{"_".join(colunas)}_idx ON {tabela} ({", ".join(colunas)});')
+    return sugestoes
+
+
+class CapturaConsultasLentas:
+    """
+    execute_wrapper instalado em cada conexão (connection_created): consultas
+    acima de CONSULTAS_LENTAS_LIMITE_MS são gravadas, uma por linha, em
+    CONSULTAS_LENTAS_ARQUIVO (JSON Lines), com o formato normalizado, a origem
+    no código e o plano de execução. `python manage.py consultas_lentas`
+    agrega o arquivo e aponta os piores formatos.
+
+    O EXPLAIN roda uma vez por formato e processo; abaixo do limite o custo é
+    só a medição do tempo.
+    """
+
+    def __init__(self):
+        self._planos = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(self._local, 'explicando', False):
+            return execute(sql, params, many, context)
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracao_ms = (time.perf_counter() - inicio) * 1000
+            if duracao_ms >= getattr(settings, 'CONSULTAS_LENTAS_LIMITE_MS', 200):
+                self._registrar(context['connection'], sql, params, many, duracao_ms)
+
+    def _plano(self, conexao, sql, params, formato):
+        chave = (conexao.alias, formato)
+        plano = self._planos.get(chave)
+        if plano is None:
+            self._local.explicando = True
+            try:
+                plano = explicar(conexao, sql, params)
+            finally:
+                self._local.explicando = False
+            self._planos[chave] = plano
+        return plano
+
+    def _registrar(self, conexao, sql, params, many, duracao_ms):
+        formato = normalizar_sql(sql)
+        leitura = not many and formato[:6].upper() == 'SELECT'
+        plano = self._plano(conexao, sql, params, formato) if leitura else []
+        varridas = tabelas_varridas(conexao.vendor, plano)
+        sem_indice = tabelas_sem_indice(conexao.vendor, formato, plano)
+        registro = {
+            'quando': timezone.now().isoformat(),
+            'banco': conexao.alias,
+            'vendor': conexao.vendor,
+            'formato': formato,
+            'sql': sql[:2000],
+            'duracao_ms': round(duracao_ms, 3),
+            'origem': origem_consulta(),
+            'plano': plano,
+            'varreduras': varridas,
+            'sugestoes': sugerir_indices(formato, sem_indice),
+        }
+        try:
+            with self._lock, open(settings.CONSULTAS_LENTAS_ARQUIVO, 'a', encoding='utf-8') as arquivo:
+                arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        except OSError as e:
+            logger.warning('Não foi possível gravar a consulta lenta: %s', e)
+        logger.warning('Consulta lenta (%.1f ms) em %s: %s', duracao_ms, registro['origem'] or conexao.alias, formato)
+
+
+captura = CapturaConsultasLentas()
+
+
+def instalar_captura(sender, connection, **kwargs):
+    """Handler de connection_created: adiciona a captura às conexões (CONSULTAS_LENTAS_ATIVO)"""
+    if not getattr(settings, 'CONSULTAS_LENTAS_ATIVO', False):
+        return
+    # No início da lista (a camada mais interna): connection_created costuma
+    # disparar dentro de um `with connection.execute_wrapper(...)`, que ao sair
+    # remove o último da lista
+    if captura not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, captura)
@@ -0,0 +1,68 @@
+# core/formato_binario.py
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.parsers import BaseParser
+from rest_framework.utils.encoders import JSONEncoder
+from core.layout_colunar import aplicar_layout
+
+try:
+    import msgpack
+except ImportError:  # sem msgpack o formato não é oferecido na negociação
+    msgpack = None
+
+MEDIA_TYPE_MSGPACK = 'application/msgpack'
+
+# Datas, UUIDs, Decimal etc. viram os mesmos valores que o JSON da API
+_encoder = JSONEncoder()
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """
+    Respostas em MessagePack (Accept: application/msgpack), para o app dos
+    motoristas: números e booleanos em binário e strings sem escapes, com o
+    mesmo conteúdo do JSON. Aceita o layout colunar (layout=colunar).
+    """
+
+    media_type = MEDIA_TYPE_MSGPACK
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    disponivel = msgpack is not None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        data = aplicar_layout(data, accepted_media_type, renderer_context)
+        return msgpack.packb(data, default=_encoder.default, use_bin_type=True, strict_types=False)
+
+
+class MessagePackParser(BaseParser):
+    """Corpo do request em MessagePack."""
+
+    media_type = MEDIA_TYPE_MSGPACK
+    disponivel = msgpack is not None
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if msgpack is None:
+            raise ParseError('MessagePack não suportado neste servidor')
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        # TypeError: chave de mapa não hashable (ex.: uma lista como chave)
+        except (ValueError, TypeError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
+
+
+class NegociacaoConteudo(DefaultContentNegotiation):
+    """
+    Negociação padrão do DRF ignorando renderers e parsers cuja dependência
+    opcional não está instalada (atributo `disponivel = False`).
+    """
+
+    def select_parser(self, request, parsers):
+        return super().select_parser(request, [parser for parser in parsers if getattr(parser, 'disponivel', True)])
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return super().select_renderer(
+            request, [renderer for renderer in renderers if getattr(renderer, 'disponivel', True)], format_suffix
+        )
@@ -0,0 +1,135 @@
+# core/hashing.py
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashSobrecarregadoError(APIException):
+    """Pool de hash cheio: o cliente deve tentar de novo após `wait` segundos (HTTP 503)."""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Servidor ocupado processando autenticações. Tente novamente em instantes."
+    default_code = 'hash_sobrecarregado'
+
+    def __init__(self, wait, detail=None):
+        super().__init__(detail)
+        # O exception_handler do DRF transforma `wait` no cabeçalho Retry-After
+        self.wait = wait
+
+
+class ExecutorHash:
+    """
+    Pool limitado de threads para o PBKDF2 de senhas.
+
+    O hashlib libera o GIL durante o pbkdf2_hmac, então as threads usam
+    núcleos de verdade. No máximo `trabalhadores` hashes rodam ao mesmo tempo
+    e no máximo `fila_maxima` esperam na fila; quando a fila está cheia o
+    request aguarda uma vaga por até `espera` segundos e depois recebe 503,
+    em vez de todos os workers do servidor disputarem a CPU ao mesmo tempo.
+
+    Configuração (settings): HASH_SENHA_TRABALHADORES, HASH_SENHA_FILA_MAXIMA,
+    HASH_SENHA_ESPERA e HASH_SENHA_RETRY_AFTER.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._vagas = None
+        self._trabalhadores = 1
+        self._lock = threading.Lock()
+
+    def _iniciar(self):
+        with self._lock:
+            if self._executor is None:
+                trabalhadores = getattr(settings, 'HASH_SENHA_TRABALHADORES', None) or os.cpu_count() or 1
+                fila_maxima = getattr(settings, 'HASH_SENHA_FILA_MAXIMA', None) or trabalhadores * 4
+                self._trabalhadores = trabalhadores
+                self._vagas = threading.BoundedSemaphore(trabalhadores + fila_maxima)
+                self._executor = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix='hash-senha')
+        return self._executor
+
+    def encerrar(self):
+        """Desfaz o pool; o próximo uso relê as settings (benchmark, testes)"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            self._executor = None
+            self._vagas = None
+
+    def _submeter(self, executor, funcao, *args):
+        if not self._vagas.acquire(timeout=getattr(settings, 'HASH_SENHA_ESPERA', 2.0)):
+            raise HashSobrecarregadoError(wait=getattr(settings, 'HASH_SENHA_RETRY_AFTER', 1))
+        try:
+            futuro = executor.submit(funcao, *args)
+        except BaseException:
+            self._vagas.release()
+            raise
+        futuro.add_done_callback(lambda _: self._vagas.release())
+        return futuro
+
+    def executar(self, funcao, *args):
+        """Executa `funcao(*args)` no pool e devolve o resultado (bloqueia o request, não a CPU)"""
+        return self._submeter(self._iniciar(), funcao, *args).result()
+
+    def mapear(self, funcao, valores):
+        """
+        Executa `funcao(valor)` para cada valor no pool, na ordem de `valores`.
+
+        Cada chamada mantém no máximo `trabalhadores` itens em andamento: um
+        lote grande usa todos os núcleos sem ocupar a fila inteira e deixar os
+        logins concorrentes sem vaga.
+        """
+        executor = self._iniciar()
+        futuros, resultados = deque(), []
+        for valor in valores:
+            if len(futuros) >= self._trabalhadores:
+                resultados.append(futuros.popleft().result())
+            futuros.append(self._submeter(executor, funcao, valor))
+        resultados.extend(futuro.result() for futuro in futuros)
+        return resultados
+
+
+executor_hash = ExecutorHash()
+
+
+def gerar_hash_senha(senha):
+    """make_password executado no pool de hash"""
+    return executor_hash.executar(make_password, senha)
+
+
+def gerar_hashes_senha(senhas):
+    """make_password de cada senha no pool de hash, cada uma com o seu salt"""
+    return executor_hash.mapear(make_password, senhas)
+
+
+def verificar_senha(usuario, senha):
+    """
+    Verifica a senha do usuário no pool de hash.
+
+    Se a senha estiver correta mas o hash usar um algoritmo ou número de
+    iterações antigo, ele é regravado (como faz o AbstractBaseUser.check_password).
+
+    Args:
+        usuario (User): Usuário com o campo password carregado
+        senha (str): Senha informada
+
+    Returns:
+        bool: True se a senha confere
+    """
+    codificada = usuario.password
+    if not executor_hash.executar(check_password, senha, codificada):
+        return False
+
+    try:
+        hasher = identify_hasher(codificada)
+    except ValueError:
+        return True
+    preferido = get_hasher()
+    if hasher.algorithm != preferido.algorithm or preferido.must_update(codificada):
+        usuario.password = gerar_hash_senha(senha)
+        usuario.save(update_fields=['password'])
+    return True
@@ -0,0 +1,74 @@
+# core/json_rapido.py
+from decimal import Decimal
+
+from django.conf import settings
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from core.layout_colunar import aplicar_layout
+
+try:
+    import orjson
+except ImportError:  # sem orjson os dois caem para a implementação padrão do DRF
+    orjson = None
+
+if orjson is not None:
+    # Datas saem em ISO 8601 com "Z" (como no encoder do DRF); chaves não-string
+    # (ex.: erros indexados pela posição no lote) são convertidas como no json padrão
+    OPCOES_ORJSON = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _converter(valor):
+    """Tipos que o orjson não conhece, tratados como no JSONEncoder do DRF."""
+    if isinstance(valor, Promise):
+        return force_str(valor)
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, bytes):
+        return valor.decode()
+    if hasattr(valor, 'tolist'):
+        return valor.tolist()
+    if hasattr(valor, '__iter__'):
+        return list(valor)
+    raise TypeError(f"Objeto do tipo {type(valor).__name__} não é serializável em JSON")
+
+
+class JSONRapidoRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer que codifica com orjson (em Rust, com datas, UUIDs e
+    dataclasses nativos), várias vezes mais rápido que o json da biblioteca
+    padrão nas listagens grandes. Pedidos com indentação (ex.: Accept com
+    indent=4) e ambientes sem orjson usam o renderer padrão do DRF. Aceita o
+    layout colunar (layout=colunar no Accept ou na query string).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is not None:
+            data = aplicar_layout(data, accepted_media_type, renderer_context)
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=_converter, option=OPCOES_ORJSON)
+
+
+class JSONRapidoParser(JSONParser):
+    """JSONParser que decodifica o corpo com orjson."""
+
+    renderer_class = JSONRapidoRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        conteudo = stream.read() if stream is not None else b''
+        try:
+            if encoding.lower().replace('-', '') != 'utf8':
+                conteudo = conteudo.decode(encoding)
+            return orjson.loads(conteudo)
+        except (orjson.JSONDecodeError, UnicodeDecodeError, LookupError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
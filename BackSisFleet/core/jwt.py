@@ -1,14 +1,54 @@
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer, TokenObtainPairSerializer, TokenRefreshSerializer, TokenVerifySerializer
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
 from rest_framework_simplejwt.views import TokenObtainPairView
+from .lista_negra import RefreshTokenFiltrado, lista_negra
+from .throttling import LoginThrottle
 
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RefreshTokenFiltrado
+
     @classmethod
     def get_token(cls, user):
 
         token = super().get_token(user)
         token['username'] = user.username
         token['is_staff'] = user.is_staff
+        token['is_active'] = user.is_active
+        # Claims usadas por JWTClaimsAuthentication para montar o usuário sem consultar o banco
+        token['tipo_usuario'] = user.tipo_usuario
+        token['cpf_cnpj'] = user.cpf_cnpj
+        token['responsavel_id'] = cls.get_responsavel_id(user)
         return token
 
+    @classmethod
+    def get_responsavel_id(cls, user):
+        """Cliente responde por si; motorista herda o responsável do seu cadastro."""
+        if user.tipo_usuario == 'cliente':
+            return user.id
+        if user.tipo_usuario == 'motorista':
+            from motoristas.models.motoristas import Motorista
+            return Motorista.objects.filter(usuario_fk_id=user.id).values_list('responsavel_fk_id', flat=True).first()
+        return None
+
 class MyTokenObtainPairView(TokenObtainPairView):
     serializer_class = MyTokenObtainPairSerializer
+    throttle_classes = [LoginThrottle]
+
+# Serializers configurados em SIMPLE_JWT: consultam a blacklist pelo filtro em memória
+class TokenRefreshFiltradoSerializer(TokenRefreshSerializer):
+    token_class = RefreshTokenFiltrado
+
+class TokenBlacklistFiltradoSerializer(TokenBlacklistSerializer):
+    token_class = RefreshTokenFiltrado
+
+class TokenVerifyFiltradoSerializer(TokenVerifySerializer):
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+        if api_settings.BLACKLIST_AFTER_ROTATION and lista_negra.contem(token.get(api_settings.JTI_CLAIM)):
+            raise ValidationError(_("Token is blacklisted"))
+        return {}
@@ -0,0 +1,73 @@
+# core/layout_colunar.py
+from rest_framework.utils.mediatypes import _MediaType
+
+LAYOUT_COLUNAR = 'colunar'
+
+
+def layout_solicitado(accepted_media_type, renderer_context):
+    """
+    Layout pedido pelo cliente: parâmetro do Accept (application/msgpack; layout=colunar)
+    ou da query string (?layout=colunar).
+
+    Returns:
+        str: Nome do layout ou None para o padrão (lista de objetos)
+    """
+    if accepted_media_type:
+        layout = _MediaType(accepted_media_type).params.get('layout')
+        if layout:
+            return layout
+    request = (renderer_context or {}).get('request')
+    if request is not None and hasattr(request, 'query_params'):
+        return request.query_params.get('layout')
+    return None
+
+
+def _achatar(objeto, prefixo=''):
+    """Pares (chave, valor) do dicionário, com os aninhados em 'pai.filho'"""
+    for chave, valor in objeto.items():
+        nome = f'{prefixo}{chave}'
+        if isinstance(valor, dict) and valor:
+            yield from _achatar(valor, f'{nome}.')
+        else:
+            yield nome, valor
+
+
+def _para_colunas(objetos):
+    linhas = [dict(_achatar(objeto)) for objeto in objetos]
+    colunas = list(dict.fromkeys(chave for linha in linhas for chave in linha))
+    return {
+        'colunas': colunas,
+        'linhas': [[linha.get(coluna) for coluna in colunas] for linha in linhas],
+    }
+
+
+def converter_para_colunas(dados):
+    """
+    Troca cada lista de objetos da resposta por {"colunas": [...], "linhas": [[...]]}:
+    as chaves aparecem uma vez e cada objeto vira um array na ordem das colunas.
+
+    Objetos aninhados (ex.: o usuário do motorista) viram colunas 'usuario_fk.email';
+    colunas que faltam em algum objeto saem como null. Dicionários e listas que
+    não são de objetos são mantidos.
+
+    Args:
+        dados: Dados da resposta
+
+    Returns:
+        Os mesmos dados com as listas de objetos em colunas
+    """
+    if isinstance(dados, dict):
+        return {chave: converter_para_colunas(valor) for chave, valor in dados.items()}
+    if isinstance(dados, (list, tuple)) and dados and all(isinstance(item, dict) for item in dados):
+        return _para_colunas(dados)
+    return dados
+
+
+def aplicar_layout(dados, accepted_media_type, renderer_context):
+    """Converte os dados para o layout pedido (só respostas de sucesso)"""
+    if layout_solicitado(accepted_media_type, renderer_context) != LAYOUT_COLUNAR:
+        return dados
+    response = (renderer_context or {}).get('response')
+    if response is not None and response.status_code >= 400:
+        return dados
+    return converter_para_colunas(dados)
@@ -0,0 +1,159 @@
+# core/lista_negra.py
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+from django.core.cache import cache
+from core.cache_compartilhado import cache_compartilhado
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom sobre strings: sem falsos negativos, com taxa de falsos
+    positivos próxima de `taxa_falso_positivo` até `capacidade` elementos.
+    """
+
+    def __init__(self, capacidade=100_000, taxa_falso_positivo=0.001):
+        self.capacidade = capacidade
+        self.total_bits = max(8, int(-capacidade * math.log(taxa_falso_positivo) / (math.log(2) ** 2)))
+        self.total_hashes = max(1, round(self.total_bits / capacidade * math.log(2)))
+        self.bits = bytearray(self.total_bits // 8 + 1)
+        self.quantidade = 0
+
+    def _posicoes(self, valor):
+        resumo = hashlib.blake2b(valor.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(resumo[:8], 'little')
+        h2 = int.from_bytes(resumo[8:], 'little') | 1
+        return [(h1 + i * h2) % self.total_bits for i in range(self.total_hashes)]
+
+    def adicionar(self, valor):
+        for posicao in self._posicoes(valor):
+            self.bits[posicao >> 3] |= 1 << (posicao & 7)
+        self.quantidade += 1
+
+    def __contains__(self, valor):
+        return all(self.bits[posicao >> 3] & (1 << (posicao & 7)) for posicao in self._posicoes(valor))
+
+
+class ListaNegraTokens:
+    """
+    Espelho em memória dos JTIs da blacklist do simplejwt.
+
+    Um JTI fora do filtro certamente não está na blacklist, então a consulta
+    ao banco só acontece nos (raros) positivos do filtro. O filtro é montado
+    no primeiro uso com os tokens ainda não expirados e recebe os JTIs
+    colocados na blacklist por este processo na hora. As inclusões feitas por
+    outros processos chegam por uma leitura incremental disparada quando o
+    contador de versão no cache compartilhado muda; o contador é lido a cada
+    consulta, então a propagação é imediata. INTERVALO_SINCRONIZACAO só cobre
+    o contador ter sido despejado do cache.
+
+    Sem cache compartilhado (LocMemCache) o contador não atravessa processos
+    e o filtro poderia dar um falso negativo: a consulta vai sempre ao banco.
+    """
+
+    CHAVE_VERSAO = 'jwt:lista_negra:versao'
+    INTERVALO_SINCRONIZACAO = 5
+    # Margem na leitura incremental para transações que confirmaram fora de ordem
+    MARGEM_SINCRONIZACAO = timedelta(seconds=60)
+    CAPACIDADE_MINIMA = 100_000
+
+    def __init__(self):
+        self._filtro = None
+        self._versao = None
+        self._sincronizado_em = None
+        self._verificado_em = 0.0
+        self._lock = threading.Lock()
+
+    def _reconstruir(self):
+        agora = timezone.now()
+        jtis = BlacklistedToken.objects.filter(token__expires_at__gt=agora).values_list('token__jti', flat=True)
+        quantidade = jtis.count()
+        filtro = FiltroBloom(capacidade=max(self.CAPACIDADE_MINIMA, quantidade * 2))
+        for jti in jtis.iterator(chunk_size=5000):
+            filtro.adicionar(jti)
+        self._filtro = filtro
+        self._sincronizado_em = agora
+
+    def _sincronizar(self):
+        versao = cache.get(self.CHAVE_VERSAO)
+        agora = time.monotonic()
+        with self._lock:
+            if self._filtro is None or self._filtro.quantidade > self._filtro.capacidade:
+                self._reconstruir()
+            elif versao != self._versao or agora - self._verificado_em > self.INTERVALO_SINCRONIZACAO:
+                inicio = timezone.now()
+                novos = BlacklistedToken.objects.filter(
+                    blacklisted_at__gte=self._sincronizado_em - self.MARGEM_SINCRONIZACAO,
+                ).values_list('token__jti', flat=True)
+                for jti in novos.iterator(chunk_size=5000):
+                    self._filtro.adicionar(jti)
+                self._sincronizado_em = inicio
+            self._versao = versao
+            self._verificado_em = agora
+
+    def contem(self, jti):
+        """Retorna True se o JTI estiver na blacklist"""
+        if not cache_compartilhado():
+            return BlacklistedToken.objects.filter(token__jti=jti).exists()
+        self._sincronizar()
+        if jti not in self._filtro:
+            return False
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def adicionar(self, jti):
+        """Registra um JTI recém-incluído na blacklist e avisa os outros processos"""
+        with self._lock:
+            if self._filtro is not None:
+                self._filtro.adicionar(jti)
+        cache.add(self.CHAVE_VERSAO, 0, timeout=None)
+        try:
+            self._versao = cache.incr(self.CHAVE_VERSAO)
+        except ValueError:
+            cache.set(self.CHAVE_VERSAO, 1, timeout=None)
+            self._versao = 1
+
+
+lista_negra = ListaNegraTokens()
+
+
+class RefreshTokenFiltrado(RefreshToken):
+    """
+    RefreshToken que consulta a blacklist através do filtro em memória.
+
+    outstand() e blacklist() gravam o usuário pelo id da claim, sem o SELECT
+    em CustomUser que a implementação padrão faz em cada um deles.
+    """
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if lista_negra.contem(jti):
+            raise TokenError(_("Token is blacklisted"))
+
+    def _obter_outstanding(self):
+        return OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM],
+            defaults={
+                "user_id": self.payload.get(api_settings.USER_ID_CLAIM),
+                "created_at": self.current_time,
+                "token": str(self),
+                "expires_at": datetime_from_epoch(self.payload["exp"]),
+            },
+        )
+
+    def outstand(self):
+        return self._obter_outstanding()
+
+    def blacklist(self):
+        token, criado = self._obter_outstanding()
+        resultado = BlacklistedToken.objects.get_or_create(token=token)
+        lista_negra.adicionar(token.jti)
+        return resultado
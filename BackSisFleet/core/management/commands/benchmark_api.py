@@ -0,0 +1,268 @@
+import io
+import json
+import os
+import platform
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, teardown_databases
+from django.utils import timezone
+from core.jwt import MyTokenObtainPairSerializer
+from core.models import CustomUser
+from motoristas.models.motoristas import Motorista
+
+SENHA = 'Senha@123'
+
+# (nome, método, caminho, papel que faz o request); o login manda usuário e senha do cliente.
+# GET /veiculos/ responde uma mensagem fixa, sem consultas: a frota do cliente é
+# medida pela exportação, que lê todos os veículos dele
+ENDPOINTS = [
+    ('motoristas', 'GET', '/motoristas/', 'cliente'),
+    ('motoristas_app', 'GET', '/motoristas/app/', 'motorista'),
+    ('veiculos_exportar', 'GET', '/veiculos/exportar/', 'cliente'),
+    ('token', 'POST', '/api/token/', None),
+]
+
+# O login passa pelo token bucket: sem isto o benchmark mediria respostas 429
+SEM_LIMITE = (10 ** 9, 10 ** 9)
+BALDES_BENCHMARK = {'login': {'ip': SEM_LIMITE, 'identificador': SEM_LIMITE}}
+
+
+def _percentil(valores, percentil):
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(percentil / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+def _lista_inteiros(texto):
+    try:
+        valores = [int(valor) for valor in texto.split(',') if valor.strip()]
+    except ValueError:
+        raise CommandError(f"Lista inválida: '{texto}'")
+    if not valores or min(valores) < 1:
+        raise CommandError(f"Lista inválida: '{texto}'")
+    return valores
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark dos endpoints /motoristas/, /motoristas/app/, /veiculos/exportar/ e /api/token/ "
+        "num banco de teste descartável: popula uma frota por escala (gerar_frota), dispara "
+        "os requests pelo test client em threads e mostra vazão e p50/p95/p99. Com --saida "
+        "grava o resultado em JSON; com --base compara com um resultado anterior."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escalas', default='10,100,1000',
+                            help="Motoristas e veículos do cliente medido em cada escala, separados por vírgula.")
+        parser.add_argument('--concorrencia', default='1,4', help="Threads simultâneas, separadas por vírgula.")
+        parser.add_argument('--requisicoes', type=int, default=50, help="Requisições por thread em cada medição.")
+        parser.add_argument('--aquecimento', type=int, default=5, help="Requisições descartadas antes de medir (caches).")
+        parser.add_argument('--endpoints', default=','.join(nome for nome, *_ in ENDPOINTS),
+                            help="Endpoints medidos, separados por vírgula.")
+        parser.add_argument('--fundo', type=int, default=0,
+                            help="Clientes extras (10 motoristas e 10 veículos cada) para as tabelas terem volume.")
+        parser.add_argument('--semente', type=int, default=42)
+        parser.add_argument('--debug', action='store_true', help="Mede com DEBUG=True (log de queries, detector de N+1).")
+        parser.add_argument('--saida', help="Arquivo JSON onde gravar os resultados.")
+        parser.add_argument('--base', help="Resultado anterior (JSON) para comparar.")
+        parser.add_argument('--tolerancia', type=float, default=10.0,
+                            help="Piora percentual do p95 ou da vazão, em relação à base, considerada regressão.")
+        parser.add_argument('--falhar-se-regredir', action='store_true',
+                            help="Termina com erro se alguma medição regredir além da tolerância (CI).")
+
+    def handle(self, *args, **options):
+        escalas = sorted(_lista_inteiros(options['escalas']))
+        concorrencias = _lista_inteiros(options['concorrencia'])
+        nomes = [nome.strip() for nome in options['endpoints'].split(',') if nome.strip()]
+        desconhecidos = set(nomes) - {nome for nome, *_ in ENDPOINTS}
+        if desconhecidos:
+            raise CommandError(f"Endpoints desconhecidos: {', '.join(sorted(desconhecidos))}")
+        endpoints = [endpoint for endpoint in ENDPOINTS if endpoint[0] in nomes]
+        base = self._carregar_base(options['base']) if options['base'] else None
+
+        resultados = []
+        with self._banco_temporario():
+            with override_settings(DEBUG=options['debug'], THROTTLE_BALDES=BALDES_BENCHMARK,
+                                   DETECTOR_CONSULTAS_ATIVO=options['debug']):
+                if options['fundo']:
+                    self._popular(options['fundo'], 10, options['semente'])
+                self.stdout.write(
+                    f"{'endpoint':<18} {'escala':>7} {'threads':>7} {'req/s':>9} {'p50 ms':>8} "
+                    f"{'p95 ms':>8} {'p99 ms':>8} {'erros':>6}"
+                )
+                for escala in escalas:
+                    contas = self._popular(1, escala, options['semente'] + escala)
+                    for nome, metodo, caminho, papel in endpoints:
+                        for threads in concorrencias:
+                            resultado = self._medir(
+                                nome, metodo, caminho, papel, contas, threads,
+                                max(1, options['requisicoes']), max(0, options['aquecimento']),
+                            )
+                            resultado.update(escala=escala, concorrencia=threads)
+                            resultados.append(resultado)
+                            self.stdout.write(
+                                f"{nome:<18} {escala:>7} {threads:>7} {resultado['req_s']:>9.1f} "
+                                f"{resultado['p50_ms']:>8.1f} {resultado['p95_ms']:>8.1f} "
+                                f"{resultado['p99_ms']:>8.1f} {resultado['erros']:>6}"
+                            )
+
+        if options['saida']:
+            self._gravar(options, resultados)
+        if base is not None:
+            regressoes = self._comparar(base, resultados, options['tolerancia'])
+            if regressoes and options['falhar_se_regredir']:
+                raise CommandError(f"{regressoes} medições regrediram mais de {options['tolerancia']:.0f}%")
+
+    @contextmanager
+    def _banco_temporario(self):
+        """Banco de teste descartável; no SQLite um arquivo (threads não compartilham o banco em memória)"""
+        configuracao = connections['default'].settings_dict
+        teste_original = dict(configuracao.get('TEST') or {})
+        diretorio = None
+        if connections['default'].vendor == 'sqlite':
+            diretorio = tempfile.mkdtemp(prefix='benchmark_api_')
+            configuracao['TEST'] = dict(teste_original, NAME=os.path.join(diretorio, 'benchmark.sqlite3'))
+        self.stdout.write("Criando o banco de teste...")
+        antigos = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            yield
+        finally:
+            connections.close_all()
+            teardown_databases(antigos, verbosity=0)
+            configuracao['TEST'] = teste_original
+            if diretorio:
+                shutil.rmtree(diretorio, ignore_errors=True)
+
+    def _popular(self, clientes, por_cliente, semente):
+        """Gera `clientes` com `por_cliente` motoristas e veículos; devolve as contas do último cliente"""
+        call_command(
+            'gerar_frota', clientes=clientes, motoristas_por_cliente=por_cliente, veiculos_por_cliente=por_cliente,
+            semente=semente, senha=SENHA, stdout=io.StringIO(),
+        )
+        cliente = CustomUser.objects.filter(tipo_usuario='cliente').latest('id')
+        motorista = Motorista.objects.filter(responsavel_fk=cliente).select_related('usuario_fk').order_by('id').first()
+        contas = {'cliente': cliente, 'motorista': motorista.usuario_fk if motorista else None}
+        return {
+            papel: (usuario, str(MyTokenObtainPairSerializer.get_token(usuario).access_token) if usuario else None)
+            for papel, usuario in contas.items()
+        }
+
+    def _medir(self, nome, metodo, caminho, papel, contas, threads, requisicoes, aquecimento):
+        if papel:
+            cabecalhos = {'HTTP_AUTHORIZATION': f'Bearer {contas[papel][1]}'}
+            corpo = None
+        else:
+            cabecalhos = {}
+            corpo = json.dumps({'username': contas['cliente'][0].username, 'password': SENHA})
+        latencias, erros = [], []
+        trava = threading.Lock()
+
+        def requisitar(cliente):
+            if metodo == 'GET':
+                resposta = cliente.get(caminho, **cabecalhos)
+            else:
+                resposta = cliente.generic(metodo, caminho, corpo, content_type='application/json', **cabecalhos)
+            if resposta.streaming:
+                for _ in resposta.streaming_content:
+                    pass
+            # O que o request_finished faz em produção
+            close_old_connections()
+            return resposta.status_code
+
+        def trabalhar():
+            cliente = Client(raise_request_exception=False)
+            locais, falhas = [], []
+            for _ in range(requisicoes):
+                inicio = time.perf_counter()
+                status = requisitar(cliente)
+                locais.append(time.perf_counter() - inicio)
+                if status >= 400:
+                    falhas.append(status)
+            with trava:
+                latencias.extend(locais)
+                erros.extend(falhas)
+            connections.close_all()
+
+        aquecedor = Client(raise_request_exception=False)
+        for _ in range(aquecimento):
+            requisitar(aquecedor)
+
+        inicio = time.perf_counter()
+        trabalhadores = [threading.Thread(target=trabalhar) for _ in range(threads)]
+        for trabalhador in trabalhadores:
+            trabalhador.start()
+        for trabalhador in trabalhadores:
+            trabalhador.join()
+        duracao = time.perf_counter() - inicio
+
+        return {
+            'endpoint': nome,
+            'requisicoes': len(latencias),
+            'erros': len(erros),
+            'status_erros': sorted(set(erros)),
+            'req_s': len(latencias) / duracao,
+            'media_ms': sum(latencias) / len(latencias) * 1000,
+            'p50_ms': _percentil(latencias, 50) * 1000,
+            'p95_ms': _percentil(latencias, 95) * 1000,
+            'p99_ms': _percentil(latencias, 99) * 1000,
+        }
+
+    def _gravar(self, options, resultados):
+        documento = {
+            'gerado_em': timezone.now().isoformat(),
+            'ambiente': {
+                'python': platform.python_version(),
+                'plataforma': platform.platform(),
+                'banco': connections['default'].vendor,
+            },
+            'parametros': {
+                chave: options[chave]
+                for chave in ('escalas', 'concorrencia', 'requisicoes', 'aquecimento', 'fundo', 'semente', 'debug')
+            },
+            'resultados': resultados,
+        }
+        with open(options['saida'], 'w', encoding='utf-8') as arquivo:
+            json.dump(documento, arquivo, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Resultados gravados em {options['saida']}"))
+
+    def _carregar_base(self, caminho):
+        try:
+            with open(caminho, encoding='utf-8') as arquivo:
+                documento = json.load(arquivo)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Não foi possível ler a base '{caminho}': {e}")
+        return {
+            (resultado['endpoint'], resultado['escala'], resultado['concorrencia']): resultado
+            for resultado in documento.get('resultados', [])
+        }
+
+    def _comparar(self, base, resultados, tolerancia):
+        """Variação em relação à base; regressão = p95 maior ou vazão menor além da tolerância"""
+        self.stdout.write(f"\nComparação com a base (tolerância {tolerancia:.0f}%):")
+        self.stdout.write(f"{'endpoint':<18} {'escala':>7} {'threads':>7} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8}")
+        regressoes = 0
+        for resultado in resultados:
+            anterior = base.get((resultado['endpoint'], resultado['escala'], resultado['concorrencia']))
+            if anterior is None:
+                continue
+
+            def variacao(campo):
+                return (resultado[campo] - anterior[campo]) / anterior[campo] * 100 if anterior[campo] else 0.0
+
+            regrediu = variacao('p95_ms') > tolerancia or variacao('req_s') < -tolerancia
+            regressoes += regrediu
+            linha = (
+                f"{resultado['endpoint']:<18} {resultado['escala']:>7} {resultado['concorrencia']:>7} "
+                f"{variacao('req_s'):>+8.1f}% {variacao('p50_ms'):>+7.1f}% {variacao('p95_ms'):>+7.1f}% "
+                f"{variacao('p99_ms'):>+7.1f}%"
+            )
+            self.stdout.write(self.style.ERROR(linha + '  regressão') if regrediu else linha)
+        return regressoes
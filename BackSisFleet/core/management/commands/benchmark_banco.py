@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.test import Client, override_settings
+from django.utils import timezone
+from core.banco import pragmas_sqlite_producao
+from core.jwt import MyTokenObtainPairSerializer
+
+# Perfil atual do settings.py contra o perfil de settings_producao
+PERFIS = {
+    'padrao': {'pragmas': None, 'conn_max_age': 0, 'debug': True},
+    'producao': {'pragmas': pragmas_sqlite_producao(), 'conn_max_age': 600, 'debug': False},
+}
+
+
+def _percentil(valores, percentil):
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(percentil / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara os endpoints de listagem com o perfil de banco padrão (sem PRAGMAs, "
+        "conexão nova por request, DEBUG) e o de produção (WAL e PRAGMAs, conexão persistente). "
+        "No SQLite cada perfil roda numa cópia do banco, que não é alterado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--admin', required=True, help="Username de um administrador (listagem de usuários).")
+        parser.add_argument('--cliente', required=True, help="Username de um cliente (motoristas e veículos).")
+        parser.add_argument('--threads', type=int, default=4, help="Clientes simultâneos.")
+        parser.add_argument('--requisicoes', type=int, default=50, help="Requisições por thread em cada endpoint.")
+        parser.add_argument('--escritor', action='store_true', help="Mantém uma thread gravando durante a medição.")
+
+    def _tokens(self, options):
+        User = get_user_model()
+        tokens = {}
+        for papel in ('admin', 'cliente'):
+            try:
+                usuario = User.objects.get(username=options[papel])
+            except User.DoesNotExist:
+                raise CommandError(f"Usuário '{options[papel]}' não encontrado")
+            tokens[papel] = (usuario.pk, str(MyTokenObtainPairSerializer.get_token(usuario).access_token))
+        return tokens
+
+    def _medir(self, url, token, threads, requisicoes):
+        latencias, erros = [], []
+
+        def trabalhar():
+            cliente = Client(raise_request_exception=False)
+            for _ in range(requisicoes):
+                inicio = time.perf_counter()
+                resposta = cliente.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+                if resposta.streaming:
+                    for _ in resposta.streaming_content:
+                        pass
+                latencias.append(time.perf_counter() - inicio)
+                if resposta.status_code >= 400:
+                    erros.append(resposta.status_code)
+                # O que o request_finished faz em produção: fecha a conexão se CONN_MAX_AGE expirou
+                close_old_connections()
+            connections.close_all()
+
+        inicio = time.perf_counter()
+        trabalhadores = [threading.Thread(target=trabalhar) for _ in range(threads)]
+        for trabalhador in trabalhadores:
+            trabalhador.start()
+        for trabalhador in trabalhadores:
+            trabalhador.join()
+        return latencias, len(erros), time.perf_counter() - inicio
+
+    def _escrever(self, usuario_id, parar):
+        User = get_user_model()
+        while not parar.is_set():
+            User.objects.filter(pk=usuario_id).update(atualizado_em=timezone.now())
+            time.sleep(0.005)
+        connections.close_all()
+
+    def handle(self, *args, **options):
+        tokens = self._tokens(options)
+        configuracao = connections['default'].settings_dict
+        sqlite = connections['default'].vendor == 'sqlite'
+        original = {chave: configuracao.get(chave) for chave in ('NAME', 'CONN_MAX_AGE')}
+        endpoints = [
+            ('/api/usuarios/?limite=50', tokens['admin'][1]),
+            ('/motoristas/', tokens['cliente'][1]),
+            ('/veiculos/exportar/', tokens['cliente'][1]),
+        ]
+
+        self.stdout.write(f"{'perfil':<10} {'endpoint':<26} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erros':>6}")
+        diretorio = tempfile.mkdtemp(prefix='benchmark_banco_')
+        try:
+            for nome, perfil in PERFIS.items():
+                connections.close_all()
+                if sqlite:
+                    copia = os.path.join(diretorio, f'{nome}.sqlite3')
+                    shutil.copyfile(original['NAME'], copia)
+                    configuracao['NAME'] = copia
+                configuracao['CONN_MAX_AGE'] = perfil['conn_max_age']
+
+                parar = threading.Event()
+                escritor = threading.Thread(target=self._escrever, args=(tokens['cliente'][0], parar))
+                with override_settings(DEBUG=perfil['debug'], SQLITE_PRAGMAS=perfil['pragmas']):
+                    if options['escritor']:
+                        escritor.start()
+                    try:
+                        for url, token in endpoints:
+                            latencias, erros, duracao = self._medir(url, token, max(1, options['threads']), max(1, options['requisicoes']))
+                            self.stdout.write(
+                                f"{nome:<10} {url:<26} {len(latencias) / duracao:>8.1f} "
+                                f"{_percentil(latencias, 50) * 1000:>8.1f} {_percentil(latencias, 95) * 1000:>8.1f} "
+                                f"{_percentil(latencias, 99) * 1000:>8.1f} {erros:>6}"
+                            )
+                    finally:
+                        parar.set()
+                        if escritor.is_alive():
+                            escritor.join()
+        finally:
+            connections.close_all()
+            configuracao.update(original)
+            shutil.rmtree(diretorio, ignore_errors=True)
@@ -0,0 +1,87 @@
+import threading
+import time
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from core.hashing import ExecutorHash, HashSobrecarregadoError
+
+
+def _percentil(valores, percentil):
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(percentil / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede vazão e latência (p50/p99) da verificação de senha PBKDF2 para "
+        "combinações de iterações e tamanho do pool, simulando uma rajada de logins. "
+        "Os logins passam pelo ExecutorHash, com a mesma fila e o mesmo 503 da API."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iteracoes', default=f'100000,{PBKDF2PasswordHasher.iterations}',
+                            help="Iterações do PBKDF2, separadas por vírgula.")
+        parser.add_argument('--trabalhadores', default='1,2,4,8',
+                            help="Tamanhos do pool de hash, separados por vírgula.")
+        parser.add_argument('--requisicoes', type=int, default=200,
+                            help="Logins simultâneos na rajada.")
+        parser.add_argument('--fila', type=int, default=None,
+                            help="HASH_SENHA_FILA_MAXIMA usada no pool (padrão: a das settings).")
+        parser.add_argument('--alvo-p99', type=float, default=None,
+                            help="Latência p99 alvo em ms; marca as combinações que atendem.")
+
+    def handle(self, *args, **options):
+        lista_iteracoes = [int(valor) for valor in options['iteracoes'].split(',')]
+        lista_trabalhadores = [int(valor) for valor in options['trabalhadores'].split(',')]
+        requisicoes = max(1, options['requisicoes'])
+        alvo = options['alvo_p99']
+        hasher = PBKDF2PasswordHasher()
+
+        self.stdout.write(f"{'iteracoes':>10} {'pool':>5} {'logins/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'503':>5}")
+        for iteracoes in lista_iteracoes:
+            codificada = hasher.encode('senha-benchmark', hasher.salt(), iterations=iteracoes)
+            for trabalhadores in lista_trabalhadores:
+                configuracao = {'HASH_SENHA_TRABALHADORES': trabalhadores}
+                if options['fila'] is not None:
+                    configuracao['HASH_SENHA_FILA_MAXIMA'] = max(1, options['fila'])
+                with override_settings(**configuracao):
+                    latencias, rejeitados = self._rajada(hasher, codificada, requisicoes)
+
+                atendidos = len(latencias)
+                if not atendidos:
+                    self.stdout.write(f"{iteracoes:>10} {trabalhadores:>5} {'-':>10} {'-':>9} {'-':>9} {rejeitados:>5}")
+                    continue
+                p50 = _percentil(latencias, 50) * 1000
+                p99 = _percentil(latencias, 99) * 1000
+                vazao = atendidos / max(latencias)
+                linha = f"{iteracoes:>10} {trabalhadores:>5} {vazao:>10.1f} {p50:>9.1f} {p99:>9.1f} {rejeitados:>5}"
+                if alvo is not None:
+                    linha = self.style.SUCCESS(linha + '  ok') if p99 <= alvo and not rejeitados else linha
+                self.stdout.write(linha)
+
+    def _rajada(self, hasher, codificada, requisicoes):
+        """Todos os logins chegam juntos, cada um numa thread, como os requests de um servidor com threads"""
+        executor = ExecutorHash()
+        latencias, rejeitados = [], []
+        largada = threading.Event()
+
+        def login():
+            largada.wait()
+            enviado_em = time.perf_counter()
+            try:
+                executor.executar(hasher.verify, 'senha-benchmark', codificada)
+            except HashSobrecarregadoError:
+                rejeitados.append(1)
+                return
+            latencias.append(time.perf_counter() - enviado_em)
+
+        clientes = [threading.Thread(target=login) for _ in range(requisicoes)]
+        for cliente in clientes:
+            cliente.start()
+        largada.set()
+        for cliente in clientes:
+            cliente.join()
+        executor.encerrar()
+        return latencias, len(rejeitados)
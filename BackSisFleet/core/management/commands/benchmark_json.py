@@ -0,0 +1,114 @@
+import gzip
+import io
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from core.formato_binario import MessagePackParser, MessagePackRenderer
+from core.json_rapido import JSONRapidoParser, JSONRapidoRenderer
+from core.models import CustomUser
+from motoristas.models.motoristas import Motorista
+
+
+def _montar_motoristas(quantidade):
+    """Motoristas em memória (sem banco) com todos os campos preenchidos, como numa frota real"""
+    agora = timezone.now()
+    responsavel = CustomUser(id=1, username='transportadora', atualizado_em=agora)
+    motoristas = []
+    for i in range(quantidade):
+        usuario = CustomUser(
+            id=i + 2, username=f'motorista{i}', email=f'motorista{i}@frota.com.br',
+            first_name='José', last_name=f'da Silva {i}', nome_razao_social=f'José da Silva {i}',
+            cpf_cnpj=f'{i:011d}', telefone='(11) 91234-5678', tipo_usuario='motorista',
+            endereco_rua='Rua das Palmeiras', endereco_numero=str(i), endereco_bairro='Centro',
+            endereco_cidade='São Paulo', endereco_estado='SP', endereco_cep='01001-000',
+            data_nascimento=date(1980, 1, 1) + timedelta(days=i % 5000),
+            data_cadastro=agora, atualizado_em=agora,
+        )
+        motoristas.append(Motorista(
+            id=i + 1, usuario_fk=usuario, responsavel_fk=responsavel, criado_por=responsavel,
+            atualizado_por=responsavel, data_nascimento=usuario.data_nascimento,
+            validade_toxicologico=date(2026, 6, 30), pis=f'{i:011d}', estado_civil='casado',
+            filiacao_pai='João da Silva', filiacao_mae='Maria da Silva', cnh_numero=f'{i:011d}',
+            cnh_categoria='E', cnh_validade=date(2029, 3, 15), dt_emissao_cnh=date(2019, 3, 15),
+            dt_primeira_cnh=date(2005, 8, 1), numero_registro_cnh=f'{i:011d}',
+            created_at=agora, updated_at=agora,
+        ))
+    return motoristas
+
+
+def _formatar_com_strftime(data):
+    return data.strftime("%Y-%m-%d %H:%M:%S") if data else None
+
+
+class Command(BaseCommand):
+    help = (
+        "Microbenchmark de serialização: Motorista.to_dict (strftime x isoformat), JSON do DRF x orjson "
+        "e tamanho/decodificação dos formatos do app (JSON, MessagePack, layout colunar)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--motoristas', type=int, default=2000, help="Motoristas por payload.")
+        parser.add_argument('--repeticoes', type=int, default=20, help="Repetições de cada medição.")
+
+    def _medir(self, funcao, repeticoes):
+        melhor = float('inf')
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            melhor = min(melhor, time.perf_counter() - inicio)
+        return melhor * 1000
+
+    def handle(self, *args, **options):
+        repeticoes = max(1, options['repeticoes'])
+        motoristas = _montar_motoristas(max(1, options['motoristas']))
+        payload = {'motoristas': [motorista.to_dict() for motorista in motoristas]}
+        padrao, rapido = JSONRenderer(), JSONRapidoRenderer()
+        corpo = padrao.render(payload)
+
+        def to_dict_strftime():
+            for motorista in motoristas:
+                motorista.formatar_data = _formatar_com_strftime
+                motorista.to_dict()
+                motorista.usuario_fk.to_dict()
+                del motorista.formatar_data
+
+        def to_dict_isoformat():
+            for motorista in motoristas:
+                motorista.to_dict()
+                motorista.usuario_fk.to_dict()
+
+        medicoes = [
+            ('to_dict com strftime', to_dict_strftime),
+            ('to_dict com isoformat', to_dict_isoformat),
+            ('render JSONRenderer (DRF)', lambda: padrao.render(payload)),
+            ('render JSONRapidoRenderer', lambda: rapido.render(payload)),
+            ('parse JSONParser (DRF)', lambda: JSONParser().parse(io.BytesIO(corpo))),
+            ('parse JSONRapidoParser', lambda: JSONRapidoParser().parse(io.BytesIO(corpo))),
+        ]
+        self.stdout.write(f"Payload: {len(motoristas)} motoristas, {len(corpo) / 1024:.0f} KiB (melhor de {repeticoes})")
+        for nome, funcao in medicoes:
+            self.stdout.write(f"{nome:<28} {self._medir(funcao, repeticoes):>8.2f} ms")
+
+        self.stdout.write("")
+        self.stdout.write(f"{'formato':<28} {'KiB':>8} {'gzip KiB':>9} {'decodificar ms':>15}")
+        formatos = [
+            ('json', rapido, JSONRapidoParser(), 'application/json'),
+            ('json colunar', rapido, JSONRapidoParser(), 'application/json; layout=colunar'),
+        ]
+        if MessagePackRenderer.disponivel:
+            formatos += [
+                ('msgpack', MessagePackRenderer(), MessagePackParser(), 'application/msgpack'),
+                ('msgpack colunar', MessagePackRenderer(), MessagePackParser(), 'application/msgpack; layout=colunar'),
+            ]
+        else:
+            self.stdout.write("(msgpack não instalado: formatos MessagePack omitidos)")
+        for nome, renderer, parser, media_type in formatos:
+            conteudo = renderer.render(payload, media_type, {})
+            decodificar = self._medir(lambda: parser.parse(io.BytesIO(conteudo)), repeticoes)
+            self.stdout.write(
+                f"{nome:<28} {len(conteudo) / 1024:>8.0f} {len(gzip.compress(conteudo)) / 1024:>9.0f} {decodificar:>15.2f}"
+            )
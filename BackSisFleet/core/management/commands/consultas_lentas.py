@@ -0,0 +1,85 @@
+import json
+import os
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+ORDENS = {
+    'total': lambda grupo: grupo['total_ms'],
+    'maximo': lambda grupo: grupo['maximo_ms'],
+    'quantidade': lambda grupo: grupo['quantidade'],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Resume as consultas lentas capturadas (CONSULTAS_LENTAS_ARQUIVO): agrupa pelo "
+        "formato normalizado e lista os piores, com varreduras completas e índices sugeridos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--arquivo', default=None, help="Arquivo JSON Lines (padrão: CONSULTAS_LENTAS_ARQUIVO).")
+        parser.add_argument('--limite', type=int, default=10, help="Quantidade de formatos listados.")
+        parser.add_argument('--ordem', choices=sorted(ORDENS), default='total', help="Critério de ordenação.")
+        parser.add_argument('--plano', action='store_true', help="Mostra o plano de execução de cada formato.")
+        parser.add_argument('--limpar', action='store_true', help="Esvazia o arquivo depois do resumo.")
+
+    def _agrupar(self, arquivo):
+        grupos = defaultdict(lambda: {
+            'quantidade': 0, 'total_ms': 0.0, 'maximo_ms': 0.0, 'origens': set(),
+            'plano': [], 'varreduras': [], 'sugestoes': [],
+        })
+        with open(arquivo, encoding='utf-8') as linhas:
+            for numero, linha in enumerate(linhas, 1):
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    self.stderr.write(f"Linha {numero} ignorada (JSON inválido)")
+                    continue
+                grupo = grupos[(registro['banco'], registro['formato'])]
+                grupo['quantidade'] += 1
+                grupo['total_ms'] += registro['duracao_ms']
+                grupo['maximo_ms'] = max(grupo['maximo_ms'], registro['duracao_ms'])
+                if registro.get('origem'):
+                    grupo['origens'].add(registro['origem'])
+                for campo in ('plano', 'varreduras', 'sugestoes'):
+                    if registro.get(campo):
+                        grupo[campo] = registro[campo]
+        return grupos
+
+    def handle(self, *args, **options):
+        arquivo = str(options['arquivo'] or settings.CONSULTAS_LENTAS_ARQUIVO)
+        if not os.path.exists(arquivo):
+            raise CommandError(f"Nenhuma consulta lenta registrada ({arquivo} não existe)")
+
+        grupos = self._agrupar(arquivo)
+        if not grupos:
+            self.stdout.write("Nenhuma consulta lenta registrada.")
+            return
+
+        piores = sorted(grupos.items(), key=lambda item: ORDENS[options['ordem']](item[1]), reverse=True)
+        total = sum(grupo['quantidade'] for grupo in grupos.values())
+        self.stdout.write(f"{total} consultas lentas em {len(grupos)} formatos; os {min(options['limite'], len(grupos))} piores por {options['ordem']}:\n")
+
+        for posicao, ((banco, formato), grupo) in enumerate(piores[:options['limite']], 1):
+            media = grupo['total_ms'] / grupo['quantidade']
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{posicao}. {grupo['quantidade']}x  total {grupo['total_ms']:.1f} ms  "
+                f"média {media:.1f} ms  máx {grupo['maximo_ms']:.1f} ms  [{banco}]"
+            ))
+            self.stdout.write(f"   {formato}")
+            for origem in sorted(grupo['origens'])[:3]:
+                self.stdout.write(f"   em {origem}")
+            if options['plano']:
+                for linha in grupo['plano']:
+                    self.stdout.write(f"   | {linha}")
+            if grupo['varreduras']:
+                self.stdout.write(self.style.WARNING(f"   varredura completa: {', '.join(grupo['varreduras'])}"))
+            for sugestao in grupo['sugestoes']:
+                self.stdout.write(self.style.SUCCESS(f"   sugestão: {sugestao}"))
+            self.stdout.write("")
+
+        if options['limpar']:
+            open(arquivo, 'w').close()
+            self.stdout.write(f"{arquivo} esvaziado.")
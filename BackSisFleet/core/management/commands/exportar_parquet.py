@@ -0,0 +1,36 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from common.utils.exportacao_colunar import LINHAS_POR_GRUPO
+from core.service.exportacao_bi_service import ExportacaoBIService, ExportacaoBIError, DependenciaAusenteError
+
+
+class Command(BaseCommand):
+    help = "Exporta as tabelas da frota em Parquet (um arquivo por tabela) para a carga de BI."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--destino', required=True, help="Diretório onde os arquivos .parquet serão gravados.")
+        parser.add_argument('--tabelas', help="Tabelas separadas por vírgula. Padrão: todas as disponíveis.")
+        parser.add_argument('--responsavel', type=int, help="Exporta apenas a frota deste responsável (id do cliente).")
+        parser.add_argument('--linhas-por-grupo', type=int, default=LINHAS_POR_GRUPO, help="Linhas por row group.")
+
+    def handle(self, *args, **options):
+        responsavel_id = options['responsavel']
+        disponiveis = ExportacaoBIService.tabelas_disponiveis(responsavel_id)
+        tabelas = options['tabelas'].split(',') if options['tabelas'] else disponiveis
+        os.makedirs(options['destino'], exist_ok=True)
+
+        for tabela in tabelas:
+            inicio = time.perf_counter()
+            try:
+                caminho, total = ExportacaoBIService.exportar_para_arquivo(
+                    tabela.strip(), options['destino'], responsavel_id, max(1, options['linhas_por_grupo'])
+                )
+            except DependenciaAusenteError as e:
+                raise CommandError(str(e))
+            except ExportacaoBIError as e:
+                raise CommandError(f"{e}. Disponíveis: {', '.join(disponiveis)}")
+            self.stdout.write(self.style.SUCCESS(
+                f"{tabela}: {total} linhas em {caminho} ({time.perf_counter() - inicio:.1f}s)"
+            ))
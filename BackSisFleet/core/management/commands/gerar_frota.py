@@ -0,0 +1,253 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from common.utils import documentos_sinteticos as documentos
+from core.models import CustomUser
+from core.service.usuarios_service import UserService
+from motoristas.models.motoristas import Motorista
+from veiculos.models.veiculos import Veiculo
+
+NOMES = [
+    'Ana', 'Bruno', 'Carla', 'Diego', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique', 'Isabela', 'João',
+    'Juliana', 'Lucas', 'Mariana', 'Nicolas', 'Patrícia', 'Rafael', 'Sabrina', 'Thiago', 'Vanessa', 'Wesley',
+]
+SOBRENOMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes',
+    'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira', 'Barbosa',
+]
+RAMOS = ['Transportes', 'Logística', 'Cargas', 'Distribuidora', 'Mudanças', 'Expresso']
+# (cidade, UF, latitude, longitude): a frota fica em volta das capitais
+CIDADES = [
+    ('São Paulo', 'SP', -23.55, -46.63), ('Rio de Janeiro', 'RJ', -22.91, -43.17),
+    ('Belo Horizonte', 'MG', -19.92, -43.94), ('Curitiba', 'PR', -25.43, -49.27),
+    ('Porto Alegre', 'RS', -30.03, -51.23), ('Salvador', 'BA', -12.97, -38.50),
+    ('Recife', 'PE', -8.05, -34.88), ('Fortaleza', 'CE', -3.73, -38.52),
+    ('Goiânia', 'GO', -16.68, -49.25), ('Manaus', 'AM', -3.12, -60.02),
+]
+# (marca, modelo, combustível)
+VEICULOS = [
+    ('Volvo', 'FH 540', 'Diesel'), ('Scania', 'R 450', 'Diesel'), ('Mercedes-Benz', 'Actros 2651', 'Diesel'),
+    ('Volkswagen', 'Constellation 24.280', 'Diesel'), ('Iveco', 'Tector 240E28', 'Diesel'),
+    ('DAF', 'XF 530', 'Diesel'), ('Volkswagen', 'Delivery 11.180', 'Diesel'), ('Fiat', 'Strada', 'Flex'),
+    ('Toyota', 'Hilux', 'Diesel'), ('Renault', 'Master', 'Diesel'),
+]
+CORES = ['Branco', 'Prata', 'Preto', 'Cinza', 'Vermelho', 'Azul']
+CATEGORIAS_CNH = [('E', 0.55), ('D', 0.2), ('C', 0.15), ('AE', 0.06), ('B', 0.04)]
+
+
+def _dias_ate_vencer(aleatorio):
+    """Distribuição dos vencimentos: parte vencida, parte vencendo, a maioria em dia"""
+    faixa = aleatorio.random()
+    if faixa < 0.08:
+        return -aleatorio.randint(1, 720)
+    if faixa < 0.13:
+        return aleatorio.randint(0, 30)
+    if faixa < 0.23:
+        return aleatorio.randint(31, 90)
+    return aleatorio.randint(91, 3650)
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera uma frota sintética para testes de volume: clientes (CNPJ), motoristas "
+        "(usuário com CPF + Motorista com CNH) e veículos (placa Mercosul, RENAVAM, chassi). "
+        "Determinístico pela semente; documentos únicos por construção."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clientes', type=int, required=True, help="Quantidade de clientes.")
+        parser.add_argument('--motoristas-por-cliente', type=int, default=10)
+        parser.add_argument('--veiculos-por-cliente', type=int, default=10)
+        parser.add_argument('--semente', type=int, default=42, help="Mesma semente e mesmo banco geram os mesmos dados.")
+        parser.add_argument('--lote', type=int, default=5000, help="Linhas por bulk_create.")
+        parser.add_argument('--senha', default='Senha@123', help="Senha de todos os usuários gerados (hash calculado uma vez).")
+
+    def handle(self, *args, **options):
+        if options['clientes'] < 1 or options['motoristas_por_cliente'] < 0 or options['veiculos_por_cliente'] < 0:
+            raise CommandError("Quantidades inválidas")
+
+        self.aleatorio = random.Random(options['semente'])
+        self.lote = max(1, options['lote'])
+        self.hash_senha = make_password(options['senha'])
+        self.hoje = timezone.now().date()
+        # As sequências dos documentos continuam de onde o banco parou: rodar de
+        # novo acrescenta dados sem repetir CPF, placa etc. das rodadas anteriores
+        self.seq_usuario = (CustomUser.objects.aggregate(maximo=Max('id'))['maximo'] or 0) + 1
+        self.seq_veiculo = (Veiculo.objects.aggregate(maximo=Max('id'))['maximo'] or 0) + 1
+        self.ignorados = 0
+
+        # Clientes por bloco: cada bloco (clientes, motoristas e veículos) numa transação
+        por_bloco = max(1, self.lote // max(1, options['motoristas_por_cliente'], options['veiculos_por_cliente']))
+        inicio = time.perf_counter()
+        totais = {'clientes': 0, 'motoristas': 0, 'veiculos': 0}
+        restantes = options['clientes']
+        while restantes:
+            quantidade = min(por_bloco, restantes)
+            with transaction.atomic():
+                clientes = self._criar_clientes(quantidade)
+                motoristas = self._criar_motoristas(clientes, options['motoristas_por_cliente'])
+                veiculos = self._criar_veiculos(clientes, motoristas, options['veiculos_por_cliente'])
+            restantes -= quantidade
+            totais['clientes'] += len(clientes)
+            totais['motoristas'] += sum(len(lista) for lista in motoristas.values())
+            totais['veiculos'] += veiculos
+            linhas = sum(totais.values()) + totais['motoristas']
+            self.stdout.write(
+                f"{totais['clientes']} clientes, {totais['motoristas']} motoristas, {totais['veiculos']} veículos "
+                f"({linhas / (time.perf_counter() - inicio):.0f} linhas/s)"
+            )
+
+        # bulk_create não dispara signals
+        UserService.invalidar_estatisticas()
+        if self.ignorados:
+            self.stdout.write(self.style.WARNING(f"{self.ignorados} registros ignorados por documento já existente"))
+        self.stdout.write(self.style.SUCCESS(f"Frota gerada em {time.perf_counter() - inicio:.1f}s"))
+
+    def _sem_conflito(self, modelo, objetos, campos):
+        """Remove do lote os objetos cujo valor único já existe no banco (dados reais ou de outra rodada)"""
+        for campo in campos:
+            valores = [getattr(objeto, campo) for objeto in objetos]
+            existentes = set()
+            for inicio in range(0, len(valores), 500):
+                existentes.update(
+                    modelo.objects.filter(**{f'{campo}__in': valores[inicio:inicio + 500]}).values_list(campo, flat=True)
+                )
+            if existentes:
+                self.ignorados += sum(getattr(objeto, campo) in existentes for objeto in objetos)
+                objetos = [objeto for objeto in objetos if getattr(objeto, campo) not in existentes]
+        return objetos
+
+    def _proxima_sequencia_usuario(self):
+        sequencia = self.seq_usuario
+        self.seq_usuario += 1
+        return sequencia
+
+    def _nome(self):
+        return f'{self.aleatorio.choice(NOMES)} {self.aleatorio.choice(SOBRENOMES)} {self.aleatorio.choice(SOBRENOMES)}'
+
+    def _endereco(self, usuario):
+        cidade, uf, _, _ = self.aleatorio.choice(CIDADES)
+        usuario.endereco_cidade = cidade
+        usuario.endereco_estado = uf
+        usuario.endereco_rua = f'Rua {self.aleatorio.choice(SOBRENOMES)}'
+        usuario.endereco_numero = str(self.aleatorio.randint(1, 3000))
+        usuario.endereco_cep = f'{self.aleatorio.randint(1000, 99999):05d}-{self.aleatorio.randint(0, 999):03d}'
+        return usuario
+
+    def _criar_clientes(self, quantidade):
+        clientes = []
+        for _ in range(quantidade):
+            sequencia = self._proxima_sequencia_usuario()
+            nome = f'{self.aleatorio.choice(SOBRENOMES)} {self.aleatorio.choice(RAMOS)}'
+            clientes.append(self._endereco(CustomUser(
+                username=f'cliente{sequencia}',
+                email=f'cliente{sequencia}@frota.sisfleet.dev',
+                password=self.hash_senha,
+                nome_razao_social=nome,
+                cpf_cnpj=documentos.cnpj(sequencia),
+                telefone=f'({self.aleatorio.randint(11, 99)}) 9{self.aleatorio.randint(1000, 9999)}-{self.aleatorio.randint(0, 9999):04d}',
+                tipo_usuario='cliente',
+                tipo_plano='premium' if self.aleatorio.random() < 0.3 else 'gratis',
+                is_verified=self.aleatorio.random() < 0.9,
+            )))
+        clientes = self._sem_conflito(CustomUser, clientes, ['username', 'cpf_cnpj'])
+        return CustomUser.objects.bulk_create(clientes, batch_size=self.lote)
+
+    def _criar_motoristas(self, clientes, por_cliente):
+        """Usuários motoristas e seus Motorista, agrupados por cliente: {cliente.id: [Motorista]}"""
+        usuarios, responsaveis = [], []
+        for cliente in clientes:
+            for _ in range(por_cliente):
+                sequencia = self._proxima_sequencia_usuario()
+                nome = self._nome()
+                primeiro, _, sobrenome = nome.partition(' ')
+                usuarios.append(self._endereco(CustomUser(
+                    username=f'motorista{sequencia}',
+                    email=f'motorista{sequencia}@frota.sisfleet.dev',
+                    password=self.hash_senha,
+                    first_name=primeiro,
+                    last_name=sobrenome,
+                    nome_razao_social=nome,
+                    cpf_cnpj=documentos.cpf(sequencia),
+                    tipo_usuario='motorista',
+                    is_verified=True,
+                )))
+                responsaveis.append(cliente)
+
+        livres = {id(usuario) for usuario in self._sem_conflito(CustomUser, usuarios, ['username', 'cpf_cnpj'])}
+        pares = [(usuario, cliente) for usuario, cliente in zip(usuarios, responsaveis) if id(usuario) in livres]
+        CustomUser.objects.bulk_create([usuario for usuario, _ in pares], batch_size=self.lote)
+
+        motoristas = []
+        for usuario, cliente in pares:
+            idade = self.aleatorio.randint(21, 65)
+            nascimento = self.hoje - timedelta(days=idade * 365 + self.aleatorio.randint(0, 364))
+            # CNH de 10 anos até os 50, de 5 anos depois: a emissão nunca fica no futuro
+            periodo = 3650 if idade < 50 else 1825
+            validade = self.hoje + timedelta(days=min(_dias_ate_vencer(self.aleatorio), periodo))
+            emissao = validade - timedelta(days=periodo)
+            primeira = nascimento + timedelta(days=18 * 365 + self.aleatorio.randint(0, 3650))
+            categoria = self.aleatorio.choices(
+                [c for c, _ in CATEGORIAS_CNH], weights=[p for _, p in CATEGORIAS_CNH]
+            )[0]
+            motoristas.append(Motorista(
+                usuario_fk=usuario,
+                responsavel_fk=cliente,
+                data_nascimento=nascimento,
+                validade_toxicologico=self.hoje + timedelta(days=min(_dias_ate_vencer(self.aleatorio), 900)),
+                estado_civil=self.aleatorio.choice(['Solteiro', 'Casado', 'Divorciado', 'Viúvo']),
+                filiacao_mae=f'{self.aleatorio.choice(NOMES)} {self.aleatorio.choice(SOBRENOMES)}',
+                cnh_numero=documentos.cnh(usuario.id),
+                numero_registro_cnh=documentos.cnh(usuario.id),
+                cnh_categoria=categoria,
+                cnh_validade=validade,
+                dt_emissao_cnh=max(emissao, primeira),
+                dt_primeira_cnh=min(primeira, self.hoje),
+                criado_por=cliente,
+            ))
+        Motorista.objects.bulk_create(motoristas, batch_size=self.lote)
+
+        por_cliente_id = {}
+        for motorista in motoristas:
+            por_cliente_id.setdefault(motorista.responsavel_fk_id, []).append(motorista)
+        return por_cliente_id
+
+    def _criar_veiculos(self, clientes, motoristas, por_cliente):
+        veiculos = []
+        for cliente in clientes:
+            disponiveis = motoristas.get(cliente.id, [])
+            cidade = self.aleatorio.choice(CIDADES)
+            for indice in range(por_cliente):
+                sequencia = self.seq_veiculo
+                self.seq_veiculo += 1
+                marca, modelo, combustivel = self.aleatorio.choice(VEICULOS)
+                fabricacao = self.aleatorio.randint(2005, self.hoje.year)
+                posicao = None
+                if self.aleatorio.random() < 0.8:
+                    posicao = timezone.now() - timedelta(minutes=self.aleatorio.randint(0, 60 * 24 * 7))
+                veiculos.append(Veiculo(
+                    # Um motorista por veículo enquanto houver; o resto fica sem motorista
+                    motorista=disponiveis[indice] if indice < len(disponiveis) else None,
+                    placa=documentos.placa(sequencia),
+                    renavam=documentos.renavam(sequencia),
+                    chassi=documentos.chassi(sequencia),
+                    marca=marca,
+                    modelo=modelo,
+                    ano_fabricacao=fabricacao,
+                    ano_modelo=min(fabricacao + self.aleatorio.randint(0, 1), self.hoje.year + 1),
+                    cor=self.aleatorio.choice(CORES),
+                    tipo_combustivel=combustivel,
+                    ultima_latitude=cidade[2] + self.aleatorio.uniform(-0.5, 0.5) if posicao else None,
+                    ultima_longitude=cidade[3] + self.aleatorio.uniform(-0.5, 0.5) if posicao else None,
+                    ultima_posicao_em=posicao,
+                    criado_por=cliente,
+                ))
+        veiculos = self._sem_conflito(Veiculo, veiculos, ['placa', 'renavam', 'chassi'])
+        Veiculo.objects.bulk_create(veiculos, batch_size=self.lote)
+        return len(veiculos)
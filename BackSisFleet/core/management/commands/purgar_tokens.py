@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = "Remove, em lotes, os tokens JWT expirados das tabelas de outstanding e blacklist."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanho-lote', type=int, default=5000, help="Tokens removidos por transação.")
+        parser.add_argument('--pausa', type=float, default=0.0, help="Segundos de espera entre lotes, para não disputar o banco.")
+
+    def handle(self, *args, **options):
+        tamanho_lote = max(1, options['tamanho_lote'])
+        agora = timezone.now()
+        total_outstanding = total_blacklist = 0
+
+        while True:
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lt=agora)
+                .order_by().values_list('id', flat=True)[:tamanho_lote]
+            )
+            if not ids:
+                break
+
+            # Blacklist e outstanding do lote saem juntos: uma falha no meio não deixa órfãos
+            with transaction.atomic():
+                removidos_blacklist, _ = BlacklistedToken.objects.filter(token_id__in=ids).delete()
+                removidos_outstanding, _ = OutstandingToken.objects.filter(id__in=ids).delete()
+            total_blacklist += removidos_blacklist
+            total_outstanding += removidos_outstanding
+
+            if options['pausa']:
+                time.sleep(options['pausa'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{total_outstanding} tokens expirados removidos ({total_blacklist} da blacklist)"
+        ))
@@ -0,0 +1,39 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.roteamento import alias_replica
+
+
+class Command(BaseCommand):
+    help = (
+        "Copia o banco SQLite principal para o arquivo da réplica de leitura "
+        "(uso local, para exercitar o roteamento). Com --intervalo, repete a cópia continuamente."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--intervalo', type=float, default=0, help="Segundos entre cópias (0 = copia uma vez).")
+
+    def _copiar(self, origem, destino):
+        # A API de backup do SQLite gera uma cópia consistente mesmo com o banco em uso
+        with sqlite3.connect(origem) as conexao_origem, sqlite3.connect(destino) as conexao_destino:
+            conexao_origem.backup(conexao_destino, pages=1024)
+
+    def handle(self, *args, **options):
+        alias = alias_replica()
+        if alias is None:
+            raise CommandError("Réplica não configurada (defina SISFLEET_REPLICA_SQLITE ou DATABASES['replica'])")
+
+        principal = settings.DATABASES['default']
+        replica = settings.DATABASES[alias]
+        if 'sqlite3' not in principal['ENGINE'] or 'sqlite3' not in replica['ENGINE']:
+            raise CommandError("A sincronização local só se aplica a SQLite; use a replicação do próprio banco")
+
+        while True:
+            inicio = time.perf_counter()
+            self._copiar(str(principal['NAME']), str(replica['NAME']))
+            self.stdout.write(f"Réplica sincronizada em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+            if not options['intervalo']:
+                break
+            time.sleep(options['intervalo'])
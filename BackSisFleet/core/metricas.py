@@ -0,0 +1,398 @@
+# core/metricas.py
+import atexit
+import functools
+import hmac
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.permissions import BasePermission
+from core.permissions import IsAdministrador
+
+# Limites superiores (em segundos / consultas) dos buckets; o +Inf é implícito
+BUCKETS_DURACAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+CONTENT_TYPE_PROMETHEUS = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Métodos fora desta lista (enviados por qualquer cliente) caem num rótulo só
+METODOS_HTTP = {'get', 'post', 'put', 'patch', 'delete', 'head', 'options'}
+
+
+class Histograma:
+    """Histograma de buckets fixos: memória constante por série, qualquer que seja o volume."""
+
+    __slots__ = ('limites', 'contagens', 'soma', 'total')
+
+    def __init__(self, limites):
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+    def somar(self, contagens, soma, total):
+        for indice, contagem in enumerate(contagens):
+            self.contagens[indice] += contagem
+        self.soma += soma
+        self.total += total
+
+
+class Metrica:
+    """
+    Família de séries (contador ou histograma) indexada pelos valores dos rótulos.
+
+    Os rótulos vêm de conjuntos fechados (nome da view, método HTTP, status,
+    método de serviço), então o número de séries é limitado pelo código, não
+    pelo tráfego.
+    """
+
+    def __init__(self, nome, ajuda, tipo, rotulos, limites=None):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.tipo = tipo
+        self.rotulos = rotulos
+        self.limites = limites
+        self.series = {}
+
+    def _serie(self, valores):
+        serie = self.series.get(valores)
+        if serie is None:
+            serie = self.series[valores] = Histograma(self.limites) if self.tipo == 'histogram' else [0]
+        return serie
+
+    def instantaneo(self):
+        """Séries em forma serializável em JSON"""
+        if self.tipo == 'histogram':
+            return [[list(valores), serie.contagens, serie.soma, serie.total] for valores, serie in self.series.items()]
+        return [[list(valores), serie[0]] for valores, serie in self.series.items()]
+
+    def somar(self, series):
+        """Acrescenta séries de instantaneo() (de outro processo) a estas"""
+        for valores, *dados in series:
+            serie = self._serie(tuple(valores))
+            if self.tipo == 'histogram':
+                serie.somar(*dados)
+            else:
+                serie[0] += dados[0]
+
+    def _rotulos(self, valores, extra=()):
+        pares = list(zip(self.rotulos, valores)) + list(extra)
+        if not pares:
+            return ''
+        texto = ','.join(f'{nome}="{_escapar(valor)}"' for nome, valor in pares)
+        return '{' + texto + '}'
+
+    def exportar(self):
+        linhas = [f'# HELP {self.nome} {self.ajuda}', f'# TYPE {self.nome} {self.tipo}']
+        for valores, serie in sorted(self.series.items()):
+            if self.tipo != 'histogram':
+                linhas.append(f'{self.nome}{self._rotulos(valores)} {_numero(serie[0])}')
+                continue
+            acumulado = 0
+            for limite, contagem in zip(self.limites + (float('inf'),), serie.contagens):
+                acumulado += contagem
+                le = '+Inf' if limite == float('inf') else _numero(limite)
+                linhas.append(f'{self.nome}_bucket{self._rotulos(valores, [("le", le)])} {acumulado}')
+            linhas.append(f'{self.nome}_sum{self._rotulos(valores)} {_numero(serie.soma)}')
+            linhas.append(f'{self.nome}_count{self._rotulos(valores)} {serie.total}')
+        return linhas
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class RegistroMetricas:
+    """
+    Métricas do processo. Uma única trava protege as atualizações (alguns
+    incrementos por request); a exportação copia o texto sob a mesma trava.
+
+    Com vários workers (gunicorn) cada processo tem o seu registro. Com
+    METRICAS_DIRETORIO definido, cada processo grava um instantâneo das suas
+    séries em '<pid>.json' no diretório (no máximo a cada
+    METRICAS_INTERVALO_GRAVACAO segundos, e na saída do processo), e
+    /api/metricas/ soma os arquivos de todos: o Prometheus vê a aplicação
+    inteira, qualquer que seja o worker que atendeu a coleta. Arquivos de
+    processos que já terminaram continuam somando (contadores não podem
+    diminuir); o diretório deve ser esvaziado no deploy, antes de subir o
+    gunicorn.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._gravado_em = 0.0
+        self._criar_metricas()
+
+    def _criar_metricas(self):
+        self.requisicoes = Metrica(
+            'sisfleet_http_requisicoes_total', 'Requisições por view, método e status.',
+            'counter', ('view', 'metodo', 'status'),
+        )
+        self.duracao = Metrica(
+            'sisfleet_http_duracao_segundos', 'Latência das requisições por view e método.',
+            'histogram', ('view', 'metodo'), BUCKETS_DURACAO,
+        )
+        self.consultas = Metrica(
+            'sisfleet_http_consultas_banco', 'Consultas ao banco por requisição.',
+            'histogram', ('view', 'metodo'), BUCKETS_CONSULTAS,
+        )
+        self.duracao_banco = Metrica(
+            'sisfleet_http_banco_segundos_total', 'Tempo gasto em consultas ao banco por view e método.',
+            'counter', ('view', 'metodo'),
+        )
+        self.servicos = Metrica(
+            'sisfleet_servico_duracao_segundos', 'Duração das chamadas aos métodos de serviço.',
+            'histogram', ('servico', 'metodo'), BUCKETS_DURACAO,
+        )
+        self.erros_servicos = Metrica(
+            'sisfleet_servico_erros_total', 'Chamadas a métodos de serviço que terminaram em exceção.',
+            'counter', ('servico', 'metodo', 'erro'),
+        )
+
+    @property
+    def metricas(self):
+        return (self.requisicoes, self.duracao, self.consultas, self.duracao_banco, self.servicos, self.erros_servicos)
+
+    def _verificar_fork(self):
+        # Worker criado por fork (gunicorn --preload) herda as séries do pai: começa do zero
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._gravado_em = 0.0
+            self._criar_metricas()
+
+    def registrar_requisicao(self, view, metodo, status, duracao, consultas, duracao_banco):
+        with self._lock:
+            self._verificar_fork()
+            self.requisicoes._serie((view, metodo, status))[0] += 1
+            self.duracao._serie((view, metodo)).observar(duracao)
+            self.consultas._serie((view, metodo)).observar(consultas)
+            self.duracao_banco._serie((view, metodo))[0] += duracao_banco
+        self.gravar()
+
+    def registrar_servico(self, servico, metodo, duracao, erro=None):
+        with self._lock:
+            self._verificar_fork()
+            self.servicos._serie((servico, metodo)).observar(duracao)
+            if erro is not None:
+                self.erros_servicos._serie((servico, metodo, erro))[0] += 1
+        self.gravar()
+
+    def gravar(self, forcar=False):
+        """Grava o instantâneo deste processo em METRICAS_DIRETORIO (se definido)"""
+        diretorio = getattr(settings, 'METRICAS_DIRETORIO', None)
+        if not diretorio:
+            return
+        agora = time.monotonic()
+        if not forcar and agora - self._gravado_em < getattr(settings, 'METRICAS_INTERVALO_GRAVACAO', 1.0):
+            return
+        with self._lock:
+            self._verificar_fork()
+            self._gravado_em = agora
+            conteudo = json.dumps({metrica.nome: metrica.instantaneo() for metrica in self.metricas})
+            arquivo = os.path.join(diretorio, f'{self._pid}.json')
+        os.makedirs(diretorio, exist_ok=True)
+        # Grava ao lado e troca: quem lê nunca vê um arquivo pela metade
+        temporario = f'{arquivo}.{threading.get_ident()}.tmp'
+        with open(temporario, 'w') as saida:
+            saida.write(conteudo)
+        os.replace(temporario, arquivo)
+
+    def _somar_processos(self, diretorio):
+        """Registro novo com a soma dos instantâneos de todos os processos"""
+        total = RegistroMetricas()
+        por_nome = {metrica.nome: metrica for metrica in total.metricas}
+        for nome_arquivo in os.listdir(diretorio):
+            if not nome_arquivo.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(diretorio, nome_arquivo)) as entrada:
+                    instantaneo = json.load(entrada)
+            except (OSError, ValueError):
+                continue
+            for nome, series in instantaneo.items():
+                if nome in por_nome:
+                    por_nome[nome].somar(series)
+        return total
+
+    def exportar(self):
+        """Texto no formato de exposição do Prometheus (0.0.4)"""
+        diretorio = getattr(settings, 'METRICAS_DIRETORIO', None)
+        if diretorio:
+            self.gravar(forcar=True)
+            return self._somar_processos(diretorio)._exportar_local()
+        return self._exportar_local()
+
+    def _exportar_local(self):
+        with self._lock:
+            linhas = []
+            for metrica in self.metricas:
+                linhas.extend(metrica.exportar())
+        return '\n'.join(linhas) + '\n'
+
+
+registro = RegistroMetricas()
+# O último intervalo de um worker que termina (max_requests, deploy) não se perde
+atexit.register(registro.gravar, forcar=True)
+
+
+class _TempoBanco:
+    """execute_wrapper que só soma quantidade e tempo das consultas"""
+
+    __slots__ = ('consultas', 'duracao')
+
+    def __init__(self):
+        self.consultas = 0
+        self.duracao = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duracao += time.perf_counter() - inicio
+            self.consultas += 1
+
+
+def _nome_view(request):
+    """'MotoristasView' (classe da view) ou o nome da função; rotas inexistentes num rótulo único"""
+    resolucao = getattr(request, 'resolver_match', None)
+    if resolucao is None:
+        return 'nao_encontrada'
+    funcao = resolucao.func
+    classe = getattr(funcao, 'view_class', None) or getattr(funcao, 'cls', None)
+    if classe is not None:
+        return classe.__name__
+    return getattr(funcao, '__name__', 'desconhecida')
+
+
+def _medindo_banco(banco):
+    pilha = ExitStack()
+    for conexao in connections.all():
+        pilha.enter_context(conexao.execute_wrapper(banco))
+    return pilha
+
+
+def _consumir_medindo(conteudo, banco, registrar):
+    """Repassa o corpo de um StreamingHttpResponse medindo o banco em cada pedaço; registra no fim"""
+    iterador = iter(conteudo)
+    try:
+        while True:
+            with _medindo_banco(banco):
+                try:
+                    pedaco = next(iterador)
+                except StopIteration:
+                    return
+            yield pedaco
+    finally:
+        if hasattr(iterador, 'close'):
+            iterador.close()
+        registrar()
+
+
+class MetricasMiddleware:
+    """
+    Mede cada request: latência, status, quantidade e tempo das consultas ao
+    banco, com rótulos view ('MotoristasView') e método ('get'). Respostas em
+    streaming são medidas até o fim do envio do corpo. Desligado com
+    METRICAS_ATIVAS = False.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'METRICAS_ATIVAS', True):
+            return self.get_response(request)
+
+        banco = _TempoBanco()
+        inicio = time.perf_counter()
+        with _medindo_banco(banco):
+            response = self.get_response(request)
+
+        metodo = request.method.lower()
+
+        def registrar():
+            registro.registrar_requisicao(
+                _nome_view(request), metodo if metodo in METODOS_HTTP else 'outro', response.status_code,
+                time.perf_counter() - inicio, banco.consultas, banco.duracao,
+            )
+
+        if response.streaming:
+            # Exportações leem o banco enquanto o corpo é enviado: mede até o último pedaço
+            response.streaming_content = _consumir_medindo(response.streaming_content, banco, registrar)
+        else:
+            registrar()
+        return response
+
+
+def _medir(servico, metodo, funcao):
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            resultado = funcao(*args, **kwargs)
+        except Exception as e:
+            registro.registrar_servico(servico, metodo, time.perf_counter() - inicio, type(e).__name__)
+            raise
+        registro.registrar_servico(servico, metodo, time.perf_counter() - inicio)
+        return resultado
+
+    return envoltorio
+
+
+def medir_servico(classe):
+    """
+    Decorador de classe: mede a duração de cada classmethod público do serviço
+    (sisfleet_servico_duracao_segundos{servico="MotoristaService",metodo="..."}).
+
+    Para métodos que devolvem iteradores (exportações) mede só a montagem,
+    não o consumo.
+    """
+    for nome, atributo in list(vars(classe).items()):
+        if nome.startswith('_') or not isinstance(atributo, classmethod):
+            continue
+        setattr(classe, nome, classmethod(_medir(classe.__name__, nome, atributo.__func__)))
+    return classe
+
+
+class TokenMetricasAuthentication(BaseAuthentication):
+    """
+    Aceita 'Authorization: Bearer <METRICAS_TOKEN>' para o coletor do Prometheus,
+    que não faz login. Outros tokens seguem para a autenticação JWT.
+    """
+
+    def authenticate(self, request):
+        esperado = getattr(settings, 'METRICAS_TOKEN', None)
+        partes = get_authorization_header(request).split()
+        if not esperado or len(partes) != 2 or partes[0].lower() != b'bearer':
+            return None
+        if not hmac.compare_digest(partes[1], esperado.encode()):
+            return None
+        return AnonymousUser(), 'metricas'
+
+    def authenticate_header(self, request):
+        return 'Bearer realm="metricas"'
+
+
+class PodeVerMetricas(BasePermission):
+    """Coletor com METRICAS_TOKEN ou administrador autenticado."""
+
+    def has_permission(self, request, view):
+        return request.auth == 'metricas' or IsAdministrador().has_permission(request, view)
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.23 on 2026-10-19 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_usuariotoken'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['-data_cadastro', '-id'], name='usuario_cadastro_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['tipo_usuario', '-data_cadastro', '-id'], name='usuario_tipo_cadastro_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['tipo_plano', '-data_cadastro', '-id'], name='usuario_plano_cadastro_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['is_verified', '-data_cadastro', '-id'], name='usuario_verif_cadastro_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['email'], name='usuario_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['nome_razao_social'], name='usuario_nome_idx'),
+        ),
+    ]
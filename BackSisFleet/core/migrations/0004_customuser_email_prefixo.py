@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-19 03:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_customuser_indices_listagem'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='usuario_email_idx',
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['email'], name='usuario_email_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
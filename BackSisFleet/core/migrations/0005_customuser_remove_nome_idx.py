@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-19 03:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_customuser_email_prefixo'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='usuario_nome_idx',
+        ),
+    ]
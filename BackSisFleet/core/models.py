@@ -1,6 +1,6 @@
 # core/models.py
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, router
 
 class CustomUser(AbstractUser):
     # Dados pessoais/empresa
@@ -43,6 +43,14 @@ class CustomUser(AbstractUser):
     class Meta:
         verbose_name = "Usuário"
         verbose_name_plural = "Usuários"
+        # Listagem administrativa: ordem (data_cadastro, id) com e sem os filtros de igualdade
+        indexes = [
+            models.Index(fields=['-data_cadastro', '-id'], name='usuario_cadastro_idx'),
+            models.Index(fields=['tipo_usuario', '-data_cadastro', '-id'], name='usuario_tipo_cadastro_idx'),
+            models.Index(fields=['tipo_plano', '-data_cadastro', '-id'], name='usuario_plano_cadastro_idx'),
+            models.Index(fields=['is_verified', '-data_cadastro', '-id'], name='usuario_verif_cadastro_idx'),
+            models.Index(fields=['email'], name='usuario_email_idx', opclasses=['varchar_pattern_ops']),
+        ]
 
     def __str__(self):
         return self.username or self.email
@@ -74,3 +82,36 @@ class CustomUser(AbstractUser):
             "atualizado_em": self.atualizado_em,
         }
 
+
+class UsuarioToken(CustomUser):
+    """
+    Usuário montado a partir das claims do JWT, sem consulta ao banco.
+
+    Apenas os campos presentes no token são preenchidos; os demais ficam
+    adiados e são carregados todos de uma vez no primeiro acesso a qualquer
+    um deles (uma única consulta, em vez de uma por campo).
+    """
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_token(cls, user_id, token):
+        claims = {
+            'id': cls._meta.pk.to_python(user_id),
+            'username': token['username'],
+            'tipo_usuario': token['tipo_usuario'],
+            'cpf_cnpj': token.get('cpf_cnpj'),
+            'is_staff': token.get('is_staff', False),
+        }
+        # from_db espera os valores na ordem dos campos do modelo
+        campos = [campo.attname for campo in cls._meta.concrete_fields if campo.attname in claims]
+        usuario = cls.from_db(router.db_for_read(cls), campos, [claims[campo] for campo in campos])
+        usuario.responsavel_id = token.get('responsavel_id')
+        return usuario
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        adiados = self.get_deferred_fields()
+        if fields is not None and adiados and set(fields) <= adiados:
+            fields = list(adiados)
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
@@ -0,0 +1,289 @@
+# core/perfilador.py
+import cProfile
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.cache_compartilhado import cache_compartilhado
+
+CHAVE_ARMACAO = 'perfilador:armacao'
+MODOS = ('cprofile', 'amostragem')
+EXTENSOES = {'cprofile': '.prof', 'amostragem': '.folded'}
+_NOME_ARQUIVO = re.compile(r'^[\w.-]+\.(prof|folded)$')
+AVISO_CACHE_LOCAL = (
+    "O cache padrão é local ao processo: só o worker que atendeu este request foi armado. "
+    "Configure um cache compartilhado (CACHE_BACKEND) para perfilar todos os workers."
+)
+
+
+class PerfiladorError(Exception):
+    """Exceção base para erros do perfilador."""
+
+
+class BadRequestError(PerfiladorError):
+    """Exceção para parâmetros de armação inválidos (código HTTP 400)."""
+
+
+class NotFoundError(PerfiladorError):
+    """Exceção para perfil inexistente (código HTTP 404)."""
+
+
+def diretorio(criar=False):
+    caminho = str(getattr(settings, 'PERFILADOR_DIRETORIO', settings.BASE_DIR / 'perfis'))
+    if criar:
+        os.makedirs(caminho, exist_ok=True)
+    return caminho
+
+
+class _EstadoLocal:
+    """Cópia da armação lida do cache, renovada no máximo a cada PERFILADOR_VERIFICACAO_SEGUNDOS"""
+
+    armacao = None
+    verificado_em = float('-inf')
+    lock = threading.Lock()
+
+
+def _armacao_atual():
+    agora = time.monotonic()
+    if agora - _EstadoLocal.verificado_em >= getattr(settings, 'PERFILADOR_VERIFICACAO_SEGUNDOS', 1.0):
+        with _EstadoLocal.lock:
+            _EstadoLocal.armacao = cache.get(CHAVE_ARMACAO)
+            _EstadoLocal.verificado_em = agora
+    return _EstadoLocal.armacao
+
+
+def armar(caminho, quantidade=1, modo='cprofile', metodo=None, validade_segundos=3600):
+    """
+    Arma o perfilador para os próximos `quantidade` requests cujo path começa
+    com `caminho`. A armação fica no cache padrão: só os processos que o
+    compartilham a enxergam. Com LocMem (desenvolvimento) apenas o processo
+    que atendeu o POST fica armado; a armação devolvida traz 'compartilhado'
+    para o administrador saber disso.
+
+    Args:
+        caminho (str): Prefixo do path (ex.: '/motoristas/')
+        quantidade (int): Requests a perfilar (1 a PERFILADOR_MAX_REQUISICOES)
+        modo (str): 'cprofile' (.prof para pstats/snakeviz) ou 'amostragem' (.folded para
+            flamegraph; indicado para requests de dezenas de ms ou mais)
+        metodo (str): Método HTTP ou None para todos
+        validade_segundos (int): Desarma sozinho depois deste tempo
+
+    Returns:
+        dict: Armação gravada
+    """
+    if not caminho or not str(caminho).startswith('/'):
+        raise BadRequestError("Informe 'caminho' começando com '/'")
+    if modo not in MODOS:
+        raise BadRequestError(f"Modo inválido. Use: {', '.join(MODOS)}")
+    try:
+        quantidade, validade_segundos = int(quantidade), int(validade_segundos)
+    except (TypeError, ValueError):
+        raise BadRequestError("'quantidade' e 'validade_segundos' devem ser inteiros")
+    maximo = getattr(settings, 'PERFILADOR_MAX_REQUISICOES', 100)
+    if not 1 <= quantidade <= maximo:
+        raise BadRequestError(f"'quantidade' deve estar entre 1 e {maximo}")
+    if not 1 <= validade_segundos <= 86400:
+        raise BadRequestError("'validade_segundos' deve estar entre 1 e 86400")
+
+    armacao = {
+        'id': uuid.uuid4().hex[:12],
+        'caminho': str(caminho),
+        'metodo': metodo.upper() if metodo else None,
+        'modo': modo,
+        'quantidade': quantidade,
+        'armado_em': timezone.now().isoformat(),
+        'compartilhado': cache_compartilhado(),
+    }
+    cache.set(f"perfilador:restantes:{armacao['id']}", quantidade, timeout=validade_segundos)
+    cache.set(CHAVE_ARMACAO, armacao, timeout=validade_segundos)
+    with _EstadoLocal.lock:
+        _EstadoLocal.armacao = armacao
+        _EstadoLocal.verificado_em = time.monotonic()
+    return armacao
+
+
+def desarmar():
+    cache.delete(CHAVE_ARMACAO)
+    with _EstadoLocal.lock:
+        _EstadoLocal.armacao = None
+        _EstadoLocal.verificado_em = time.monotonic()
+
+
+def situacao():
+    """Armação atual (com os requests restantes) ou None"""
+    armacao = cache.get(CHAVE_ARMACAO)
+    if armacao is None:
+        return None
+    return dict(armacao, restantes=cache.get(f"perfilador:restantes:{armacao['id']}", 0))
+
+
+def _reservar(armacao):
+    """Consome uma das vagas da armação; False quando já se esgotaram (em qualquer processo)"""
+    try:
+        restantes = cache.decr(f"perfilador:restantes:{armacao['id']}")
+    except ValueError:
+        restantes = -1
+    if restantes <= 0:
+        cache.delete(CHAVE_ARMACAO)
+        with _EstadoLocal.lock:
+            _EstadoLocal.armacao = None
+    return restantes >= 0
+
+
+def listar_perfis():
+    """Perfis gravados, do mais recente para o mais antigo"""
+    pasta = diretorio()
+    if not os.path.isdir(pasta):
+        return []
+    perfis = []
+    for nome in os.listdir(pasta):
+        if not _NOME_ARQUIVO.match(nome):
+            continue
+        info = os.stat(os.path.join(pasta, nome))
+        perfis.append({'nome': nome, 'bytes': info.st_size, 'criado_em': info.st_mtime})
+    perfis.sort(key=lambda perfil: perfil['criado_em'], reverse=True)
+    for perfil in perfis:
+        perfil['criado_em'] = datetime.fromtimestamp(perfil['criado_em'], tz=dt_timezone.utc).isoformat()
+    return perfis
+
+
+def caminho_perfil(nome):
+    """
+    Caminho do arquivo de um perfil gravado.
+
+    Raises:
+        NotFoundError: Nome inválido ou arquivo inexistente
+    """
+    if not _NOME_ARQUIVO.match(nome or ''):
+        raise NotFoundError(f"Perfil '{nome}' não encontrado")
+    caminho = os.path.join(diretorio(), nome)
+    if not os.path.isfile(caminho):
+        raise NotFoundError(f"Perfil '{nome}' não encontrado")
+    return caminho
+
+
+def _descartar_antigos(pasta):
+    maximo = getattr(settings, 'PERFILADOR_MAX_ARQUIVOS', 50)
+    arquivos = sorted(
+        (os.path.join(pasta, nome) for nome in os.listdir(pasta) if _NOME_ARQUIVO.match(nome)),
+        key=os.path.getmtime,
+    )
+    for arquivo in arquivos[:max(0, len(arquivos) - maximo)]:
+        os.remove(arquivo)
+
+
+class Amostrador:
+    """
+    Amostragem da pilha da thread do request a cada `intervalo` segundos, numa
+    thread à parte. O resultado sai no formato "collapsed" (pilha;separada;por;
+    ponto-e-vírgula contagem), lido por flamegraph.pl, speedscope e afins.
+    """
+
+    def __init__(self, intervalo=0.005):
+        self.intervalo = intervalo
+        self.pilhas = Counter()
+        self._alvo = threading.get_ident()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._amostrar, daemon=True)
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo):
+            quadro = sys._current_frames().get(self._alvo)
+            pilha = []
+            while quadro is not None:
+                codigo = quadro.f_code
+                pilha.append(f'{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})')
+                quadro = quadro.f_back
+            if pilha:
+                self.pilhas[';'.join(reversed(pilha))] += 1
+
+    def enable(self):
+        self._thread.start()
+
+    def disable(self):
+        self._parar.set()
+        self._thread.join()
+
+    def dump_stats(self, arquivo):
+        with open(arquivo, 'w', encoding='utf-8') as saida:
+            for pilha, contagem in self.pilhas.most_common():
+                saida.write(f'{pilha} {contagem}\n')
+
+
+class PerfiladorMiddleware:
+    """
+    Perfila requests sob demanda, em produção.
+
+    Dois gatilhos:
+        - Armação pelo administrador (POST /api/perfis/): os próximos N requests
+          cujo path começa com o prefixo informado, em todos os workers que
+          compartilham o cache padrão.
+        - Cabeçalho 'X-Perfilar: <PERFILADOR_TOKEN>' (e opcionalmente
+          'X-Perfilar-Modo: amostragem') num request específico.
+
+    Desarmado, o custo é uma comparação de relógio por request (a armação é
+    relida do cache no máximo a cada PERFILADOR_VERIFICACAO_SEGUNDOS) e a
+    leitura de um cabeçalho. O arquivo gravado aparece no cabeçalho X-Perfil
+    da resposta e em GET /api/perfis/; na amostragem, um request rápido demais
+    para ter amostras não grava arquivo e responde com X-Perfil-Aviso.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _modo_cabecalho(self, request):
+        token = getattr(settings, 'PERFILADOR_TOKEN', None)
+        enviado = request.META.get('HTTP_X_PERFILAR')
+        if not token or not enviado or not hmac.compare_digest(enviado.encode(), token.encode()):
+            return None
+        modo = request.META.get('HTTP_X_PERFILAR_MODO', 'cprofile')
+        return modo if modo in MODOS else 'cprofile'
+
+    def _modo_armacao(self, request):
+        armacao = _armacao_atual()
+        if armacao is None or not request.path.startswith(armacao['caminho']):
+            return None
+        if armacao['metodo'] and armacao['metodo'] != request.method:
+            return None
+        return armacao['modo'] if _reservar(armacao) else None
+
+    def __call__(self, request):
+        modo = self._modo_cabecalho(request) if 'HTTP_X_PERFILAR' in request.META else None
+        if modo is None:
+            modo = self._modo_armacao(request)
+        if modo is None:
+            return self.get_response(request)
+
+        coletor = Amostrador(getattr(settings, 'PERFILADOR_INTERVALO_AMOSTRAGEM', 0.005)) if modo == 'amostragem' else cProfile.Profile()
+        inicio = time.perf_counter()
+        coletor.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            coletor.disable()
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+
+        if modo == 'amostragem' and not coletor.pilhas:
+            # Request mais curto que o intervalo: um .folded vazio não serve para nada
+            response['X-Perfil-Aviso'] = (
+                f"nenhuma amostra em {duracao_ms:.0f}ms; use o modo cprofile ou reduza PERFILADOR_INTERVALO_AMOSTRAGEM"
+            )
+            return response
+
+        pasta = diretorio(criar=True)
+        caminho = re.sub(r'[^\w-]+', '_', request.path).strip('_')[:60] or 'raiz'
+        nome = f"{timezone.now():%Y%m%dT%H%M%S}_{request.method}_{caminho}_{duracao_ms:.0f}ms_{uuid.uuid4().hex[:6]}{EXTENSOES[modo]}"
+        coletor.dump_stats(os.path.join(pasta, nome))
+        _descartar_antigos(pasta)
+        response['X-Perfil'] = nome
+        return response
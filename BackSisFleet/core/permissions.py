@@ -0,0 +1,15 @@
+# core/permissions.py
+from rest_framework.permissions import BasePermission
+
+
+class IsAdministrador(BasePermission):
+    """
+    Permite acesso apenas a administradores (tipo_usuario 'admin' ou is_staff).
+    """
+
+    def has_permission(self, request, view):
+        usuario = request.user
+        return bool(
+            usuario and usuario.is_authenticated
+            and (usuario.tipo_usuario == 'admin' or usuario.is_staff)
+        )
@@ -0,0 +1,182 @@
+# core/roteamento.py
+import functools
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import QuerySet
+
+# Estado do request atual (definido pelo FixarPrimarioMiddleware) e método de leitura em execução
+_estado_requisicao = ContextVar('roteamento_estado_requisicao', default=None)
+_leitura_replica = ContextVar('roteamento_leitura_replica', default=False)
+
+COOKIE_PRIMARIO = 'sisfleet_primario'
+# Token de fixação devolvido depois de uma gravação; clientes sem cookies (app) o reenviam
+CABECALHO_PRIMARIO = 'X-SisFleet-Primario'
+_SALT_PRIMARIO = 'core.roteamento.primario'
+
+
+class EstadoRequisicao:
+    """Informações do request usadas para decidir entre réplica e primário."""
+
+    def __init__(self, request, fixado=False):
+        self.request = request
+        self.fixado = fixado
+        self.escreveu = False
+        self.usuario_fixado = None
+
+
+def alias_replica():
+    """Alias da réplica, ou None se não houver réplica configurada"""
+    alias = getattr(settings, 'REPLICA_ALIAS', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+def _chave_fixacao(usuario_id):
+    return f'replica:primario:{usuario_id}'
+
+
+def gerar_token_primario():
+    """Token assinado que fixa no primário quem o reenvia, válido por REPLICA_FIXAR_SEGUNDOS"""
+    return signing.TimestampSigner(salt=_SALT_PRIMARIO).sign('1')
+
+
+def token_primario_valido(token):
+    try:
+        signing.TimestampSigner(salt=_SALT_PRIMARIO).unsign(token, max_age=getattr(settings, 'REPLICA_FIXAR_SEGUNDOS', 10))
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def _usuario_fixado(estado):
+    """Consulta (uma vez por request) se o usuário gravou algo recentemente"""
+    if estado.usuario_fixado is None:
+        # request.user pode ser lazy e consultar o banco: essa leitura não passa pela réplica
+        token = _leitura_replica.set(False)
+        try:
+            usuario = getattr(estado.request, 'user', None)
+            autenticado = usuario is not None and getattr(usuario, 'is_authenticated', False)
+            estado.usuario_fixado = autenticado and bool(cache.get(_chave_fixacao(usuario.pk)))
+        finally:
+            _leitura_replica.reset(token)
+    return estado.usuario_fixado
+
+
+def _deve_ler_da_replica():
+    if not _leitura_replica.get() or alias_replica() is None:
+        return False
+    # Dentro de transação no primário a leitura precisa ver o que a transação gravou
+    if connections['default'].in_atomic_block:
+        return False
+    estado = _estado_requisicao.get()
+    if estado is not None and (estado.fixado or estado.escreveu or _usuario_fixado(estado)):
+        return False
+    return True
+
+
+def leitura_replica(funcao):
+    """
+    Marca um método de serviço somente-leitura: as consultas feitas durante a
+    chamada vão para a réplica, a menos que o request já tenha gravado algo
+    (ou o usuário tenha gravado há menos de REPLICA_FIXAR_SEGUNDOS).
+
+    Um QuerySet devolvido sem avaliar é amarrado ao banco escolhido. Pode ser
+    desligado por método em settings.REPLICA_METODOS = {'modulo.Classe.metodo': False}.
+    """
+    chave = f'{funcao.__module__}.{funcao.__qualname__}'
+
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        if not getattr(settings, 'REPLICA_METODOS', {}).get(chave, True):
+            return funcao(*args, **kwargs)
+
+        token = _leitura_replica.set(True)
+        try:
+            resultado = funcao(*args, **kwargs)
+            if isinstance(resultado, QuerySet) and resultado._db is None:
+                resultado = fixar_banco(resultado)
+            return resultado
+        finally:
+            _leitura_replica.reset(token)
+
+    return envoltorio
+
+
+def fixar_banco(queryset):
+    """
+    Amarra o queryset ao banco escolhido agora. Necessário para iteradores
+    consumidos depois que o método @leitura_replica retornou (ex.: streaming).
+    """
+    return queryset.using(queryset.db)
+
+
+class RoteadorReplica:
+    """
+    Router de banco: leituras de métodos marcados com @leitura_replica vão para
+    a réplica; todo o resto (inclusive todas as gravações) vai para o primário.
+
+    Sem o alias da réplica em DATABASES o router não altera nada.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _deve_ler_da_replica():
+            return alias_replica()
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        estado = _estado_requisicao.get()
+        if estado is not None:
+            estado.escreveu = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica e primário têm os mesmos dados
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == alias_replica():
+            return False
+        return None
+
+
+class FixarPrimarioMiddleware:
+    """
+    Garante "leia o que você gravou" com a réplica atrasada: métodos de escrita
+    (POST/PUT/PATCH/DELETE) e requests que gravaram fixam no primário, e depois
+    de uma gravação o usuário continua lendo do primário por REPLICA_FIXAR_SEGUNDOS.
+
+    A fixação depois da gravação vem de três fontes: o cookie, o cabeçalho
+    X-SisFleet-Primario (token assinado devolvido na resposta da gravação, que
+    o cliente reenvia; não depende de cookie nem do cache) e uma chave no cache
+    compartilhado com o id do usuário, que cobre os outros dispositivos dele.
+    """
+
+    METODOS_SEGUROS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        fixado = (
+            request.method not in self.METODOS_SEGUROS
+            or COOKIE_PRIMARIO in request.COOKIES
+            or token_primario_valido(request.headers.get(CABECALHO_PRIMARIO, ''))
+        )
+        estado = EstadoRequisicao(request, fixado)
+        token = _estado_requisicao.set(estado)
+        try:
+            response = self.get_response(request)
+        finally:
+            _estado_requisicao.reset(token)
+
+        if estado.escreveu and alias_replica() is not None:
+            segundos = getattr(settings, 'REPLICA_FIXAR_SEGUNDOS', 10)
+            response.set_cookie(COOKIE_PRIMARIO, '1', max_age=segundos, httponly=True, samesite='Lax')
+            response[CABECALHO_PRIMARIO] = gerar_token_primario()
+            usuario = getattr(request, 'user', None)
+            if usuario is not None and getattr(usuario, 'is_authenticated', False):
+                cache.set(_chave_fixacao(usuario.pk), True, timeout=segundos)
+        return response
@@ -1,6 +1,7 @@
 # core/serializers.py
 from rest_framework import serializers
 from .models import CustomUser
+from .hashing import gerar_hash_senha
 
 class CustomUserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -51,7 +52,8 @@ class RegisterSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         password = validated_data.pop("password")
         user = CustomUser(**validated_data)
-        user.set_password(password)
+        # PBKDF2 no pool limitado de hash (core.hashing)
+        user.password = gerar_hash_senha(password)
         user.save()
         return user
 
@@ -0,0 +1,114 @@
+# core/service/exportacao_bi_service.py
+import os
+from django.apps import apps
+from django.db.models import Q
+from core.roteamento import fixar_banco, leitura_replica
+from common.utils import exportacao_colunar
+from common.utils.exportacao_colunar import DependenciaAusenteError
+
+
+class ExportacaoBIError(Exception):
+    """Exceção base para erros da exportação para BI."""
+
+
+class NotFoundError(ExportacaoBIError):
+    """Exceção para tabela inexistente ou não disponível ao usuário (código HTTP 404)."""
+
+
+class ExportacaoBIService:
+    """
+    Exportação das tabelas da frota em Parquet para ferramentas de BI.
+
+    Cada tabela é lida pelo cursor do banco e gravada em row groups tipados
+    (inteiros, datas, timestamps), então a carga noturna lê poucos arquivos
+    compactos em vez de paginar a API. Tabelas de apps não instalados são
+    ignoradas. Clientes recebem apenas os dados da sua frota; a tabela de
+    usuários é exclusiva do administrador.
+    """
+
+    # nome: (modelo, campos excluídos, filtro pelo responsável ou None se só admin)
+    TABELAS = {
+        'usuarios': ('core.CustomUser', ('password',), None),
+        'motoristas': ('motoristas.Motorista', (), lambda responsavel_id: Q(responsavel_fk_id=responsavel_id)),
+        'veiculos': ('veiculos.Veiculo', (), lambda responsavel_id: (
+            Q(criado_por_id=responsavel_id) | Q(motorista__responsavel_fk_id=responsavel_id)
+        )),
+        'pontuacoes': ('motoristas.PontuacaoMotorista', (), lambda responsavel_id: Q(motorista__responsavel_fk_id=responsavel_id)),
+        'telemetria': ('telemetria.Telemetria', (), lambda responsavel_id: Q(motorista__responsavel_fk_id=responsavel_id)),
+        'checkins': ('telemetria.CheckIn', (), lambda responsavel_id: Q(motorista__responsavel_fk_id=responsavel_id)),
+    }
+
+    @classmethod
+    def _modelo(cls, nome):
+        try:
+            return apps.get_model(cls.TABELAS[nome][0])
+        except (KeyError, LookupError):
+            return None
+
+    @classmethod
+    def tabelas_disponiveis(cls, responsavel_id=None):
+        """
+        Lista as tabelas exportáveis.
+
+        Args:
+            responsavel_id (int): Responsável da frota, ou None para o administrador (todas)
+
+        Returns:
+            list: Nomes das tabelas
+        """
+        return [
+            nome for nome, (_, _, filtro) in cls.TABELAS.items()
+            if cls._modelo(nome) is not None and (responsavel_id is None or filtro is not None)
+        ]
+
+    @classmethod
+    def _preparar(cls, nome, responsavel_id):
+        if nome not in cls.tabelas_disponiveis(responsavel_id):
+            raise NotFoundError(f"Tabela '{nome}' não disponível para exportação")
+
+        modelo = cls._modelo(nome)
+        _, excluir, filtro = cls.TABELAS[nome]
+        queryset = modelo._default_manager.order_by('pk')
+        if responsavel_id is not None:
+            queryset = queryset.filter(filtro(responsavel_id))
+        # O Parquet é gerado durante o streaming, depois do retorno: o banco é escolhido aqui
+        return fixar_banco(queryset), exportacao_colunar.campos_exportaveis(modelo, excluir)
+
+    @classmethod
+    @leitura_replica
+    def gerar_parquet(cls, nome, responsavel_id=None, linhas_por_grupo=exportacao_colunar.LINHAS_POR_GRUPO):
+        """
+        Gera o Parquet da tabela em pedaços de bytes, para resposta em streaming.
+
+        Raises:
+            NotFoundError: Tabela inexistente ou não permitida
+            DependenciaAusenteError: pyarrow não instalado
+        """
+        exportacao_colunar.verificar_dependencia()
+        queryset, campos = cls._preparar(nome, responsavel_id)
+        return exportacao_colunar.gerar_parquet(queryset, campos, linhas_por_grupo)
+
+    @classmethod
+    @leitura_replica
+    def exportar_para_arquivo(cls, nome, diretorio, responsavel_id=None, linhas_por_grupo=exportacao_colunar.LINHAS_POR_GRUPO):
+        """
+        Grava a tabela em `diretorio/<nome>.parquet`.
+
+        O arquivo é escrito com outro nome e renomeado ao final, então um leitor
+        nunca encontra um Parquet pela metade.
+
+        Returns:
+            tuple: (caminho do arquivo, quantidade de linhas)
+        """
+        exportacao_colunar.verificar_dependencia()
+        queryset, campos = cls._preparar(nome, responsavel_id)
+        caminho = os.path.join(diretorio, f'{nome}.parquet')
+        temporario = caminho + '.parcial'
+        try:
+            total = exportacao_colunar.escrever_parquet(temporario, queryset, campos, linhas_por_grupo)
+            os.replace(temporario, caminho)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+        return caminho, total
+
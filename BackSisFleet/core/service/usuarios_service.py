@@ -1,11 +1,20 @@
 # core/services/user_service.py
+import base64
+import binascii
+from datetime import datetime
 from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseNotFound
-from django.db import IntegrityError
+from django.db import IntegrityError, connection, transaction
 from django.utils import timezone
 from django.contrib.auth.hashers import make_password
 from django.core.exceptions import ValidationError
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import Count, Q
+from rest_framework.exceptions import APIException
 from ..models import CustomUser
+from ..hashing import gerar_hash_senha, gerar_hashes_senha
+from ..roteamento import fixar_banco, leitura_replica
+from ..metricas import medir_servico
+from tarefas.services.tarefa_service import TarefaService
 
 class UserError(Exception):
     """Exceção base para erros relacionados ao usuário."""
@@ -19,34 +28,80 @@ class NotFoundError(UserError):
 class InternalServerError(UserError):
     """Exceção para erros internos do servidor (código HTTP 500)."""
 
+@medir_servico
 class UserService:
     """
     Service class para operações de negócio com CustomUser
     """
+
+    CAMPOS_UNICOS = {
+        'cpf_cnpj': "CPF/CNPJ já cadastrado",
+        'email': "Email já cadastrado",
+        'username': "Username já cadastrado",
+    }
+    TAMANHO_CONSULTA_IN = 5000
+
+    LIMITE_PADRAO_PAGINA = 50
+    LIMITE_MAXIMO_PAGINA = 200
+
+    MAX_NOTIFICACOES = 10000
+
+    CHAVE_CACHE_ESTATISTICAS = 'usuarios:estatisticas'
+    TEMPO_CACHE_ESTATISTICAS = 300
     
     @classmethod
     def _validar_dados_usuario(cls, data):
-        """Valida dados básicos do usuário"""
+        """
+        Valida dados básicos do usuário
+
+        A unicidade de cpf_cnpj, email e username é verificada numa única
+        consulta com OR, e o erro informa todos os campos que colidem.
+        """
+        campos = [campo for campo in cls.CAMPOS_UNICOS if data.get(campo)]
+        if not campos:
+            return
+
+        condicao = Q()
+        for campo in campos:
+            condicao |= Q(**{campo: data[campo]})
+
+        existentes = CustomUser.objects.filter(condicao).exclude(id=data.get('id')).values_list(*campos)
+
         errors = {}
-        
-        # Validação de CPF/CNPJ único
-        if 'cpf_cnpj' in data and data['cpf_cnpj']:
-            if CustomUser.objects.filter(cpf_cnpj=data['cpf_cnpj']).exclude(id=data.get('id')).exists():
-                errors['cpf_cnpj'] = "CPF/CNPJ já cadastrado"
-        
-        # Validação de email único
-        if 'email' in data and data['email']:
-            if CustomUser.objects.filter(email=data['email']).exclude(id=data.get('id')).exists():
-                errors['email'] = "Email já cadastrado"
-        
-        # Validação de username único
-        if 'username' in data and data['username']:
-            if CustomUser.objects.filter(username=data['username']).exclude(id=data.get('id')).exists():
-                errors['username'] = "Username já cadastrado"
-        
+        for valores in existentes:
+            for campo, valor in zip(campos, valores):
+                if valor == data[campo]:
+                    errors[campo] = cls.CAMPOS_UNICOS[campo]
+
         if errors:
             raise BadRequestError(errors)
-    
+
+    @classmethod
+    def _montar_dados_usuario(cls, data):
+        """Prepara os dados para criação do usuário (sem a senha)"""
+        return {
+            'username': data.get('username'),
+            'email': data.get('email'),
+            'first_name': data.get('first_name', ''),
+            'last_name': data.get('last_name', ''),
+            'nome_razao_social': data.get('nome_razao_social'),
+            'cpf_cnpj': data.get('cpf_cnpj'),
+            'telefone': data.get('telefone'),
+            'tipo_usuario': data.get('tipo_usuario', 'cliente'),
+            'tipo_plano': data.get('tipo_plano', 'gratis'),
+            'endereco_rua': data.get('endereco_rua'),
+            'endereco_numero': data.get('endereco_numero'),
+            'endereco_complemento': data.get('endereco_complemento'),
+            'endereco_bairro': data.get('endereco_bairro'),
+            'endereco_cidade': data.get('endereco_cidade'),
+            'endereco_estado': data.get('endereco_estado'),
+            'endereco_cep': data.get('endereco_cep'),
+            'inscricao_estadual': data.get('inscricao_estadual'),
+            'inscricao_municipal': data.get('inscricao_municipal'),
+            'data_nascimento': data.get('data_nascimento'),
+            'is_verified': data.get('is_verified', False),
+        }
+
     @classmethod
     def criar_usuario(cls, data):
         """
@@ -62,40 +117,17 @@ class UserService:
             # Valida dados
             cls._validar_dados_usuario(data)
             
-            # Prepara dados para criação
-            user_data = {
-                'username': data.get('username'),
-                'email': data.get('email'),
-                'first_name': data.get('first_name', ''),
-                'last_name': data.get('last_name', ''),
-                'nome_razao_social': data.get('nome_razao_social'),
-                'cpf_cnpj': data.get('cpf_cnpj'),
-                'telefone': data.get('telefone'),
-                'tipo_usuario': data.get('tipo_usuario', 'cliente'),
-                'tipo_plano': data.get('tipo_plano', 'gratis'),
-                'endereco_rua': data.get('endereco_rua'),
-                'endereco_numero': data.get('endereco_numero'),
-                'endereco_complemento': data.get('endereco_complemento'),
-                'endereco_bairro': data.get('endereco_bairro'),
-                'endereco_cidade': data.get('endereco_cidade'),
-                'endereco_estado': data.get('endereco_estado'),
-                'endereco_cep': data.get('endereco_cep'),
-                'inscricao_estadual': data.get('inscricao_estadual'),
-                'inscricao_municipal': data.get('inscricao_municipal'),
-                'data_nascimento': data.get('data_nascimento'),
-                'is_verified': data.get('is_verified', False),
-            }
-            
-            # Cria usuário
-            usuario = CustomUser.objects.create(**user_data)
-            
-            # Define password se fornecido
+            # Prepara dados para criação, já com a senha, para gravar num único INSERT
+            user_data = cls._montar_dados_usuario(data)
             if 'password' in data and data['password']:
-                usuario.set_password(data['password'])
-                usuario.save()
+                user_data['password'] = gerar_hash_senha(data['password'])
             
-            return usuario
+            # Cria usuário
+            return CustomUser.objects.create(**user_data)
             
+        except (UserError, APIException):
+            # APIException: HashSobrecarregadoError segue até o DRF como 503 com Retry-After
+            raise
         except IntegrityError as e:
             if 'username' in str(e):
                 raise BadRequestError("Username já existe")
@@ -106,6 +138,78 @@ class UserService:
             raise InternalServerError(f"Erro de integridade ao criar usuário: {str(e)}")
         except Exception as e:
             raise InternalServerError(f"Erro ao criar usuário: {str(e)}")
+
+    @classmethod
+    def criar_usuarios_em_lote(cls, lista_dados, tamanho_lote=1000):
+        """
+        Cria vários usuários de uma vez (ex.: cadastro inicial dos motoristas de um cliente)
+
+        O lote é validado inteiro antes de qualquer gravação: duplicidades dentro
+        do próprio lote e contra o banco (uma consulta IN por campo único). Se
+        houver erro, nada é criado. Cada senha ganha o seu salt; como o PBKDF2
+        domina o tempo de cadastro, os hashes rodam em paralelo no pool de hash.
+
+        Args:
+            lista_dados (list): Lista de dicionários com os dados de cada usuário
+            tamanho_lote (int): Registros por INSERT
+
+        Returns:
+            list: Usuários criados
+
+        Raises:
+            BadRequestError: Com um dicionário {índice: {campo: mensagem}}
+        """
+        if not isinstance(lista_dados, list) or not lista_dados:
+            raise BadRequestError("Informe uma lista de usuários")
+
+        errors = {}
+        for indice, data in enumerate(lista_dados):
+            if not isinstance(data, dict) or not data.get('username'):
+                errors[indice] = {'username': "Username é obrigatório"}
+            elif data.get('password') is not None and not isinstance(data['password'], str):
+                errors[indice] = {'password': "Senha deve ser um texto"}
+        if errors:
+            raise BadRequestError(errors)
+
+        for campo, mensagem in cls.CAMPOS_UNICOS.items():
+            indices_por_valor = {}
+            for indice, data in enumerate(lista_dados):
+                if data.get(campo):
+                    indices_por_valor.setdefault(data[campo], []).append(indice)
+
+            for indices in indices_por_valor.values():
+                for indice in indices[1:]:
+                    errors.setdefault(indice, {})[campo] = f"{campo} repetido no lote"
+
+            valores = list(indices_por_valor)
+            for inicio in range(0, len(valores), cls.TAMANHO_CONSULTA_IN):
+                trecho = valores[inicio:inicio + cls.TAMANHO_CONSULTA_IN]
+                existentes = CustomUser.objects.filter(**{f'{campo}__in': trecho}).values_list(campo, flat=True)
+                for valor in existentes:
+                    for indice in indices_por_valor[valor]:
+                        errors.setdefault(indice, {})[campo] = mensagem
+
+        if errors:
+            raise BadRequestError(errors)
+
+        com_senha = [indice for indice, data in enumerate(lista_dados) if data.get('password')]
+        hashes = dict(zip(com_senha, gerar_hashes_senha([lista_dados[indice]['password'] for indice in com_senha])))
+
+        usuarios = []
+        for indice, data in enumerate(lista_dados):
+            usuario = CustomUser(**cls._montar_dados_usuario(data))
+            usuario.password = hashes[indice] if indice in hashes else make_password(None)
+            usuarios.append(usuario)
+
+        try:
+            with transaction.atomic():
+                usuarios = CustomUser.objects.bulk_create(usuarios, batch_size=tamanho_lote)
+        except IntegrityError as e:
+            raise BadRequestError(f"Conflito ao gravar o lote (cadastro concorrente?): {str(e)}")
+
+        # bulk_create não dispara signals
+        cls.invalidar_estatisticas()
+        return usuarios
     
     @classmethod
     def atualizar_usuario(cls, usuario_id, data):
@@ -220,10 +324,33 @@ class UserService:
             return None
     
     @classmethod
+    def _filtro_prefixo(cls, campo, prefixo):
+        """
+        Busca por prefixo, diferenciando maiúsculas de minúsculas.
+
+        No SQLite (collation BINARY) vira o intervalo campo >= p AND campo < p + U+10FFFF,
+        que usa o índice comum; lá o LIKE ignora maiúsculas e não usa índice.
+        Nos outros bancos a ordem depende da collation (en_US ignora '.', '-'
+        e '@' na primeira passada) e o intervalo perderia linhas: vira LIKE
+        'p%', servido no Postgres pelos índices varchar_pattern_ops (o '_like'
+        que o Django cria para cpf_cnpj e o usuario_email_idx).
+        """
+        if connection.vendor == 'sqlite':
+            return Q(**{f'{campo}__gte': prefixo, f'{campo}__lt': prefixo + '\U0010ffff'})
+        return Q(**{f'{campo}__startswith': prefixo})
+
+    @classmethod
+    @leitura_replica
     def listar_usuarios(cls, filtros=None):
         """
         Lista usuários com filtros opcionais
         
+        cpf_cnpj e email são buscados por prefixo ou por igualdade (email
+        completo), para que usem os índices em vez de varrer a tabela. O nome
+        é buscado em qualquer parte de nome/razão social, nome e sobrenome, sem
+        diferenciar maiúsculas: essa busca percorre o índice da ordenação e
+        para assim que a página enche.
+
         Args:
             filtros (dict): Dicionário com filtros de busca
             
@@ -249,20 +376,95 @@ class UserService:
             if 'tipo_plano' in filtros and filtros['tipo_plano']:
                 queryset = queryset.filter(tipo_plano=filtros['tipo_plano'])
             
-            # Filtro por CPF/CNPJ
+            # Filtro por CPF/CNPJ (prefixo)
             if 'cpf_cnpj' in filtros and filtros['cpf_cnpj']:
-                queryset = queryset.filter(cpf_cnpj__icontains=filtros['cpf_cnpj'])
+                queryset = queryset.filter(cls._filtro_prefixo('cpf_cnpj', filtros['cpf_cnpj']))
             
-            # Filtro por email
+            # Filtro por email: completo (igualdade) ou início do endereço (prefixo)
             if 'email' in filtros and filtros['email']:
-                queryset = queryset.filter(email__icontains=filtros['email'])
+                if '@' in filtros['email']:
+                    queryset = queryset.filter(email=filtros['email'])
+                else:
+                    queryset = queryset.filter(cls._filtro_prefixo('email', filtros['email']))
             
             # Filtro por verificação
             if 'is_verified' in filtros and filtros['is_verified'] is not None:
                 queryset = queryset.filter(is_verified=filtros['is_verified'])
         
-        return queryset.order_by('-data_cadastro')
+        return queryset.order_by('-data_cadastro', '-id')
+
+    @classmethod
+    def _codificar_cursor(cls, usuario):
+        valor = f"{usuario.data_cadastro.isoformat()}|{usuario.id}"
+        return base64.urlsafe_b64encode(valor.encode()).decode()
+
+    @classmethod
+    def _decodificar_cursor(cls, cursor):
+        try:
+            data, usuario_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            data = datetime.fromisoformat(data)
+            return data, int(usuario_id)
+        except (ValueError, UnicodeDecodeError, binascii.Error):
+            raise BadRequestError("Cursor inválido")
+
+    @classmethod
+    @leitura_replica
+    def listar_usuarios_paginado(cls, filtros=None, cursor=None, limite=None):
+        """
+        Lista usuários com paginação por chave (keyset) em (data_cadastro, id).
+
+        Cada página continua a partir do último usuário da anterior, então o custo
+        não cresce com o número da página como acontece com OFFSET.
+
+        Args:
+            filtros (dict): Mesmos filtros de listar_usuarios
+            cursor (str): Valor de 'proximo_cursor' da página anterior
+            limite (int): Usuários por página (máximo LIMITE_MAXIMO_PAGINA)
+
+        Returns:
+            dict: usuarios (lista de dicionários) e proximo_cursor (None na última página)
+        """
+        try:
+            limite = int(limite) if limite else cls.LIMITE_PADRAO_PAGINA
+        except (TypeError, ValueError):
+            raise BadRequestError("Parâmetro limite inválido")
+        limite = max(1, min(limite, cls.LIMITE_MAXIMO_PAGINA))
+
+        queryset = cls.listar_usuarios(filtros)
+        if cursor:
+            data, usuario_id = cls._decodificar_cursor(cursor)
+            queryset = queryset.filter(Q(data_cadastro__lt=data) | Q(data_cadastro=data, id__lt=usuario_id))
+
+        usuarios = list(queryset[:limite + 1])
+        proximo_cursor = cls._codificar_cursor(usuarios[limite - 1]) if len(usuarios) > limite else None
+        return {
+            'usuarios': [usuario.to_dict() for usuario in usuarios[:limite]],
+            'proximo_cursor': proximo_cursor,
+        }
     
+    CAMPOS_EXPORTACAO = [
+        'id', 'username', 'email', 'nome_razao_social', 'cpf_cnpj', 'telefone',
+        'tipo_usuario', 'tipo_plano', 'is_verified', 'is_active',
+        'endereco_cidade', 'endereco_estado', 'data_cadastro', 'last_login',
+    ]
+
+    @classmethod
+    @leitura_replica
+    def exportar_usuarios(cls, filtros=None, tamanho_chunk=2000):
+        """
+        Linhas para exportação de usuários, lidas sob demanda.
+
+        Args:
+            filtros (dict): Mesmos filtros de listar_usuarios
+            tamanho_chunk (int): Linhas buscadas no banco por vez
+
+        Returns:
+            tuple: (cabeçalho, iterador de tuplas)
+        """
+        # As linhas são lidas durante o streaming, depois do retorno: o banco é escolhido aqui
+        linhas = fixar_banco(cls.listar_usuarios(filtros)).values_list(*cls.CAMPOS_EXPORTACAO).iterator(chunk_size=tamanho_chunk)
+        return list(cls.CAMPOS_EXPORTACAO), linhas
+
     @classmethod
     def deletar_usuario(cls, usuario_id):
         """
@@ -319,6 +521,38 @@ class UserService:
         except CustomUser.DoesNotExist:
             raise NotFoundError(f"Usuário com ID {usuario_id} não encontrado")
     
+    @classmethod
+    def notificar_usuarios(cls, usuario_ids, assunto, mensagem):
+        """
+        Enfileira um email ('core.enviar_email') para cada usuário, em vez de
+        enviar dentro do request. Cada envio é uma tarefa: uma falha de SMTP
+        refaz só aquele destinatário.
+
+        Args:
+            usuario_ids (list): IDs dos destinatários
+            assunto (str): Assunto do email
+            mensagem (str): Corpo do email
+
+        Returns:
+            int: Quantidade de emails enfileirados
+
+        Raises:
+            BadRequestError: Sem destinatários, assunto ou mensagem, IDs que não são
+                inteiros ou mais de MAX_NOTIFICACOES destinatários
+        """
+        if not usuario_ids or not assunto or not mensagem:
+            raise BadRequestError("Informe destinatários, assunto e mensagem")
+        if not isinstance(usuario_ids, list) or not all(type(usuario_id) is int for usuario_id in usuario_ids):
+            raise BadRequestError("Destinatários devem ser uma lista de IDs de usuário")
+        if not isinstance(assunto, str) or not isinstance(mensagem, str):
+            raise BadRequestError("Assunto e mensagem devem ser textos")
+        if len(usuario_ids) > cls.MAX_NOTIFICACOES:
+            raise BadRequestError(f"Máximo de {cls.MAX_NOTIFICACOES} destinatários por envio")
+        return TarefaService.enfileirar_muitas('core.enviar_email', [
+            {'usuario_id': usuario_id, 'assunto': assunto, 'mensagem': mensagem}
+            for usuario_id in dict.fromkeys(usuario_ids)
+        ])
+
     @classmethod
     def to_dict(cls, usuario):
         """
@@ -360,22 +594,37 @@ class UserService:
     def estatisticas_usuarios(cls):
         """
         Retorna estatísticas sobre os usuários
-        
+
+        Os totais saem de uma única consulta com agregação condicional e ficam
+        em cache até que um CustomUser seja salvo ou excluído (ver core/signals.py).
+        QuerySet.update() não passa pelos signals: nesse caso o valor antigo dura
+        no máximo TEMPO_CACHE_ESTATISTICAS segundos. A consulta vai ao primário,
+        não à réplica: totais de uma réplica atrasada, lidos logo depois da
+        invalidação, ficariam no cache por TEMPO_CACHE_ESTATISTICAS.
+
         Returns:
             dict: Estatísticas dos usuários
         """
-        total_usuarios = CustomUser.objects.count()
-        total_motoristas = CustomUser.objects.filter(tipo_usuario='motorista').count()
-        total_clientes = CustomUser.objects.filter(tipo_usuario='cliente').count()
-        total_admins = CustomUser.objects.filter(tipo_usuario='admin').count()
-        total_verificados = CustomUser.objects.filter(is_verified=True).count()
-        total_premium = CustomUser.objects.filter(tipo_plano='premium').count()
-        
-        return {
-            'total_usuarios': total_usuarios,
-            'total_motoristas': total_motoristas,
-            'total_clientes': total_clientes,
-            'total_admins': total_admins,
-            'total_verificados': total_verificados,
-            'total_premium': total_premium,
-        }
\ No newline at end of file
+        estatisticas = cache.get(cls.CHAVE_CACHE_ESTATISTICAS)
+        if estatisticas is not None:
+            return estatisticas
+
+        estatisticas = CustomUser.objects.aggregate(
+            total_usuarios=Count('id'),
+            total_motoristas=Count('id', filter=Q(tipo_usuario='motorista')),
+            total_clientes=Count('id', filter=Q(tipo_usuario='cliente')),
+            total_admins=Count('id', filter=Q(tipo_usuario='admin')),
+            total_verificados=Count('id', filter=Q(is_verified=True)),
+            total_premium=Count('id', filter=Q(tipo_plano='premium')),
+        )
+        cache.set(cls.CHAVE_CACHE_ESTATISTICAS, estatisticas, cls.TEMPO_CACHE_ESTATISTICAS)
+        return estatisticas
+
+    @classmethod
+    def invalidar_estatisticas(cls):
+        """
+        Descarta as estatísticas em cache depois do commit da transação corrente
+        (na hora, fora de transação). Antes do commit, uma leitura concorrente
+        recolocaria no cache os totais antigos por TEMPO_CACHE_ESTATISTICAS.
+        """
+        transaction.on_commit(lambda: cache.delete(cls.CHAVE_CACHE_ESTATISTICAS))
@@ -0,0 +1,38 @@
+# core/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .authentication import marcar_usuario_inativo
+from .models import CustomUser
+from .service.usuarios_service import UserService
+
+# Campos que alteram as estatísticas de UserService.estatisticas_usuarios
+CAMPOS_ESTATISTICAS = {'tipo_usuario', 'is_verified', 'tipo_plano'}
+
+# Sem filtro de sender: proxies e subclasses de CustomUser disparam signals com
+# a própria classe. QuerySet.update() e bulk_create() não disparam signals;
+# quem os usa nesses campos chama UserService.invalidar_estatisticas(), que só
+# descarta o cache depois do commit.
+
+
+@receiver(post_save)
+def invalidar_estatisticas_ao_salvar(sender, instance, created, update_fields=None, **kwargs):
+    if not issubclass(sender, CustomUser):
+        return
+    # Saves parciais que não tocam esses campos (ex.: last_login no login) não invalidam
+    if not created and update_fields is not None and not CAMPOS_ESTATISTICAS & set(update_fields):
+        return
+    UserService.invalidar_estatisticas()
+
+
+@receiver(post_delete)
+def invalidar_estatisticas_ao_excluir(sender, instance, **kwargs):
+    if issubclass(sender, CustomUser):
+        UserService.invalidar_estatisticas()
+
+
+@receiver(post_save)
+def revogar_acesso_ao_desativar(sender, instance, created, update_fields=None, **kwargs):
+    # Access tokens já emitidos deixam de valer (JWTClaimsAuthentication consulta a marca)
+    if not issubclass(sender, CustomUser) or created or (update_fields is not None and 'is_active' not in update_fields):
+        return
+    marcar_usuario_inativo(instance.id, inativo=not instance.is_active)
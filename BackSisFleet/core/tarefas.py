@@ -0,0 +1,20 @@
+# core/tarefas.py
+from django.core.mail import send_mail
+from core.models import CustomUser
+from tarefas.registro import tarefa
+
+
+@tarefa('core.enviar_email', prioridade=5)
+def enviar_email(usuario_id, assunto, mensagem):
+    """
+    Envia um email para o usuário. Uma tarefa por destinatário: uma falha de
+    SMTP refaz só aquele envio.
+
+    Returns:
+        dict: Destinatário, ou o motivo de não ter enviado
+    """
+    email = CustomUser.objects.filter(id=usuario_id).values_list('email', flat=True).first()
+    if not email:
+        return {'enviado': False, 'motivo': 'usuário inexistente ou sem email'}
+    send_mail(assunto, mensagem, None, [email])
+    return {'enviado': True, 'email': email}
@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from core.jwt import MyTokenObtainPairSerializer
+from core.models import CustomUser
+
+
+class JWTClaimsAuthenticationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = CustomUser.objects.create(username='cliente', tipo_usuario='cliente', cpf_cnpj='11222333000181')
+
+    def setUp(self):
+        cache.clear()
+
+    def _get(self, token):
+        return self.client.get(reverse('hello'), HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def _token(self):
+        return MyTokenObtainPairSerializer.get_token(self.usuario).access_token
+
+    def test_token_de_usuario_ativo(self):
+        self.assertEqual(self._get(self._token()).status_code, 200)
+
+    def test_desativar_revoga_token_ja_emitido(self):
+        token = self._token()
+        self.usuario.is_active = False
+        self.usuario.save(update_fields=['is_active'])
+        self.assertEqual(self._get(token).status_code, 401)
+
+    def test_reativar_libera_novamente(self):
+        token = self._token()
+        self.usuario.is_active = False
+        self.usuario.save()
+        self.usuario.is_active = True
+        self.usuario.save()
+        self.assertEqual(self._get(token).status_code, 200)
+
+    def test_claim_is_active_falsa(self):
+        token = self._token()
+        token['is_active'] = False
+        self.assertEqual(self._get(token).status_code, 401)
@@ -0,0 +1,37 @@
+from unittest import mock
+
+from django.test import TestCase
+from core.cache_representacao import CacheRepresentacao
+from core.models import CustomUser
+from veiculos.models.veiculos import Veiculo
+from veiculos.service.veiculos_service import REPRESENTACOES_VEICULO
+
+
+class CacheRepresentacaoTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cliente = CustomUser.objects.create(username='cliente', tipo_usuario='cliente', cpf_cnpj='11222333000181')
+
+    def setUp(self):
+        CacheRepresentacao.backend().clear()
+        self.veiculo = Veiculo.objects.create(
+            placa='ABC1D23', renavam='12345678901', chassi='9BWZZZ377VT004251', marca='VW', modelo='Gol',
+            ano_fabricacao=2020, ano_modelo=2021, cor='branco', criado_por=self.cliente,
+        )
+
+    def _representar(self):
+        return REPRESENTACOES_VEICULO.representar(Veiculo.objects.filter(pk=self.veiculo.pk))
+
+    def test_segunda_leitura_vem_do_cache(self):
+        self._representar()
+        with self.assertNumQueries(1):
+            self.assertEqual(self._representar()[0]['cor'], 'branco')
+
+    def test_save_em_outro_processo_muda_a_versao(self):
+        self._representar()
+        # Outro processo: o post_save dele não remove a entrada deste
+        with mock.patch.object(CacheRepresentacao, '_invalidar'):
+            self.veiculo.cor = 'prata'
+            self.veiculo.save()
+        self.assertEqual(self._representar()[0]['cor'], 'prata')
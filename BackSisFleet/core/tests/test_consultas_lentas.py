@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from common.utils.normalizar_sql import normalizar_sql
+from core.consultas_lentas import CapturaConsultasLentas, explicar, sugerir_indices, tabelas_sem_indice, tabelas_varridas
+from motoristas.models.motoristas import Motorista
+
+TABELA = Motorista._meta.db_table
+
+
+class TabelasVarridasTests(SimpleTestCase):
+
+    def test_linhas_de_plano_do_sqlite(self):
+        self.assertEqual(tabelas_varridas('sqlite', [
+            f'SCAN {TABELA} USING INDEX motorista_atualizacao_idx',
+            f'SCAN {TABELA} USING COVERING INDEX motorista_cnh_idx',
+            'SCAN CONSTANT ROW',
+            'SEARCH core_customuser USING INTEGER PRIMARY KEY (rowid=?)',
+        ]), [])
+        self.assertEqual(tabelas_varridas('sqlite', [f'SCAN {TABELA}', 'SCAN TABLE core_customuser']), [TABELA, 'core_customuser'])
+
+    def test_linhas_de_plano_do_postgres(self):
+        plano = ['Sort  (cost=1.01..1.02 rows=1 width=8)', f'  ->  Seq Scan on {TABELA}  (cost=0.00..1.00 rows=1 width=8)']
+        self.assertEqual(tabelas_varridas('postgresql', plano), [TABELA])
+        self.assertEqual(tabelas_varridas('postgresql', [f'Index Scan using motorista_cnh_idx on {TABELA}']), [])
+
+
+class PlanosSqliteTests(TestCase):
+    """Planos reais do SQLite dos testes, para consultas geradas pelo ORM"""
+
+    def _analisar(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        plano = explicar(connection, sql, params)
+        formato = normalizar_sql(sql)
+        sem_indice = tabelas_sem_indice(connection.vendor, formato, plano)
+        return plano, tabelas_varridas(connection.vendor, plano), sem_indice, sugerir_indices(formato, sem_indice)
+
+    def test_varredura_na_ordem_de_um_indice_nao_e_apontada(self):
+        plano, varridas, sem_indice, sugestoes = self._analisar(Motorista.objects.order_by('updated_at'))
+        self.assertTrue(any('USING INDEX motorista_atualizacao_idx' in linha for linha in plano), plano)
+        self.assertEqual((varridas, sem_indice, sugestoes), ([], [], []))
+
+    def test_busca_por_indice_nao_e_apontada(self):
+        _, varridas, sem_indice, _ = self._analisar(Motorista.objects.filter(cnh_numero='123'))
+        self.assertEqual((varridas, sem_indice), ([], []))
+
+    def test_varredura_completa_sugere_indice_pelo_filtro(self):
+        plano, varridas, _, sugestoes = self._analisar(Motorista.objects.filter(cnh_categoria='D'))
+        self.assertEqual(varridas, [TABELA], plano)
+        self.assertEqual(sugestoes, [f'CREATE INDEX {TABELA}_cnh_categoria_idx ON {TABELA} (cnh_categoria);'])
+
+    def test_ordenacao_em_b_tree_temporaria_sugere_indice_pela_ordem(self):
+        plano, _, sem_indice, sugestoes = self._analisar(
+            Motorista.objects.filter(cnh_numero='123').order_by('cnh_categoria')
+        )
+        self.assertTrue(any('USE TEMP B-TREE FOR ORDER BY' in linha for linha in plano), plano)
+        self.assertEqual(sem_indice, [TABELA])
+        self.assertEqual(sugestoes, [f'CREATE INDEX {TABELA}_cnh_numero_cnh_categoria_idx ON {TABELA} (cnh_numero, cnh_categoria);'])
+
+    def test_captura_grava_consulta_com_plano(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            arquivo = os.path.join(pasta, 'lentas.jsonl')
+            # Só esta captura: a global (instalar_captura) também gravaria no arquivo
+            with override_settings(CONSULTAS_LENTAS_LIMITE_MS=0, CONSULTAS_LENTAS_ARQUIVO=arquivo), \
+                    mock.patch.object(connection, 'execute_wrappers', []), \
+                    self.assertLogs('core.consultas_lentas', 'WARNING'), \
+                    connection.execute_wrapper(CapturaConsultasLentas()):
+                list(Motorista.objects.filter(cnh_categoria='D'))
+            with open(arquivo, encoding='utf-8') as linhas:
+                [registro] = [json.loads(linha) for linha in linhas]
+        self.assertEqual(registro['varreduras'], [TABELA])
+        self.assertIn('cnh_categoria', registro['sugestoes'][0])
+        self.assertIn('?', registro['formato'])
+
+
+class ComandoConsultasLentasTests(SimpleTestCase):
+
+    def setUp(self):
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        self.arquivo = os.path.join(pasta.name, 'lentas.jsonl')
+
+    def _gravar(self, *linhas):
+        with open(self.arquivo, 'w', encoding='utf-8') as saida:
+            for linha in linhas:
+                saida.write((linha if isinstance(linha, str) else json.dumps(linha)) + '\n')
+
+    def _registro(self, formato, duracao_ms, **campos):
+        return {'banco': 'default', 'formato': formato, 'duracao_ms': duracao_ms, 'origem': None, **campos}
+
+    def _executar(self, *argumentos):
+        saida, erros = StringIO(), StringIO()
+        call_command('consultas_lentas', '--arquivo', self.arquivo, *argumentos, stdout=saida, stderr=erros, no_color=True)
+        return saida.getvalue(), erros.getvalue()
+
+    def test_agrupa_por_formato_e_ordena(self):
+        self._gravar(
+            self._registro('SELECT a', 300, origem='motoristas/views.py:10', varreduras=['t'], sugestoes=['CREATE INDEX x;']),
+            self._registro('SELECT a', 500),
+            '{"truncado',
+            self._registro('SELECT b', 700),
+        )
+        saida, erros = self._executar()
+        self.assertIn('Linha 3 ignorada', erros)
+        self.assertIn('3 consultas lentas em 2 formatos', saida)
+        self.assertLess(saida.index('SELECT a'), saida.index('SELECT b'))
+        self.assertIn('2x  total 800.0 ms  média 400.0 ms  máx 500.0 ms', saida)
+        self.assertIn('em motoristas/views.py:10', saida)
+        self.assertIn('varredura completa: t', saida)
+        self.assertIn('sugestão: CREATE INDEX x;', saida)
+
+        saida, _ = self._executar('--ordem', 'maximo', '--limite', '1')
+        self.assertIn('SELECT b', saida)
+        self.assertNotIn('SELECT a', saida)
+
+    def test_limpar_esvazia_o_arquivo(self):
+        self._gravar(self._registro('SELECT a', 300))
+        self._executar('--limpar')
+        self.assertEqual(os.path.getsize(self.arquivo), 0)
+        saida, _ = self._executar()
+        self.assertIn('Nenhuma consulta lenta registrada', saida)
+
+    def test_arquivo_inexistente(self):
+        with self.assertRaises(CommandError):
+            self._executar()
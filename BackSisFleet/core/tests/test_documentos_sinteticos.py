@@ -0,0 +1,82 @@
+import re
+
+from django.test import SimpleTestCase
+from common.utils import documentos_sinteticos as documentos
+
+SEQUENCIAS = range(20_000)
+
+
+def _modulo11(digitos, pesos):
+    resto = sum(int(d) * p for d, p in zip(digitos, pesos)) % 11
+    return str(0 if resto < 2 else 11 - resto)
+
+
+def cpf_valido(numero):
+    return (
+        numero[9] == _modulo11(numero[:9], range(10, 1, -1))
+        and numero[10] == _modulo11(numero[:10], range(11, 1, -1))
+    )
+
+
+def cnpj_valido(numero):
+    pesos = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    return numero[12] == _modulo11(numero[:12], pesos[1:]) and numero[13] == _modulo11(numero[:13], pesos)
+
+
+def cnh_valida(numero):
+    # Mesmo cálculo dos validadores do Detran: o segundo DV com desconto pode ficar negativo e não bater
+    primeiro = sum(int(d) * p for d, p in zip(numero[:9], range(9, 0, -1))) % 11
+    desconto = 0
+    if primeiro >= 10:
+        primeiro, desconto = 0, 2
+    segundo = sum(int(d) * p for d, p in zip(numero[:9], range(1, 10))) % 11
+    segundo = 0 if segundo >= 10 else segundo - desconto
+    return f'{primeiro}{segundo}' == numero[9:]
+
+
+def renavam_valido(numero):
+    soma = sum(int(d) * p for d, p in zip(reversed(numero[:10]), [2, 3, 4, 5, 6, 7, 8, 9, 2, 3]))
+    return numero[10] == str(soma * 10 % 11 % 10)
+
+
+class DocumentosSinteticosTests(SimpleTestCase):
+
+    def _verificar(self, gerador, tamanho, valido):
+        numeros = [gerador(sequencia) for sequencia in SEQUENCIAS]
+        self.assertEqual(len(set(numeros)), len(numeros))
+        for sequencia, numero in zip(SEQUENCIAS, numeros):
+            if not (len(numero) == tamanho and numero.isdigit() and valido(numero)):
+                self.fail(f'{gerador.__name__}({sequencia}) = {numero} inválido')
+
+    def test_cpf(self):
+        self._verificar(documentos.cpf, 11, cpf_valido)
+
+    def test_cnpj(self):
+        self._verificar(documentos.cnpj, 14, cnpj_valido)
+        self.assertEqual(documentos.cnpj(0)[8:12], '0001')
+
+    def test_cnh(self):
+        self._verificar(documentos.cnh, 11, cnh_valida)
+
+    def test_cnh_sem_dv_possivel_usa_o_nono_digito_seguinte(self):
+        # Base com primeiro DV 10 (desconto) e segundo resto 0: nenhum DV seria aceito
+        self.assertIsNone(documentos._dv_cnh([0, 0, 0, 0, 0, 0, 0, 9, 3]))
+        self.assertTrue(any(
+            documentos._dv_cnh(prefixo + [sum(prefixo) % 10]) is None
+            for prefixo in (documentos._digitos(documentos._CNH(sequencia), 8) for sequencia in SEQUENCIAS)
+        ))
+
+    def test_renavam(self):
+        self._verificar(documentos.renavam, 11, renavam_valido)
+
+    def test_mesma_sequencia_mesmo_documento(self):
+        for gerador in (documentos.cpf, documentos.cnpj, documentos.cnh, documentos.renavam, documentos.placa, documentos.chassi):
+            self.assertEqual(gerador(42), gerador(42))
+
+    def test_placa_e_chassi(self):
+        placas = [documentos.placa(sequencia) for sequencia in SEQUENCIAS]
+        chassis = [documentos.chassi(sequencia) for sequencia in SEQUENCIAS]
+        self.assertEqual(len(set(placas)), len(placas))
+        self.assertEqual(len(set(chassis)), len(chassis))
+        self.assertTrue(all(re.fullmatch(r'[A-Z]{3}\d[A-Z]\d{2}', placa) for placa in placas))
+        self.assertTrue(all(re.fullmatch(r'9BR[A-HJ-NPR-Z0-9]{14}', chassi) for chassi in chassis))
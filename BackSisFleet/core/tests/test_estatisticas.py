@@ -0,0 +1,73 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import SimpleTestCase, TestCase
+from core.models import CustomUser, UsuarioToken
+from core.service.usuarios_service import UserService
+
+
+class EstatisticasUsuariosTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def _total(self):
+        return UserService.estatisticas_usuarios()['total_usuarios']
+
+    def test_save_de_proxy_invalida(self):
+        self.assertEqual(self._total(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            UsuarioToken.objects.create(username='cliente', tipo_usuario='cliente', cpf_cnpj='11222333000181')
+        self.assertEqual(self._total(), 1)
+
+    def test_exclusao_invalida(self):
+        usuario = CustomUser.objects.create(username='cliente', tipo_usuario='cliente', cpf_cnpj='11222333000181')
+        self.assertEqual(self._total(), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            usuario.delete()
+        self.assertEqual(self._total(), 0)
+
+    def test_save_parcial_fora_dos_campos_nao_invalida(self):
+        usuario = CustomUser.objects.create(username='cliente', tipo_usuario='cliente', cpf_cnpj='11222333000181')
+        estatisticas = UserService.estatisticas_usuarios()
+        usuario.save(update_fields=['last_login'])
+        self.assertEqual(cache.get(UserService.CHAVE_CACHE_ESTATISTICAS), estatisticas)
+
+    def test_cache_so_e_descartado_depois_do_commit(self):
+        self.assertEqual(self._total(), 0)
+        with self.captureOnCommitCallbacks() as callbacks:
+            CustomUser.objects.create(username='cliente', tipo_usuario='cliente', cpf_cnpj='11222333000181')
+            # Uma leitura antes do commit ainda vê (e mantém) os totais confirmados
+            self.assertIsNotNone(cache.get(UserService.CHAVE_CACHE_ESTATISTICAS))
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(cache.get(UserService.CHAVE_CACHE_ESTATISTICAS))
+
+    def test_gerar_frota_invalida(self):
+        self.assertEqual(self._total(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('gerar_frota', clientes=2, motoristas_por_cliente=1, veiculos_por_cliente=1, stdout=StringIO())
+        self.assertGreater(self._total(), 0)
+
+
+
+@mock.patch('core.roteamento.alias_replica', return_value='replica')
+class EstatisticasUsuariosReplicaTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_consulta_vai_ao_primario(self, _):
+        # Fora de transação e com réplica: uma leitura dela logo após a invalidação iria para o cache
+        bancos = []
+
+        def agregar(queryset, **campos):
+            bancos.append(queryset.db)
+            return dict.fromkeys(campos, 0)
+
+        with mock.patch.object(QuerySet, 'aggregate', autospec=True, side_effect=agregar):
+            UserService.estatisticas_usuarios()
+        self.assertEqual(bancos, ['default'])
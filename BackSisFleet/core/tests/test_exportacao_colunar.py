@@ -0,0 +1,45 @@
+import io
+from unittest import skipUnless
+
+from django.test import TestCase
+from common.utils.exportacao_colunar import campos_exportaveis, esquema, gerar_parquet, pa, pq
+from core.models import CustomUser
+from veiculos.models.veiculos import Veiculo
+
+
+@skipUnless(pa, "pyarrow não instalado")
+class ExportacaoParquetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cliente = CustomUser.objects.create(username='cliente', tipo_usuario='cliente', cpf_cnpj='11222333000181')
+        Veiculo.objects.bulk_create([
+            Veiculo(placa=f'AAA{i:04d}', marca='VW', modelo='Gol', ano_fabricacao=2000 + i,
+                    criado_por=cls.cliente, ultima_latitude=-23.5 if i % 2 else None)
+            for i in range(5)
+        ])
+
+    def test_esquema_tipado_pelos_campos(self):
+        tipos = {campo.name: campo.type for campo in esquema(campos_exportaveis(Veiculo))}
+        self.assertEqual(tipos['id'], pa.int64())
+        self.assertEqual(tipos['criado_por_id'], pa.int64())
+        self.assertEqual(tipos['ultima_latitude'], pa.float64())
+        self.assertEqual(tipos['created_at'], pa.timestamp('us', tz='UTC'))
+        self.assertEqual(tipos['placa'], pa.string())
+
+    def test_streaming_em_row_groups(self):
+        campos = campos_exportaveis(Veiculo, excluir=('motorista',))
+        pedacos = list(gerar_parquet(Veiculo.objects.order_by('id'), campos, linhas_por_grupo=2))
+        # Um pedaço por row group e o rodapé no último
+        self.assertEqual(len(pedacos), 4)
+
+        arquivo = pq.ParquetFile(io.BytesIO(b''.join(pedacos)))
+        self.assertEqual(arquivo.metadata.num_row_groups, 3)
+        tabela = arquivo.read()
+        self.assertNotIn('motorista_id', tabela.column_names)
+        self.assertEqual(tabela.column('placa').to_pylist(), [f'AAA{i:04d}' for i in range(5)])
+        self.assertEqual(tabela.column('ultima_latitude').to_pylist(), [None, -23.5, None, -23.5, None])
+
+    def test_queryset_vazio_gera_arquivo_valido(self):
+        pedacos = gerar_parquet(Veiculo.objects.none(), campos_exportaveis(Veiculo))
+        self.assertEqual(pq.read_table(io.BytesIO(b''.join(pedacos))).num_rows, 0)
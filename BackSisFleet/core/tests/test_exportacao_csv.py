@@ -0,0 +1,26 @@
+from datetime import date, datetime
+
+from django.test import SimpleTestCase
+from common.utils.exportacao_csv import LINHAS_POR_BLOCO, gerar_linhas_csv
+
+
+class ExportacaoCSVTests(SimpleTestCase):
+
+    def _csv(self, linhas):
+        return ''.join(gerar_linhas_csv(['a', 'b'], linhas))
+
+    def test_formula_sai_como_texto(self):
+        conteudo = self._csv([('=HYPERLINK("http://x")', '+1'), ('-2+3', '@SUM(A1)')])
+        self.assertIn("'=HYPERLINK", conteudo)
+        self.assertIn("'+1", conteudo)
+        self.assertIn("'-2+3", conteudo)
+        self.assertIn("'@SUM(A1)", conteudo)
+
+    def test_numeros_negativos_e_datas_nao_mudam(self):
+        conteudo = self._csv([(-5, date(2026, 1, 2)), (1.5, datetime(2026, 1, 2, 3, 4, 5))])
+        self.assertEqual(conteudo, '\ufeffa;b\r\n-5;2026-01-02\r\n1.5;2026-01-02 03:04:05\r\n')
+
+    def test_blocos_de_linhas(self):
+        blocos = list(gerar_linhas_csv(['a'], ((i,) for i in range(LINHAS_POR_BLOCO + 1))))
+        self.assertEqual(len(blocos), 3)
+        self.assertEqual(blocos[2], f'{LINHAS_POR_BLOCO}\r\n')
@@ -0,0 +1,60 @@
+from unittest import skipUnless
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+from core.formato_binario import MessagePackRenderer, msgpack
+from core.layout_colunar import converter_para_colunas
+from core.models import CustomUser
+
+CORPOS_INVALIDOS = {
+    'chave de mapa não hashable': b'\x81\x91\x01\x01',
+    'byte reservado': b'\xc1',
+    'truncado': b'\x92\x01',
+    'dados sobrando': b'\x01\x02',
+}
+
+
+@skipUnless(msgpack, "msgpack não instalado")
+class MessagePackTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cliente = CustomUser.objects.create(username='cliente', tipo_usuario='cliente', cpf_cnpj='11222333000181')
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.cliente)
+
+    def test_corpo_invalido_responde_400(self):
+        for descricao, corpo in CORPOS_INVALIDOS.items():
+            with self.subTest(descricao):
+                resposta = self.api.post('/cercas/', corpo, content_type='application/msgpack')
+                self.assertEqual(resposta.status_code, 400)
+
+    def test_resposta_em_msgpack(self):
+        resposta = self.api.get('/cercas/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta['Content-Type'], 'application/msgpack')
+        self.assertIsInstance(msgpack.unpackb(resposta.content, raw=False), (list, dict))
+
+
+class LayoutColunarTests(TestCase):
+
+    def test_lista_de_objetos_vira_colunas(self):
+        dados = {'total': 2, 'itens': [
+            {'id': 1, 'usuario': {'email': 'a@x.com'}},
+            {'id': 2, 'usuario': {'email': 'b@x.com'}, 'cor': 'azul'},
+        ]}
+        self.assertEqual(converter_para_colunas(dados), {'total': 2, 'itens': {
+            'colunas': ['id', 'usuario.email', 'cor'],
+            'linhas': [[1, 'a@x.com', None], [2, 'b@x.com', 'azul']],
+        }})
+
+    def test_listas_que_nao_sao_de_objetos_ficam(self):
+        dados = {'vertices': [[1, 2], [3, 4]], 'vazia': [], 'usuario': {}}
+        self.assertEqual(converter_para_colunas(dados), dados)
+
+    @skipUnless(msgpack, "msgpack não instalado")
+    def test_msgpack_colunar_pelo_accept(self):
+        corpo = MessagePackRenderer().render([{'id': 1}, {'id': 2}], 'application/msgpack; layout=colunar')
+        self.assertEqual(msgpack.unpackb(corpo, raw=False), {'colunas': ['id'], 'linhas': [[1], [2]]})
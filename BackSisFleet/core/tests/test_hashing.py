@@ -0,0 +1,35 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from core.hashing import ExecutorHash, HashSobrecarregadoError
+from core.service.usuarios_service import UserService
+
+
+class ExecutorHashTests(SimpleTestCase):
+
+    def setUp(self):
+        self.executor = ExecutorHash()
+        self.addCleanup(self.executor.encerrar)
+
+    def test_mapear_preserva_a_ordem(self):
+        with override_settings(HASH_SENHA_TRABALHADORES=3):
+            self.assertEqual(self.executor.mapear(lambda valor: valor * 2, range(10)), [valor * 2 for valor in range(10)])
+
+    def test_fila_cheia_responde_503(self):
+        with override_settings(HASH_SENHA_TRABALHADORES=1, HASH_SENHA_FILA_MAXIMA=1, HASH_SENHA_ESPERA=0.01):
+            self.executor._iniciar()
+            self.executor._vagas.acquire()
+            self.executor._vagas.acquire()
+            with self.assertRaises(HashSobrecarregadoError) as erro:
+                self.executor.executar(str, 1)
+            self.executor._vagas.release()
+            self.executor._vagas.release()
+        self.assertEqual(erro.exception.status_code, 503)
+
+
+class CriarUsuarioSobrecargaTests(TestCase):
+
+    def test_sobrecarga_do_hash_nao_vira_500(self):
+        with mock.patch('core.service.usuarios_service.gerar_hash_senha', side_effect=HashSobrecarregadoError(wait=1)):
+            with self.assertRaises(HashSobrecarregadoError):
+                UserService.criar_usuario({'username': 'novo', 'email': 'novo@sisfleet.com', 'password': 'Senha@123'})
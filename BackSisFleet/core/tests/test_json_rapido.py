@@ -0,0 +1,23 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from core.json_rapido import JSONRapidoRenderer
+
+
+class JSONRapidoRendererTests(SimpleTestCase):
+
+    def test_mesmo_conteudo_que_o_renderer_do_drf(self):
+        dados = {
+            'valor': Decimal('12.50'),
+            'texto': gettext_lazy('Olá'),
+            'conjunto': (1, 2),
+            'quando': datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+        }
+        rapido = json.loads(JSONRapidoRenderer().render(dados))
+        padrao = json.loads(JSONRenderer().render(dados))
+        self.assertEqual(rapido['valor'], 12.5)
+        self.assertEqual(rapido, padrao)
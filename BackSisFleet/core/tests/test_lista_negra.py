@@ -0,0 +1,69 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from core.lista_negra import FiltroBloom, ListaNegraTokens
+from core.models import CustomUser
+
+
+class FiltroBloomTests(SimpleTestCase):
+
+    def test_sem_falsos_negativos(self):
+        filtro = FiltroBloom(capacidade=1000)
+        valores = [f'jti-{i}' for i in range(1000)]
+        for valor in valores:
+            filtro.adicionar(valor)
+        self.assertTrue(all(valor in filtro for valor in valores))
+        self.assertEqual(filtro.quantidade, 1000)
+
+    def test_taxa_de_falsos_positivos(self):
+        filtro = FiltroBloom(capacidade=1000, taxa_falso_positivo=0.01)
+        for i in range(1000):
+            filtro.adicionar(f'jti-{i}')
+        falsos = sum(f'outro-{i}' in filtro for i in range(10_000))
+        # Esperado ~1%; folga para a variação da amostra
+        self.assertLess(falsos / 10_000, 0.03)
+
+    def test_vazio_nao_contem_nada(self):
+        self.assertNotIn('jti', FiltroBloom(capacidade=10))
+
+
+@mock.patch('core.lista_negra.cache_compartilhado', return_value=True)
+class ListaNegraTokensTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = CustomUser.objects.create(username='cliente', tipo_usuario='cliente', cpf_cnpj='11222333000181')
+
+    def setUp(self):
+        cache.clear()
+
+    def _blacklistar(self, jti):
+        token = OutstandingToken.objects.create(
+            user=self.usuario, jti=jti, token=jti, expires_at=timezone.now() + timedelta(days=1),
+        )
+        BlacklistedToken.objects.create(token=token)
+
+    def test_inclusao_de_outro_processo_e_vista_na_hora(self, _):
+        processo_a, processo_b = ListaNegraTokens(), ListaNegraTokens()
+        self.assertFalse(processo_a.contem('jti-1'))
+        self._blacklistar('jti-1')
+        processo_b.adicionar('jti-1')
+        self.assertTrue(processo_a.contem('jti-1'))
+
+    def test_fora_do_filtro_nao_consulta_o_banco(self, _):
+        lista = ListaNegraTokens()
+        lista.contem('aquecimento')
+        with self.assertNumQueries(0):
+            self.assertFalse(lista.contem('jti-livre'))
+
+    def test_sem_cache_compartilhado_consulta_o_banco(self, compartilhado):
+        compartilhado.return_value = False
+        lista = ListaNegraTokens()
+        lista.contem('aquecimento')
+        # Inclusão por outro processo sem aviso pelo cache
+        self._blacklistar('jti-2')
+        self.assertTrue(lista.contem('jti-2'))
@@ -0,0 +1,51 @@
+from django.test import TestCase
+from core.models import CustomUser
+from core.service.usuarios_service import BadRequestError, UserService
+
+
+class ListagemUsuariosTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.transportes = CustomUser.objects.create(
+            username='transportes', email='contato@silva.com.br', cpf_cnpj='11222333000181',
+            nome_razao_social='Transportes Silva LTDA',
+        )
+        cls.joao = CustomUser.objects.create(
+            username='joao', email='joao.souza@sisfleet.com', cpf_cnpj='12345678909',
+            first_name='João', last_name='Souza',
+        )
+        cls.maria = CustomUser.objects.create(
+            username='maria', email='maria@sisfleet.com', cpf_cnpj='98765432100',
+            first_name='Maria', last_name='da Silva',
+        )
+
+    def _usernames(self, **filtros):
+        return sorted(UserService.listar_usuarios(filtros).values_list('username', flat=True))
+
+    def test_nome_em_qualquer_campo_sem_diferenciar_maiusculas(self):
+        self.assertEqual(self._usernames(nome='silva'), ['maria', 'transportes'])
+        self.assertEqual(self._usernames(nome='SOUZA'), ['joao'])
+
+    def test_cpf_cnpj_por_prefixo(self):
+        self.assertEqual(self._usernames(cpf_cnpj='1'), ['joao', 'transportes'])
+        self.assertEqual(self._usernames(cpf_cnpj='112'), ['transportes'])
+
+    def test_email_por_prefixo_ou_completo(self):
+        self.assertEqual(self._usernames(email='joao.'), ['joao'])
+        self.assertEqual(self._usernames(email='maria@sisfleet.com'), ['maria'])
+        self.assertEqual(self._usernames(email='maria@sisfleet'), [])
+
+    def test_paginacao_por_cursor_percorre_tudo_sem_repetir(self):
+        vistos, cursor = [], None
+        while True:
+            pagina = UserService.listar_usuarios_paginado(cursor=cursor, limite=2)
+            vistos += [usuario['username'] for usuario in pagina['usuarios']]
+            cursor = pagina['proximo_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(vistos, ['maria', 'joao', 'transportes'])
+
+    def test_cursor_invalido(self):
+        with self.assertRaises(BadRequestError):
+            UserService.listar_usuarios_paginado(cursor='nao-e-cursor')
@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from core.metricas import RegistroMetricas, registro
+from core.models import CustomUser
+
+
+class RegistroMetricasMultiprocessoTests(SimpleTestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.diretorio.cleanup)
+        configuracao = override_settings(METRICAS_DIRETORIO=self.diretorio.name, METRICAS_INTERVALO_GRAVACAO=3600)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+    def _outro_worker(self, pid, **series):
+        with open(os.path.join(self.diretorio.name, f'{pid}.json'), 'w') as saida:
+            json.dump(series, saida)
+
+    def test_soma_os_workers(self):
+        local = RegistroMetricas()
+        local.registrar_requisicao('MotoristasView', 'get', 200, 0.02, 3, 0.01)
+        self._outro_worker(
+            999999,
+            sisfleet_http_requisicoes_total=[[['MotoristasView', 'get', 200], 4]],
+            sisfleet_http_consultas_banco=[[['MotoristasView', 'get'], [0, 0, 0, 4, 0, 0, 0, 0, 0, 0], 12, 4]],
+        )
+        texto = local.exportar()
+        self.assertIn('sisfleet_http_requisicoes_total{view="MotoristasView",metodo="get",status="200"} 5', texto)
+        self.assertIn('sisfleet_http_consultas_banco_count{view="MotoristasView",metodo="get"} 5', texto)
+        self.assertIn('sisfleet_http_consultas_banco_sum{view="MotoristasView",metodo="get"} 15', texto)
+
+    def test_arquivo_corrompido_e_ignorado(self):
+        with open(os.path.join(self.diretorio.name, '1.json'), 'w') as saida:
+            saida.write('{"sisfleet_http_req')
+        local = RegistroMetricas()
+        local.registrar_servico('MotoristaService', 'listar', 0.01)
+        self.assertIn('sisfleet_servico_duracao_segundos_count{servico="MotoristaService",metodo="listar"} 1', local.exportar())
+
+    def test_fork_comeca_do_zero(self):
+        local = RegistroMetricas()
+        local.registrar_servico('MotoristaService', 'listar', 0.01)
+        local._pid = -1  # como se este processo fosse um fork do que registrou
+        local.registrar_servico('MotoristaService', 'obter', 0.01)
+        self.assertEqual(list(local.servicos.series), [('MotoristaService', 'obter')])
+
+
+class MetricasStreamingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(username='admin', tipo_usuario='admin', cpf_cnpj='11222333000181', is_staff=True)
+
+    def test_consultas_do_corpo_em_streaming_contam(self):
+        api = APIClient()
+        api.force_authenticate(self.admin)
+        serie = ('ExportarUsuariosView', 'get')
+        antes = registro.consultas.series[serie].soma if serie in registro.consultas.series else 0
+
+        resposta = api.get('/api/usuarios/exportar/')
+        self.assertTrue(resposta.streaming)
+        b''.join(resposta.streaming_content)
+        resposta.close()
+
+        # O SELECT da exportação só roda quando o corpo é consumido
+        self.assertGreaterEqual(registro.consultas.series[serie].soma - antes, 1)
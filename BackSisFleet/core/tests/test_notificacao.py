@@ -0,0 +1,45 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from core.models import CustomUser
+from tarefas.models import Tarefa
+
+
+class NotificarUsuariosViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(username='admin', email='admin@sisfleet.com', tipo_usuario='admin', is_staff=True)
+        cls.cliente = CustomUser.objects.create(
+            username='transportadora', email='cliente@sisfleet.com', tipo_usuario='cliente', cpf_cnpj='11222333000181',
+        )
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+
+    def test_enfileira_um_email_por_destinatario(self):
+        resposta = self.api.post('/api/usuarios/notificar/', {
+            'usuario_ids': [self.cliente.id, self.admin.id, self.cliente.id], 'assunto': 'Aviso', 'mensagem': 'Olá',
+        }, format='json')
+        self.assertEqual(resposta.status_code, 202)
+        self.assertEqual(resposta.data['enfileirados'], 2)
+        self.assertEqual(
+            sorted(Tarefa.objects.filter(nome='core.enviar_email').values_list('argumentos__usuario_id', flat=True)),
+            sorted([self.cliente.id, self.admin.id]),
+        )
+
+    def test_destinatarios_invalidos(self):
+        for usuario_ids in ([], 'todos', [1, '2'], [[1]]):
+            with self.subTest(usuario_ids=usuario_ids):
+                resposta = self.api.post('/api/usuarios/notificar/', {
+                    'usuario_ids': usuario_ids, 'assunto': 'Aviso', 'mensagem': 'Olá',
+                }, format='json')
+                self.assertEqual(resposta.status_code, 400)
+        self.assertFalse(Tarefa.objects.exists())
+
+    def test_somente_administradores(self):
+        self.api.force_authenticate(self.cliente)
+        resposta = self.api.post('/api/usuarios/notificar/', {
+            'usuario_ids': [self.cliente.id], 'assunto': 'Aviso', 'mensagem': 'Olá',
+        }, format='json')
+        self.assertEqual(resposta.status_code, 403)
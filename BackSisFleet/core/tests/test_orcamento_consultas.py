@@ -0,0 +1,314 @@
+from datetime import date
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+from cercas.models.cercas import CercaEletronica
+from cercas.services.cerca_service import CercaService
+from core.cache_representacao import CacheRepresentacao
+from core.jwt import MyTokenObtainPairSerializer
+from core.models import CustomUser
+from motoristas.models.motoristas import Motorista
+from tarefas.services.tarefa_service import TarefaService
+from telemetria.models import CheckIn, Telemetria
+from veiculos.models.veiculos import Veiculo
+from veiculos.service.agrupamento_service import AgrupamentoService
+
+SENHA = 'Senha@123'
+
+# Frotas de tamanho crescente: o número de consultas de cada endpoint não pode crescer junto
+TAMANHOS = (1, 10, 40)
+
+# Máximo de consultas por (nome da URL, método), para qualquer tamanho de frota
+ORCAMENTOS = {
+    ('admin:index', 'GET'): 3,
+    ('token_obtain_pair', 'POST'): 2,
+    ('token_refresh', 'POST'): 12,
+    ('token_verify', 'POST'): 1,
+    # LocMemCache nos testes: a lista negra vai ao banco em vez do filtro de Bloom
+    ('token_blacklist', 'POST'): 6,
+    ('hello', 'GET'): 0,
+    ('register', 'POST'): 3,
+    ('recuperar-senha', 'POST'): 1,
+    ('redefinir-senha', 'POST'): 2,
+    ('usuarios', 'GET'): 1,
+    ('usuarios-estatisticas', 'GET'): 1,
+    ('usuarios-exportar', 'GET'): 1,
+    # lote de 40: o SQLite limita os parâmetros por INSERT e o bulk_create divide em dois
+    ('usuarios-lote', 'POST'): 6,
+    # um bulk_create das tarefas de email; o envio roda no worker
+    ('usuarios-notificar', 'POST'): 1,
+    ('exportacao-bi', 'GET'): 0,
+    ('exportacao-bi-tabela', 'GET'): 1,
+    ('metricas', 'GET'): 0,
+    ('perfis', 'GET'): 0,
+    ('perfis', 'POST'): 0,
+    ('perfis', 'DELETE'): 0,
+    ('perfis-arquivo', 'GET'): 0,
+    ('teste', 'GET'): 0,
+    ('motoristas', 'GET'): 2,
+    ('motoristas', 'POST'): 3,
+    ('app_motoristas', 'GET'): 3,
+    ('motoristas_exportar', 'GET'): 1,
+    ('veiculos', 'GET'): 0,
+    ('veiculos', 'POST'): 3,
+    ('veiculos_clusters', 'GET'): 1,
+    ('veiculos_exportar', 'GET'): 1,
+    # só o INSERT da tarefa; o cadastro roda no worker
+    ('veiculos_importar', 'POST'): 1,
+    ('cercas', 'GET'): 1,
+    ('cercas', 'POST'): 1,
+    ('cercas', 'PUT'): 2,
+    ('cercas', 'DELETE'): 2,
+    ('consulta_cercas', 'POST'): 1,
+    ('telemetria_pontos', 'POST'): 11,
+    ('telemetria_checkins', 'POST'): 10,
+    ('tarefa', 'GET'): 1,
+}
+
+
+def _nomes_de_url(padroes, namespace=None):
+    """Nomes (com namespace) de todas as rotas do URLconf"""
+    for padrao in padroes:
+        if isinstance(padrao, URLResolver):
+            interno = ':'.join(filter(None, [namespace, padrao.namespace])) or None
+            yield from _nomes_de_url(padrao.url_patterns, interno)
+        elif isinstance(padrao, URLPattern) and padrao.name:
+            yield f'{namespace}:{padrao.name}' if namespace else padrao.name
+
+
+def _limpar_caches():
+    """Caches de processo e do Django: cada medição parte do caminho frio"""
+    for cache in caches.all():
+        cache.clear()
+    CacheRepresentacao.backend().clear()
+    AgrupamentoService._grades.clear()
+    CercaService._indices.clear()
+    CercaService._versoes.clear()
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    DETECTOR_CONSULTAS_ATIVO=True,
+    DETECTOR_CONSULTAS_ACAO='erro',
+    DETECTOR_CONSULTAS_LIMITE=5,
+)
+class OrcamentoConsultasTests(TestCase):
+    """
+    Orçamento de consultas por endpoint. Cada rota de SisFleet/urls.py é
+    chamada com frotas de 1, 10 e 40 motoristas (com veículos, cercas e
+    telemetria); o total de consultas do request, inclusive o corpo das
+    respostas em streaming, deve ficar dentro do orçamento em todos os
+    tamanhos. O DetectorConsultasMiddleware roda em modo 'erro', então um
+    N+1 também falha o teste com o formato e a origem da consulta repetida.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        hash_senha = make_password(SENHA)
+        cls.admin = CustomUser.objects.create(
+            username='admin', email='admin@sisfleet.com', password=hash_senha,
+            tipo_usuario='admin', is_staff=True, is_superuser=True,
+        )
+        cls.cliente = CustomUser.objects.create(
+            username='transportadora', email='cliente@sisfleet.com', password=hash_senha,
+            tipo_usuario='cliente', cpf_cnpj='11222333000181',
+        )
+        cls.usuario_motorista = CustomUser.objects.create(
+            username='motorista', email='motorista@sisfleet.com', password=hash_senha,
+            tipo_usuario='motorista', cpf_cnpj='52998224725',
+        )
+        cls.motorista = Motorista.objects.create(
+            usuario_fk=cls.usuario_motorista, responsavel_fk=cls.cliente, criado_por=cls.cliente,
+            atualizado_por=cls.cliente, cnh_numero='00000000000',
+        )
+        cls.veiculo = Veiculo.objects.create(
+            motorista=cls.motorista, placa='AAA0A00', marca='Volvo', modelo='FH 540',
+            criado_por=cls.cliente, atualizado_por=cls.cliente,
+            ultima_latitude=-23.55, ultima_longitude=-46.63, ultima_posicao_em=timezone.now(),
+        )
+        CercaEletronica.objects.create(
+            responsavel_fk=cls.cliente, nome='Cerca 0', criado_por=cls.cliente, atualizado_por=cls.cliente,
+            vertices=[[-23.6, -46.7], [-23.6, -46.5], [-23.4, -46.6]],
+        )
+        cls.frota = 1
+        cls.sequencia = 0
+
+    def _token(self, usuario):
+        return str(MyTokenObtainPairSerializer.get_token(usuario).access_token)
+
+    def _semear(self, tamanho):
+        """Completa a frota do cliente até `tamanho` motoristas, cada um com veículo, cerca e telemetria"""
+        inicio = type(self).frota
+        if tamanho <= inicio:
+            return
+        agora = timezone.now()
+        usuarios = CustomUser.objects.bulk_create([
+            CustomUser(
+                username=f'motorista{i}', email=f'motorista{i}@sisfleet.com', tipo_usuario='motorista',
+                cpf_cnpj=f'{i:011d}', nome_razao_social=f'Motorista {i}',
+            )
+            for i in range(inicio, tamanho)
+        ])
+        motoristas = Motorista.objects.bulk_create([
+            Motorista(
+                usuario_fk=usuario, responsavel_fk=self.cliente, criado_por=self.cliente,
+                atualizado_por=self.cliente, cnh_numero=f'{i:011d}', cnh_validade=date(2030, 1, 1),
+            )
+            for i, usuario in zip(range(inicio, tamanho), usuarios)
+        ])
+        veiculos = Veiculo.objects.bulk_create([
+            Veiculo(
+                motorista=motorista, placa=f'BBB{i:04d}', marca='Scania', modelo='R 450',
+                criado_por=self.cliente, atualizado_por=self.cliente,
+                ultima_latitude=-23.5 + i * 0.01, ultima_longitude=-46.6 + i * 0.01, ultima_posicao_em=agora,
+            )
+            for i, motorista in zip(range(inicio, tamanho), motoristas)
+        ])
+        CercaEletronica.objects.bulk_create([
+            CercaEletronica(
+                responsavel_fk=self.cliente, nome=f'Cerca {i}', criado_por=self.cliente, atualizado_por=self.cliente,
+                vertices=[[-23.6 + i * 0.01, -46.7], [-23.6 + i * 0.01, -46.5], [-23.4 + i * 0.01, -46.6]],
+            )
+            for i in range(inicio, tamanho)
+        ])
+        Telemetria.objects.bulk_create([
+            Telemetria(veiculo=veiculo, motorista=veiculo.motorista, registrado_em=agora, latitude=-23.5, longitude=-46.6)
+            for veiculo in veiculos
+        ])
+        CheckIn.objects.bulk_create([
+            CheckIn(veiculo=veiculo, motorista=veiculo.motorista, tipo=CheckIn.TIPOS[0][0], registrado_em=agora)
+            for veiculo in veiculos
+        ])
+        type(self).frota = tamanho
+
+    def _unico(self):
+        type(self).sequencia += 1
+        return type(self).sequencia
+
+    def _requisicoes(self, tamanho):
+        """(nome da URL, método, caminho, usuário autenticado, corpo) de cada endpoint"""
+        n = self._unico()
+        novo_motorista = CustomUser.objects.create(username=f'cnh{n}', cpf_cnpj=f'7{n:010d}', tipo_usuario='motorista')
+        cerca = CercaEletronica.objects.filter(responsavel_fk=self.cliente).order_by('-id').first()
+        tarefa = TarefaService.enfileirar('core.enviar_email', {
+            'usuario_id': self.cliente.id, 'assunto': 'Teste', 'mensagem': 'Teste',
+        }, criado_por_id=self.cliente.id)
+        refresh = MyTokenObtainPairSerializer.get_token(self.cliente)
+        recuperacao = AccessToken.for_user(self.usuario_motorista)
+        agora = timezone.now().isoformat()
+        pontos = [[-23.5 + i * 0.01, -46.6] for i in range(tamanho)]
+        itens = [
+            {'seq': i, 'registrado_em': agora, 'latitude': -23.5, 'longitude': -46.6, 'tipo': CheckIn.TIPOS[0][0]}
+            for i in range(tamanho)
+        ]
+        return [
+            ('admin:index', 'GET', '/admin/', 'sessao', None),
+            ('token_obtain_pair', 'POST', '/api/token/', None, {'username': 'transportadora', 'password': SENHA}),
+            ('token_refresh', 'POST', '/api/token/refresh/', None, {'refresh': str(refresh)}),
+            ('token_verify', 'POST', '/api/token/verify/', None, {'token': str(refresh.access_token)}),
+            ('token_blacklist', 'POST', '/api/token/blacklist/', None,
+             {'refresh': str(MyTokenObtainPairSerializer.get_token(self.cliente))}),
+            ('hello', 'GET', '/api/hello/', self.cliente, None),
+            ('register', 'POST', '/api/register/', None, {
+                'username': f'novo{n}', 'email': f'novo{n}@sisfleet.com', 'password': SENHA,
+                'cpf_cnpj': f'9{n:010d}', 'tipo_usuario': 'cliente',
+            }),
+            ('recuperar-senha', 'POST', '/api/recuperar-senha/', self.usuario_motorista, {'email': 'motorista@sisfleet.com'}),
+            ('redefinir-senha', 'POST', '/api/redefinir-senha/', self.usuario_motorista,
+             {'token': str(recuperacao), 'nova_senha': SENHA}),
+            ('usuarios', 'GET', '/api/usuarios/?limite=200', self.admin, None),
+            ('usuarios-estatisticas', 'GET', '/api/usuarios/estatisticas/', self.admin, None),
+            ('usuarios-exportar', 'GET', '/api/usuarios/exportar/', self.admin, None),
+            ('usuarios-lote', 'POST', '/api/usuarios/lote/', self.admin, {'usuarios': [
+                {'username': f'lote{n}_{i}', 'email': f'lote{n}_{i}@sisfleet.com', 'password': SENHA}
+                for i in range(tamanho)
+            ]}),
+            ('usuarios-notificar', 'POST', '/api/usuarios/notificar/', self.admin, {
+                'usuario_ids': [self.cliente.id + i for i in range(tamanho)], 'assunto': 'Aviso', 'mensagem': 'Manutenção programada',
+            }),
+            ('exportacao-bi', 'GET', '/api/exportar/', self.cliente, None),
+            ('exportacao-bi-tabela', 'GET', '/api/exportar/motoristas/', self.cliente, None),
+            ('metricas', 'GET', '/api/metricas/', self.admin, None),
+            ('perfis', 'GET', '/api/perfis/', self.admin, None),
+            ('perfis', 'POST', '/api/perfis/', self.admin, {'caminho': '/nenhuma-rota/', 'quantidade': 1}),
+            ('perfis', 'DELETE', '/api/perfis/', self.admin, None),
+            ('perfis-arquivo', 'GET', '/api/perfis/inexistente.prof/', self.admin, None),
+            ('teste', 'GET', '/home/teste/', self.cliente, None),
+            ('motoristas', 'GET', '/motoristas/', self.cliente, None),
+            ('motoristas', 'POST', '/motoristas/', self.cliente, {
+                'cpf_usuario': novo_motorista.cpf_cnpj, 'cnh_numero': f'8{n:010d}', 'cnh_validade': '2030-01-01',
+            }),
+            ('app_motoristas', 'GET', '/motoristas/app/', self.usuario_motorista, None),
+            ('motoristas_exportar', 'GET', '/motoristas/exportar/', self.cliente, None),
+            ('veiculos', 'GET', '/veiculos/', self.cliente, None),
+            ('veiculos', 'POST', '/veiculos/', self.cliente, {
+                'cpf_cnpj': '52998224725', 'placa': f'CCC{n:04d}', 'marca': 'Volvo', 'modelo': 'FH 460',
+            }),
+            ('veiculos_clusters', 'GET', '/veiculos/clusters/?bbox=-180,-90,180,90&zoom=4', self.cliente, None),
+            ('veiculos_exportar', 'GET', '/veiculos/exportar/', self.cliente, None),
+            ('veiculos_importar', 'POST', '/veiculos/importar/', self.cliente, {'veiculos': [
+                {'cpf_cnpj': '52998224725', 'placa': f'DDD{n:02d}{i:02d}', 'marca': 'Volvo', 'modelo': 'FH 460'}
+                for i in range(tamanho)
+            ]}),
+            ('cercas', 'GET', '/cercas/', self.cliente, None),
+            ('cercas', 'POST', '/cercas/', self.cliente, {
+                'nome': f'Nova {n}', 'vertices': [[-23.6, -46.7], [-23.6, -46.5], [-23.4, -46.6]],
+            }),
+            ('cercas', 'PUT', '/cercas/', self.cliente, {'id': cerca.id, 'nome': f'Alterada {n}'}),
+            ('cercas', 'DELETE', '/cercas/', self.cliente, {'id': cerca.id}),
+            ('consulta_cercas', 'POST', '/cercas/consulta/', self.cliente, {'pontos': pontos}),
+            ('telemetria_pontos', 'POST', '/telemetria/pontos/', self.usuario_motorista, {
+                'dispositivo_id': 'celular', 'lote_id': f'pontos{n}', 'veiculo': self.veiculo.id, 'itens': itens,
+            }),
+            ('telemetria_checkins', 'POST', '/telemetria/checkins/', self.usuario_motorista, {
+                'dispositivo_id': 'celular', 'lote_id': f'checkins{n}', 'veiculo': self.veiculo.id, 'itens': itens,
+            }),
+            ('tarefa', 'GET', f'/api/tarefas/{tarefa.id}/', self.cliente, None),
+        ]
+
+    def _chamar(self, metodo, caminho, usuario, corpo):
+        """Faz o request e consome o corpo (streaming incluído); devolve (status, consultas)"""
+        extra = {}
+        if usuario == 'sessao':
+            self.client.force_login(self.admin)
+        elif usuario is not None:
+            extra['HTTP_AUTHORIZATION'] = f'Bearer {self._token(usuario)}'
+        chamada = getattr(self.client, metodo.lower())
+
+        with CaptureQueriesContext(connection) as consultas:
+            if corpo is None:
+                resposta = chamada(caminho, **extra)
+            else:
+                resposta = chamada(caminho, data=corpo, content_type='application/json', **extra)
+            if resposta.streaming:
+                b''.join(resposta.streaming_content)
+        self.client.logout()
+        return resposta.status_code, consultas
+
+    def test_todas_as_rotas_tem_orcamento(self):
+        rotas = set(_nomes_de_url(get_resolver().url_patterns))
+        # Nenhum modelo é registrado no admin: das rotas do admin só o índice é medido
+        rotas = {rota for rota in rotas if not rota.startswith('admin:')} | {'admin:index'}
+        com_orcamento = {nome for nome, _ in ORCAMENTOS}
+        self.assertEqual(rotas - com_orcamento, set(), "Rotas sem orçamento de consultas em ORCAMENTOS")
+
+    def test_orcamento_de_consultas_por_endpoint(self):
+        for tamanho in TAMANHOS:
+            self._semear(tamanho)
+            for nome, metodo, caminho, usuario, corpo in self._requisicoes(tamanho):
+                with self.subTest(rota=nome, metodo=metodo, frota=tamanho):
+                    _limpar_caches()
+                    status, consultas = self._chamar(metodo, caminho, usuario, corpo)
+                    self.assertLess(status, 500)
+                    orcamento = ORCAMENTOS[(nome, metodo)]
+                    self.assertLessEqual(
+                        len(consultas), orcamento,
+                        f"{metodo} {caminho} (frota {tamanho}, status {status}): {len(consultas)} consultas, "
+                        f"orçamento {orcamento}:\n" + '\n'.join(consulta['sql'] for consulta in consultas),
+                    )
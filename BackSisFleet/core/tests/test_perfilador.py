@@ -0,0 +1,119 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from core import perfilador
+from core.perfilador import PerfiladorMiddleware
+from core.models import CustomUser
+
+
+class PerfisViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(username='admin', tipo_usuario='admin', cpf_cnpj='11222333000181', is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+        self.addCleanup(perfilador.desarmar)
+
+    def test_avisa_quando_o_cache_e_local(self):
+        resposta = self.api.post('/api/perfis/', {'caminho': '/api/motoristas/'}, format='json')
+        self.assertEqual(resposta.status_code, 201)
+        self.assertFalse(resposta.data['compartilhado'])
+        self.assertEqual(resposta.data['aviso'], perfilador.AVISO_CACHE_LOCAL)
+        self.assertFalse(self.api.get('/api/perfis/').data['armacao']['compartilhado'])
+
+    def test_sem_aviso_com_cache_compartilhado(self):
+        with mock.patch('core.perfilador.cache_compartilhado', return_value=True):
+            resposta = self.api.post('/api/perfis/', {'caminho': '/api/motoristas/'}, format='json')
+        self.assertEqual(resposta.status_code, 201)
+        self.assertTrue(resposta.data['compartilhado'])
+        self.assertNotIn('aviso', resposta.data)
+
+
+class PerfiladorMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        self.pasta = pasta.name
+        configuracao = override_settings(
+            PERFILADOR_DIRETORIO=self.pasta, PERFILADOR_VERIFICACAO_SEGUNDOS=0, PERFILADOR_TOKEN='segredo',
+        )
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+        self.addCleanup(perfilador.desarmar)
+        self.fabrica = RequestFactory()
+
+    def _atender(self, caminho='/api/motoristas/', metodo='get', duracao=0.0, **cabecalhos):
+        def get_response(request):
+            if duracao:
+                time.sleep(duracao)
+            return HttpResponse()
+        return PerfiladorMiddleware(get_response)(getattr(self.fabrica, metodo)(caminho, **cabecalhos))
+
+    def test_armacao_para_depois_da_quantidade(self):
+        perfilador.armar('/api/motoristas/', quantidade=2)
+        respostas = [self._atender() for _ in range(3)]
+        self.assertEqual(['X-Perfil' in resposta for resposta in respostas], [True, True, False])
+        self.assertIsNone(perfilador.situacao())
+        self.assertEqual(len(perfilador.listar_perfis()), 2)
+
+    def test_armacao_filtra_caminho_e_metodo(self):
+        perfilador.armar('/api/motoristas/', quantidade=5, metodo='post')
+        self.assertNotIn('X-Perfil', self._atender('/api/veiculos/', 'post'))
+        self.assertNotIn('X-Perfil', self._atender('/api/motoristas/', 'get'))
+        self.assertIn('X-Perfil', self._atender('/api/motoristas/', 'post'))
+        self.assertEqual(perfilador.situacao()['restantes'], 4)
+
+    def test_cabecalho_com_token(self):
+        resposta = self._atender(HTTP_X_PERFILAR='segredo')
+        self.assertTrue(resposta['X-Perfil'].endswith('.prof'))
+        self.assertTrue(os.path.getsize(perfilador.caminho_perfil(resposta['X-Perfil'])))
+        self.assertNotIn('X-Perfil', self._atender(HTTP_X_PERFILAR='errado'))
+        with override_settings(PERFILADOR_TOKEN=None):
+            self.assertNotIn('X-Perfil', self._atender(HTTP_X_PERFILAR='segredo'))
+
+    @override_settings(PERFILADOR_INTERVALO_AMOSTRAGEM=0.001)
+    def test_amostragem_grava_pilhas(self):
+        resposta = self._atender(duracao=0.05, HTTP_X_PERFILAR='segredo', HTTP_X_PERFILAR_MODO='amostragem')
+        self.assertTrue(resposta['X-Perfil'].endswith('.folded'))
+        with open(perfilador.caminho_perfil(resposta['X-Perfil']), encoding='utf-8') as arquivo:
+            self.assertIn('get_response', arquivo.read())
+
+    @override_settings(PERFILADOR_INTERVALO_AMOSTRAGEM=10)
+    def test_amostragem_sem_amostras_nao_grava_arquivo_vazio(self):
+        resposta = self._atender(HTTP_X_PERFILAR='segredo', HTTP_X_PERFILAR_MODO='amostragem')
+        self.assertNotIn('X-Perfil', resposta)
+        self.assertIn('nenhuma amostra', resposta['X-Perfil-Aviso'])
+        self.assertEqual(os.listdir(self.pasta), [])
+
+    @override_settings(PERFILADOR_MAX_ARQUIVOS=3)
+    def test_descartar_antigos_mantem_os_mais_recentes(self):
+        agora = time.time()
+        for indice in range(5):
+            caminho = os.path.join(self.pasta, f'perfil{indice}.prof')
+            open(caminho, 'w').close()
+            os.utime(caminho, (agora + indice, agora + indice))
+        open(os.path.join(self.pasta, 'anotacoes.txt'), 'w').close()
+        perfilador._descartar_antigos(self.pasta)
+        self.assertEqual(sorted(os.listdir(self.pasta)), ['anotacoes.txt', 'perfil2.prof', 'perfil3.prof', 'perfil4.prof'])
+
+    def test_caminho_perfil_recusa_fuga_do_diretorio(self):
+        open(os.path.join(self.pasta, 'valido.prof'), 'w').close()
+        with open(os.path.join(os.path.dirname(self.pasta), 'fora.prof'), 'w'):
+            pass
+        self.addCleanup(os.remove, os.path.join(os.path.dirname(self.pasta), 'fora.prof'))
+        self.assertEqual(perfilador.caminho_perfil('valido.prof'), os.path.join(self.pasta, 'valido.prof'))
+        for nome in ('../fora.prof', '..', '/etc/passwd', 'a/../valido.prof', 'settings.py', '', None, 'inexistente.prof'):
+            with self.subTest(nome=nome), self.assertRaises(perfilador.NotFoundError):
+                perfilador.caminho_perfil(nome)
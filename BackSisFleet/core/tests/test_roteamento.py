@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from core import roteamento
+from core.service.usuarios_service import UserService
+from core.roteamento import CABECALHO_PRIMARIO, FixarPrimarioMiddleware, gerar_token_primario, token_primario_valido
+
+
+@mock.patch('core.roteamento.alias_replica', return_value='replica')
+class FixarPrimarioMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        self.fabrica = RequestFactory()
+        self.estados = []
+
+    def _middleware(self, gravar=False):
+        def get_response(request):
+            estado = roteamento._estado_requisicao.get()
+            estado.escreveu = gravar
+            self.estados.append(estado)
+            return HttpResponse()
+        return FixarPrimarioMiddleware(get_response)
+
+    def _get(self, **cabecalhos):
+        request = self.fabrica.get('/api/veiculos/', **cabecalhos)
+        request.user = AnonymousUser()
+        return request
+
+    def test_gravacao_devolve_token_que_fixa_no_primario(self, _):
+        resposta = self._middleware(gravar=True)(self._get())
+        token = resposta[CABECALHO_PRIMARIO]
+        self._middleware()(self._get(HTTP_X_SISFLEET_PRIMARIO=token))
+        self.assertTrue(self.estados[-1].fixado)
+
+    def test_sem_token_le_da_replica(self, _):
+        resposta = self._middleware()(self._get())
+        self.assertNotIn(CABECALHO_PRIMARIO, resposta)
+        self.assertFalse(self.estados[-1].fixado)
+
+    def test_token_forjado_ou_vencido(self, _):
+        self.assertFalse(token_primario_valido('1:forjado:assinatura'))
+        self.assertFalse(token_primario_valido(''))
+        token = gerar_token_primario()
+        self.assertTrue(token_primario_valido(token))
+        with override_settings(REPLICA_FIXAR_SEGUNDOS=-1):
+            self.assertFalse(token_primario_valido(token))
+
+
+
+@mock.patch('core.roteamento.alias_replica', return_value='replica')
+class ExportacaoStreamingTests(SimpleTestCase):
+
+    def test_exportacao_de_usuarios_fixa_o_banco_antes_do_streaming(self, _):
+        escolhidos = []
+
+        def fixar(queryset):
+            # O banco amarrado é o da chamada; a réplica não existe nos testes, então o iterador usa o default
+            escolhidos.append(roteamento.fixar_banco(queryset).db)
+            return queryset.using('default')
+
+        with mock.patch('core.service.usuarios_service.fixar_banco', side_effect=fixar):
+            UserService.exportar_usuarios()
+        self.assertEqual(escolhidos, ['replica'])
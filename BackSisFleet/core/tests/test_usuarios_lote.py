@@ -0,0 +1,24 @@
+from django.contrib.auth.hashers import check_password
+from django.test import TestCase, override_settings
+from core.service.usuarios_service import BadRequestError, UserService
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class CriarUsuariosEmLoteTests(TestCase):
+
+    def test_senhas_iguais_tem_salts_diferentes(self):
+        usuarios = UserService.criar_usuarios_em_lote([
+            {'username': f'lote{i}', 'email': f'lote{i}@sisfleet.com', 'password': 'Senha@123'} for i in range(3)
+        ])
+        hashes = [usuario.password for usuario in usuarios]
+        self.assertEqual(len(set(hashes)), 3)
+        self.assertTrue(all(check_password('Senha@123', codificada) for codificada in hashes))
+
+    def test_sem_senha_fica_inutilizavel(self):
+        usuario, = UserService.criar_usuarios_em_lote([{'username': 'lote', 'email': 'lote@sisfleet.com'}])
+        self.assertFalse(usuario.has_usable_password())
+
+    def test_senha_que_nao_e_texto(self):
+        with self.assertRaises(BadRequestError) as erro:
+            UserService.criar_usuarios_em_lote([{'username': 'a', 'password': 'ok'}, {'username': 'b', 'password': 123}])
+        self.assertEqual(erro.exception.args[0], {1: {'password': "Senha deve ser um texto"}})
@@ -0,0 +1,121 @@
+# core/throttling.py
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle por token bucket, com um balde por IP e outro por identificador
+    (username, email ou cpf_cnpj enviado no corpo).
+
+    O balde de capacidade C e taxa r é contado em janelas de C/r segundos
+    com contadores atômicos do cache (add/incr, sem lock nem get/set): o uso
+    estimado é o contador da janela atual mais a fração ainda não
+    "reabastecida" do contador da anterior. Permite rajadas de até C e no
+    máximo r requisições por segundo na média, como o balde (sob saturação,
+    um pouco menos: C - 1 por janela). Com o cache compartilhado
+    de produção o limite vale para todos os processos.
+
+    O IP é o REMOTE_ADDR, ou o endereço de X-Forwarded-For posto pelo último
+    de NUM_PROXIES proxies confiáveis (REST_FRAMEWORK['NUM_PROXIES']); um
+    X-Forwarded-For enviado pelo cliente não troca de balde.
+
+    Um ataque de credential stuffing esgota apenas os baldes dos IPs e contas
+    atacados e é barrado antes do hash de senha e das consultas ao banco; os
+    demais usuários não sentem diferença de latência. A resposta é 429 com
+    Retry-After (calculado por wait()).
+
+    Configuração (settings): THROTTLE_BALDES = {escopo: {'ip': (capacidade,
+    tokens_por_segundo), 'identificador': (...)}} e THROTTLE_CACHE (alias do cache).
+    """
+
+    escopo = None
+    campos_identificador = ()
+
+    def _configuracao(self):
+        return settings.THROTTLE_BALDES[self.escopo]
+
+    def _identificador(self, request):
+        try:
+            dados = request.data
+        except Exception:
+            return None
+        if not hasattr(dados, 'get'):
+            return None
+        for campo in self.campos_identificador:
+            valor = dados.get(campo)
+            if valor:
+                return f"{campo}:{str(valor).strip().lower()}"
+        return None
+
+    def _incrementar(self, cache, chave, timeout):
+        cache.add(chave, 0, timeout=timeout)
+        try:
+            return cache.incr(chave)
+        except ValueError:
+            # Despejada entre o add e o incr
+            cache.add(chave, 1, timeout=timeout)
+            return 1
+
+    def _consumir(self, cache, chave, capacidade, taxa, agora):
+        """
+        Consome um token do balde. Retorna 0 se permitido, senão os segundos
+        até haver um token (e devolve o token consumido).
+        """
+        periodo = capacidade / taxa
+        janela, decorrido = divmod(agora, periodo)
+        fracao = decorrido / periodo
+        # Cada contador é lido durante a própria janela e a seguinte
+        atual = self._incrementar(cache, f'{chave}:{int(janela)}', math.ceil(2 * periodo) + 1)
+        anterior = cache.get(f'{chave}:{int(janela) - 1}', 0)
+        if anterior * (1 - fracao) + atual <= capacidade:
+            return 0
+
+        try:
+            cache.decr(f'{chave}:{int(janela)}')
+        except ValueError:
+            pass
+        if atual > capacidade:
+            # Só na próxima janela, quando a atual já tiver reabastecido o bastante
+            return (1 - fracao) * periodo + (1 - (capacidade - 1) / atual) * periodo
+        return (1 - (capacidade - atual) / anterior - fracao) * periodo
+
+    def allow_request(self, request, view):
+        cache = caches[getattr(settings, 'THROTTLE_CACHE', 'default')]
+        configuracao = self._configuracao()
+        baldes = [('ip', self.get_ident(request))]
+        identificador = self._identificador(request)
+        if identificador:
+            baldes.append(('identificador', identificador))
+
+        agora = time.time()
+        self.espera = 0
+        for tipo, valor in baldes:
+            resumo = hashlib.blake2b(str(valor).encode(), digest_size=12).hexdigest()
+            capacidade, taxa = configuracao[tipo]
+            espera = self._consumir(cache, f'throttle:{self.escopo}:{tipo}:{resumo}', capacidade, taxa, agora)
+            self.espera = max(self.espera, espera)
+        return self.espera == 0
+
+    def wait(self):
+        return math.ceil(self.espera) or None
+
+
+class LoginThrottle(TokenBucketThrottle):
+    escopo = 'login'
+    campos_identificador = ('username',)
+
+
+class CadastroThrottle(TokenBucketThrottle):
+    escopo = 'cadastro'
+    campos_identificador = ('email', 'cpf_cnpj', 'username')
+
+
+class RecuperacaoSenhaThrottle(TokenBucketThrottle):
+    escopo = 'recuperacao_senha'
+    campos_identificador = ('email', 'cpf_cnpj')
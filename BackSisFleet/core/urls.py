@@ -1,9 +1,19 @@
 from django.urls import path
-from .views import HelloView, RegisterView,SolicitarRecuperacaoSenhaView, RedefinirSenhaView
+from .views import HelloView, RegisterView,SolicitarRecuperacaoSenhaView, RedefinirSenhaView, EstatisticasUsuariosView, CriarUsuariosEmLoteView, NotificarUsuariosView, UsuariosView, ExportarUsuariosView, ExportacaoBIView, MetricasView, PerfisView, PerfilArquivoView
 
 urlpatterns = [
     path('hello/', HelloView.as_view(), name='hello'),
     path('register/', RegisterView.as_view(), name='register'),  # opcional
     path("recuperar-senha/", SolicitarRecuperacaoSenhaView.as_view(), name="recuperar-senha"),
     path("redefinir-senha/", RedefinirSenhaView.as_view(), name="redefinir-senha"),
+    path("usuarios/", UsuariosView.as_view(), name="usuarios"),
+    path("usuarios/estatisticas/", EstatisticasUsuariosView.as_view(), name="usuarios-estatisticas"),
+    path("usuarios/exportar/", ExportarUsuariosView.as_view(), name="usuarios-exportar"),
+    path("usuarios/lote/", CriarUsuariosEmLoteView.as_view(), name="usuarios-lote"),
+    path("usuarios/notificar/", NotificarUsuariosView.as_view(), name="usuarios-notificar"),
+    path("exportar/", ExportacaoBIView.as_view(), name="exportacao-bi"),
+    path("exportar/<str:tabela>/", ExportacaoBIView.as_view(), name="exportacao-bi-tabela"),
+    path("metricas/", MetricasView.as_view(), name="metricas"),
+    path("perfis/", PerfisView.as_view(), name="perfis"),
+    path("perfis/<str:nome>/", PerfilArquivoView.as_view(), name="perfis-arquivo"),
 ]
@@ -9,9 +9,28 @@ from rest_framework import status
 from rest_framework_simplejwt.tokens import AccessToken
 from datetime import timedelta
 from django.contrib.auth import get_user_model
+from .permissions import IsAdministrador
+from .hashing import gerar_hash_senha
+from .throttling import CadastroThrottle, RecuperacaoSenhaThrottle
+from common.utils.exportacao_csv import resposta_csv
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from . import perfilador
+from .metricas import CONTENT_TYPE_PROMETHEUS, PodeVerMetricas, TokenMetricasAuthentication, registro as registro_metricas
+from .authentication import JWTClaimsAuthentication
+from .service.exportacao_bi_service import ExportacaoBIService, DependenciaAusenteError, NotFoundError as TabelaNaoEncontradaError
+from .service.usuarios_service import UserService, BadRequestError
 
 User = get_user_model()
 
+
+def filtros_usuarios(parametros):
+    """Converte a query string nos filtros de UserService.listar_usuarios"""
+    filtros = {campo: parametros.get(campo) for campo in ('nome', 'cpf_cnpj', 'email', 'tipo_usuario', 'tipo_plano')}
+    is_verified = parametros.get('is_verified')
+    if is_verified is not None:
+        filtros['is_verified'] = is_verified.lower() in ('1', 'true', 'sim')
+    return filtros
+
 class HelloView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -23,6 +42,7 @@ class RegisterView(generics.CreateAPIView):
     queryset = CustomUser.objects.all()  
     permission_classes = [permissions.AllowAny]  
     serializer_class = RegisterSerializer
+    throttle_classes = [CadastroThrottle]
 
 
 class SolicitarRecuperacaoSenhaView(APIView):
@@ -30,6 +50,8 @@ class SolicitarRecuperacaoSenhaView(APIView):
     Solicita a recuperação de senha por email ou cpf_cnpj.
     Retorna um token JWT temporário (30 minutos).
     """
+    throttle_classes = [RecuperacaoSenhaThrottle]
+
     def post(self, request):
         email = request.data.get("email")
         cpf_cnpj = request.data.get("cpf_cnpj")
@@ -74,7 +96,200 @@ class RedefinirSenhaView(APIView):
         except Exception as e:
             return Response({"erro": f"Token inválido ou expirado: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
 
-        usuario.set_password(nova_senha)
-        usuario.save()
+        usuario.password = gerar_hash_senha(nova_senha)
+        usuario.save(update_fields=["password"])
 
         return Response({"mensagem": "Senha alterada com sucesso!"}, status=status.HTTP_200_OK)
+
+
+class EstatisticasUsuariosView(APIView):
+    """
+    Totais de usuários por tipo, plano e verificação (painel administrativo).
+    """
+    permission_classes = [IsAdministrador]
+
+    def get(self, request):
+        return Response(UserService.estatisticas_usuarios())
+
+
+class CriarUsuariosEmLoteView(APIView):
+    """
+    Cadastro em lote de usuários (painel administrativo).
+
+    Corpo esperado:
+        {"usuarios": [{"username": ..., "email": ..., "password": ...}, ...]}
+
+    O lote é gravado inteiro ou rejeitado inteiro; em caso de erro a resposta
+    traz os problemas indexados pela posição do usuário na lista.
+    """
+    permission_classes = [IsAdministrador]
+
+    def post(self, request):
+        try:
+            usuarios = UserService.criar_usuarios_em_lote(request.data.get('usuarios'))
+        except BadRequestError as e:
+            return Response({"erro": e.args[0]}, status=400)
+        return Response({"mensagem": "Usuários criados com sucesso", "criados": len(usuarios)}, status=201)
+
+
+class NotificarUsuariosView(APIView):
+    """
+    Envio de um aviso por email a usuários (painel administrativo).
+
+    Corpo esperado:
+        {"usuario_ids": [1, 2, ...], "assunto": ..., "mensagem": ...}
+
+    Os emails são enfileirados como tarefas ('core.enviar_email') e enviados
+    pelo worker; a resposta sai na hora, com a quantidade enfileirada.
+    """
+    permission_classes = [IsAdministrador]
+
+    def post(self, request):
+        try:
+            enfileirados = UserService.notificar_usuarios(
+                request.data.get('usuario_ids'), request.data.get('assunto'), request.data.get('mensagem'),
+            )
+        except BadRequestError as e:
+            return Response({"erro": str(e)}, status=400)
+        return Response({"mensagem": "Emails enfileirados", "enfileirados": enfileirados}, status=202)
+
+
+class UsuariosView(APIView):
+    """
+    Listagem de usuários (painel administrativo), paginada por cursor.
+        - nome: trecho do nome/razão social, do primeiro ou do último nome (sem diferenciar maiúsculas)
+    Parâmetros (query string):
+        - nome: parte do nome, razão social ou primeiro/último nome (sem diferenciar maiúsculas)
+        - cpf_cnpj: busca por prefixo
+        - email: endereço completo ou prefixo
+        - tipo_usuario, tipo_plano, is_verified: igualdade
+        - limite: usuários por página; cursor: 'proximo_cursor' da página anterior
+    """
+    permission_classes = [IsAdministrador]
+
+    def get(self, request):
+        parametros = request.query_params
+        filtros = filtros_usuarios(parametros)
+
+        try:
+            pagina = UserService.listar_usuarios_paginado(filtros, parametros.get('cursor'), parametros.get('limite'))
+        except BadRequestError as e:
+            return Response({"erro": str(e)}, status=400)
+        return Response(pagina)
+
+
+class ExportarUsuariosView(APIView):
+    """
+    Exporta os usuários em CSV (painel administrativo), gerado em streaming.
+
+    Aceita os mesmos filtros de busca da listagem (nome, cpf_cnpj, email,
+    tipo_usuario, tipo_plano, is_verified).
+    """
+    permission_classes = [IsAdministrador]
+
+    def get(self, request):
+        filtros = filtros_usuarios(request.query_params)
+
+        cabecalho, linhas = UserService.exportar_usuarios(filtros)
+        return resposta_csv('usuarios.csv', cabecalho, linhas)
+
+
+class ExportacaoBIView(APIView):
+    """
+    Exportação das tabelas da frota em Parquet para ferramentas de BI.
+
+    GET /api/exportar/ lista as tabelas disponíveis; GET /api/exportar/<tabela>/
+    devolve o arquivo .parquet, gerado em streaming um row group por vez.
+    Clientes exportam a própria frota; o administrador exporta tudo.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def _responsavel(self, usuario):
+        if usuario.tipo_usuario == 'admin' or usuario.is_staff:
+            return None
+        return usuario.id
+
+    def get(self, request, tabela=None):
+        usuario = request.user
+        if usuario.tipo_usuario == 'motorista':
+            return Response({"mensagem": "Você não tem acesso a esta funcionalidade."}, status=403)
+
+        responsavel_id = self._responsavel(usuario)
+        if tabela is None:
+            return Response({"tabelas": ExportacaoBIService.tabelas_disponiveis(responsavel_id)})
+
+        try:
+            blocos = ExportacaoBIService.gerar_parquet(tabela, responsavel_id)
+        except TabelaNaoEncontradaError as e:
+            return Response({"erro": str(e)}, status=404)
+        except DependenciaAusenteError as e:
+            return Response({"erro": str(e)}, status=501)
+
+        resposta = StreamingHttpResponse(blocos, content_type='application/vnd.apache.parquet')
+        resposta['Content-Disposition'] = f'attachment; filename="{tabela}.parquet"'
+        resposta['Cache-Control'] = 'no-store'
+        return resposta
+
+
+class MetricasView(APIView):
+    """
+    Métricas no formato de texto do Prometheus: latência, status, consultas e
+    tempo de banco por view e método, e duração dos métodos de serviço. Com
+    METRICAS_DIRETORIO, somadas entre todos os workers.
+
+    Acesso com 'Authorization: Bearer <METRICAS_TOKEN>' (coletor) ou JWT de administrador.
+    """
+    authentication_classes = [TokenMetricasAuthentication, JWTClaimsAuthentication]
+    permission_classes = [PodeVerMetricas]
+
+    def get(self, request):
+        return HttpResponse(registro_metricas.exportar(), content_type=CONTENT_TYPE_PROMETHEUS)
+
+
+class PerfisView(APIView):
+    """
+    Perfilador sob demanda (core.perfilador), somente administradores.
+
+    GET lista a armação atual e os perfis gravados; POST arma o perfilador para
+    os próximos N requests de um caminho; DELETE desarma. Sem cache
+    compartilhado a armação vale só para o worker que atendeu o POST, e a
+    resposta traz um aviso.
+    """
+    permission_classes = [IsAdministrador]
+
+    def get(self, request):
+        return Response({"armacao": perfilador.situacao(), "perfis": perfilador.listar_perfis()})
+
+    def post(self, request):
+        try:
+            armacao = perfilador.armar(
+                request.data.get("caminho"),
+                quantidade=request.data.get("quantidade", 1),
+                modo=request.data.get("modo", "cprofile"),
+                metodo=request.data.get("metodo"),
+                validade_segundos=request.data.get("validade_segundos", 3600),
+            )
+        except perfilador.BadRequestError as e:
+            return Response({"erro": str(e)}, status=400)
+        if not armacao['compartilhado']:
+            armacao = dict(armacao, aviso=perfilador.AVISO_CACHE_LOCAL)
+        return Response(armacao, status=201)
+
+    def delete(self, request):
+        perfilador.desarmar()
+        return Response({"mensagem": "Perfilador desarmado."})
+
+
+class PerfilArquivoView(APIView):
+    """
+    Download de um perfil gravado: .prof (pstats, snakeviz) ou .folded
+    (pilhas colapsadas para flamegraph.pl/speedscope).
+    """
+    permission_classes = [IsAdministrador]
+
+    def get(self, request, nome):
+        try:
+            caminho = perfilador.caminho_perfil(nome)
+        except perfilador.NotFoundError as e:
+            return Response({"erro": str(e)}, status=404)
+        return FileResponse(open(caminho, 'rb'), as_attachment=True, filename=nome, content_type='application/octet-stream')
@@ -0,0 +1,47 @@
+import os
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from motoristas.services.motorista_service import MotoristaService
+
+
+class Command(BaseCommand):
+    help = "Calcula a pontuação semanal de segurança dos motoristas a partir da telemetria."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semana', help="Qualquer data da semana a calcular (YYYY-MM-DD). Padrão: semana anterior.")
+        parser.add_argument('--processos', type=int, default=os.cpu_count() or 1, help="Tamanho do pool de processos.")
+        parser.add_argument('--tamanho-lote', type=int, default=500, help="Motoristas por lote enviado a cada processo.")
+        parser.add_argument('--em-segundo-plano', action='store_true',
+                            help="Só enfileira o cálculo para o worker_tarefas e retorna.")
+
+    def handle(self, *args, **options):
+        semana = None
+        if options['semana']:
+            try:
+                semana = datetime.strptime(options['semana'], "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError("Formato inválido para --semana. Use YYYY-MM-DD.")
+
+        if options['em_segundo_plano']:
+            tarefa = MotoristaService.agendar_pontuacao_semana(semana, processos=max(1, options['processos']))
+            self.stdout.write(self.style.SUCCESS(f"Tarefa {tarefa} enfileirada"))
+            return
+
+        try:
+            from motoristas.services.pontuacao_service import PontuacaoService
+        except ImportError as e:
+            raise CommandError(f"O cálculo da pontuação requer numpy instalado: {e}")
+
+        semana_inicio = PontuacaoService.inicio_semana(semana)
+        inicio = time.perf_counter()
+        total = PontuacaoService.calcular_semana(
+            semana_inicio,
+            processos=max(1, options['processos']),
+            tamanho_lote=max(1, options['tamanho_lote']),
+        )
+        duracao = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"Semana de {semana_inicio.isoformat()}: {total} motoristas pontuados em {duracao:.1f}s"
+        ))
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.23 on 2026-10-19 02:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('motoristas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PontuacaoMotorista',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semana_inicio', models.DateField()),
+                ('pontuacao', models.FloatField()),
+                ('freadas_bruscas', models.IntegerField(default=0)),
+                ('aceleracoes_bruscas', models.IntegerField(default=0)),
+                ('segundos_excesso_velocidade', models.IntegerField(default=0)),
+                ('segundos_noturnos', models.IntegerField(default=0)),
+                ('distancia_km', models.FloatField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('motorista', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pontuacoes', to='motoristas.motorista')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='pontuacaomotorista',
+            constraint=models.UniqueConstraint(fields=('motorista', 'semana_inicio'), name='pontuacao_motorista_semana_unica'),
+        ),
+    ]
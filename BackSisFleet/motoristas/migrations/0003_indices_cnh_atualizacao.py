@@ -0,0 +1,25 @@
+# Generated by Django 4.2.23 on 2026-10-19 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('motoristas', '0002_pontuacaomotorista_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='motorista',
+            index=models.Index(fields=['cnh_numero'], name='motorista_cnh_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='motorista',
+            index=models.Index(fields=['cnh_validade'], name='motorista_cnh_validade_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='motorista',
+            index=models.Index(fields=['updated_at'], name='motorista_atualizacao_idx'),
+        ),
+    ]
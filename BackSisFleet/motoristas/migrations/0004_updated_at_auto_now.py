@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('motoristas', '0003_indices_cnh_atualizacao'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='motorista',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,2 @@
+from motoristas.models.motoristas import Motorista
+from motoristas.models.pontuacao import PontuacaoMotorista
\ No newline at end of file
@@ -4,6 +4,7 @@ from django.conf import settings
 from django.utils import timezone
 from django.utils import formats
 from datetime import datetime
+from common.utils.converte_data_para_string import converter_data_para_string
 
 class Motorista(models.Model):
     """
@@ -39,7 +40,17 @@ class Motorista(models.Model):
     criado_por = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, related_name='motorista_criado_por', null=True)
     atualizado_por = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, related_name='motorista_atualizado_por', null=True)
     created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(default=timezone.now)
+    # auto_now: todo save() muda a versão usada pelo CacheRepresentacao
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Busca por CNH, filtro de validade da CNH e consultas por data de atualização;
+        # sem eles cada consulta varre a tabela (python manage.py consultas_lentas)
+        indexes = [
+            models.Index(fields=['cnh_numero'], name='motorista_cnh_idx'),
+            models.Index(fields=['cnh_validade'], name='motorista_cnh_validade_idx'),
+            models.Index(fields=['updated_at'], name='motorista_atualizacao_idx'),
+        ]
 
     def __str__(self):
         return self.usuario_fk.username if self.usuario_fk else ''
@@ -66,7 +77,4 @@ class Motorista(models.Model):
         }
     
     def formatar_data(self, data):
-        if data and isinstance(data, str):
-            # Se for uma string, converte para datetime
-            data = datetime.strptime(data, "%Y-%m-%d")
-        return data.strftime("%Y-%m-%d %H:%M:%S") if data else None
+        return converter_data_para_string(data)
@@ -0,0 +1,50 @@
+from django.db import models
+from django.utils import timezone
+from motoristas.models.motoristas import Motorista
+
+
+class PontuacaoMotorista(models.Model):
+    """
+    Pontuação semanal de segurança do motorista, calculada em lote a partir da telemetria.
+
+    Campos:
+    - motorista: Motorista avaliado.
+    - semana_inicio: Segunda-feira da semana avaliada.
+    - pontuacao: Nota de 0 a 100 (100 = nenhuma ocorrência).
+    - freadas_bruscas: Quantidade de eventos de frenagem brusca.
+    - aceleracoes_bruscas: Quantidade de eventos de aceleração brusca.
+    - segundos_excesso_velocidade: Tempo total acima do limite da via.
+    - segundos_noturnos: Tempo total dirigindo entre 22h e 5h.
+    - distancia_km: Distância estimada percorrida na semana.
+    - created_at: Data e hora do cálculo.
+    """
+
+    motorista = models.ForeignKey(Motorista, on_delete=models.CASCADE, related_name='pontuacoes')
+    semana_inicio = models.DateField()
+    pontuacao = models.FloatField()
+    freadas_bruscas = models.IntegerField(default=0)
+    aceleracoes_bruscas = models.IntegerField(default=0)
+    segundos_excesso_velocidade = models.IntegerField(default=0)
+    segundos_noturnos = models.IntegerField(default=0)
+    distancia_km = models.FloatField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['motorista', 'semana_inicio'], name='pontuacao_motorista_semana_unica'),
+        ]
+
+    def __str__(self):
+        return f"{self.motorista_id} - {self.semana_inicio}: {self.pontuacao:.1f}"
+
+    def to_dict(self):
+        return {
+            'motorista': self.motorista_id,
+            'semana_inicio': self.semana_inicio.isoformat() if self.semana_inicio else None,
+            'pontuacao': round(self.pontuacao, 1),
+            'freadas_bruscas': self.freadas_bruscas,
+            'aceleracoes_bruscas': self.aceleracoes_bruscas,
+            'segundos_excesso_velocidade': self.segundos_excesso_velocidade,
+            'segundos_noturnos': self.segundos_noturnos,
+            'distancia_km': round(self.distancia_km, 2),
+        }
@@ -1,10 +1,15 @@
 # motorista_manager.py
+from datetime import timedelta
 from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseNotFound
 from django.db import IntegrityError
 from django.utils import timezone
 from core.models import CustomUser
 from motoristas.models.motoristas import Motorista
 from django.db.models import Q
+from core.roteamento import fixar_banco, leitura_replica
+from core.cache_representacao import CacheRepresentacao
+from core.metricas import medir_servico
+from tarefas.services.tarefa_service import TarefaService
 
 class MotoristaError(Exception):
     """Exceção base para erros relacionados ao motorista."""
@@ -18,6 +23,15 @@ class NotFoundError(MotoristaError):
 class InternalServerError(MotoristaError):
     """Exceção para erros internos do servidor (código HTTP 500)."""
 
+REPRESENTACOES_MOTORISTA = CacheRepresentacao(
+    Motorista,
+    # to_dict inclui o usuário do motorista e o username de quem criou/atualizou
+    campos_versao=['updated_at', 'usuario_fk__atualizado_em', 'criado_por__atualizado_em', 'atualizado_por__atualizado_em'],
+    serializar=lambda motorista: motorista.to_dict(),
+)
+
+
+@medir_servico
 class MotoristaService:
     
     @classmethod
@@ -64,7 +78,6 @@ class MotoristaService:
             dados_comuns['criado_por'] = usuario_criador
             dados_comuns['atualizado_por'] = usuario_criador
             dados_comuns['created_at'] = timezone.now()
-            dados_comuns['updated_at'] = timezone.now()
 
             # Validações
             if dados_comuns['cnh_validade'] and dados_comuns['cnh_validade'] < timezone.now().date():
@@ -112,7 +125,6 @@ class MotoristaService:
                     setattr(motorista, field, value)
             
             motorista.atualizado_por = usuario_atualizador
-            motorista.updated_at = timezone.now()
             motorista.save()
             
             return motorista
@@ -190,19 +202,17 @@ class MotoristaService:
             Motorista: Objeto do motorista ou None se não encontrado
         """
         try:
-            # Busca o usuário pelo CPF
-            usuario = CustomUser.objects.filter(cpf_cnpj=cpf, tipo_usuario='motorista').first()
-            if not usuario:
-                return None
-            
-            # Busca o motorista associado a esse usuário
-            return Motorista.objects.filter(usuario_fk=usuario).first()
+            # Uma consulta só, já com o usuário e quem criou/atualizou (usados em to_dict)
+            return Motorista.objects.filter(
+                usuario_fk__cpf_cnpj=cpf, usuario_fk__tipo_usuario='motorista'
+            ).select_related('usuario_fk', 'criado_por', 'atualizado_por').order_by('id').first()
         
         except Exception:
             return None
 
     
     @classmethod
+    @leitura_replica
     def listar_motoristas(cls, filtros=None):
         """
         Lista motoristas com filtros opcionais
@@ -254,6 +264,7 @@ class MotoristaService:
         return queryset.select_related('usuario_fk', 'responsavel_fk', 'criado_por', 'atualizado_por')
     
     @classmethod
+    @leitura_replica
     def listar_motoristas_por_responsavel(cls, responsavel_id):
         """
         Lista todos os motoristas de um determinado responsável.
@@ -267,10 +278,45 @@ class MotoristaService:
 
         motoristas = Motorista.objects.filter(responsavel_fk_id=responsavel_id).select_related(
             'usuario_fk', 'responsavel_fk', 'criado_por', 'atualizado_por'
-        )
+        ).order_by('id')
+
+        # Só os motoristas alterados desde a última listagem são serializados de novo
+        return REPRESENTACOES_MOTORISTA.representar(motoristas)
+
+    CAMPOS_EXPORTACAO = [
+        ('id', 'id'),
+        ('usuario', 'usuario_fk__username'),
+        ('nome', 'usuario_fk__nome_razao_social'),
+        ('cpf', 'usuario_fk__cpf_cnpj'),
+        ('email', 'usuario_fk__email'),
+        ('telefone', 'usuario_fk__telefone'),
+        ('data_nascimento', 'data_nascimento'),
+        ('cnh_numero', 'cnh_numero'),
+        ('cnh_categoria', 'cnh_categoria'),
+        ('cnh_validade', 'cnh_validade'),
+        ('validade_toxicologico', 'validade_toxicologico'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ]
+
+    @classmethod
+    @leitura_replica
+    def exportar_motoristas_por_responsavel(cls, responsavel_id, tamanho_chunk=2000):
+        """
+        Linhas para exportação dos motoristas de um responsável, lidas sob demanda.
+
+        Args:
+            responsavel_id (int): ID do usuário responsável.
+            tamanho_chunk (int): Linhas buscadas no banco por vez.
 
-        motoristas = [cls.to_dict(motorista) for motorista in motoristas]
-        return motoristas
+        Returns:
+            tuple: (cabeçalho, iterador de tuplas)
+        """
+        # As linhas são lidas durante o streaming, depois do retorno: o banco é escolhido aqui
+        linhas = fixar_banco(Motorista.objects.filter(responsavel_fk_id=responsavel_id)).order_by('id').values_list(
+            *[campo for _, campo in cls.CAMPOS_EXPORTACAO]
+        ).iterator(chunk_size=tamanho_chunk)
+        return [coluna for coluna, _ in cls.CAMPOS_EXPORTACAO], linhas
 
     @classmethod
     def deletar_motorista(cls, motorista_id):
@@ -323,6 +369,43 @@ class MotoristaService:
         except NotFoundError:
             return False
     
+    @classmethod
+    def agendar_verificacao_vencimentos(cls, dias=30):
+        """
+        Enfileira a varredura de CNHs e toxicológicos a vencer, que avisa cada
+        responsável por email. Uma por dia: chamadas repetidas enquanto a do
+        dia estiver na fila devolvem a mesma tarefa.
+
+        Args:
+            dias (int): Antecedência do aviso
+
+        Returns:
+            Tarefa: Tarefa enfileirada
+        """
+        return TarefaService.enfileirar(
+            'motoristas.verificar_vencimentos', {'dias': dias},
+            chave=f"motoristas.verificar_vencimentos:{timezone.localdate().isoformat()}",
+        )
+
+    @classmethod
+    def agendar_pontuacao_semana(cls, semana_inicio=None, processos=1):
+        """
+        Enfileira o cálculo da pontuação semanal de segurança (PontuacaoService).
+
+        Args:
+            semana_inicio (date): Qualquer data da semana (padrão: semana anterior)
+            processos (int): Pool do cálculo dentro do worker
+
+        Returns:
+            Tarefa: Tarefa enfileirada (ou a já pendente para a mesma semana)
+        """
+        # Segunda-feira, como em PontuacaoService.inicio_semana: datas da mesma semana dão a mesma chave
+        semana = (semana_inicio - timedelta(days=semana_inicio.weekday())).isoformat() if semana_inicio else None
+        return TarefaService.enfileirar(
+            'motoristas.calcular_pontuacao_semana', {'semana_inicio': semana, 'processos': processos},
+            chave=f"motoristas.calcular_pontuacao_semana:{semana or 'anterior'}",
+        )
+
     @classmethod
     def to_dict(cls, motorista):
         """
@@ -0,0 +1,226 @@
+# motoristas/services/pontuacao_service.py
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time, timedelta
+from itertools import repeat
+
+import numpy as np
+from django.db import connections
+from django.utils import timezone
+from motoristas.models.pontuacao import PontuacaoMotorista
+from telemetria.models.telemetria import Telemetria
+
+# Limiares dos eventos (m/s²) e parâmetros do cálculo
+LIMIAR_FREADA_BRUSCA = -3.0
+LIMIAR_ACELERACAO_BRUSCA = 3.0
+LIMITE_VELOCIDADE_PADRAO = 110.0  # km/h, usado quando o ponto não traz o limite da via
+INTERVALO_MAXIMO = 30.0  # segundos; intervalos maiores são lacunas de sinal e não entram nas contas
+HORA_INICIO_NOTURNO = 22
+HORA_FIM_NOTURNO = 5
+
+# Penalidades: eventos por 100 km e fração do tempo de direção
+PENALIDADE_FREADA = 2.0
+PENALIDADE_ACELERACAO = 1.5
+PENALIDADE_EXCESSO_VELOCIDADE = 40.0
+PENALIDADE_NOTURNO = 10.0
+
+
+def _contar_eventos(mascara):
+    """Conta sequências contíguas de True (um evento por sequência, não por amostra)."""
+    inicio = mascara & ~np.concatenate(([False], mascara[:-1]))
+    return int(np.count_nonzero(inicio))
+
+
+def calcular_componentes(tempos, velocidades, limites, deslocamento_utc=0):
+    """
+    Calcula os componentes da pontuação a partir das séries de um motorista.
+
+    Args:
+        tempos (ndarray): Instantes em segundos (epoch), em ordem crescente
+        velocidades (ndarray): Velocidades em km/h
+        limites (ndarray): Limite da via em km/h (NaN quando desconhecido)
+        deslocamento_utc (int): Deslocamento do fuso local em segundos
+
+    Returns:
+        dict: Eventos, tempos (s) e distância (km) da série
+    """
+    componentes = {
+        'freadas_bruscas': 0,
+        'aceleracoes_bruscas': 0,
+        'segundos_excesso_velocidade': 0,
+        'segundos_noturnos': 0,
+        'segundos_direcao': 0.0,
+        'distancia_km': 0.0,
+    }
+    if len(tempos) < 2:
+        return componentes
+
+    velocidades = np.nan_to_num(velocidades, nan=0.0)
+    limites = np.where(np.isnan(limites), LIMITE_VELOCIDADE_PADRAO, limites)
+
+    intervalos = np.diff(tempos)
+    validos = (intervalos > 0) & (intervalos <= INTERVALO_MAXIMO)
+    intervalos_validos = np.where(validos, intervalos, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        aceleracoes = np.where(validos, np.diff(velocidades / 3.6) / intervalos, 0.0)
+
+    horas_locais = ((tempos[:-1] + deslocamento_utc) // 3600) % 24
+    noturno = (horas_locais >= HORA_INICIO_NOTURNO) | (horas_locais < HORA_FIM_NOTURNO)
+    em_excesso = velocidades[:-1] > limites[:-1]
+
+    componentes['freadas_bruscas'] = _contar_eventos(aceleracoes <= LIMIAR_FREADA_BRUSCA)
+    componentes['aceleracoes_bruscas'] = _contar_eventos(aceleracoes >= LIMIAR_ACELERACAO_BRUSCA)
+    componentes['segundos_excesso_velocidade'] = int(intervalos_validos[em_excesso].sum())
+    componentes['segundos_noturnos'] = int(intervalos_validos[noturno].sum())
+    componentes['segundos_direcao'] = float(intervalos_validos.sum())
+    componentes['distancia_km'] = float((intervalos_validos * (velocidades[:-1] + velocidades[1:]) / 2).sum() / 3600)
+    return componentes
+
+
+def calcular_pontuacao(componentes):
+    """Converte os componentes em uma nota de 0 a 100."""
+    fator_distancia = 100.0 / max(componentes['distancia_km'], 1.0)
+    segundos_direcao = max(componentes['segundos_direcao'], 1.0)
+
+    penalidade = (
+        componentes['freadas_bruscas'] * fator_distancia * PENALIDADE_FREADA
+        + componentes['aceleracoes_bruscas'] * fator_distancia * PENALIDADE_ACELERACAO
+        + componentes['segundos_excesso_velocidade'] / segundos_direcao * PENALIDADE_EXCESSO_VELOCIDADE
+        + componentes['segundos_noturnos'] / segundos_direcao * PENALIDADE_NOTURNO
+    )
+    return float(min(100.0, max(0.0, 100.0 - penalidade)))
+
+
+def _pontuar_lote(motorista_ids, inicio, fim):
+    """
+    Carrega a telemetria de um lote de motoristas numa única consulta e
+    devolve as linhas de pontuação. Roda dentro dos processos do pool.
+    """
+    linhas = Telemetria.objects.filter(
+        motorista_id__in=motorista_ids,
+        registrado_em__gte=inicio,
+        registrado_em__lt=fim,
+    ).order_by('motorista_id', 'registrado_em').values_list(
+        'motorista_id', 'registrado_em', 'velocidade', 'limite_velocidade'
+    )
+
+    ids, tempos, velocidades, limites = [], [], [], []
+    for motorista_id, registrado_em, velocidade, limite in linhas.iterator(chunk_size=5000):
+        ids.append(motorista_id)
+        tempos.append(registrado_em.timestamp())
+        velocidades.append(velocidade)
+        limites.append(limite)
+
+    if not ids:
+        return []
+
+    ids = np.asarray(ids, dtype=np.int64)
+    tempos = np.asarray(tempos, dtype=np.float64)
+    velocidades = np.asarray(velocidades, dtype=np.float64)
+    limites = np.asarray(limites, dtype=np.float64)
+    deslocamento_utc = int(timezone.localtime(inicio).utcoffset().total_seconds())
+
+    # Fronteiras entre motoristas na série ordenada
+    cortes = np.flatnonzero(np.diff(ids)) + 1
+    inicios = np.concatenate(([0], cortes))
+    fins = np.concatenate((cortes, [len(ids)]))
+
+    resultado = []
+    for a, b in zip(inicios, fins):
+        componentes = calcular_componentes(tempos[a:b], velocidades[a:b], limites[a:b], deslocamento_utc)
+        componentes['pontuacao'] = calcular_pontuacao(componentes)
+        componentes['motorista_id'] = int(ids[a])
+        resultado.append(componentes)
+    return resultado
+
+
+def _inicializar_worker():
+    import django
+    django.setup()
+    # Conexões herdadas do processo pai não podem ser compartilhadas
+    connections.close_all()
+
+
+class PontuacaoService:
+    """
+    Cálculo em lote da pontuação semanal de segurança dos motoristas.
+    """
+
+    CAMPOS_PONTUACAO = [
+        'pontuacao', 'freadas_bruscas', 'aceleracoes_bruscas',
+        'segundos_excesso_velocidade', 'segundos_noturnos', 'distancia_km',
+    ]
+
+    @classmethod
+    def inicio_semana(cls, data=None):
+        """Retorna a segunda-feira da semana de `data` (padrão: semana anterior à atual)"""
+        if data is None:
+            data = timezone.localdate() - timedelta(days=7)
+        return data - timedelta(days=data.weekday())
+
+    @classmethod
+    def _gravar(cls, semana_inicio, linhas):
+        pontuacoes = [
+            PontuacaoMotorista(
+                motorista_id=linha['motorista_id'],
+                semana_inicio=semana_inicio,
+                created_at=timezone.now(),
+                **{campo: linha[campo] for campo in cls.CAMPOS_PONTUACAO},
+            )
+            for linha in linhas
+        ]
+        PontuacaoMotorista.objects.bulk_create(
+            pontuacoes,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['motorista', 'semana_inicio'],
+            update_fields=cls.CAMPOS_PONTUACAO + ['created_at'],
+        )
+
+    @classmethod
+    def calcular_semana(cls, semana_inicio=None, processos=None, tamanho_lote=500):
+        """
+        Calcula e grava a pontuação de todos os motoristas com telemetria na semana.
+
+        Os motoristas são divididos em lotes e cada lote é pontuado num processo
+        do pool; a gravação fica no processo principal, em bulk.
+
+        Args:
+            semana_inicio (date): Segunda-feira da semana (padrão: semana anterior)
+            processos (int): Tamanho do pool (1 = executa no próprio processo)
+            tamanho_lote (int): Motoristas por lote
+
+        Returns:
+            int: Quantidade de motoristas pontuados
+        """
+        semana_inicio = cls.inicio_semana(semana_inicio)
+        inicio = timezone.make_aware(datetime.combine(semana_inicio, time.min))
+        fim = inicio + timedelta(days=7)
+
+        motorista_ids = list(
+            Telemetria.objects.filter(registrado_em__gte=inicio, registrado_em__lt=fim, motorista__isnull=False)
+            .order_by('motorista_id').values_list('motorista_id', flat=True).distinct()
+        )
+        lotes = [motorista_ids[i:i + tamanho_lote] for i in range(0, len(motorista_ids), tamanho_lote)]
+
+        total = 0
+        if processos == 1 or len(lotes) <= 1:
+            for lote in lotes:
+                linhas = _pontuar_lote(lote, inicio, fim)
+                cls._gravar(semana_inicio, linhas)
+                total += len(linhas)
+            return total
+
+        metodo = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=processos,
+            mp_context=multiprocessing.get_context(metodo),
+            initializer=_inicializar_worker,
+        ) as executor:
+            for linhas in executor.map(_pontuar_lote, lotes, repeat(inicio), repeat(fim)):
+                cls._gravar(semana_inicio, linhas)
+                total += len(linhas)
+        return total
+
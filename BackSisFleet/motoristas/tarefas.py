@@ -0,0 +1,67 @@
+# motoristas/tarefas.py
+from datetime import date, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from motoristas.models.motoristas import Motorista
+from tarefas.registro import tarefa
+from tarefas.services.tarefa_service import TarefaService
+
+
+@tarefa('motoristas.verificar_vencimentos')
+def verificar_vencimentos(dias=30):
+    """
+    Varre CNHs e exames toxicológicos vencidos ou que vencem nos próximos
+    `dias` dias e enfileira um email por responsável com a lista dos seus
+    motoristas ('core.enviar_email').
+
+    Returns:
+        dict: Motoristas encontrados e emails enfileirados
+    """
+    hoje = timezone.localdate()
+    limite = hoje + timedelta(days=dias)
+    linhas = (
+        Motorista.objects.filter(Q(cnh_validade__lte=limite) | Q(validade_toxicologico__lte=limite), responsavel_fk__isnull=False)
+        .order_by('responsavel_fk_id', 'id')
+        .values_list('responsavel_fk_id', 'usuario_fk__nome_razao_social', 'usuario_fk__username',
+                     'cnh_validade', 'validade_toxicologico')
+    )
+
+    por_responsavel = {}
+    for responsavel_id, nome, username, cnh_validade, validade_toxicologico in linhas.iterator(chunk_size=2000):
+        avisos = []
+        for documento, validade in (('CNH', cnh_validade), ('Toxicológico', validade_toxicologico)):
+            if validade and validade <= limite:
+                situacao = 'vencido' if validade < hoje else 'vence'
+                avisos.append(f"{documento} {situacao} em {validade.strftime('%d/%m/%Y')}")
+        por_responsavel.setdefault(responsavel_id, []).append(f"- {nome or username}: {'; '.join(avisos)}")
+
+    emails = TarefaService.enfileirar_muitas('core.enviar_email', [
+        {
+            'usuario_id': responsavel_id,
+            'assunto': f"SisFleet: {len(avisos)} motorista(s) com documentos a vencer",
+            'mensagem': f"Documentos vencidos ou que vencem até {limite.strftime('%d/%m/%Y')}:\n\n" + '\n'.join(avisos),
+        }
+        for responsavel_id, avisos in por_responsavel.items()
+    ])
+    return {'motoristas': sum(len(avisos) for avisos in por_responsavel.values()), 'emails': emails}
+
+
+@tarefa('motoristas.calcular_pontuacao_semana', prioridade=-5, max_tentativas=3)
+def calcular_pontuacao_semana(semana_inicio=None, processos=1):
+    """
+    Pontuação semanal de segurança (PontuacaoService.calcular_semana).
+
+    Args:
+        semana_inicio (str): Qualquer data da semana (YYYY-MM-DD); padrão: semana anterior
+        processos (int): Pool do cálculo dentro do worker
+
+    Returns:
+        dict: Semana calculada e motoristas pontuados
+    """
+    # numpy só é necessário no worker que executa o cálculo
+    from motoristas.services.pontuacao_service import PontuacaoService
+
+    semana = PontuacaoService.inicio_semana(date.fromisoformat(semana_inicio) if semana_inicio else None)
+    total = PontuacaoService.calcular_semana(semana, processos=processos)
+    return {'semana_inicio': semana.isoformat(), 'motoristas': total}
@@ -0,0 +1,97 @@
+import numpy as np
+from django.test import SimpleTestCase
+from motoristas.services.pontuacao_service import (
+    LIMITE_VELOCIDADE_PADRAO, _contar_eventos, calcular_componentes, calcular_pontuacao,
+)
+
+# Meio-dia UTC: fora do horário noturno
+MEIO_DIA = 12 * 3600.0
+
+
+def _serie(velocidades, inicio=MEIO_DIA, passo=1.0, limites=None):
+    velocidades = np.asarray(velocidades, dtype=float)
+    tempos = inicio + np.arange(len(velocidades)) * passo
+    if limites is None:
+        limites = np.full(len(velocidades), np.nan)
+    return tempos, velocidades, np.asarray(limites, dtype=float)
+
+
+class ContarEventosTests(SimpleTestCase):
+
+    def test_uma_contagem_por_sequencia(self):
+        mascara = np.array([False, True, True, False, True, False, True, True, True])
+        self.assertEqual(_contar_eventos(mascara), 3)
+
+    def test_sequencia_no_inicio(self):
+        self.assertEqual(_contar_eventos(np.array([True, True, False])), 1)
+        self.assertEqual(_contar_eventos(np.array([], dtype=bool)), 0)
+
+
+class CalcularComponentesTests(SimpleTestCase):
+
+    def test_velocidade_constante(self):
+        componentes = calcular_componentes(*_serie([36.0] * 101))
+        self.assertAlmostEqual(componentes['distancia_km'], 1.0)
+        self.assertEqual(componentes['segundos_direcao'], 100.0)
+        self.assertEqual(componentes['freadas_bruscas'], 0)
+        self.assertEqual(componentes['aceleracoes_bruscas'], 0)
+        self.assertEqual(componentes['segundos_noturnos'], 0)
+
+    def test_freada_e_aceleracao_bruscas(self):
+        # 72 -> 36 km/h em 1 s: -10 m/s², duas amostras seguidas contam uma freada
+        componentes = calcular_componentes(*_serie([72, 54, 36, 36, 36, 72, 72]))
+        self.assertEqual(componentes['freadas_bruscas'], 1)
+        self.assertEqual(componentes['aceleracoes_bruscas'], 1)
+
+    def test_lacuna_de_sinal_nao_entra(self):
+        tempos, velocidades, limites = _serie([36.0] * 3)
+        tempos[2] += 3600
+        componentes = calcular_componentes(tempos, velocidades, limites)
+        self.assertEqual(componentes['segundos_direcao'], 1.0)
+        self.assertEqual(componentes['freadas_bruscas'], 0)
+
+    def test_excesso_pelo_limite_da_via_ou_padrao(self):
+        acima_do_padrao = LIMITE_VELOCIDADE_PADRAO + 10
+        componentes = calcular_componentes(*_serie([acima_do_padrao] * 11))
+        self.assertEqual(componentes['segundos_excesso_velocidade'], 10)
+        componentes = calcular_componentes(*_serie([60.0] * 11, limites=[50.0] * 11))
+        self.assertEqual(componentes['segundos_excesso_velocidade'], 10)
+
+    def test_horario_noturno_no_fuso_local(self):
+        # 01:00 UTC é 22:00 em UTC-3
+        componentes = calcular_componentes(*_serie([36.0] * 11, inicio=3600.0), deslocamento_utc=-3 * 3600)
+        self.assertEqual(componentes['segundos_noturnos'], 10)
+        componentes = calcular_componentes(*_serie([36.0] * 11, inicio=3600.0 * 9), deslocamento_utc=-3 * 3600)
+        self.assertEqual(componentes['segundos_noturnos'], 0)
+
+    def test_serie_curta_ou_com_nan(self):
+        self.assertEqual(calcular_componentes(*_serie([50.0]))['distancia_km'], 0.0)
+        componentes = calcular_componentes(*_serie([np.nan, 36.0, 36.0]))
+        self.assertGreater(componentes['distancia_km'], 0)
+
+
+class CalcularPontuacaoTests(SimpleTestCase):
+
+    def _componentes(self, **valores):
+        base = {
+            'freadas_bruscas': 0, 'aceleracoes_bruscas': 0, 'segundos_excesso_velocidade': 0,
+            'segundos_noturnos': 0, 'segundos_direcao': 3600.0, 'distancia_km': 100.0,
+        }
+        return {**base, **valores}
+
+    def test_sem_eventos_nota_maxima(self):
+        self.assertEqual(calcular_pontuacao(self._componentes()), 100.0)
+
+    def test_penalidades_por_100_km_e_por_fracao_do_tempo(self):
+        # 1 freada em 100 km (2), 1 aceleração (1,5), 10% em excesso (4) e 50% noturno (5)
+        componentes = self._componentes(
+            freadas_bruscas=1, aceleracoes_bruscas=1, segundos_excesso_velocidade=360, segundos_noturnos=1800,
+        )
+        self.assertAlmostEqual(calcular_pontuacao(componentes), 100 - 2 - 1.5 - 4 - 5)
+
+    def test_nota_limitada_a_zero(self):
+        self.assertEqual(calcular_pontuacao(self._componentes(freadas_bruscas=1000)), 0.0)
+
+    def test_distancia_curta_nao_explode(self):
+        # Menos de 1 km conta como 1 km
+        self.assertEqual(calcular_pontuacao(self._componentes(freadas_bruscas=1, distancia_km=0.01)), 0.0)
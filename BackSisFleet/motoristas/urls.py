@@ -1,8 +1,10 @@
 from django.urls import path
 from .views.motoristas import MotoristasView
 from .views.app_motoristas import AppMotoristasView
+from .views.exportacao import ExportarMotoristasView
 
 urlpatterns = [
     path('', MotoristasView.as_view(), name='motoristas'),
     path('app/', AppMotoristasView.as_view(), name='app_motoristas'),
+    path('exportar/', ExportarMotoristasView.as_view(), name='motoristas_exportar'),
 ]
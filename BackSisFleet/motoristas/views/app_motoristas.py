@@ -25,7 +25,6 @@ class AppMotoristasView(APIView):
             Response: JSON com a lista de motoristas ou mensagem de erro caso não permitido.
         """
         usuario = request.user 
-        print(usuario.to_dict())
         if usuario.tipo_usuario == 'motorista':
             motorista = MotoristaService.obter_motorista_por_cpf(usuario.cpf_cnpj)
             veiculo = VeiculoService.obter_veiculos_por_motorista(motorista.id)
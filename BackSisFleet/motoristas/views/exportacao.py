@@ -0,0 +1,26 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from common.utils.exportacao_csv import resposta_csv
+from motoristas.services.motorista_service import MotoristaService
+
+
+class ExportarMotoristasView(APIView):
+    """
+    Exporta em CSV os motoristas do usuário responsável.
+
+    O arquivo é gerado em streaming a partir do banco, sem montar a lista
+    em memória, então funciona igual para frotas de qualquer tamanho.
+
+    Permissões:
+        - Somente usuários autenticados do tipo 'cliente'.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        usuario = request.user
+        if usuario.tipo_usuario != 'cliente':
+            return Response({"mensagem": "Você não tem acesso a esta funcionalidade."}, status=403)
+
+        cabecalho, linhas = MotoristaService.exportar_motoristas_por_responsavel(usuario.id)
+        return resposta_csv('motoristas.csv', cabecalho, linhas)
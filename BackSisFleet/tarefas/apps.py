@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class TarefasConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'tarefas'
+
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+
+        # Registra as tarefas declaradas em <app>/tarefas.py (motoristas, veiculos, core...)
+        autodiscover_modules('tarefas')
@@ -0,0 +1,54 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from tarefas.registro import TAREFAS
+from tarefas.services.tarefa_service import BadRequestError, TarefaService
+
+
+class Command(BaseCommand):
+    help = (
+        "Enfileira uma tarefa registrada para o worker_tarefas (ex.: no cron, "
+        "'motoristas.verificar_vencimentos' uma vez por dia). Com --purgar remove "
+        "as tarefas concluídas antigas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('nome', nargs='?', help="Nome da tarefa. Sem nome, lista as registradas.")
+        parser.add_argument('--argumentos', default='{}', help="Argumentos nomeados em JSON.")
+        parser.add_argument('--prioridade', type=int, help="Sobrepõe a prioridade padrão da tarefa.")
+        parser.add_argument('--atraso', type=float, default=0, help="Segundos até a tarefa ficar disponível.")
+        parser.add_argument('--chave', help="Chave de deduplicação: não enfileira se houver tarefa ativa com ela.")
+        parser.add_argument('--purgar', type=int, metavar='DIAS',
+                            help="Remove as tarefas concluídas há mais de DIAS dias.")
+
+    def handle(self, *args, **options):
+        if options['purgar'] is not None:
+            removidas = TarefaService.purgar_concluidas(max(0, options['purgar']))
+            self.stdout.write(self.style.SUCCESS(f"{removidas} tarefas concluídas removidas"))
+            if not options['nome']:
+                return
+
+        if not options['nome']:
+            for nome, definicao in sorted(TAREFAS.items()):
+                self.stdout.write(f"{nome}  (prioridade {definicao.prioridade}, {definicao.max_tentativas} tentativas)")
+            return
+
+        try:
+            argumentos = json.loads(options['argumentos'])
+        except ValueError as e:
+            raise CommandError(f"--argumentos não é um JSON válido: {e}")
+        if not isinstance(argumentos, dict):
+            raise CommandError("--argumentos deve ser um objeto JSON")
+
+        try:
+            tarefa = TarefaService.enfileirar(
+                options['nome'], argumentos,
+                prioridade=options['prioridade'],
+                executar_em=timezone.now() + timedelta(seconds=max(0, options['atraso'])),
+                chave=options['chave'],
+            )
+        except BadRequestError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Tarefa {tarefa} enfileirada"))
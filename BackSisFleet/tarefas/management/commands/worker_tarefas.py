@@ -0,0 +1,113 @@
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from tarefas.services.tarefa_service import TarefaService
+
+
+class _Parada:
+    """
+    Pedido de parada vindo de um sinal. Só uma flag: o handler roda entre
+    instruções do laço principal, e tomar um lock ali (Event.set) pode travar
+    se o laço estiver segurando o mesmo lock.
+    """
+
+    def __init__(self):
+        self.pedida = False
+
+    def pedir(self, *_):
+        self.pedida = True
+
+    def dormir(self, segundos):
+        """Espera `segundos` em fatias curtas, acordando logo depois de um pedido de parada"""
+        limite = time.monotonic() + segundos
+        while not self.pedida and time.monotonic() < limite:
+            time.sleep(max(0.0, min(0.1, limite - time.monotonic())))
+
+
+def _trabalhar(intervalo, lote, uma_vez):
+    """Laço de um processo do pool: reivindica, executa, repete; dorme quando a fila está vazia"""
+    import django
+    django.setup()
+    # Conexões herdadas do processo pai não podem ser compartilhadas
+    connections.close_all()
+    # O Ctrl+C do terminal chega a todo o grupo; quem decide parar é o pai, que repassa SIGTERM
+    parada = _Parada()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, parada.pedir)
+
+    trabalhador = f"{socket.gethostname()}:{os.getpid()}"
+    while not parada.pedida:
+        close_old_connections()
+        tarefas = TarefaService.reivindicar(trabalhador, lote)
+        # Um pedido de parada no meio do lote deixa as tarefas já reivindicadas terminarem
+        for tarefa in tarefas:
+            TarefaService.executar(tarefa, trabalhador)
+        if uma_vez and not tarefas:
+            break
+        if not tarefas:
+            parada.dormir(intervalo)
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa as tarefas em segundo plano (app tarefas) num pool de processos. Cada "
+        "processo reivindica tarefas prontas da fila no banco (SKIP LOCKED no Postgres), "
+        "executa e grava o resultado; falhas voltam para a fila com backoff. SIGTERM ou "
+        "Ctrl+C terminam as tarefas em andamento antes de sair."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processos', type=int, default=os.cpu_count() or 1, help="Tamanho do pool de processos.")
+        parser.add_argument('--intervalo', type=float, default=1.0, help="Segundos de espera quando a fila está vazia.")
+        parser.add_argument('--lote', type=int, default=1,
+                            help="Tarefas reivindicadas por vez em cada processo (tarefas curtas: lotes maiores).")
+        parser.add_argument('--uma-vez', action='store_true', help="Esvazia a fila e sai (cron, testes).")
+
+    def handle(self, *args, **options):
+        processos = max(1, options['processos'])
+        argumentos = (max(0.1, options['intervalo']), max(1, options['lote']), options['uma_vez'])
+
+        metodo = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+        contexto = multiprocessing.get_context(metodo)
+        connections.close_all()
+
+        def iniciar(indice):
+            processo = contexto.Process(target=_trabalhar, args=argumentos, name=f'worker-tarefas-{indice}')
+            processo.start()
+            return processo
+
+        parada = _Parada()
+        signal.signal(signal.SIGTERM, parada.pedir)
+        signal.signal(signal.SIGINT, parada.pedir)
+
+        pool = [iniciar(indice) for indice in range(processos)]
+        self.stdout.write(f"{processos} processo(s) executando tarefas (pids {', '.join(str(p.pid) for p in pool)})")
+
+        while not parada.pedida:
+            vivos = 0
+            for indice, processo in enumerate(pool):
+                if processo.is_alive():
+                    vivos += 1
+                elif not options['uma_vez']:
+                    # Processo que morreu (OOM, segfault numa extensão...) é substituído;
+                    # a tarefa que ele segurava volta à fila depois do lease
+                    self.stderr.write(f"Processo {processo.pid} terminou com código {processo.exitcode}; reiniciando")
+                    pool[indice] = iniciar(indice)
+                    vivos += 1
+            if not vivos:
+                break
+            parada.dormir(1.0)
+
+        # SIGTERM para os processos: cada um termina o que está executando e sai
+        for processo in pool:
+            if processo.is_alive():
+                processo.terminate()
+        for processo in pool:
+            processo.join()
+        self.stdout.write(self.style.SUCCESS("Worker encerrado"))
@@ -0,0 +1 @@
+from tarefas.models.tarefa import Tarefa
@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from common.utils.converte_data_para_string import converter_data_para_string
+
+
+class Tarefa(models.Model):
+    """
+    Trabalho em segundo plano, gravado no banco e executado pelo worker
+    (python manage.py worker_tarefas).
+
+    Campos:
+    - nome: Nome da tarefa registrada com @tarefa (ex.: 'motoristas.verificar_vencimentos').
+    - argumentos: Argumentos nomeados da função (JSON).
+    - estado: pendente, executando, concluida ou falhou (esgotou as tentativas).
+    - prioridade: Maior executa antes.
+    - chave: Opcional; impede duas tarefas com a mesma chave pendentes/executando ao mesmo tempo.
+    - tentativas/max_tentativas: Execuções feitas e o limite antes de desistir.
+    - executar_em: Não executa antes deste instante (agendamento e backoff entre tentativas).
+    - bloqueado_por/bloqueado_em: Worker que reivindicou a tarefa e quando; se o worker
+      morrer, a tarefa volta a ser reivindicável depois de TAREFAS_LEASE_SEGUNDOS.
+    - resultado: Retorno da função (JSON), quando concluída.
+    - ultimo_erro: Exceção da última tentativa que falhou.
+    - criado_por: Usuário que originou a tarefa (pode ser nulo para tarefas do sistema).
+    """
+    PENDENTE = 'pendente'
+    EXECUTANDO = 'executando'
+    CONCLUIDA = 'concluida'
+    FALHOU = 'falhou'
+    ESTADOS = [
+        (PENDENTE, 'Pendente'),
+        (EXECUTANDO, 'Executando'),
+        (CONCLUIDA, 'Concluída'),
+        (FALHOU, 'Falhou'),
+    ]
+
+    nome = models.CharField(max_length=100)
+    argumentos = models.JSONField(default=dict, blank=True)
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDENTE)
+    prioridade = models.IntegerField(default=0)
+    chave = models.CharField(max_length=200, null=True, blank=True)
+    tentativas = models.PositiveIntegerField(default=0)
+    max_tentativas = models.PositiveIntegerField(default=5)
+    executar_em = models.DateTimeField(default=timezone.now)
+    bloqueado_por = models.CharField(max_length=100, null=True, blank=True)
+    bloqueado_em = models.DateTimeField(null=True, blank=True)
+    resultado = models.JSONField(null=True, blank=True)
+    ultimo_erro = models.TextField(null=True, blank=True)
+    criado_por = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, related_name='tarefas', null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+    concluida_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Reivindicação: pendentes prontas, da maior prioridade para a menor
+            models.Index(fields=['estado', '-prioridade', 'executar_em'], name='tarefa_fila_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['chave'],
+                condition=Q(estado__in=['pendente', 'executando']),
+                name='tarefa_chave_ativa_unica',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.nome} #{self.id} ({self.estado})"
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'nome': self.nome,
+            'argumentos': self.argumentos,
+            'estado': self.estado,
+            'prioridade': self.prioridade,
+            'tentativas': self.tentativas,
+            'max_tentativas': self.max_tentativas,
+            'executar_em': self.formatar_data(self.executar_em),
+            'resultado': self.resultado,
+            'ultimo_erro': self.ultimo_erro,
+            'created_at': self.formatar_data(self.created_at),
+            'concluida_em': self.formatar_data(self.concluida_em) if self.concluida_em else None,
+        }
+
+    def formatar_data(self, data):
+        return converter_data_para_string(data)
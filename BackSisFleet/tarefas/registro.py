@@ -0,0 +1,41 @@
+# tarefas/registro.py
+from django.core.exceptions import ImproperlyConfigured
+
+# nome -> Definicao; preenchido pelos módulos <app>/tarefas.py (TarefasConfig.ready)
+TAREFAS = {}
+
+
+class Definicao:
+    """Função registrada como tarefa e os padrões usados ao enfileirá-la."""
+
+    __slots__ = ('nome', 'funcao', 'prioridade', 'max_tentativas')
+
+    def __init__(self, nome, funcao, prioridade, max_tentativas):
+        self.nome = nome
+        self.funcao = funcao
+        self.prioridade = prioridade
+        self.max_tentativas = max_tentativas
+
+
+def tarefa(nome, prioridade=0, max_tentativas=5):
+    """
+    Decorador que registra uma função como tarefa de segundo plano.
+
+    A função recebe só argumentos nomeados serializáveis em JSON e o que ela
+    devolve (também JSON) fica em Tarefa.resultado. Uma exceção conta como
+    tentativa falha: a tarefa volta para a fila com backoff até esgotar
+    `max_tentativas`.
+
+    Args:
+        nome (str): Nome único, prefixado pelo app (ex.: 'motoristas.verificar_vencimentos')
+        prioridade (int): Prioridade padrão (maior executa antes)
+        max_tentativas (int): Execuções antes de marcar como falhou
+    """
+    def registrar(funcao):
+        existente = TAREFAS.get(nome)
+        if existente is not None and existente.funcao.__qualname__ != funcao.__qualname__:
+            raise ImproperlyConfigured(f"Tarefa '{nome}' registrada duas vezes")
+        TAREFAS[nome] = Definicao(nome, funcao, prioridade, max_tentativas)
+        return funcao
+
+    return registrar
@@ -0,0 +1,315 @@
+# tarefas/services/tarefa_service.py
+import json
+import logging
+import random
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from core.metricas import medir_servico
+from tarefas.models import Tarefa
+from tarefas.registro import TAREFAS
+
+logger = logging.getLogger(__name__)
+
+
+class TarefaError(Exception):
+    """Exceção base para erros relacionados às tarefas."""
+
+
+class BadRequestError(TarefaError):
+    """Exceção para erros de solicitação inválida (código HTTP 400)."""
+
+
+class NotFoundError(TarefaError):
+    """Exceção para erros de recurso não encontrado (código HTTP 404)."""
+
+
+ORDEM_FILA = ('-prioridade', 'executar_em', 'id')
+
+
+class RenovacaoLease:
+    """
+    Renova o lease de uma tarefa em execução: numa thread à parte, a cada
+    terço de TAREFAS_LEASE_SEGUNDOS, regrava bloqueado_em enquanto a tarefa
+    continuar reservada por `trabalhador`. Sem isso, uma tarefa mais longa
+    que o lease seria reivindicada por outro worker e rodaria duas vezes ao
+    mesmo tempo. Se o worker morrer, a thread morre junto e o lease expira.
+    """
+
+    def __init__(self, tarefa_id, trabalhador, intervalo=None):
+        self.tarefa_id = tarefa_id
+        self.trabalhador = trabalhador
+        self.intervalo = intervalo or getattr(settings, 'TAREFAS_LEASE_SEGUNDOS', 600) / 3
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, name=f'lease-tarefa-{tarefa_id}', daemon=True)
+
+    def renovar(self):
+        """Regrava bloqueado_em; False se a tarefa já não está reservada por este worker"""
+        return Tarefa.objects.filter(
+            id=self.tarefa_id, bloqueado_por=self.trabalhador, estado=Tarefa.EXECUTANDO,
+        ).update(bloqueado_em=timezone.now()) > 0
+
+    def _executar(self):
+        try:
+            while not self._parar.wait(self.intervalo):
+                try:
+                    if not self.renovar():
+                        break
+                except DatabaseError:
+                    # Banco indisponível por um instante: tenta de novo no próximo intervalo
+                    logger.warning("Tarefa #%s: falha ao renovar o lease", self.tarefa_id, exc_info=True)
+        finally:
+            # A conexão é desta thread
+            connection.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._parar.set()
+        self._thread.join()
+
+
+@medir_servico
+class TarefaService:
+
+    @classmethod
+    def _definicao(cls, nome):
+        definicao = TAREFAS.get(nome)
+        if definicao is None:
+            raise BadRequestError(f"Tarefa '{nome}' não registrada")
+        return definicao
+
+    @classmethod
+    def _nova(cls, nome, argumentos, prioridade, executar_em, max_tentativas, chave, criado_por_id):
+        definicao = cls._definicao(nome)
+        argumentos = argumentos or {}
+        try:
+            json.dumps(argumentos)
+        except (TypeError, ValueError) as e:
+            raise BadRequestError(f"Argumentos da tarefa '{nome}' não são serializáveis em JSON: {e}")
+        agora = timezone.now()
+        return Tarefa(
+            nome=nome,
+            argumentos=argumentos,
+            prioridade=definicao.prioridade if prioridade is None else prioridade,
+            max_tentativas=definicao.max_tentativas if max_tentativas is None else max_tentativas,
+            executar_em=executar_em or agora,
+            chave=chave,
+            criado_por_id=criado_por_id,
+            created_at=agora,
+            updated_at=agora,
+        )
+
+    @classmethod
+    def enfileirar(cls, nome, argumentos=None, prioridade=None, executar_em=None, max_tentativas=None,
+                   chave=None, criado_por_id=None):
+        """
+        Enfileira uma tarefa registrada com @tarefa.
+
+        Gravada na transação corrente: se a transação de quem enfileira for
+        desfeita, a tarefa também some.
+
+        Args:
+            nome (str): Nome da tarefa registrada
+            argumentos (dict): Argumentos nomeados (JSON)
+            prioridade (int): Sobrepõe a prioridade padrão da tarefa
+            executar_em (datetime): Não executa antes deste instante
+            max_tentativas (int): Sobrepõe o limite padrão da tarefa
+            chave (str): Deduplicação; se já houver tarefa ativa com a chave, ela é devolvida
+            criado_por_id (int): Usuário que originou a tarefa
+
+        Returns:
+            Tarefa: Tarefa criada (ou a já existente com a mesma chave)
+
+        Raises:
+            BadRequestError: Tarefa não registrada ou argumentos não serializáveis
+        """
+        tarefa = cls._nova(nome, argumentos, prioridade, executar_em, max_tentativas, chave, criado_por_id)
+        if chave:
+            existente = cls._ativa_por_chave(chave)
+            if existente is not None:
+                return existente
+            try:
+                with transaction.atomic():
+                    tarefa.save()
+            except IntegrityError:
+                # Outro processo enfileirou a mesma chave entre a consulta e o INSERT
+                existente = cls._ativa_por_chave(chave)
+                if existente is None:
+                    raise
+                return existente
+            return tarefa
+        tarefa.save()
+        return tarefa
+
+    @classmethod
+    def _ativa_por_chave(cls, chave):
+        return Tarefa.objects.filter(chave=chave, estado__in=[Tarefa.PENDENTE, Tarefa.EXECUTANDO]).first()
+
+    @classmethod
+    def enfileirar_muitas(cls, nome, lista_argumentos, prioridade=None, executar_em=None, criado_por_id=None):
+        """
+        Enfileira a mesma tarefa para cada item de `lista_argumentos` (fan-out)
+        em bulk_create, sem chave de deduplicação.
+
+        Returns:
+            int: Quantidade de tarefas enfileiradas
+        """
+        tarefas = [
+            cls._nova(nome, argumentos, prioridade, executar_em, None, None, criado_por_id)
+            for argumentos in lista_argumentos
+        ]
+        Tarefa.objects.bulk_create(tarefas, batch_size=1000)
+        return len(tarefas)
+
+    @classmethod
+    def obter_tarefa(cls, tarefa_id):
+        try:
+            return Tarefa.objects.get(id=tarefa_id)
+        except Tarefa.DoesNotExist:
+            raise NotFoundError(f"Tarefa {tarefa_id} não encontrada")
+
+    @classmethod
+    def _prontas(cls, agora):
+        lease = timedelta(seconds=getattr(settings, 'TAREFAS_LEASE_SEGUNDOS', 600))
+        return (
+            Q(estado=Tarefa.PENDENTE, executar_em__lte=agora)
+            # Worker que morreu no meio: a tarefa volta depois do lease
+            | Q(estado=Tarefa.EXECUTANDO, bloqueado_em__lt=agora - lease)
+        )
+
+    @classmethod
+    def reivindicar(cls, trabalhador, quantidade=1):
+        """
+        Reserva para `trabalhador` até `quantidade` tarefas prontas, da maior
+        prioridade para a menor.
+
+        No Postgres (e em bancos com SKIP LOCKED) usa SELECT ... FOR UPDATE
+        SKIP LOCKED: workers concorrentes pegam linhas diferentes sem esperar
+        uns pelos outros. No SQLite, que trava o banco inteiro na escrita, cada
+        candidata é reservada com um UPDATE condicionado ao estado lido; se
+        outro worker chegou antes, o UPDATE não altera nada e a candidata é
+        descartada.
+
+        Args:
+            trabalhador (str): Identificador do worker (host:pid)
+            quantidade (int): Máximo de tarefas reservadas
+
+        Returns:
+            list: Tarefas reservadas (estado 'executando', tentativas já incrementadas)
+        """
+        agora = timezone.now()
+        reserva = {
+            'estado': Tarefa.EXECUTANDO,
+            'bloqueado_por': trabalhador,
+            'bloqueado_em': agora,
+            'tentativas': F('tentativas') + 1,
+            'updated_at': agora,
+        }
+
+        if connection.features.has_select_for_update_skip_locked:
+            with transaction.atomic():
+                ids = list(
+                    Tarefa.objects.select_for_update(skip_locked=True)
+                    .filter(cls._prontas(agora)).order_by(*ORDEM_FILA)
+                    .values_list('id', flat=True)[:quantidade]
+                )
+                if ids:
+                    Tarefa.objects.filter(id__in=ids).update(**reserva)
+        else:
+            ids = []
+            candidatas = (
+                Tarefa.objects.filter(cls._prontas(agora)).order_by(*ORDEM_FILA)
+                .values_list('id', 'estado', 'bloqueado_em')[:quantidade * 4]
+            )
+            for tarefa_id, estado, bloqueado_em in candidatas:
+                if len(ids) == quantidade:
+                    break
+                reservada = Tarefa.objects.filter(id=tarefa_id, estado=estado, bloqueado_em=bloqueado_em).update(**reserva)
+                if reservada:
+                    ids.append(tarefa_id)
+
+        if not ids:
+            return []
+        return list(Tarefa.objects.filter(id__in=ids, bloqueado_por=trabalhador).order_by(*ORDEM_FILA))
+
+    @classmethod
+    def atraso_nova_tentativa(cls, tentativas):
+        """Backoff exponencial com jitter: base * 2^(tentativas - 1), até TAREFAS_BACKOFF_MAXIMO segundos"""
+        base = getattr(settings, 'TAREFAS_BACKOFF_BASE', 10)
+        maximo = getattr(settings, 'TAREFAS_BACKOFF_MAXIMO', 3600)
+        atraso = min(maximo, base * 2 ** max(0, tentativas - 1))
+        return timedelta(seconds=atraso * random.uniform(0.8, 1.2))
+
+    @classmethod
+    def executar(cls, tarefa, trabalhador):
+        """
+        Executa uma tarefa reservada por `trabalhador` e grava o desfecho:
+        concluída com o resultado, de volta à fila com backoff ou falhou de vez.
+
+        Enquanto a função roda, o lease é renovado (RenovacaoLease). Se ainda
+        assim ele expirou (banco fora do ar, processo congelado) e outro
+        worker reservou a tarefa, o desfecho desta execução é descartado.
+
+        Returns:
+            str: Estado final da tarefa (None se o desfecho foi descartado)
+        """
+        definicao = TAREFAS.get(tarefa.nome)
+        if definicao is None:
+            return cls._falhar(tarefa, trabalhador, f"Tarefa '{tarefa.nome}' não registrada neste worker", definitiva=True)
+        if tarefa.tentativas > tarefa.max_tentativas:
+            return cls._falhar(tarefa, trabalhador, "Tentativas esgotadas (worker interrompido durante a execução)", definitiva=True)
+
+        try:
+            with RenovacaoLease(tarefa.id, trabalhador):
+                resultado = definicao.funcao(**tarefa.argumentos)
+            json.dumps(resultado)
+        except Exception:
+            erro = traceback.format_exc(limit=20)
+            logger.warning("Tarefa %s #%s falhou (tentativa %s/%s)", tarefa.nome, tarefa.id, tarefa.tentativas, tarefa.max_tentativas)
+            return cls._falhar(tarefa, trabalhador, erro, definitiva=tarefa.tentativas >= tarefa.max_tentativas)
+
+        agora = timezone.now()
+        gravada = Tarefa.objects.filter(id=tarefa.id, bloqueado_por=trabalhador, estado=Tarefa.EXECUTANDO).update(
+            estado=Tarefa.CONCLUIDA, resultado=resultado, concluida_em=agora, updated_at=agora,
+            bloqueado_por=None, bloqueado_em=None,
+        )
+        return cls._desfecho(tarefa, Tarefa.CONCLUIDA, gravada)
+
+    @classmethod
+    def _falhar(cls, tarefa, trabalhador, erro, definitiva):
+        agora = timezone.now()
+        if definitiva:
+            campos = {'estado': Tarefa.FALHOU, 'concluida_em': agora}
+        else:
+            campos = {'estado': Tarefa.PENDENTE, 'executar_em': agora + cls.atraso_nova_tentativa(tarefa.tentativas)}
+        gravada = Tarefa.objects.filter(id=tarefa.id, bloqueado_por=trabalhador, estado=Tarefa.EXECUTANDO).update(
+            ultimo_erro=erro, updated_at=agora, bloqueado_por=None, bloqueado_em=None, **campos,
+        )
+        return cls._desfecho(tarefa, campos['estado'], gravada)
+
+    @classmethod
+    def _desfecho(cls, tarefa, estado, gravada):
+        if not gravada:
+            logger.warning("Tarefa %s #%s: lease expirado, reservada por outro worker; desfecho descartado", tarefa.nome, tarefa.id)
+            return None
+        return estado
+
+    @classmethod
+    def purgar_concluidas(cls, dias=7):
+        """
+        Remove tarefas concluídas há mais de `dias` dias (as que falharam ficam para análise).
+
+        Returns:
+            int: Quantidade removida
+        """
+        limite = timezone.now() - timedelta(days=dias)
+        removidas, _ = Tarefa.objects.filter(estado=Tarefa.CONCLUIDA, concluida_em__lt=limite).delete()
+        return removidas
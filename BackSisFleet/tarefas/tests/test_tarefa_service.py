@@ -0,0 +1,129 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from tarefas.models import Tarefa
+from tarefas.registro import tarefa
+from tarefas.services.tarefa_service import RenovacaoLease, TarefaService
+
+
+@tarefa('tarefas_teste.somar')
+def somar(a, b):
+    return a + b
+
+
+@tarefa('tarefas_teste.falhar')
+def falhar():
+    raise RuntimeError("falha proposital")
+
+
+class ReivindicacaoTests(TestCase):
+
+    def test_cada_tarefa_vai_para_um_worker(self):
+        for _ in range(3):
+            TarefaService.enfileirar('tarefas_teste.somar', {'a': 1, 'b': 2})
+        primeiro = TarefaService.reivindicar('host:1', quantidade=2)
+        segundo = TarefaService.reivindicar('host:2', quantidade=2)
+        self.assertEqual(len(primeiro), 2)
+        self.assertEqual(len(segundo), 1)
+        self.assertFalse({t.id for t in primeiro} & {t.id for t in segundo})
+        self.assertEqual(TarefaService.reivindicar('host:3'), [])
+        self.assertTrue(all(t.tentativas == 1 and t.estado == Tarefa.EXECUTANDO for t in primeiro + segundo))
+
+    def test_prioridade_e_agendamento(self):
+        baixa = TarefaService.enfileirar('tarefas_teste.somar', {'a': 1, 'b': 1}, prioridade=0)
+        alta = TarefaService.enfileirar('tarefas_teste.somar', {'a': 1, 'b': 1}, prioridade=10)
+        TarefaService.enfileirar('tarefas_teste.somar', {'a': 1, 'b': 1}, prioridade=99,
+                                 executar_em=timezone.now() + timedelta(hours=1))
+        self.assertEqual([t.id for t in TarefaService.reivindicar('host:1', quantidade=5)], [alta.id, baixa.id])
+
+    def test_lease_expirado_volta_para_a_fila(self):
+        TarefaService.enfileirar('tarefas_teste.somar', {'a': 1, 'b': 2})
+        [reservada] = TarefaService.reivindicar('host:1')
+        self.assertEqual(TarefaService.reivindicar('host:2'), [])
+        Tarefa.objects.filter(id=reservada.id).update(bloqueado_em=timezone.now() - timedelta(hours=1))
+        [retomada] = TarefaService.reivindicar('host:2')
+        self.assertEqual((retomada.id, retomada.tentativas), (reservada.id, 2))
+
+
+class ExecucaoTests(TestCase):
+
+    def _reservar(self, nome, argumentos=None, **kwargs):
+        TarefaService.enfileirar(nome, argumentos, **kwargs)
+        [reservada] = TarefaService.reivindicar('host:1')
+        return reservada
+
+    def test_concluida_com_resultado(self):
+        reservada = self._reservar('tarefas_teste.somar', {'a': 2, 'b': 3})
+        self.assertEqual(TarefaService.executar(reservada, 'host:1'), Tarefa.CONCLUIDA)
+        reservada.refresh_from_db()
+        self.assertEqual((reservada.resultado, reservada.bloqueado_por), (5, None))
+
+    @override_settings(TAREFAS_BACKOFF_BASE=10, TAREFAS_BACKOFF_MAXIMO=3600)
+    def test_backoff_exponencial_com_teto(self):
+        with mock.patch('tarefas.services.tarefa_service.random.uniform', return_value=1.0):
+            atrasos = [TarefaService.atraso_nova_tentativa(n).total_seconds() for n in (1, 2, 3, 20)]
+        self.assertEqual(atrasos, [10, 20, 40, 3600])
+
+    def test_falha_volta_para_a_fila_com_backoff(self):
+        reservada = self._reservar('tarefas_teste.falhar', max_tentativas=3)
+        antes = timezone.now()
+        with self.assertLogs('tarefas.services.tarefa_service', 'WARNING'):
+            self.assertEqual(TarefaService.executar(reservada, 'host:1'), Tarefa.PENDENTE)
+        reservada.refresh_from_db()
+        self.assertGreater(reservada.executar_em, antes)
+        self.assertIn("falha proposital", reservada.ultimo_erro)
+        self.assertEqual(TarefaService.reivindicar('host:1'), [])
+
+    def test_falha_definitiva_na_ultima_tentativa(self):
+        reservada = self._reservar('tarefas_teste.falhar', max_tentativas=1)
+        with self.assertLogs('tarefas.services.tarefa_service', 'WARNING'):
+            self.assertEqual(TarefaService.executar(reservada, 'host:1'), Tarefa.FALHOU)
+        reservada.refresh_from_db()
+        self.assertIsNotNone(reservada.concluida_em)
+
+    def test_worker_interrompido_esgota_as_tentativas(self):
+        reservada = self._reservar('tarefas_teste.somar', {'a': 1, 'b': 1}, max_tentativas=1)
+        Tarefa.objects.filter(id=reservada.id).update(bloqueado_em=timezone.now() - timedelta(hours=1))
+        [retomada] = TarefaService.reivindicar('host:2')
+        self.assertEqual(TarefaService.executar(retomada, 'host:2'), Tarefa.FALHOU)
+
+    def test_desfecho_de_worker_com_lease_vencido_e_descartado(self):
+        reservada = self._reservar('tarefas_teste.somar', {'a': 1, 'b': 1})
+        Tarefa.objects.filter(id=reservada.id).update(bloqueado_em=timezone.now() - timedelta(hours=1))
+        TarefaService.reivindicar('host:2')
+        with self.assertLogs('tarefas.services.tarefa_service', 'WARNING'):
+            self.assertIsNone(TarefaService.executar(reservada, 'host:1'))
+        atual = Tarefa.objects.get(id=reservada.id)
+        self.assertEqual((atual.estado, atual.bloqueado_por, atual.resultado), (Tarefa.EXECUTANDO, 'host:2', None))
+
+
+class RenovacaoLeaseTests(TestCase):
+
+    def test_renova_so_enquanto_a_tarefa_e_do_worker(self):
+        TarefaService.enfileirar('tarefas_teste.somar', {'a': 1, 'b': 2})
+        [reservada] = TarefaService.reivindicar('host:1')
+        Tarefa.objects.filter(id=reservada.id).update(bloqueado_em=timezone.now() - timedelta(minutes=9))
+
+        self.assertTrue(RenovacaoLease(reservada.id, 'host:1').renovar())
+        self.assertGreater(Tarefa.objects.get(id=reservada.id).bloqueado_em, timezone.now() - timedelta(minutes=1))
+        # Lease renovado: outro worker não a reivindica
+        self.assertEqual(TarefaService.reivindicar('host:2'), [])
+        self.assertFalse(RenovacaoLease(reservada.id, 'host:2').renovar())
+
+    @override_settings(TAREFAS_LEASE_SEGUNDOS=30)
+    def test_intervalo_e_um_terco_do_lease(self):
+        self.assertEqual(RenovacaoLease(1, 'host:1').intervalo, 10)
+
+
+class RenovacaoLeaseThreadTests(TransactionTestCase):
+
+    def test_thread_renova_durante_a_execucao(self):
+        TarefaService.enfileirar('tarefas_teste.somar', {'a': 1, 'b': 2})
+        [reservada] = TarefaService.reivindicar('host:1')
+        reservado_em = reservada.bloqueado_em
+        with RenovacaoLease(reservada.id, 'host:1', intervalo=0.01):
+            time.sleep(0.2)
+        self.assertGreater(Tarefa.objects.get(id=reservada.id).bloqueado_em, reservado_em)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import TarefaView
+
+urlpatterns = [
+    path('<int:tarefa_id>/', TarefaView.as_view(), name='tarefa'),
+]
@@ -0,0 +1 @@
+from tarefas.views.tarefas import TarefaView
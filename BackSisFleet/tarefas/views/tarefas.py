@@ -0,0 +1,27 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from core.permissions import IsAdministrador
+from tarefas.services.tarefa_service import NotFoundError, TarefaService
+
+
+class TarefaView(APIView):
+    """
+    Situação de uma tarefa em segundo plano (ex.: a importação de veículos):
+    estado, tentativas, resultado e último erro.
+
+    Permissões:
+        - Quem enfileirou a tarefa ou administradores.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, tarefa_id, *args, **kwargs):
+        usuario = request.user
+        try:
+            tarefa = TarefaService.obter_tarefa(tarefa_id)
+        except NotFoundError as e:
+            return Response({"erro": str(e)}, status=404)
+        if tarefa.criado_por_id != usuario.id and not IsAdministrador().has_permission(request, self):
+            # 404 e não 403: não revela que a tarefa existe
+            return Response({"erro": f"Tarefa {tarefa_id} não encontrada"}, status=404)
+        return Response(tarefa.to_dict())
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.23 on 2026-10-19 02:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('veiculos', '0001_initial'),
+        ('motoristas', '0002_pontuacaomotorista_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Telemetria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('registrado_em', models.DateTimeField()),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('velocidade', models.FloatField(blank=True, null=True)),
+                ('limite_velocidade', models.FloatField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('motorista', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='telemetrias', to='motoristas.motorista')),
+                ('veiculo', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='telemetrias', to='veiculos.veiculo')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['motorista', 'registrado_em'], name='telemetria_motorista_data_idx'), models.Index(fields=['veiculo', 'registrado_em'], name='telemetria_veiculo_data_idx')],
+            },
+        ),
+    ]
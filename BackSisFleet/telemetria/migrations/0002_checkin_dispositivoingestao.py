@@ -0,0 +1,59 @@
+# Generated by Django 4.2.23 on 2026-10-19 02:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('motoristas', '0002_pontuacaomotorista_and_more'),
+        ('veiculos', '0002_veiculo_ultima_posicao'),
+        ('telemetria', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckIn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('inicio_jornada', 'Início de jornada'), ('fim_jornada', 'Fim de jornada'), ('entrega', 'Entrega'), ('parada', 'Parada')], max_length=20)),
+                ('registrado_em', models.DateTimeField()),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('observacao', models.CharField(blank=True, max_length=255, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DispositivoIngestao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dispositivo_id', models.CharField(max_length=100)),
+                ('fluxo', models.CharField(max_length=20)),
+                ('seq_base', models.BigIntegerField(default=0)),
+                ('janela', models.BinaryField(default=bytes)),
+                ('lotes_recentes', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dispositivoingestao',
+            constraint=models.UniqueConstraint(fields=('dispositivo_id', 'fluxo'), name='dispositivo_fluxo_unico'),
+        ),
+        migrations.AddField(
+            model_name='checkin',
+            name='motorista',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkins', to='motoristas.motorista'),
+        ),
+        migrations.AddField(
+            model_name='checkin',
+            name='veiculo',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='checkins', to='veiculos.veiculo'),
+        ),
+        migrations.AddIndex(
+            model_name='checkin',
+            index=models.Index(fields=['motorista', 'registrado_em'], name='checkin_motorista_data_idx'),
+        ),
+    ]
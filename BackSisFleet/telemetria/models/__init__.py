@@ -0,0 +1,3 @@
+from telemetria.models.telemetria import Telemetria
+from telemetria.models.checkin import CheckIn
+from telemetria.models.dispositivo import DispositivoIngestao
\ No newline at end of file
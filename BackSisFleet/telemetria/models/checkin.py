@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils import timezone
+from motoristas.models.motoristas import Motorista
+from veiculos.models.veiculos import Veiculo
+
+
+class CheckIn(models.Model):
+    """
+    Modelo para representar um check-in do motorista enviado pelo app.
+
+    Campos:
+    - motorista: Motorista que fez o check-in.
+    - veiculo: Veículo em uso no momento do check-in.
+    - tipo: Início/fim de jornada, entrega ou parada.
+    - registrado_em: Data e hora em que o check-in foi feito no dispositivo.
+    - latitude/longitude: Posição do check-in, quando disponível.
+    - observacao: Texto livre informado pelo motorista.
+    - created_at: Data e hora em que o check-in chegou ao servidor.
+    """
+
+    TIPOS = [
+        ('inicio_jornada', 'Início de jornada'),
+        ('fim_jornada', 'Fim de jornada'),
+        ('entrega', 'Entrega'),
+        ('parada', 'Parada'),
+    ]
+
+    motorista = models.ForeignKey(Motorista, on_delete=models.CASCADE, related_name='checkins')
+    veiculo = models.ForeignKey(Veiculo, on_delete=models.SET_NULL, related_name='checkins', null=True)
+    tipo = models.CharField(max_length=20, choices=TIPOS)
+    registrado_em = models.DateTimeField()
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    observacao = models.CharField(max_length=255, blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['motorista', 'registrado_em'], name='checkin_motorista_data_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.motorista_id} - {self.get_tipo_display()} @ {self.registrado_em}"
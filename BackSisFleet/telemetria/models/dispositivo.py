@@ -0,0 +1,31 @@
+from django.db import models
+from django.utils import timezone
+
+
+class DispositivoIngestao(models.Model):
+    """
+    Estado de deduplicação dos envios em lote de um dispositivo.
+
+    Campos:
+    - dispositivo_id: '<id do usuário>:<identificador gerado pelo app na instalação>'.
+    - fluxo: Endpoint de ingestão ('telemetria' ou 'checkin').
+    - seq_base: Menor número de sequência coberto pela janela.
+    - janela: Bitmap das sequências já recebidas a partir de seq_base.
+    - lotes_recentes: Últimos lotes processados e suas respostas, para retries.
+    - updated_at: Data e hora do último lote recebido.
+    """
+
+    dispositivo_id = models.CharField(max_length=100)
+    fluxo = models.CharField(max_length=20)
+    seq_base = models.BigIntegerField(default=0)
+    janela = models.BinaryField(default=bytes)
+    lotes_recentes = models.JSONField(default=list)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dispositivo_id', 'fluxo'], name='dispositivo_fluxo_unico'),
+        ]
+
+    def __str__(self):
+        return f"{self.dispositivo_id} ({self.fluxo})"
@@ -0,0 +1,37 @@
+from django.db import models
+from django.utils import timezone
+from motoristas.models.motoristas import Motorista
+from veiculos.models.veiculos import Veiculo
+
+
+class Telemetria(models.Model):
+    """
+    Modelo para representar um ponto de telemetria enviado pelo rastreador/app.
+
+    Campos:
+    - veiculo: Veículo que gerou o ponto.
+    - motorista: Motorista ao volante no momento do registro.
+    - registrado_em: Data e hora em que o ponto foi coletado no dispositivo.
+    - latitude/longitude: Posição em graus decimais.
+    - velocidade: Velocidade instantânea em km/h.
+    - limite_velocidade: Limite da via em km/h, quando conhecido.
+    - created_at: Data e hora em que o ponto chegou ao servidor.
+    """
+
+    veiculo = models.ForeignKey(Veiculo, on_delete=models.CASCADE, related_name='telemetrias', null=True)
+    motorista = models.ForeignKey(Motorista, on_delete=models.SET_NULL, related_name='telemetrias', null=True)
+    registrado_em = models.DateTimeField()
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    velocidade = models.FloatField(null=True, blank=True)
+    limite_velocidade = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['motorista', 'registrado_em'], name='telemetria_motorista_data_idx'),
+            models.Index(fields=['veiculo', 'registrado_em'], name='telemetria_veiculo_data_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.veiculo_id} @ {self.registrado_em}"
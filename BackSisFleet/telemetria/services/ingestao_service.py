@@ -0,0 +1,314 @@
+# telemetria/services/ingestao_service.py
+import logging
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from motoristas.services.motorista_service import MotoristaService
+from telemetria.models.checkin import CheckIn
+from telemetria.models.dispositivo import DispositivoIngestao
+from telemetria.models.telemetria import Telemetria
+from veiculos.models.veiculos import Veiculo
+from veiculos.service.veiculos_service import VeiculoService
+
+logger = logging.getLogger(__name__)
+
+
+class IngestaoError(Exception):
+    """Exceção base para erros na ingestão de lotes."""
+
+
+class BadRequestError(IngestaoError):
+    """Exceção para erros de solicitação inválida (código HTTP 400)."""
+
+
+class ForbiddenError(IngestaoError):
+    """Exceção para acesso não permitido (código HTTP 403)."""
+
+
+class JanelaSequencias:
+    """
+    Janela deslizante de números de sequência já recebidos.
+
+    Guarda um bitmap de TAMANHO sequências a partir de `base`. Sequências
+    abaixo da base chegaram atrasadas demais para a janela saber se são
+    repetidas (ex.: retry de um lote antigo depois de um mais novo); quem
+    chama decide como deduplicá-las.
+    """
+
+    TAMANHO = 4096
+
+    NOVA = 'nova'
+    REPETIDA = 'repetida'
+    ATRASADA = 'atrasada'
+
+    def __init__(self, base=0, bitmap=b''):
+        self.base = base
+        self.bits = int.from_bytes(bytes(bitmap), 'little')
+
+    def registrar(self, seq):
+        """Marca a sequência como recebida. Retorna NOVA, REPETIDA ou ATRASADA (abaixo da base)."""
+        if seq < self.base:
+            return self.ATRASADA
+
+        deslocamento = seq - self.base
+        if deslocamento >= self.TAMANHO:
+            avanco = deslocamento - self.TAMANHO + 1
+            self.bits >>= avanco
+            self.base += avanco
+            deslocamento = seq - self.base
+
+        mascara = 1 << deslocamento
+        if self.bits & mascara:
+            return self.REPETIDA
+        self.bits |= mascara
+        return self.NOVA
+
+    def para_bytes(self):
+        return self.bits.to_bytes(self.TAMANHO // 8, 'little')
+
+
+class IngestaoService:
+    """
+    Ingestão idempotente de lotes enviados pelo SisFleetMobile.
+
+    Cada lote traz um `lote_id` do cliente e cada item um `seq` crescente por
+    dispositivo. Um lote repetido devolve a resposta original sem tocar nas
+    tabelas; itens repetidos dentro de lotes novos são descartados pela janela
+    de sequências do dispositivo, lida e gravada uma vez por lote. Itens
+    abaixo da janela não são descartados: são comparados pelo conteúdo
+    (CAMPOS_ATRASADOS) com o que já está gravado para o motorista.
+    """
+
+    # Um lote válido nunca empurra o próprio início para fora da janela
+    MAX_ITENS_LOTE = JanelaSequencias.TAMANHO
+    # Identificam um item atrasado, junto com o motorista, quando o seq já saiu da janela
+    CAMPOS_ATRASADOS = {
+        'telemetria': ('registrado_em', 'latitude', 'longitude'),
+        'checkin': ('registrado_em', 'tipo'),
+    }
+    MAX_LOTES_RECENTES = 32
+    # Maior seq aceito (DispositivoIngestao.seq_base é BigIntegerField)
+    MAX_SEQ = 2 ** 63 - 1
+    # Quanto um lote pode avançar além da base da janela; um seq absurdo
+    # empurraria a base e todos os pontos legítimos seguintes virariam atrasados
+    MAX_SALTO_SEQ = 1_000_000
+
+    @classmethod
+    def _ler_data(cls, valor):
+        data = parse_datetime(str(valor)) if valor else None
+        if data is None:
+            raise BadRequestError("Campo registrado_em inválido. Use o formato ISO 8601")
+        if timezone.is_naive(data):
+            data = timezone.make_aware(data)
+        return data
+
+    @classmethod
+    def _ler_float(cls, item, campo, obrigatorio=False):
+        valor = item.get(campo)
+        if valor is None:
+            if obrigatorio:
+                raise BadRequestError(f"Campo {campo} é obrigatório")
+            return None
+        try:
+            return float(valor)
+        except (TypeError, ValueError):
+            raise BadRequestError(f"Campo {campo} inválido")
+
+    @classmethod
+    def _resolver_contexto(cls, usuario, veiculo_id):
+        """Resolve o motorista do usuário e valida o veículo informado"""
+        if usuario.tipo_usuario != 'motorista':
+            raise ForbiddenError("Apenas motoristas podem enviar dados do app")
+
+        motorista = MotoristaService.obter_motorista_por_usuario(usuario.id)
+        if motorista is None:
+            raise ForbiddenError("Usuário não possui cadastro de motorista")
+
+        if veiculo_id is None:
+            return motorista, None
+        try:
+            veiculo_id = int(veiculo_id)
+        except (TypeError, ValueError):
+            raise BadRequestError("Campo veiculo inválido")
+        if not Veiculo.objects.filter(id=veiculo_id, motorista_id=motorista.id).exists():
+            raise BadRequestError("Veículo não vinculado ao motorista")
+        return motorista, veiculo_id
+
+    @classmethod
+    def _validar_lote(cls, dados):
+        dispositivo_id = dados.get('dispositivo_id')
+        lote_id = dados.get('lote_id')
+        itens = dados.get('itens')
+
+        if not dispositivo_id or not lote_id:
+            raise BadRequestError("Informe dispositivo_id e lote_id")
+        if len(str(dispositivo_id)) > 64 or len(str(lote_id)) > 64:
+            raise BadRequestError("dispositivo_id e lote_id devem ter no máximo 64 caracteres")
+        if not isinstance(itens, list):
+            raise BadRequestError("Informe 'itens' como uma lista")
+        if len(itens) > cls.MAX_ITENS_LOTE:
+            raise BadRequestError(f"Máximo de {cls.MAX_ITENS_LOTE} itens por lote")
+
+        for item in itens:
+            if not isinstance(item, dict):
+                raise BadRequestError("Cada item deve ser um objeto")
+            try:
+                item['seq'] = int(item.get('seq'))
+            except (TypeError, ValueError):
+                raise BadRequestError("Cada item deve ter um seq inteiro")
+            if not 0 <= item['seq'] <= cls.MAX_SEQ:
+                raise BadRequestError(f"seq deve estar entre 0 e {cls.MAX_SEQ}")
+        return str(dispositivo_id), str(lote_id), itens
+
+    @classmethod
+    def _montar_telemetria(cls, item, motorista, veiculo_id):
+        return Telemetria(
+            veiculo_id=veiculo_id,
+            motorista=motorista,
+            registrado_em=cls._ler_data(item.get('registrado_em')),
+            latitude=cls._ler_float(item, 'latitude', obrigatorio=True),
+            longitude=cls._ler_float(item, 'longitude', obrigatorio=True),
+            velocidade=cls._ler_float(item, 'velocidade'),
+            limite_velocidade=cls._ler_float(item, 'limite_velocidade'),
+            created_at=timezone.now(),
+        )
+
+    @classmethod
+    def _montar_checkin(cls, item, motorista, veiculo_id):
+        tipo = item.get('tipo')
+        if tipo not in dict(CheckIn.TIPOS):
+            raise BadRequestError(f"Tipo de check-in inválido. Use: {', '.join(dict(CheckIn.TIPOS))}")
+        return CheckIn(
+            motorista=motorista,
+            veiculo_id=veiculo_id,
+            tipo=tipo,
+            registrado_em=cls._ler_data(item.get('registrado_em')),
+            latitude=cls._ler_float(item, 'latitude'),
+            longitude=cls._ler_float(item, 'longitude'),
+            observacao=(item.get('observacao') or None),
+            created_at=timezone.now(),
+        )
+
+    @classmethod
+    def _obter_estado(cls, dispositivo_id, fluxo):
+        """Lê (e trava, em bancos que suportam) o estado de deduplicação do dispositivo"""
+        try:
+            return DispositivoIngestao.objects.select_for_update().get(dispositivo_id=dispositivo_id, fluxo=fluxo)
+        except DispositivoIngestao.DoesNotExist:
+            pass
+        try:
+            with transaction.atomic():
+                return DispositivoIngestao.objects.create(dispositivo_id=dispositivo_id, fluxo=fluxo)
+        except IntegrityError:
+            # Outro request criou o estado ao mesmo tempo
+            return DispositivoIngestao.objects.select_for_update().get(dispositivo_id=dispositivo_id, fluxo=fluxo)
+
+    @classmethod
+    def _atrasados_ineditos(cls, modelo, campos, motorista, objetos):
+        """
+        Filtra os itens abaixo da janela que ainda não estão gravados,
+        comparando motorista + `campos` com o banco (uma consulta pelo
+        intervalo de registrado_em, coberto pelo índice motorista/data).
+        """
+        datas = [objeto.registrado_em for objeto in objetos]
+        vistos = set(
+            modelo.objects.filter(motorista=motorista, registrado_em__range=(min(datas), max(datas)))
+            .values_list(*campos)
+        )
+        ineditos = []
+        for objeto in objetos:
+            chave = tuple(getattr(objeto, campo) for campo in campos)
+            if chave not in vistos:
+                vistos.add(chave)
+                ineditos.append(objeto)
+        return ineditos
+
+    @classmethod
+    def _registrar_lote(cls, fluxo, modelo, montar_item, dados, usuario):
+        dispositivo_id, lote_id, itens = cls._validar_lote(dados)
+        motorista, veiculo_id = cls._resolver_contexto(usuario, dados.get('veiculo'))
+
+        # Monta todos os objetos antes de mexer no estado: um item inválido rejeita o lote inteiro
+        objetos = [(item['seq'], montar_item(item, motorista, veiculo_id)) for item in itens]
+
+        with transaction.atomic():
+            # O estado é separado por usuário: um dispositivo_id alheio não interfere na deduplicação
+            estado = cls._obter_estado(f"{usuario.id}:{dispositivo_id}", fluxo)
+            for lote_anterior, resposta in estado.lotes_recentes:
+                if lote_anterior == lote_id:
+                    return dict(resposta, repetido=True), []
+
+            janela = JanelaSequencias(estado.seq_base, estado.janela)
+            maior_seq = max((seq for seq, _ in objetos), default=0)
+            if maior_seq - janela.base >= JanelaSequencias.TAMANHO + cls.MAX_SALTO_SEQ:
+                raise BadRequestError(
+                    f"seq {maior_seq} salta mais de {cls.MAX_SALTO_SEQ} sequências além da última recebida ({janela.base})"
+                )
+
+            novos, atrasados, repetidos = [], [], 0
+            for seq, objeto in sorted(objetos, key=lambda par: par[0]):
+                situacao = janela.registrar(seq)
+                if situacao == JanelaSequencias.NOVA:
+                    novos.append(objeto)
+                elif situacao == JanelaSequencias.ATRASADA:
+                    atrasados.append(objeto)
+                else:
+                    repetidos += 1
+            if atrasados:
+                ineditos = cls._atrasados_ineditos(modelo, cls.CAMPOS_ATRASADOS[fluxo], motorista, atrasados)
+                repetidos += len(atrasados) - len(ineditos)
+                novos.extend(ineditos)
+                logger.info(
+                    "Ingestão %s do dispositivo %s: %s itens abaixo da janela (base %s), %s inéditos",
+                    fluxo, estado.dispositivo_id, len(atrasados), janela.base, len(ineditos),
+                )
+            modelo.objects.bulk_create(novos, batch_size=1000)
+
+            resposta = {
+                'lote_id': lote_id,
+                'recebidos': len(objetos),
+                'gravados': len(novos),
+                'duplicados': repetidos,
+                'atrasados': len(atrasados),
+            }
+            estado.seq_base = janela.base
+            estado.janela = janela.para_bytes()
+            estado.lotes_recentes = (estado.lotes_recentes + [[lote_id, resposta]])[-cls.MAX_LOTES_RECENTES:]
+            estado.updated_at = timezone.now()
+            estado.save(update_fields=['seq_base', 'janela', 'lotes_recentes', 'updated_at'])
+
+        return dict(resposta, repetido=False), novos
+
+    @classmethod
+    def registrar_telemetria(cls, dados, usuario):
+        """
+        Registra um lote de pontos de telemetria de forma idempotente.
+
+        Args:
+            dados (dict): dispositivo_id, lote_id, veiculo e itens [{seq, registrado_em, latitude, ...}]
+            usuario (User): Usuário motorista autenticado
+
+        Returns:
+            dict: Contagens de itens recebidos, gravados e duplicados
+        """
+        resposta, pontos = cls._registrar_lote('telemetria', Telemetria, cls._montar_telemetria, dados, usuario)
+        if pontos and pontos[0].veiculo_id:
+            ultimo = max(pontos, key=lambda ponto: ponto.registrado_em)
+            VeiculoService.atualizar_ultima_posicao(ultimo.veiculo_id, ultimo.latitude, ultimo.longitude, ultimo.registrado_em)
+        return resposta
+
+    @classmethod
+    def registrar_checkins(cls, dados, usuario):
+        """
+        Registra um lote de check-ins de forma idempotente.
+
+        Args:
+            dados (dict): dispositivo_id, lote_id, veiculo e itens [{seq, tipo, registrado_em, ...}]
+            usuario (User): Usuário motorista autenticado
+
+        Returns:
+            dict: Contagens de itens recebidos, gravados e duplicados
+        """
+        resposta, _ = cls._registrar_lote('checkin', CheckIn, cls._montar_checkin, dados, usuario)
+        return resposta
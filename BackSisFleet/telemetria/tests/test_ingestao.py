@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from core.models import CustomUser
+from motoristas.models.motoristas import Motorista
+from telemetria.models import Telemetria
+from telemetria.services.ingestao_service import BadRequestError, IngestaoService, JanelaSequencias
+from veiculos.models.veiculos import Veiculo
+
+
+class JanelaSequenciasTests(SimpleTestCase):
+
+    def test_repetida_e_nova(self):
+        janela = JanelaSequencias()
+        self.assertEqual(janela.registrar(5), JanelaSequencias.NOVA)
+        self.assertEqual(janela.registrar(5), JanelaSequencias.REPETIDA)
+        self.assertEqual(janela.registrar(3), JanelaSequencias.NOVA)
+
+    def test_janela_desliza_e_mais_antigas_ficam_atrasadas(self):
+        janela = JanelaSequencias()
+        janela.registrar(0)
+        janela.registrar(JanelaSequencias.TAMANHO + 10)
+        self.assertEqual(janela.base, 11)
+        self.assertEqual(janela.registrar(0), JanelaSequencias.ATRASADA)
+        self.assertEqual(janela.registrar(11), JanelaSequencias.NOVA)
+        self.assertEqual(janela.registrar(JanelaSequencias.TAMANHO + 10), JanelaSequencias.REPETIDA)
+
+    def test_persistencia_do_bitmap(self):
+        janela = JanelaSequencias(base=100)
+        for seq in (100, 101, 4000):
+            janela.registrar(seq)
+        copia = JanelaSequencias(janela.base, janela.para_bytes())
+        self.assertEqual(len(janela.para_bytes()), JanelaSequencias.TAMANHO // 8)
+        self.assertEqual([copia.registrar(seq) for seq in (100, 101, 102, 4000)],
+                         [JanelaSequencias.REPETIDA, JanelaSequencias.REPETIDA, JanelaSequencias.NOVA, JanelaSequencias.REPETIDA])
+
+
+class IngestaoServiceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cliente = CustomUser.objects.create(username='cliente', tipo_usuario='cliente', cpf_cnpj='11222333000181')
+        cls.usuario = CustomUser.objects.create(username='motorista', tipo_usuario='motorista', cpf_cnpj='52998224725')
+        motorista = Motorista.objects.create(usuario_fk=cls.usuario, responsavel_fk=cliente, cnh_numero='1')
+        cls.veiculo = Veiculo.objects.create(motorista=motorista, placa='AAA0A00', marca='Volvo', modelo='FH')
+
+    def _lote(self, lote_id, seqs):
+        # Um ponto por segundo: o seq e o instante andam juntos, como no app
+        inicio = timezone.now().replace(microsecond=0)
+        segundos = lambda seq: seq % 10 ** 6 if isinstance(seq, int) else 0
+        return {
+            'dispositivo_id': 'celular', 'lote_id': lote_id, 'veiculo': self.veiculo.id,
+            'itens': [
+                {'seq': seq, 'registrado_em': (inicio + timedelta(seconds=segundos(seq))).isoformat(), 'latitude': -23.5, 'longitude': -46.6}
+                for seq in seqs
+            ],
+        }
+
+    def test_lote_repetido_devolve_a_resposta_original(self):
+        primeira = IngestaoService.registrar_telemetria(self._lote('a', [1, 2, 3]), self.usuario)
+        segunda = IngestaoService.registrar_telemetria(self._lote('a', [1, 2, 3]), self.usuario)
+        self.assertEqual(primeira['gravados'], 3)
+        self.assertFalse(primeira['repetido'])
+        self.assertTrue(segunda['repetido'])
+        self.assertEqual(Telemetria.objects.count(), 3)
+
+    def test_itens_repetidos_em_lote_novo_sao_descartados(self):
+        IngestaoService.registrar_telemetria(self._lote('a', [1, 2]), self.usuario)
+        resposta = IngestaoService.registrar_telemetria(self._lote('b', [2, 3, 3]), self.usuario)
+        self.assertEqual((resposta['gravados'], resposta['duplicados'], resposta['atrasados']), (1, 2, 0))
+        self.assertEqual(Telemetria.objects.count(), 3)
+
+    def test_itens_abaixo_da_janela_sao_gravados_e_deduplicados_pelo_conteudo(self):
+        IngestaoService.registrar_telemetria(self._lote('a', [1]), self.usuario)
+        IngestaoService.registrar_telemetria(self._lote('b', [JanelaSequencias.TAMANHO + 50]), self.usuario)
+        # Retry de um lote antigo depois de um mais novo: o 1 já está gravado, o 2 não
+        resposta = IngestaoService.registrar_telemetria(self._lote('c', [1, 2]), self.usuario)
+        self.assertEqual((resposta['gravados'], resposta['duplicados'], resposta['atrasados']), (1, 1, 2))
+        resposta = IngestaoService.registrar_telemetria(self._lote('d', [2, 2]), self.usuario)
+        self.assertEqual((resposta['gravados'], resposta['duplicados'], resposta['atrasados']), (0, 2, 2))
+        self.assertEqual(Telemetria.objects.count(), 3)
+
+    def test_lote_maximo_cabe_na_janela(self):
+        self.assertLessEqual(IngestaoService.MAX_ITENS_LOTE, JanelaSequencias.TAMANHO)
+        seqs = list(range(IngestaoService.MAX_ITENS_LOTE))
+        resposta = IngestaoService.registrar_telemetria(self._lote('a', seqs), self.usuario)
+        self.assertEqual((resposta['gravados'], resposta['atrasados']), (len(seqs), 0))
+
+    def test_salto_grande_de_seq_rejeita_o_lote_sem_mover_a_janela(self):
+        with self.assertRaises(BadRequestError):
+            IngestaoService.registrar_telemetria(self._lote('a', [1, 10 ** 12]), self.usuario)
+        resposta = IngestaoService.registrar_telemetria(self._lote('b', [1]), self.usuario)
+        self.assertEqual(resposta['gravados'], 1)
+
+    def test_seq_fora_da_faixa(self):
+        for seq in (-1, 2 ** 63, 'x'):
+            with self.subTest(seq=seq), self.assertRaises(BadRequestError):
+                IngestaoService.registrar_telemetria(self._lote(f'lote{seq}', [seq]), self.usuario)
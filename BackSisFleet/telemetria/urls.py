@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import TelemetriaLoteView, CheckInLoteView
+
+urlpatterns = [
+    path('pontos/', TelemetriaLoteView.as_view(), name='telemetria_pontos'),
+    path('checkins/', CheckInLoteView.as_view(), name='telemetria_checkins'),
+]
@@ -0,0 +1 @@
+from telemetria.views.ingestao import TelemetriaLoteView, CheckInLoteView
\ No newline at end of file
@@ -0,0 +1,45 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from telemetria.services.ingestao_service import IngestaoService, BadRequestError, ForbiddenError
+
+
+class TelemetriaLoteView(APIView):
+    """
+    Recebe lotes de pontos de telemetria do app do motorista.
+
+    Corpo esperado:
+        {
+            "dispositivo_id": "...", "lote_id": "...", "veiculo": 1,
+            "itens": [{"seq": 1, "registrado_em": "...", "latitude": 0, "longitude": 0, "velocidade": 0}]
+        }
+
+    Reenviar o mesmo lote_id (ou itens com seq já recebido) não duplica registros.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        try:
+            resposta = IngestaoService.registrar_telemetria(request.data, request.user)
+        except BadRequestError as e:
+            return Response({"erro": str(e)}, status=400)
+        except ForbiddenError as e:
+            return Response({"mensagem": str(e)}, status=403)
+        return Response(resposta)
+
+
+class CheckInLoteView(APIView):
+    """
+    Recebe lotes de check-ins do app do motorista, com a mesma deduplicação
+    por lote_id e seq da telemetria.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        try:
+            resposta = IngestaoService.registrar_checkins(request.data, request.user)
+        except BadRequestError as e:
+            return Response({"erro": str(e)}, status=400)
+        except ForbiddenError as e:
+            return Response({"mensagem": str(e)}, status=403)
+        return Response(resposta)
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.23 on 2026-10-19 02:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('veiculos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='veiculo',
+            name='ultima_latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='veiculo',
+            name='ultima_longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='veiculo',
+            name='ultima_posicao_em',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('veiculos', '0002_veiculo_ultima_posicao'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='veiculo',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.conf import settings
 from django.utils import timezone
 from datetime import datetime
 from motoristas.models.motoristas import Motorista
+from common.utils.converte_data_para_string import converter_data_para_string
 
 
 class Veiculo(models.Model):
@@ -20,6 +21,8 @@ class Veiculo(models.Model):
     - ano_modelo: Ano do modelo.
     - cor: Cor do veículo.
     - tipo_combustivel: Tipo de combustível utilizado.
+    - ultima_latitude/ultima_longitude: Última posição conhecida do veículo.
+    - ultima_posicao_em: Data e hora da última posição conhecida.
     - criado_por: Usuário que criou o registro.
     - atualizado_por: Usuário que atualizou o registro pela última vez.
     - created_at: Data e hora de criação do registro.
@@ -43,6 +46,9 @@ class Veiculo(models.Model):
     ano_modelo = models.IntegerField(null=True, blank=True)
     cor = models.CharField(max_length=30, null=True, blank=True)
     tipo_combustivel = models.CharField(max_length=20, null=True, blank=True)
+    ultima_latitude = models.FloatField(null=True, blank=True)
+    ultima_longitude = models.FloatField(null=True, blank=True)
+    ultima_posicao_em = models.DateTimeField(null=True, blank=True)
 
     criado_por = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -57,7 +63,8 @@ class Veiculo(models.Model):
         null=True
     )
     created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(default=timezone.now)
+    # auto_now: todo save() muda a versão usada pelo CacheRepresentacao
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.placa} - {self.modelo}/{self.marca}"
@@ -81,6 +88,4 @@ class Veiculo(models.Model):
         }
 
     def formatar_data(self, data):
-        if data and isinstance(data, str):
-            data = datetime.strptime(data, "%Y-%m-%d")
-        return data.strftime("%Y-%m-%d %H:%M:%S") if data else None
+        return converter_data_para_string(data)
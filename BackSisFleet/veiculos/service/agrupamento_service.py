@@ -0,0 +1,211 @@
+# veiculos/service/agrupamento_service.py
+import math
+import threading
+import time
+from collections import OrderedDict
+from django.db.models import Q
+from core.roteamento import leitura_replica
+from veiculos.models.veiculos import Veiculo
+
+
+class AgrupamentoError(Exception):
+    """Exceção base para erros do agrupamento de veículos no mapa."""
+
+
+class BadRequestError(AgrupamentoError):
+    """Exceção para erros de solicitação inválida (código HTTP 400)."""
+
+
+# A partir deste zoom o mapa recebe os veículos individuais
+ZOOM_INDIVIDUAL = 15
+# Cada tile (256px) é dividido em 4x4 células de 64px
+CELULAS_POR_TILE = 4
+# Nível mais fino da grade; os níveis mais grossos são derivados dele
+NIVEL_BASE = ZOOM_INDIVIDUAL - 1
+# Limite de itens por resposta, independente do tamanho da frota
+MAX_ITENS = 500
+LIMITE_LATITUDE = 85.05112878
+
+
+def _projetar(latitude, longitude):
+    """Projeta lat/lon em coordenadas Web Mercator normalizadas (0..1)."""
+    latitude = max(-LIMITE_LATITUDE, min(LIMITE_LATITUDE, latitude))
+    x = (longitude + 180.0) / 360.0
+    seno = math.sin(math.radians(latitude))
+    y = 0.5 - math.log((1 + seno) / (1 - seno)) / (4 * math.pi)
+    return min(max(x, 0.0), 1.0), min(max(y, 0.0), 1.0)
+
+
+def _celula(latitude, longitude, nivel):
+    x, y = _projetar(latitude, longitude)
+    escala = (1 << nivel) * CELULAS_POR_TILE
+    return min(int(x * escala), escala - 1), min(int(y * escala), escala - 1)
+
+
+class GradeHierarquica:
+    """
+    Pirâmide de grades de agrupamento, uma por nível de zoom.
+
+    O nível base guarda os veículos de cada célula; cada nível acima soma
+    quatro células do nível abaixo (contagem e soma de lat/lon), de modo que
+    uma consulta só percorre as células visíveis do nível pedido.
+    """
+
+    def __init__(self, posicoes):
+        self.criada_em = time.monotonic()
+        self.total = 0
+        self.veiculos_por_celula = {}
+        base = {}
+        for veiculo_id, placa, latitude, longitude in posicoes:
+            celula = _celula(latitude, longitude, NIVEL_BASE)
+            self.veiculos_por_celula.setdefault(celula, []).append((veiculo_id, placa, latitude, longitude))
+            agregado = base.setdefault(celula, [0, 0.0, 0.0])
+            agregado[0] += 1
+            agregado[1] += latitude
+            agregado[2] += longitude
+            self.total += 1
+
+        self.niveis = {NIVEL_BASE: base}
+        for nivel in range(NIVEL_BASE - 1, -1, -1):
+            atual = {}
+            for (x, y), (quantidade, soma_lat, soma_lon) in self.niveis[nivel + 1].items():
+                agregado = atual.setdefault((x >> 1, y >> 1), [0, 0.0, 0.0])
+                agregado[0] += quantidade
+                agregado[1] += soma_lat
+                agregado[2] += soma_lon
+            self.niveis[nivel] = atual
+
+    @staticmethod
+    def _intervalo(bbox, nivel):
+        oeste, sul, leste, norte = bbox
+        x_min, y_min = _celula(norte, oeste, nivel)
+        x_max, y_max = _celula(sul, leste, nivel)
+        return x_min, x_max, y_min, y_max
+
+    @staticmethod
+    def _celulas_no_intervalo(celulas, intervalo):
+        x_min, x_max, y_min, y_max = intervalo
+        area = (x_max - x_min + 1) * (y_max - y_min + 1)
+        if area <= len(celulas):
+            for x in range(x_min, x_max + 1):
+                for y in range(y_min, y_max + 1):
+                    if (x, y) in celulas:
+                        yield (x, y), celulas[(x, y)]
+        else:
+            for (x, y), valor in celulas.items():
+                if x_min <= x <= x_max and y_min <= y <= y_max:
+                    yield (x, y), valor
+
+    def agrupar(self, bbox, nivel):
+        return [
+            {
+                'latitude': round(soma_lat / quantidade, 6),
+                'longitude': round(soma_lon / quantidade, 6),
+                'quantidade': quantidade,
+            }
+            for _, (quantidade, soma_lat, soma_lon) in self._celulas_no_intervalo(self.niveis[nivel], self._intervalo(bbox, nivel))
+        ]
+
+    def veiculos(self, bbox, limite):
+        oeste, sul, leste, norte = bbox
+        encontrados = []
+        for _, veiculos in self._celulas_no_intervalo(self.veiculos_por_celula, self._intervalo(bbox, NIVEL_BASE)):
+            for veiculo_id, placa, latitude, longitude in veiculos:
+                if sul <= latitude <= norte and oeste <= longitude <= leste:
+                    encontrados.append({'id': veiculo_id, 'placa': placa, 'latitude': latitude, 'longitude': longitude})
+                    if len(encontrados) > limite:
+                        return None
+        return encontrados
+
+
+class AgrupamentoService:
+    """
+    Agrupamento server-side das últimas posições dos veículos para o mapa.
+
+    A grade de cada responsável é montada uma vez e reaproveitada por
+    TEMPO_VALIDADE segundos; no máximo MAX_GRADES responsáveis ficam em memória.
+    """
+
+    TEMPO_VALIDADE = 15
+    MAX_GRADES = 256
+
+    _grades = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def interpretar_bbox(cls, bbox):
+        """Converte 'oeste,sul,leste,norte' em uma tupla de floats"""
+        try:
+            oeste, sul, leste, norte = (float(valor) for valor in str(bbox).split(','))
+        except ValueError:
+            raise BadRequestError("Parâmetro bbox inválido. Use bbox=oeste,sul,leste,norte")
+
+        oeste, leste = max(-180.0, oeste), min(180.0, leste)
+        sul, norte = max(-90.0, sul), min(90.0, norte)
+        if oeste > leste or sul > norte:
+            raise BadRequestError("Parâmetro bbox inválido: oeste/sul devem ser menores que leste/norte")
+        return oeste, sul, leste, norte
+
+    @classmethod
+    def _carregar_posicoes(cls, responsavel_id):
+        return Veiculo.objects.filter(
+            Q(criado_por_id=responsavel_id) | Q(motorista__responsavel_fk_id=responsavel_id),
+            ultima_latitude__isnull=False,
+            ultima_longitude__isnull=False,
+        ).values_list('id', 'placa', 'ultima_latitude', 'ultima_longitude').iterator(chunk_size=5000)
+
+    @classmethod
+    @leitura_replica
+    def obter_grade(cls, responsavel_id):
+        """Retorna a grade do responsável, remontando-a se estiver expirada"""
+        with cls._lock:
+            grade = cls._grades.get(responsavel_id)
+            if grade is not None and time.monotonic() - grade.criada_em < cls.TEMPO_VALIDADE:
+                cls._grades.move_to_end(responsavel_id)
+                return grade
+
+        grade = GradeHierarquica(cls._carregar_posicoes(responsavel_id))
+        with cls._lock:
+            cls._grades[responsavel_id] = grade
+            cls._grades.move_to_end(responsavel_id)
+            while len(cls._grades) > cls.MAX_GRADES:
+                cls._grades.popitem(last=False)
+        return grade
+
+    @classmethod
+    def agrupar(cls, responsavel_id, bbox, zoom):
+        """
+        Agrupa as posições visíveis no bbox para o zoom informado.
+
+        Args:
+            responsavel_id (int): ID do usuário responsável pela frota
+            bbox (str): 'oeste,sul,leste,norte' em graus
+            zoom (int|str): Nível de zoom do mapa (0 a 22)
+
+        Returns:
+            dict: zoom efetivo, clusters (centróide e quantidade) e veículos individuais
+        """
+        bbox = cls.interpretar_bbox(bbox)
+        try:
+            zoom = int(zoom)
+        except (TypeError, ValueError):
+            raise BadRequestError("Parâmetro zoom inválido")
+        if zoom < 0 or zoom > 22:
+            raise BadRequestError("Parâmetro zoom deve estar entre 0 e 22")
+
+        grade = cls.obter_grade(responsavel_id)
+
+        if zoom >= ZOOM_INDIVIDUAL:
+            veiculos = grade.veiculos(bbox, MAX_ITENS)
+            if veiculos is not None:
+                return {'zoom': zoom, 'total': grade.total, 'clusters': [], 'veiculos': veiculos}
+            zoom = NIVEL_BASE
+
+        # Se o bbox pedido for grande demais para o zoom, sobe de nível até caber no limite
+        nivel = min(zoom, NIVEL_BASE)
+        clusters = grade.agrupar(bbox, nivel)
+        while len(clusters) > MAX_ITENS and nivel > 0:
+            nivel -= 1
+            clusters = grade.agrupar(bbox, nivel)
+
+        return {'zoom': nivel, 'total': grade.total, 'clusters': clusters, 'veiculos': []}
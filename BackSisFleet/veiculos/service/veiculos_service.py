@@ -5,6 +5,10 @@ from core.models import CustomUser
 from motoristas.models.motoristas import Motorista
 from veiculos.models.veiculos import Veiculo
 from django.db.models import Q
+from core.roteamento import fixar_banco, leitura_replica
+from core.cache_representacao import CacheRepresentacao
+from core.metricas import medir_servico
+from tarefas.services.tarefa_service import TarefaService
 
 
 class VeiculoError(Exception):
@@ -23,7 +27,18 @@ class InternalServerError(VeiculoError):
     """Exceção para erros internos do servidor (código HTTP 500)."""
 
 
+REPRESENTACOES_VEICULO = CacheRepresentacao(
+    Veiculo,
+    # to_dict inclui o username do motorista e de quem criou/atualizou
+    campos_versao=["updated_at", "motorista__usuario_fk__atualizado_em", "criado_por__atualizado_em", "atualizado_por__atualizado_em"],
+    serializar=lambda veiculo: veiculo.to_dict(),
+)
+
+
+@medir_servico
 class VeiculoService:
+
+    MAX_LINHAS_IMPORTACAO = 10000
     
     @classmethod
     def _carregar_dados_comuns(cls, data):
@@ -54,7 +69,6 @@ class VeiculoService:
             dados["criado_por"] = usuario_criador
             dados["atualizado_por"] = usuario_criador
             dados["created_at"] = timezone.now()
-            dados["updated_at"] = timezone.now()
 
             veiculo = Veiculo.objects.create(**dados)
             return veiculo
@@ -85,14 +99,16 @@ class VeiculoService:
             NotFoundError: Se nenhum veículo for encontrado para o motorista.
         """
         try:
-            veiculos = Veiculo.objects.filter(motorista_id=motorista_id).select_related(
-                "motorista", "criado_por", "atualizado_por"
+            veiculos = REPRESENTACOES_VEICULO.representar(
+                Veiculo.objects.filter(motorista_id=motorista_id).select_related(
+                    "motorista__usuario_fk", "criado_por", "atualizado_por"
+                ).order_by("id")
             )
 
-            if not veiculos.exists():
+            if not veiculos:
                 raise NotFoundError(f"Nenhum veículo encontrado para o motorista ID {motorista_id}")
 
-            return [cls.to_dict(veiculo) for veiculo in veiculos]
+            return veiculos
 
         except Exception as e:
             raise InternalServerError(f"Erro ao obter veículos do motorista: {str(e)}")
@@ -114,7 +130,6 @@ class VeiculoService:
                     setattr(veiculo, field, value)
 
             veiculo.atualizado_por = usuario_atualizador
-            veiculo.updated_at = timezone.now()
             veiculo.save()
 
             return veiculo
@@ -145,6 +160,7 @@ class VeiculoService:
             return None
 
     @classmethod
+    @leitura_replica
     def listar_veiculos(cls, filtros=None):
         queryset = Veiculo.objects.all()
 
@@ -164,14 +180,75 @@ class VeiculoService:
             if "motorista_id" in filtros and filtros["motorista_id"]:
                 queryset = queryset.filter(motorista_id=filtros["motorista_id"])
 
-        return queryset.select_related("motorista", "criado_por", "atualizado_por")
+        # to_dict usa o username do usuário do motorista
+        return queryset.select_related("motorista__usuario_fk", "criado_por", "atualizado_por")
 
     @classmethod
+    @leitura_replica
     def listar_veiculos_por_motorista(cls, motorista_id):
         veiculos = Veiculo.objects.filter(motorista_id=motorista_id).select_related(
-            "motorista", "criado_por", "atualizado_por"
-        )
-        return [cls.to_dict(veiculo) for veiculo in veiculos]
+            "motorista__usuario_fk", "criado_por", "atualizado_por"
+        ).order_by("id")
+        # Só os veículos alterados desde a última listagem são serializados de novo
+        return REPRESENTACOES_VEICULO.representar(veiculos)
+
+    @classmethod
+    def atualizar_ultima_posicao(cls, veiculo_id, latitude, longitude, registrado_em):
+        """
+        Registra a última posição conhecida do veículo, ignorando posições
+        mais antigas que a já gravada (pacotes fora de ordem).
+
+        Returns:
+            bool: True se a posição foi atualizada
+        """
+        return Veiculo.objects.filter(
+            Q(ultima_posicao_em__isnull=True) | Q(ultima_posicao_em__lt=registrado_em),
+            id=veiculo_id,
+        ).update(
+            ultima_latitude=latitude,
+            ultima_longitude=longitude,
+            ultima_posicao_em=registrado_em,
+        ) > 0
+
+    CAMPOS_EXPORTACAO = [
+        ("id", "id"),
+        ("placa", "placa"),
+        ("renavam", "renavam"),
+        ("chassi", "chassi"),
+        ("marca", "marca"),
+        ("modelo", "modelo"),
+        ("ano_fabricacao", "ano_fabricacao"),
+        ("ano_modelo", "ano_modelo"),
+        ("cor", "cor"),
+        ("tipo_combustivel", "tipo_combustivel"),
+        ("motorista", "motorista__usuario_fk__username"),
+        ("ultima_latitude", "ultima_latitude"),
+        ("ultima_longitude", "ultima_longitude"),
+        ("ultima_posicao_em", "ultima_posicao_em"),
+        ("created_at", "created_at"),
+        ("updated_at", "updated_at"),
+    ]
+
+    @classmethod
+    @leitura_replica
+    def exportar_veiculos_por_responsavel(cls, responsavel_id, tamanho_chunk=2000):
+        """
+        Linhas para exportação da frota de um responsável, lidas sob demanda.
+
+        Args:
+            responsavel_id (int): ID do usuário responsável.
+            tamanho_chunk (int): Linhas buscadas no banco por vez.
+
+        Returns:
+            tuple: (cabeçalho, iterador de tuplas)
+        """
+        # As linhas são lidas durante o streaming, depois do retorno: o banco é escolhido aqui
+        linhas = fixar_banco(Veiculo.objects.filter(
+            Q(criado_por_id=responsavel_id) | Q(motorista__responsavel_fk_id=responsavel_id)
+        )).order_by("id").values_list(
+            *[campo for _, campo in cls.CAMPOS_EXPORTACAO]
+        ).iterator(chunk_size=tamanho_chunk)
+        return [coluna for coluna, _ in cls.CAMPOS_EXPORTACAO], linhas
 
     @classmethod
     def deletar_veiculo(cls, veiculo_id):
@@ -181,6 +258,34 @@ class VeiculoService:
         except Veiculo.DoesNotExist:
             raise NotFoundError(f"Veículo com ID {veiculo_id} não encontrado")
 
+    @classmethod
+    def agendar_importacao(cls, linhas, usuario_id):
+        """
+        Enfileira a importação de uma planilha de veículos ('veiculos.importar_veiculos').
+        O request só valida o formato e responde na hora; o cadastro linha a
+        linha roda no worker e o resultado fica na tarefa.
+
+        Args:
+            linhas (list): Dicionários com os campos do veículo e o 'cpf_cnpj' do motorista
+            usuario_id (int): Cliente que importa (dono da frota)
+
+        Returns:
+            Tarefa: Tarefa enfileirada
+
+        Raises:
+            BadRequestError: Lista vazia, com itens inválidos ou maior que MAX_LINHAS_IMPORTACAO
+        """
+        if not isinstance(linhas, list) or not linhas:
+            raise BadRequestError("Informe uma lista de veículos")
+        if len(linhas) > cls.MAX_LINHAS_IMPORTACAO:
+            raise BadRequestError(f"Máximo de {cls.MAX_LINHAS_IMPORTACAO} veículos por importação")
+        invalidas = [indice for indice, linha in enumerate(linhas) if not isinstance(linha, dict) or not linha.get("placa")]
+        if invalidas:
+            raise BadRequestError(f"Linhas sem placa: {', '.join(str(indice) for indice in invalidas[:20])}")
+        return TarefaService.enfileirar(
+            "veiculos.importar_veiculos", {"linhas": linhas, "usuario_id": usuario_id}, criado_por_id=usuario_id,
+        )
+
     @classmethod
     def to_dict(cls, veiculo):
         return veiculo.to_dict() if hasattr(veiculo, "to_dict") else {
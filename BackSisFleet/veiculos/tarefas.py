@@ -0,0 +1,48 @@
+# veiculos/tarefas.py
+from core.models import CustomUser
+from motoristas.models.motoristas import Motorista
+from tarefas.registro import tarefa
+from veiculos.service.veiculos_service import VeiculoError, VeiculoService
+
+# Campos aceitos da planilha; o motorista vem só do 'cpf_cnpj', resolvido na frota do cliente
+CAMPOS_IMPORTACAO = (
+    'placa', 'renavam', 'chassi', 'marca', 'modelo', 'ano_fabricacao', 'ano_modelo', 'cor', 'tipo_combustivel',
+)
+
+
+@tarefa('veiculos.importar_veiculos', prioridade=10)
+def importar_veiculos(linhas, usuario_id):
+    """
+    Cadastra os veículos de uma planilha enviada pelo cliente.
+
+    Cada linha traz os campos do veículo e o 'cpf_cnpj' do motorista, que
+    precisa ser da frota do cliente. Linhas com erro não interrompem a
+    importação: voltam no resultado, pelo índice. Se a tarefa for repetida
+    depois de uma falha, as linhas já gravadas acusam placa duplicada.
+    Colunas fora de CAMPOS_IMPORTACAO (inclusive um 'motorista' com ID)
+    são ignoradas.
+
+    Returns:
+        dict: Veículos criados e erros por linha
+    """
+    usuario = CustomUser.objects.get(id=usuario_id)
+    cpfs = {linha.get('cpf_cnpj') for linha in linhas if linha.get('cpf_cnpj')}
+    motoristas = dict(
+        Motorista.objects.filter(responsavel_fk_id=usuario_id, usuario_fk__cpf_cnpj__in=cpfs)
+        .values_list('usuario_fk__cpf_cnpj', 'id')
+    )
+
+    criados, erros = [], {}
+    for indice, linha in enumerate(linhas):
+        dados = {campo: linha[campo] for campo in CAMPOS_IMPORTACAO if campo in linha}
+        cpf_cnpj = linha.get('cpf_cnpj')
+        if cpf_cnpj:
+            if cpf_cnpj not in motoristas:
+                erros[indice] = f"Motorista com CPF/CNPJ {cpf_cnpj} não encontrado na sua frota"
+                continue
+            dados['motorista'] = motoristas[cpf_cnpj]
+        try:
+            criados.append(VeiculoService.criar_veiculo(dados, usuario).id)
+        except VeiculoError as e:
+            erros[indice] = str(e)
+    return {'criados': len(criados), 'veiculos': criados, 'erros': erros}
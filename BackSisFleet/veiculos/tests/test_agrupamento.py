@@ -0,0 +1,80 @@
+from django.test import SimpleTestCase, TestCase
+from core.models import CustomUser
+from veiculos.models.veiculos import Veiculo
+from veiculos.service.agrupamento_service import (
+    NIVEL_BASE, AgrupamentoService, BadRequestError, GradeHierarquica, _celula, _projetar,
+)
+
+MUNDO = (-180.0, -90.0, 180.0, 90.0)
+# Dois bairros de São Paulo e um ponto no Rio
+POSICOES = [
+    (1, 'AAA0001', -23.5505, -46.6333),
+    (2, 'AAA0002', -23.5510, -46.6340),
+    (3, 'AAA0003', -23.5870, -46.6570),
+    (4, 'AAA0004', -22.9068, -43.1729),
+]
+
+
+class GradeHierarquicaTests(SimpleTestCase):
+
+    def setUp(self):
+        self.grade = GradeHierarquica(POSICOES)
+
+    def test_projecao_nos_limites(self):
+        self.assertEqual(_projetar(0, -180), (0.0, 0.5))
+        self.assertEqual(_projetar(90, 180), (1.0, 0.0))
+        self.assertEqual(_celula(-90, 180, 0), (3, 3))
+
+    def test_todo_nivel_soma_a_frota(self):
+        for nivel in range(NIVEL_BASE + 1):
+            with self.subTest(nivel=nivel):
+                self.assertEqual(sum(c['quantidade'] for c in self.grade.agrupar(MUNDO, nivel)), 4)
+
+    def test_zoom_baixo_junta_e_calcula_o_centroide(self):
+        clusters = sorted(self.grade.agrupar(MUNDO, 3), key=lambda c: c['quantidade'])
+        self.assertEqual([c['quantidade'] for c in clusters], [1, 3])
+        self.assertAlmostEqual(clusters[1]['latitude'], (-23.5505 - 23.5510 - 23.5870) / 3, places=5)
+
+    def test_zoom_alto_separa(self):
+        self.assertEqual(len(self.grade.agrupar(MUNDO, NIVEL_BASE)), 3)
+
+    def test_veiculos_no_bbox_e_limite(self):
+        sao_paulo = (-47.0, -24.0, -46.0, -23.0)
+        self.assertEqual(sorted(v['id'] for v in self.grade.veiculos(sao_paulo, 10)), [1, 2, 3])
+        self.assertIsNone(self.grade.veiculos(sao_paulo, 2))
+
+
+class AgrupamentoServiceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cliente = CustomUser.objects.create(username='cliente', tipo_usuario='cliente', cpf_cnpj='11222333000181')
+        Veiculo.objects.bulk_create([
+            Veiculo(placa=placa, marca='VW', modelo='Gol', criado_por=cls.cliente,
+                    ultima_latitude=latitude, ultima_longitude=longitude)
+            for _, placa, latitude, longitude in POSICOES
+        ])
+
+    def setUp(self):
+        AgrupamentoService._grades.clear()
+
+    def test_bbox_e_zoom_invalidos(self):
+        for bbox, zoom in (('1,2,3', 5), ('a,b,c,d', 5), ('10,0,0,10', 5), (','.join(map(str, MUNDO)), 23)):
+            with self.subTest(bbox=bbox, zoom=zoom), self.assertRaises(BadRequestError):
+                AgrupamentoService.agrupar(self.cliente.id, bbox, zoom)
+
+    def test_zoom_individual_devolve_veiculos(self):
+        resultado = AgrupamentoService.agrupar(self.cliente.id, '-47,-24,-46,-23', 16)
+        self.assertEqual(len(resultado['veiculos']), 3)
+        self.assertEqual(resultado['clusters'], [])
+        self.assertEqual(resultado['total'], 4)
+
+    def test_zoom_baixo_devolve_clusters(self):
+        resultado = AgrupamentoService.agrupar(self.cliente.id, '-180,-90,180,90', 2)
+        self.assertEqual(resultado['veiculos'], [])
+        self.assertEqual(sum(c['quantidade'] for c in resultado['clusters']), 4)
+
+    def test_grade_reaproveitada(self):
+        AgrupamentoService.agrupar(self.cliente.id, '-180,-90,180,90', 2)
+        with self.assertNumQueries(0):
+            AgrupamentoService.agrupar(self.cliente.id, '-180,-90,180,90', 4)
@@ -0,0 +1,47 @@
+from django.test import TestCase
+from core.models import CustomUser
+from motoristas.models.motoristas import Motorista
+from veiculos.models.veiculos import Veiculo
+from veiculos.tarefas import importar_veiculos
+
+
+class ImportarVeiculosTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cliente = CustomUser.objects.create(
+            username='transportadora', email='cliente@sisfleet.com', tipo_usuario='cliente', cpf_cnpj='11222333000181',
+        )
+        outro = CustomUser.objects.create(
+            username='concorrente', email='outro@sisfleet.com', tipo_usuario='cliente', cpf_cnpj='11444777000161',
+        )
+        cls.motorista = cls._motorista('motorista', '52998224725', cls.cliente)
+        cls.motorista_alheio = cls._motorista('alheio', '39053344705', outro)
+
+    @classmethod
+    def _motorista(cls, username, cpf, responsavel):
+        usuario = CustomUser.objects.create(
+            username=username, email=f'{username}@sisfleet.com', tipo_usuario='motorista', cpf_cnpj=cpf,
+        )
+        return Motorista.objects.create(
+            usuario_fk=usuario, responsavel_fk=responsavel, criado_por=responsavel,
+            atualizado_por=responsavel, cnh_numero=cpf,
+        )
+
+    def test_motorista_vem_do_cpf_da_propria_frota(self):
+        resultado = importar_veiculos([
+            {'placa': 'AAA0001', 'marca': 'Volvo', 'modelo': 'FH 460', 'cpf_cnpj': '52998224725'},
+            {'placa': 'AAA0002', 'marca': 'Volvo', 'modelo': 'FH 460', 'cpf_cnpj': '39053344705'},
+        ], self.cliente.id)
+        self.assertEqual(resultado['criados'], 1)
+        self.assertIn(1, resultado['erros'])
+        self.assertEqual(Veiculo.objects.get(placa='AAA0001').motorista_id, self.motorista.id)
+
+    def test_id_de_motorista_e_colunas_desconhecidas_sao_ignorados(self):
+        resultado = importar_veiculos([
+            {'placa': 'BBB0001', 'marca': 'Scania', 'modelo': 'R 450', 'motorista': self.motorista_alheio.id, 'criado_por': 999},
+        ], self.cliente.id)
+        self.assertEqual(resultado['erros'], {})
+        veiculo = Veiculo.objects.get(placa='BBB0001')
+        self.assertIsNone(veiculo.motorista_id)
+        self.assertEqual((veiculo.marca, veiculo.criado_por_id), ('Scania', self.cliente.id))
@@ -1,6 +1,9 @@
 from django.urls import path
-from .views import VeiculosView
+from .views import VeiculosView, AgrupamentoVeiculosView, ExportarVeiculosView, ImportarVeiculosView
 
 urlpatterns = [
     path('', VeiculosView.as_view(), name='veiculos'),
-]
\ No newline at end of file
+    path('clusters/', AgrupamentoVeiculosView.as_view(), name='veiculos_clusters'),
+    path('exportar/', ExportarVeiculosView.as_view(), name='veiculos_exportar'),
+    path('importar/', ImportarVeiculosView.as_view(), name='veiculos_importar'),
+]
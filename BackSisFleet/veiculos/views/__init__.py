@@ -1 +1,4 @@
-from veiculos.views.veiculos import VeiculosView
\ No newline at end of file
+from veiculos.views.veiculos import VeiculosView
+from veiculos.views.agrupamento import AgrupamentoVeiculosView
+from veiculos.views.exportacao import ExportarVeiculosView
+from veiculos.views.importacao import ImportarVeiculosView
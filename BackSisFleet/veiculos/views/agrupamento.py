@@ -0,0 +1,35 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from veiculos.service.agrupamento_service import AgrupamentoService, BadRequestError
+
+
+class AgrupamentoVeiculosView(APIView):
+    """
+    Visão geral da frota no mapa, agrupada no servidor por nível de zoom.
+
+    Parâmetros (query string):
+        - bbox: 'oeste,sul,leste,norte' da área visível.
+        - zoom: Nível de zoom do mapa (0 a 22).
+
+    Retorna centróides e quantidades dos grupos; veículos individuais só
+    aparecem nos zooms mais altos. A resposta é limitada a algumas centenas
+    de itens qualquer que seja o tamanho da frota.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        usuario = request.user
+        if usuario.tipo_usuario != 'cliente':
+            return Response({"mensagem": "Você não tem acesso a esta funcionalidade."}, status=403)
+
+        bbox = request.query_params.get('bbox')
+        zoom = request.query_params.get('zoom')
+        if not bbox or zoom is None:
+            return Response({"erro": "Informe os parâmetros bbox e zoom"}, status=400)
+
+        try:
+            resultado = AgrupamentoService.agrupar(usuario.id, bbox, zoom)
+        except BadRequestError as e:
+            return Response({"erro": str(e)}, status=400)
+        return Response(resultado)
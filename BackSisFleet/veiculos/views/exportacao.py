@@ -0,0 +1,26 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from common.utils.exportacao_csv import resposta_csv
+from veiculos.service.veiculos_service import VeiculoService
+
+
+class ExportarVeiculosView(APIView):
+    """
+    Exporta em CSV os veículos da frota do usuário responsável.
+
+    O arquivo é gerado em streaming a partir do banco, sem montar a lista
+    em memória, então funciona igual para frotas de qualquer tamanho.
+
+    Permissões:
+        - Somente usuários autenticados do tipo 'cliente'.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        usuario = request.user
+        if usuario.tipo_usuario != 'cliente':
+            return Response({"mensagem": "Você não tem acesso a esta funcionalidade."}, status=403)
+
+        cabecalho, linhas = VeiculoService.exportar_veiculos_por_responsavel(usuario.id)
+        return resposta_csv('veiculos.csv', cabecalho, linhas)
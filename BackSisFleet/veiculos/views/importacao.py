@@ -0,0 +1,30 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from veiculos.service.veiculos_service import BadRequestError, VeiculoService
+
+
+class ImportarVeiculosView(APIView):
+    """
+    Importa uma planilha de veículos em segundo plano.
+
+    Corpo: {"veiculos": [{"placa": ..., "cpf_cnpj": <motorista>, "marca": ..., ...}]}
+
+    Responde 202 com a tarefa enfileirada; o andamento e os erros por linha
+    ficam em /api/tarefas/<id>/.
+
+    Permissões:
+        - Somente usuários autenticados do tipo 'cliente'.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        usuario = request.user
+        if usuario.tipo_usuario != 'cliente':
+            return Response({"mensagem": "Você não tem acesso a esta funcionalidade."}, status=403)
+
+        try:
+            tarefa = VeiculoService.agendar_importacao(request.data.get('veiculos'), usuario.id)
+        except BadRequestError as e:
+            return Response({"erro": str(e)}, status=400)
+        return Response({"mensagem": "Importação enfileirada", "tarefa": tarefa.to_dict()}, status=202)